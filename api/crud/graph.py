@@ -134,8 +134,34 @@ def get_company_network(
     }
 
 
+def get_network_summary(conn, network: str = 'coemployment') -> Optional[Dict[str, Any]]:
+    """Precomputed degree distribution for a network (see scripts/analytics/network_degree.py)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT network, people, edges, min_degree, max_degree, avg_degree, median_degree,
+               avg_strength, avg_shared_repos, refreshed_at
+        FROM network_summary
+        WHERE network = %s
+    """, (network,))
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+
 def get_graph_stats(conn) -> Dict[str, Any]:
     """Get overall graph statistics"""
+    summary = get_network_summary(conn, 'coemployment')
+    if summary:
+        return {
+            'total_edges': summary['edges'],
+            'people_in_graph': summary['people'],
+            'min_connections': summary['min_degree'] or 0,
+            'max_connections': summary['max_degree'] or 0,
+            'avg_connections': round(summary['avg_degree'] or 0),
+            'median_connections': round(summary['median_degree'] or 0),
+            'as_of': summary['refreshed_at'].isoformat() if summary['refreshed_at'] else None
+        }
+    
+    # Degree table not populated yet - aggregate the edges directly
     cursor = conn.cursor()
     
     # Get edge count
@@ -180,7 +206,8 @@ def get_graph_stats(conn) -> Dict[str, Any]:
         'min_connections': distribution['min_connections'] if distribution else 0,
         'max_connections': distribution['max_connections'] if distribution else 0,
         'avg_connections': distribution['avg_connections'] if distribution else 0,
-        'median_connections': distribution['median_connections'] if distribution else 0
+        'median_connections': distribution['median_connections'] if distribution else 0,
+        'as_of': None
     }
 
 
@@ -188,6 +215,22 @@ def get_top_connected_people(conn, limit: int = 10) -> List[Dict]:
     """Get the most connected people in the network"""
     cursor = conn.cursor()
     
+    if get_network_summary(conn, 'coemployment'):
+        cursor.execute("""
+            SELECT 
+                p.person_id::text,
+                p.full_name,
+                p.location,
+                p.headline,
+                d.coemployment_degree as connection_count
+            FROM person_network_degree d
+            JOIN person p ON d.person_id = p.person_id
+            WHERE d.coemployment_degree > 0
+            ORDER BY d.coemployment_degree DESC
+            LIMIT %s
+        """, (limit,))
+        return [dict(row) for row in cursor.fetchall()]
+    
     cursor.execute("""
         WITH all_connections AS (
             SELECT src_person_id as person_id FROM edge_coemployment
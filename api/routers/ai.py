@@ -5,13 +5,26 @@ Provides AI analysis and Q&A for candidate profiles.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from psycopg2.extras import RealDictCursor
+import asyncio
 import logging
+import uuid
 
 from api.dependencies import get_db
+from api.models.advanced_search import AdvancedSearchRequest
 from api.services.ai_service import get_ai_service, AIService
+from api.services.ai_streaming import SSE_HEADERS, stream_completion
+from api.services.batch_summarizer import (
+    MAX_BATCH_PEOPLE,
+    create_batch,
+    job_context_hash,
+    resolve_person_ids,
+    run_batch
+)
+from api.services.context_assembly import fetch_sections
 
 router = APIRouter(prefix="/api/ai", tags=["ai"])
 logger = logging.getLogger(__name__)
@@ -43,23 +56,55 @@ class QuestionRequest(BaseModel):
     model: Optional[str] = Field(None, description="Specific model (optional)")
 
 
-def _fetch_candidate_data(person_id: str, db) -> Dict[str, Any]:
-    """Fetch all candidate data for AI analysis."""
-    cursor = db.cursor(cursor_factory=RealDictCursor)
+class BatchSummaryRequest(BaseModel):
+    """Request for summarizing many candidates in one background job."""
+    list_id: Optional[str] = Field(None, description="Candidate list to summarize")
+    person_ids: Optional[List[str]] = Field(None, description="Explicit candidates (e.g. search results)")
+    search: Optional[AdvancedSearchRequest] = Field(None, description="Advanced search to run and summarize")
+    job_context: Optional[str] = Field(None, description="Optional job description or role context")
+    provider: str = Field("openai", description="AI provider: 'openai' or 'anthropic'")
+    model: Optional[str] = Field(None, description="Specific model (optional)")
+    concurrency: Optional[int] = Field(None, ge=1, le=64, description="Concurrent LLM calls (default per provider)")
+
+
+def _query(sql: str, params: tuple, one: bool = False):
+    """Section helper: run one query on the section's connection."""
+    def fetch(conn):
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            cursor.execute(sql, params)
+            if one:
+                row = cursor.fetchone()
+                return dict(row) if row else None
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    return fetch
+
+
+async def _fetch_candidate_data(person_id: str) -> Dict[str, Any]:
+    """
+    Fetch all candidate data for AI analysis.
     
+    The sections run concurrently on their own pooled connections; optional
+    sections that exceed the time budget are left out of the context.
+    
+    Raises:
+        HTTPException: 422 for a malformed person_id, 404 if there is no such
+            person, 503 if the person section timed out. Other errors loading
+            the person are raised as is.
+    """
     try:
-        # Get person
-        cursor.execute(
-            "SELECT * FROM person WHERE person_id = %s",
-            (person_id,)
-        )
-        person = cursor.fetchone()
-        
-        if not person:
-            raise HTTPException(status_code=404, detail="Person not found")
-        
-        # Get employment
-        cursor.execute(
+        uuid.UUID(person_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="person_id must be a UUID")
+    
+    # Same profile for the profile and contributions sections if a person has several
+    first_profile = "SELECT github_profile_id FROM github_profile WHERE person_id = %s ORDER BY github_profile_id LIMIT 1"
+    
+    sections, omitted = await fetch_sections({
+        "person": _query("SELECT * FROM person WHERE person_id = %s", (person_id,), one=True),
+        "employment": _query(
             """
             SELECT e.*, c.company_name
             FROM employment e
@@ -71,71 +116,74 @@ def _fetch_candidate_data(person_id: str, db) -> Dict[str, Any]:
                 e.start_date DESC
             """,
             (person_id,)
-        )
-        employment = cursor.fetchall()
-        
-        # Get emails
-        cursor.execute(
-            "SELECT * FROM person_email WHERE person_id = %s",
-            (person_id,)
-        )
-        emails = cursor.fetchall()
-        
-        # Get GitHub profile
-        cursor.execute(
-            "SELECT * FROM github_profile WHERE person_id = %s",
+        ),
+        "emails": _query("SELECT * FROM person_email WHERE person_id = %s", (person_id,)),
+        "github_profile": _query(
+            "SELECT * FROM github_profile WHERE person_id = %s ORDER BY github_profile_id LIMIT 1",
+            (person_id,), one=True
+        ),
+        "github_contributions": _query(
+            f"""
+            SELECT 
+                gc.contribution_count,
+                gc.last_contribution_date,
+                gr.repo_id,
+                gr.full_name as repo_full_name,
+                gr.repo_name,
+                gr.description,
+                gr.language,
+                gr.stars,
+                gr.forks,
+                gr.is_fork,
+                c.company_name as owner_company_name
+            FROM github_contribution gc
+            JOIN github_repository gr ON gc.repo_id = gr.repo_id
+            LEFT JOIN company c ON gr.company_id = c.company_id
+            WHERE gc.github_profile_id = ({first_profile})
+            ORDER BY gr.stars DESC, gc.contribution_count DESC
+            LIMIT 20
+            """,
             (person_id,)
-        )
-        github_profile = cursor.fetchone()
-        
-        # Get GitHub contributions
-        contributions = []
-        if github_profile:
-            cursor.execute(
-                """
-                SELECT 
-                    gc.contribution_count,
-                    gc.last_contribution_date,
-                    gr.repo_id,
-                    gr.full_name as repo_full_name,
-                    gr.repo_name,
-                    gr.description,
-                    gr.language,
-                    gr.stars,
-                    gr.forks,
-                    gr.is_fork,
-                    c.company_name as owner_company_name
-                FROM github_contribution gc
-                JOIN github_repository gr ON gc.repo_id = gr.repo_id
-                LEFT JOIN company c ON gr.company_id = c.company_id
-                WHERE gc.github_profile_id = %s
-                ORDER BY gr.stars DESC, gc.contribution_count DESC
-                LIMIT 20
-                """,
-                (github_profile['github_profile_id'],)
-            )
-            contributions = cursor.fetchall()
-        
-        cursor.close()
-        
-        return {
-            "person": dict(person),
-            "employment": [dict(e) for e in employment],
-            "emails": [dict(e) for e in emails],
-            "github_profile": dict(github_profile) if github_profile else None,
-            "github_contributions": [dict(c) for c in contributions]
-        }
-        
-    except Exception as e:
-        cursor.close()
-        logger.error(f"Error fetching candidate data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        ),
+    }, required=("person",))
+    
+    if "person" in omitted:
+        logger.error(f"Error fetching candidate data: person {person_id} timed out")
+        raise HTTPException(status_code=503, detail="Timed out loading candidate")
+    if not sections["person"]:
+        raise HTTPException(status_code=404, detail="Person not found")
+    
+    return {
+        "person": sections["person"],
+        "employment": sections.get("employment", []),
+        "emails": sections.get("emails", []),
+        "github_profile": sections.get("github_profile"),
+        "github_contributions": sections.get("github_contributions", []),
+        "omitted_sections": omitted
+    }
+
+
+def _stream_meta(person_id: str, candidate_data: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+    """meta event for streamed candidate answers: which sections fed the prompt."""
+    return {
+        "person_id": person_id,
+        "sources": [
+            name for name in ("person", "employment", "emails", "github_profile", "github_contributions")
+            if candidate_data.get(name)
+        ],
+        "omitted_sections": candidate_data["omitted_sections"],
+        "cached": cached
+    }
+
+
+def _sse_response(body) -> StreamingResponse:
+    return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @router.post("/profile-summary")
 async def generate_profile_summary(
     request: ProfileSummaryRequest,
-    db=Depends(get_db)
+    stream: bool = Query(False, description="Stream the summary as server-sent events")
 ):
     """
     Generate an AI-powered profile summary for a candidate.
@@ -147,10 +195,29 @@ async def generate_profile_summary(
     - Ideal roles
     - Career trajectory
     - Standout projects
+    
+    With stream=true the response is an SSE stream (start, meta, token..., done).
     """
+    if stream:
+        try:
+            ai_service = get_ai_service(provider=request.provider, model=request.model)
+        except (ValueError, ImportError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        async def prepare():
+            candidate_data = await _fetch_candidate_data(request.person_id)
+            cached, deltas = await ai_service.stream_profile_summary(candidate_data, request.job_context)
+            return _stream_meta(request.person_id, candidate_data, cached), deltas
+        
+        return _sse_response(stream_completion(
+            {"person_id": request.person_id, "provider": ai_service.provider, "model": ai_service.model},
+            prepare,
+            lambda text: {"person_id": request.person_id, "summary": ai_service._profile_summary_result(text)}
+        ))
+    
     try:
         # Fetch candidate data
-        candidate_data = _fetch_candidate_data(request.person_id, db)
+        candidate_data = await _fetch_candidate_data(request.person_id)
         
         # Initialize AI service
         ai_service = get_ai_service(
@@ -159,7 +226,7 @@ async def generate_profile_summary(
         )
         
         # Generate summary
-        summary = ai_service.generate_profile_summary(
+        summary = await ai_service.generate_profile_summary_async(
             candidate_data=candidate_data,
             job_context=request.job_context
         )
@@ -167,9 +234,12 @@ async def generate_profile_summary(
         return {
             "success": True,
             "person_id": request.person_id,
-            "summary": summary
+            "summary": summary,
+            "omitted_sections": candidate_data["omitted_sections"]
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -179,8 +249,7 @@ async def generate_profile_summary(
 
 @router.post("/code-analysis")
 async def analyze_code_quality(
-    request: CodeAnalysisRequest,
-    db=Depends(get_db)
+    request: CodeAnalysisRequest
 ):
     """
     Analyze a candidate's code quality and technical work.
@@ -197,7 +266,7 @@ async def analyze_code_quality(
     """
     try:
         # Fetch candidate data
-        candidate_data = _fetch_candidate_data(request.person_id, db)
+        candidate_data = await _fetch_candidate_data(request.person_id)
         
         if not candidate_data.get("github_profile"):
             raise HTTPException(
@@ -212,7 +281,7 @@ async def analyze_code_quality(
         )
         
         # Analyze code
-        analysis = ai_service.analyze_code_quality(
+        analysis = await ai_service.analyze_code_quality_async(
             candidate_data=candidate_data,
             job_requirements=request.job_requirements
         )
@@ -220,9 +289,12 @@ async def analyze_code_quality(
         return {
             "success": True,
             "person_id": request.person_id,
-            "analysis": analysis
+            "analysis": analysis,
+            "omitted_sections": candidate_data["omitted_sections"]
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -233,7 +305,7 @@ async def analyze_code_quality(
 @router.post("/ask")
 async def ask_question(
     request: QuestionRequest,
-    db=Depends(get_db)
+    stream: bool = Query(False, description="Stream the answer as server-sent events")
 ):
     """
     Ask a question about a candidate.
@@ -245,10 +317,31 @@ async def ask_question(
     - "Do they have blockchain experience?"
     - "How do they compare to my current team at X company?"
     - "What's their management experience?"
+    
+    With stream=true the response is an SSE stream (start, meta, token..., done).
     """
+    if stream:
+        try:
+            ai_service = get_ai_service(provider=request.provider, model=request.model)
+        except (ValueError, ImportError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        async def prepare():
+            candidate_data = await _fetch_candidate_data(request.person_id)
+            cached, deltas = await ai_service.stream_answer(
+                candidate_data, request.question, request.conversation_history
+            )
+            return _stream_meta(request.person_id, candidate_data, cached), deltas
+        
+        return _sse_response(stream_completion(
+            {"person_id": request.person_id, "provider": ai_service.provider, "model": ai_service.model},
+            prepare,
+            lambda text: {"person_id": request.person_id, "question": request.question, "answer": text}
+        ))
+    
     try:
         # Fetch candidate data
-        candidate_data = _fetch_candidate_data(request.person_id, db)
+        candidate_data = await _fetch_candidate_data(request.person_id)
         
         # Initialize AI service
         ai_service = get_ai_service(
@@ -257,7 +350,7 @@ async def ask_question(
         )
         
         # Get answer
-        answer = ai_service.answer_question(
+        answer = await ai_service.answer_question_async(
             candidate_data=candidate_data,
             question=request.question,
             conversation_history=request.conversation_history
@@ -267,9 +360,12 @@ async def ask_question(
             "success": True,
             "person_id": request.person_id,
             "question": request.question,
-            "answer": answer
+            "answer": answer,
+            "omitted_sections": candidate_data["omitted_sections"]
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -300,3 +396,125 @@ async def get_ai_status():
         "providers": status
     }
 
+
+# Running batch jobs; keeps a reference so the tasks aren't garbage collected
+_batch_tasks = set()
+
+
+def _batch_done(task: asyncio.Task):
+    _batch_tasks.discard(task)
+    if not task.cancelled():
+        task.exception()  # Already logged by run_batch
+
+
+@router.post("/batch-summaries")
+async def start_batch_summaries(
+    request: BatchSummaryRequest,
+    db=Depends(get_db)
+):
+    """
+    Summarize a candidate list, search or set of people in the background.
+    
+    Summaries are written to candidate_summary as they complete; poll
+    /batch-summaries/{batch_id} for progress and read them from /summaries.
+    """
+    sources = [source for source in ("list_id", "person_ids", "search") if getattr(request, source)]
+    if len(sources) != 1:
+        raise HTTPException(status_code=400, detail="Provide exactly one of list_id, person_ids or search")
+    
+    try:
+        ai_service = get_ai_service(provider=request.provider, model=request.model)
+    except (ValueError, ImportError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        person_ids = resolve_person_ids(
+            db,
+            list_id=request.list_id,
+            person_ids=request.person_ids,
+            search=request.search,
+            limit=MAX_BATCH_PEOPLE
+        )
+        if not person_ids:
+            raise HTTPException(status_code=404, detail="No candidates to summarize")
+        
+        batch_id = create_batch(
+            db, person_ids, sources[0], request.job_context,
+            ai_service.provider, ai_service.model, request.list_id
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error starting summary batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    task = asyncio.create_task(run_batch(
+        batch_id, person_ids, ai_service, request.job_context, request.concurrency
+    ))
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_done)
+    
+    return {
+        "success": True,
+        "batch_id": batch_id,
+        "total": len(person_ids)
+    }
+
+
+@router.get("/batch-summaries/{batch_id}")
+async def get_batch_summaries_status(
+    batch_id: str,
+    db=Depends(get_db)
+):
+    """
+    Progress of a summary batch: status, completed/failed counts and, once
+    finished, throughput and latency stats.
+    """
+    cursor = db.cursor(cursor_factory=RealDictCursor)
+    cursor.execute("SELECT * FROM summary_batch WHERE batch_id = %s", (batch_id,))
+    batch = cursor.fetchone()
+    cursor.close()
+    
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    return {
+        "success": True,
+        "batch": dict(batch)
+    }
+
+
+@router.get("/summaries")
+async def get_summaries(
+    list_id: Optional[str] = Query(None, description="Candidate list"),
+    person_ids: Optional[List[str]] = Query(None, description="Specific candidates"),
+    job_context: Optional[str] = Query(None, description="Job context the summaries were generated for"),
+    db=Depends(get_db)
+):
+    """
+    Stored profile summaries for a list or set of candidates.
+    
+    Candidates without a summary for this job context are listed in `missing`.
+    """
+    if not list_id and not person_ids:
+        raise HTTPException(status_code=400, detail="Provide list_id or person_ids")
+    
+    if list_id:
+        person_ids = resolve_person_ids(db, list_id=list_id)
+    
+    cursor = db.cursor(cursor_factory=RealDictCursor)
+    cursor.execute("""
+        SELECT person_id::text AS person_id, summary, provider, model, generated_at
+        FROM candidate_summary
+        WHERE person_id = ANY(%s::uuid[]) AND job_context_hash = %s
+    """, (person_ids, job_context_hash(job_context)))
+    summaries = {row['person_id']: dict(row) for row in cursor.fetchall()}
+    cursor.close()
+    
+    return {
+        "success": True,
+        "count": len(summaries),
+        "summaries": [summaries[pid] for pid in person_ids if pid in summaries],
+        "missing": [pid for pid in person_ids if pid not in summaries]
+    }
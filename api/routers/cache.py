@@ -4,8 +4,11 @@ Cache Management API
 Provides endpoints for cache monitoring and management.
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from api.services.cache_service import get_cache
+from api.services.llm_cache import get_llm_cache
 
 router = APIRouter(prefix="/api/cache", tags=["cache"])
 
@@ -95,3 +98,47 @@ async def delete_cache_pattern(pattern: str):
         "message": f"All keys matching '{pattern}' deleted successfully"
     }
 
+
+@router.get("/llm")
+async def get_llm_cache_status():
+    """
+    Get LLM response cache statistics.
+    
+    Returns per prompt template:
+    - Hits, misses and hit rate for this API process
+    - Latency, tokens and estimated cost saved
+    - Lifetime totals for the stored entries
+    """
+    llm_cache = get_llm_cache()
+    
+    if llm_cache is None:
+        return {
+            "success": True,
+            "cache": {"enabled": False}
+        }
+    
+    return {
+        "success": True,
+        "cache": await asyncio.to_thread(llm_cache.stats)
+    }
+
+
+@router.delete("/llm/subject/{subject_id}")
+async def invalidate_llm_cache_subject(subject_id: str):
+    """
+    Drop all cached AI responses about a subject (e.g. after a manual profile edit).
+    
+    Args:
+        subject_id: The person_id the responses are about
+    """
+    llm_cache = get_llm_cache()
+    
+    if llm_cache is None:
+        raise HTTPException(status_code=503, detail="LLM cache disabled")
+    
+    deleted = await asyncio.to_thread(llm_cache.invalidate, subject_id)
+    
+    return {
+        "success": True,
+        "message": f"{deleted} cached responses deleted"
+    }
@@ -207,6 +207,57 @@ async def get_developer_quality_distribution(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _live_network_stats(cursor):
+    """
+    Network stats straight from edge_github_collaboration, for before the
+    degree table is populated. Leaves the top hubs query on the cursor.
+    """
+    cursor.execute("""
+        SELECT 
+            COUNT(DISTINCT src_person_id) + COUNT(DISTINCT dst_person_id) as total_connected_people,
+            COUNT(*) as total_edges,
+            AVG(shared_repos) as avg_shared_repos,
+            AVG(collaboration_strength) as avg_collaboration_strength
+        FROM edge_github_collaboration
+    """)
+    
+    network_stats = dict(cursor.fetchone())
+    
+    # Calculate avg connections per person
+    if network_stats['total_connected_people'] > 0:
+        network_stats['avg_connections_per_person'] = (
+            network_stats['total_edges'] * 2 / network_stats['total_connected_people']
+        )
+    else:
+        network_stats['avg_connections_per_person'] = 0
+    network_stats['as_of'] = None
+    
+    # Top collaboration hubs
+    cursor.execute("""
+        SELECT 
+            p.person_id,
+            p.full_name,
+            gp.github_username,
+            gp.importance_score,
+            COUNT(*) as connection_count,
+            AVG(egc.collaboration_strength) as avg_strength
+        FROM (
+            SELECT src_person_id as person_id, collaboration_strength
+            FROM edge_github_collaboration
+            UNION ALL
+            SELECT dst_person_id, collaboration_strength
+            FROM edge_github_collaboration
+        ) egc
+        JOIN person p ON egc.person_id = p.person_id
+        LEFT JOIN github_profile gp ON p.person_id = gp.person_id
+        GROUP BY p.person_id, p.full_name, gp.github_username, gp.importance_score
+        ORDER BY connection_count DESC
+        LIMIT 20
+    """)
+    
+    return network_stats
+
+
 @router.get("/network-density")
 async def get_network_density(db=Depends(get_db)):
     """
@@ -221,48 +272,41 @@ async def get_network_density(db=Depends(get_db)):
     try:
         cursor = db.cursor(cursor_factory=RealDictCursor)
         
-        # Overall network stats
+        # Precomputed by scripts/analytics/network_degree.py (migration 24)
         cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT src_person_id) + COUNT(DISTINCT dst_person_id) as total_connected_people,
-                COUNT(*) as total_edges,
-                AVG(shared_repos) as avg_shared_repos,
-                AVG(collaboration_strength) as avg_collaboration_strength
-            FROM edge_github_collaboration
+            SELECT people, edges, avg_degree, avg_strength, avg_shared_repos, refreshed_at
+            FROM network_summary
+            WHERE network = 'github'
         """)
-        
-        network_stats = dict(cursor.fetchone())
-        
-        # Calculate avg connections per person
-        if network_stats['total_connected_people'] > 0:
-            network_stats['avg_connections_per_person'] = (
-                network_stats['total_edges'] * 2 / network_stats['total_connected_people']
-            )
+        summary = cursor.fetchone()
+        
+        if summary:
+            network_stats = {
+                'total_connected_people': summary['people'],
+                'total_edges': summary['edges'],
+                'avg_shared_repos': summary['avg_shared_repos'],
+                'avg_collaboration_strength': summary['avg_strength'],
+                'avg_connections_per_person': summary['avg_degree'] or 0,
+                'as_of': summary['refreshed_at'].isoformat() if summary['refreshed_at'] else None
+            }
+            
+            cursor.execute("""
+                SELECT 
+                    p.person_id,
+                    p.full_name,
+                    gp.github_username,
+                    gp.importance_score,
+                    d.github_degree as connection_count,
+                    d.github_strength_sum / NULLIF(d.github_strength_n, 0) as avg_strength
+                FROM person_network_degree d
+                JOIN person p ON d.person_id = p.person_id
+                LEFT JOIN github_profile gp ON p.person_id = gp.person_id
+                WHERE d.github_degree > 0
+                ORDER BY d.github_degree DESC
+                LIMIT 20
+            """)
         else:
-            network_stats['avg_connections_per_person'] = 0
-        
-        # Top collaboration hubs
-        cursor.execute("""
-            SELECT 
-                p.person_id,
-                p.full_name,
-                gp.github_username,
-                gp.importance_score,
-                COUNT(*) as connection_count,
-                AVG(egc.collaboration_strength) as avg_strength
-            FROM (
-                SELECT src_person_id as person_id, collaboration_strength
-                FROM edge_github_collaboration
-                UNION ALL
-                SELECT dst_person_id, collaboration_strength
-                FROM edge_github_collaboration
-            ) egc
-            JOIN person p ON egc.person_id = p.person_id
-            LEFT JOIN github_profile gp ON p.person_id = gp.person_id
-            GROUP BY p.person_id, p.full_name, gp.github_username, gp.importance_score
-            ORDER BY connection_count DESC
-            LIMIT 20
-        """)
+            network_stats = _live_network_stats(cursor)
         
         top_hubs = [dict(row) for row in cursor.fetchall()]
         
@@ -307,24 +351,26 @@ async def get_company_team_composition(
         # Build employment filter
         employment_filter = "AND e.end_date IS NULL" if not include_former else ""
         
-        # Team size and basics
-        cursor.execute(f"""
+        # Team size and basics (company_summary_rollup, see scripts/analytics/company_rollups.py)
+        cursor.execute("""
             SELECT 
-                COUNT(DISTINCT e.person_id) as total_employees,
-                COUNT(DISTINCT CASE WHEN e.end_date IS NULL THEN e.person_id END) as current_employees,
-                COUNT(DISTINCT CASE WHEN e.end_date IS NOT NULL THEN e.person_id END) as former_employees,
-                COUNT(DISTINCT gp.github_profile_id) as with_github,
-                AVG(gp.importance_score) as avg_importance,
-                SUM(gp.total_merged_prs) as total_merged_prs,
-                COUNT(DISTINCT pe.email) as email_count
-            FROM employment e
-            LEFT JOIN github_profile gp ON e.person_id = gp.person_id
-            LEFT JOIN person_email pe ON e.person_id = pe.person_id
-            WHERE e.company_id = %s::uuid
-            {employment_filter}
-        """, (company_id,))
+                total_employees,
+                current_employees,
+                former_employees,
+                with_github,
+                importance_sum / NULLIF(importance_n, 0) as avg_importance,
+                total_merged_prs,
+                email_count
+            FROM company_summary_rollup
+            WHERE company_id = %s::uuid
+            AND scope = %s
+        """, (company_id, 'all' if include_former else 'current'))
         
-        team_stats = dict(cursor.fetchone())
+        row = cursor.fetchone()
+        team_stats = dict(row) if row else {
+            'total_employees': 0, 'current_employees': 0, 'former_employees': 0,
+            'with_github': 0, 'avg_importance': None, 'total_merged_prs': 0, 'email_count': 0
+        }
         
         # Skills distribution
         cursor.execute(f"""
@@ -424,25 +470,28 @@ async def get_company_github_productivity(
     try:
         cursor = db.cursor(cursor_factory=RealDictCursor)
         
-        # Overall GitHub metrics
+        # Overall GitHub metrics (company_summary_rollup, current employees)
         cursor.execute("""
             SELECT 
-                COUNT(DISTINCT e.person_id) as total_developers,
-                COUNT(DISTINCT gp.github_profile_id) as developers_with_github,
-                SUM(gp.total_merged_prs) as total_merged_prs,
-                AVG(gp.total_merged_prs) as avg_merged_prs_per_dev,
-                SUM(gp.total_stars_earned) as total_stars_earned,
-                SUM(gp.total_contributions) as total_contributions,
-                COUNT(DISTINCT gc.repo_id) as unique_repos_contributed,
-                AVG(gc.contribution_quality_score) as avg_contribution_quality
-            FROM employment e
-            LEFT JOIN github_profile gp ON e.person_id = gp.person_id
-            LEFT JOIN github_contribution gc ON gp.github_profile_id = gc.github_profile_id
-            WHERE e.company_id = %s::uuid
-            AND e.end_date IS NULL
+                total_employees as total_developers,
+                with_github as developers_with_github,
+                total_merged_prs,
+                total_merged_prs::float / NULLIF(with_github, 0) as avg_merged_prs_per_dev,
+                total_stars_earned,
+                total_contributions,
+                unique_repos as unique_repos_contributed,
+                contribution_quality_sum / NULLIF(contribution_quality_n, 0) as avg_contribution_quality
+            FROM company_summary_rollup
+            WHERE company_id = %s::uuid
+            AND scope = 'current'
         """, (company_id,))
         
-        github_stats = dict(cursor.fetchone())
+        row = cursor.fetchone()
+        github_stats = dict(row) if row else {
+            'total_developers': 0, 'developers_with_github': 0, 'total_merged_prs': 0,
+            'avg_merged_prs_per_dev': None, 'total_stars_earned': 0, 'total_contributions': 0,
+            'unique_repos_contributed': 0, 'avg_contribution_quality': None
+        }
         
         # Top contributors from company
         cursor.execute("""
@@ -528,90 +577,63 @@ async def get_company_talent_flow_analysis(
         
         cutoff_date = datetime.now() - timedelta(days=30*months)
         
-        # Hiring trends
+        # Hiring and attrition trends (company_monthly_rollup)
         cursor.execute("""
             SELECT 
-                DATE_TRUNC('month', e.start_date) as month,
-                COUNT(*) as hires,
-                AVG(gp.importance_score) as avg_importance_of_hires
-            FROM employment e
-            LEFT JOIN github_profile gp ON e.person_id = gp.person_id
-            WHERE e.company_id = %s::uuid
-            AND e.start_date >= %s
-            AND e.start_date IS NOT NULL
-            GROUP BY DATE_TRUNC('month', e.start_date)
-            ORDER BY month DESC
-        """, (company_id, cutoff_date))
-        
-        hiring_trend = [dict(row) for row in cursor.fetchall()]
-        
-        # Attrition trends
-        cursor.execute("""
-            SELECT 
-                DATE_TRUNC('month', e.end_date) as month,
-                COUNT(*) as departures,
-                AVG(gp.importance_score) as avg_importance_lost
-            FROM employment e
-            LEFT JOIN github_profile gp ON e.person_id = gp.person_id
-            WHERE e.company_id = %s::uuid
-            AND e.end_date >= %s
-            AND e.end_date IS NOT NULL
-            GROUP BY DATE_TRUNC('month', e.end_date)
+                month,
+                hires,
+                departures,
+                hire_importance_sum / NULLIF(hire_importance_n, 0) as avg_importance_of_hires,
+                departure_importance_sum / NULLIF(departure_importance_n, 0) as avg_importance_lost
+            FROM company_monthly_rollup
+            WHERE company_id = %s::uuid
+            AND month >= DATE_TRUNC('month', %s::timestamp)
             ORDER BY month DESC
         """, (company_id, cutoff_date))
         
-        attrition_trend = [dict(row) for row in cursor.fetchall()]
-        
-        # Source companies (where they hire from)
+        months_rows = cursor.fetchall()
+        hiring_trend = [
+            {'month': m['month'], 'hires': m['hires'], 'avg_importance_of_hires': m['avg_importance_of_hires']}
+            for m in months_rows if m['hires']
+        ]
+        attrition_trend = [
+            {'month': m['month'], 'departures': m['departures'], 'avg_importance_lost': m['avg_importance_lost']}
+            for m in months_rows if m['departures']
+        ]
+        
+        # Source companies (joined within 6 months of leaving them)
         cursor.execute("""
-            WITH company_hires AS (
-                SELECT e1.person_id, e1.start_date
-                FROM employment e1
-                WHERE e1.company_id = %s::uuid
-                AND e1.start_date >= %s
-            )
             SELECT 
                 c.company_name as source_company,
-                COUNT(DISTINCT ch.person_id) as people_hired,
-                AVG(gp.importance_score) as avg_importance
-            FROM company_hires ch
-            JOIN employment e2 ON ch.person_id = e2.person_id 
-                AND e2.end_date < ch.start_date
-                AND e2.end_date >= ch.start_date - INTERVAL '6 months'
-            JOIN company c ON e2.company_id = c.company_id
-            LEFT JOIN github_profile gp ON ch.person_id = gp.person_id
-            WHERE c.company_id != %s::uuid
+                SUM(f.moves_within_6mo) as people_hired,
+                SUM(f.importance_sum) / NULLIF(SUM(f.importance_n), 0) as avg_importance
+            FROM company_talent_flow_rollup f
+            JOIN company c ON c.company_id = f.from_company_id
+            WHERE f.to_company_id = %s::uuid
+            AND f.joined_month >= DATE_TRUNC('month', %s::timestamp)
+            AND f.moves_within_6mo > 0
             GROUP BY c.company_id, c.company_name
             ORDER BY people_hired DESC
             LIMIT 15
-        """, (company_id, cutoff_date, company_id))
+        """, (company_id, cutoff_date))
         
         source_companies = [dict(row) for row in cursor.fetchall()]
         
-        # Destination companies (where people go)
+        # Destination companies (joined within 6 months of leaving)
         cursor.execute("""
-            WITH company_departures AS (
-                SELECT e1.person_id, e1.end_date
-                FROM employment e1
-                WHERE e1.company_id = %s::uuid
-                AND e1.end_date >= %s
-                AND e1.end_date IS NOT NULL
-            )
             SELECT 
                 c.company_name as destination_company,
-                COUNT(DISTINCT cd.person_id) as people_lost,
-                AVG(gp.importance_score) as avg_importance
-            FROM company_departures cd
-            JOIN employment e2 ON cd.person_id = e2.person_id 
-                AND e2.start_date > cd.end_date
-                AND e2.start_date <= cd.end_date + INTERVAL '6 months'
-            JOIN company c ON e2.company_id = c.company_id
-            LEFT JOIN github_profile gp ON cd.person_id = gp.person_id
-            WHERE c.company_id != %s::uuid
+                SUM(f.moves_within_6mo) as people_lost,
+                SUM(f.importance_sum) / NULLIF(SUM(f.importance_n), 0) as avg_importance
+            FROM company_talent_flow_rollup f
+            JOIN company c ON c.company_id = f.to_company_id
+            WHERE f.from_company_id = %s::uuid
+            AND f.left_month >= DATE_TRUNC('month', %s::timestamp)
+            AND f.moves_within_6mo > 0
             GROUP BY c.company_id, c.company_name
             ORDER BY people_lost DESC
             LIMIT 15
-        """, (company_id, cutoff_date, company_id))
+        """, (company_id, cutoff_date))
         
         destination_companies = [dict(row) for row in cursor.fetchall()]
         
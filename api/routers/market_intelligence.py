@@ -5,11 +5,13 @@ Provides insights about hiring patterns, talent flow, and market trends.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional
 import logging
 
 from api.dependencies import get_db
+from api.services.ai_streaming import SSE_HEADERS
 from api.services.market_intelligence import MarketIntelligenceService
 from api.services.cache_service import get_cache
 
@@ -131,6 +133,54 @@ async def get_talent_flow(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/talent-flow/multi-hop")
+async def get_multi_hop_flow(
+    company_id: Optional[str] = Query(None, description="Company UUID"),
+    company_name: Optional[str] = Query(None, description="Company name (fuzzy match)"),
+    hops: int = Query(2, ge=1, le=4, description="Number of moves (2 = A -> B -> C)"),
+    direction: str = Query("outbound", description="Flow direction: 'inbound' or 'outbound'"),
+    limit: int = Query(20, ge=1, le=100, description="Max number of companies to return"),
+    db=Depends(get_db)
+):
+    """
+    Get multi-hop talent flow for a company from the precomputed flow matrix.
+    
+    Returns:
+    - Companies reached after `hops` moves, with the share of the company's moves reaching each
+    
+    Example: /api/market/talent-flow/multi-hop?company_name=Coinbase&hops=2
+    """
+    try:
+        if direction not in ["inbound", "outbound"]:
+            raise HTTPException(
+                status_code=400,
+                detail="direction must be 'inbound' or 'outbound'"
+            )
+        
+        service = MarketIntelligenceService(db)
+        flow = service.get_multi_hop_flow(
+            company_id=company_id,
+            company_name=company_name,
+            hops=hops,
+            direction=direction,
+            limit=limit
+        )
+        
+        if "error" in flow:
+            raise HTTPException(status_code=404, detail=flow["error"])
+        
+        return {
+            "success": True,
+            "data": flow
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting multi-hop flow: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/technology-distribution")
 async def get_technology_distribution(
     company_id: Optional[str] = Query(None, description="Company UUID"),
@@ -177,6 +227,7 @@ async def get_technology_distribution(
 @router.post("/ask")
 async def ask_market_question(
     request: MarketQuestionRequest,
+    stream: bool = Query(False, description="Stream the answer as server-sent events"),
     db=Depends(get_db)
 ):
     """
@@ -193,10 +244,24 @@ async def ask_market_question(
     
     The AI will analyze hiring patterns, talent flow, and technology data
     to provide strategic insights for recruiting.
+    
+    With stream=true the response is an SSE stream (start, meta, token..., done).
     """
+    if stream:
+        try:
+            body = MarketIntelligenceService(db).stream_market_intelligence(
+                question=request.question,
+                company_id=request.company_id,
+                company_name=request.company_name,
+                provider=request.provider
+            )
+        except (ValueError, ImportError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
+    
     try:
         service = MarketIntelligenceService(db)
-        result = service.ask_market_intelligence(
+        result = await service.ask_market_intelligence(
             question=request.question,
             company_id=request.company_id,
             company_name=request.company_name,
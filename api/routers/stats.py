@@ -1,13 +1,21 @@
 # ABOUTME: Statistics API endpoints
-# ABOUTME: Database overview, quality metrics, and coverage statistics
+# ABOUTME: Database overview, quality metrics, and coverage statistics (from stats_snapshot; ?fresh=true recomputes)
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+import os
 import sys
 from pathlib import Path
+from typing import Any, Dict
+
+from psycopg2.extensions import QueryCanceledError
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from api.dependencies import get_db
+from scripts.analytics.stats_snapshot import StatsSnapshot
+
+# Time allowed for the exact counts behind ?fresh=true (and the very first request)
+STATS_FRESH_BUDGET_MS = int(os.getenv('STATS_FRESH_BUDGET_MS', '5000'))
 
 
 router = APIRouter(prefix="/stats", tags=["statistics"])
@@ -47,122 +55,99 @@ def get_overview(db=Depends(get_db)):
     }
 
 
+def _load_snapshot(db, fresh: bool) -> Dict[str, Any]:
+    """
+    Counts from stats_snapshot, or recomputed within STATS_FRESH_BUDGET_MS when
+    `fresh` is set or no snapshot exists yet. A recompute that runs out of
+    budget falls back to the stored snapshot.
+    """
+    stats = StatsSnapshot(db)
+    snapshot = None if fresh else stats.read()
+    if snapshot:
+        snapshot['source'] = 'snapshot'
+        return snapshot
+
+    try:
+        snapshot = stats.compute(budget_ms=STATS_FRESH_BUDGET_MS)
+        snapshot['source'] = 'live'
+        snapshot['age_seconds'] = 0
+        return snapshot
+    except QueryCanceledError:
+        snapshot = stats.read()
+        if not snapshot:
+            raise HTTPException(
+                status_code=503,
+                detail="Stats not computed yet and the live counts exceeded their time budget; "
+                       "run scripts/analytics/stats_snapshot.py"
+            )
+        snapshot['source'] = 'snapshot'
+        snapshot['fresh_timed_out'] = True
+        return snapshot
+
+
+def _freshness(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    freshness = {
+        'source': snapshot['source'],
+        'as_of': snapshot['refreshed_at'].isoformat(),
+        'age_seconds': round(float(snapshot['age_seconds'])),
+        'compute_ms': snapshot['refresh_ms']
+    }
+    if snapshot.get('fresh_timed_out'):
+        freshness['fresh_timed_out'] = True
+    return freshness
+
+
+def _metric(count: int, total: int) -> Dict[str, Any]:
+    return {
+        'count': count,
+        'percentage': round((count / total) * 100, 2)
+    }
+
+
 @router.get("/quality")
-def get_quality_metrics(db=Depends(get_db)):
+def get_quality_metrics(
+    fresh: bool = Query(False, description="Recompute the counts instead of reading the snapshot"),
+    db=Depends(get_db)
+):
     """Get data quality metrics"""
-    cursor = db.cursor()
-    
-    # Get total people
-    cursor.execute("SELECT COUNT(*) as count FROM person")
-    total_people = cursor.fetchone()['count']
+    snapshot = _load_snapshot(db, fresh)
+    total_people = snapshot['total_people']
     
     if total_people == 0:
         return {'error': 'No people in database'}
     
-    # LinkedIn coverage
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM person
-        WHERE normalized_linkedin_url IS NOT NULL
-        AND normalized_linkedin_url != ''
-    """)
-    with_linkedin = cursor.fetchone()['count']
-    
-    # Email coverage
-    cursor.execute("SELECT COUNT(DISTINCT person_id) as count FROM person_email")
-    with_email = cursor.fetchone()['count']
-    
-    # GitHub coverage
-    cursor.execute("SELECT COUNT(DISTINCT person_id) as count FROM github_profile")
-    with_github = cursor.fetchone()['count']
-    
-    # Location coverage
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM person
-        WHERE location IS NOT NULL AND location != ''
-    """)
-    with_location = cursor.fetchone()['count']
-    
-    # Headline coverage
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM person
-        WHERE headline IS NOT NULL AND headline != ''
-    """)
-    with_headline = cursor.fetchone()['count']
-    
     return {
         'total_people': total_people,
         'completeness': {
-            'linkedin': {
-                'count': with_linkedin,
-                'percentage': round((with_linkedin / total_people) * 100, 2)
-            },
-            'email': {
-                'count': with_email,
-                'percentage': round((with_email / total_people) * 100, 2)
-            },
-            'github': {
-                'count': with_github,
-                'percentage': round((with_github / total_people) * 100, 2)
-            },
-            'location': {
-                'count': with_location,
-                'percentage': round((with_location / total_people) * 100, 2)
-            },
-            'headline': {
-                'count': with_headline,
-                'percentage': round((with_headline / total_people) * 100, 2)
-            }
-        }
+            'linkedin': _metric(snapshot['with_linkedin'], total_people),
+            'email': _metric(snapshot['with_email'], total_people),
+            'github': _metric(snapshot['with_github'], total_people),
+            'location': _metric(snapshot['with_location'], total_people),
+            'headline': _metric(snapshot['with_headline'], total_people)
+        },
+        'freshness': _freshness(snapshot)
     }
 
 
 @router.get("/coverage")
-def get_coverage_stats(db=Depends(get_db)):
+def get_coverage_stats(
+    fresh: bool = Query(False, description="Recompute the counts instead of reading the snapshot"),
+    db=Depends(get_db)
+):
     """Get coverage percentages"""
-    cursor = db.cursor()
-    
-    # Get total people
-    cursor.execute("SELECT COUNT(*) as count FROM person")
-    total_people = cursor.fetchone()['count']
+    snapshot = _load_snapshot(db, fresh)
+    total_people = snapshot['total_people']
     
     if total_people == 0:
         return {'error': 'No people in database'}
     
-    # Various coverage metrics
-    cursor.execute("""
-        SELECT 
-            COUNT(DISTINCT pe.person_id) as with_email,
-            COUNT(DISTINCT gp.person_id) as with_github,
-            COUNT(DISTINCT e.person_id) as with_employment,
-            COUNT(DISTINCT ed.person_id) as with_education
-        FROM person p
-        LEFT JOIN person_email pe ON p.person_id = pe.person_id
-        LEFT JOIN github_profile gp ON p.person_id = gp.person_id
-        LEFT JOIN employment e ON p.person_id = e.person_id
-        LEFT JOIN education ed ON p.person_id = ed.person_id
-    """)
-    
-    result = cursor.fetchone()
-    
     return {
         'total_people': total_people,
         'coverage': {
-            'email': {
-                'count': result['with_email'],
-                'percentage': round((result['with_email'] / total_people) * 100, 2)
-            },
-            'github': {
-                'count': result['with_github'],
-                'percentage': round((result['with_github'] / total_people) * 100, 2)
-            },
-            'employment': {
-                'count': result['with_employment'],
-                'percentage': round((result['with_employment'] / total_people) * 100, 2)
-            },
-            'education': {
-                'count': result['with_education'],
-                'percentage': round((result['with_education'] / total_people) * 100, 2)
-            }
-        }
+            'email': _metric(snapshot['with_email'], total_people),
+            'github': _metric(snapshot['with_github'], total_people),
+            'employment': _metric(snapshot['with_employment'], total_people),
+            'education': _metric(snapshot['with_education'], total_people)
+        },
+        'freshness': _freshness(snapshot)
     }
-
@@ -5,15 +5,19 @@ Provides AI-powered insights about candidates using OpenAI or Anthropic Claude.
 Focuses on making technical work understandable for recruiters.
 """
 
+import asyncio
 import os
 import json
-from typing import Optional, Dict, List, Any
+import time
+from typing import Optional, Dict, List, Any, AsyncIterator, Tuple
 from datetime import datetime
 import logging
 
+from api.services.llm_cache import LLMCache, context_version, fingerprint, get_llm_cache
+
 # Try importing AI clients
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -27,6 +31,16 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Bump a template's version when its prompt changes so cached responses aren't reused
+PROMPT_VERSIONS = {
+    "profile_summary": 1,
+    "code_quality": 1,
+    "question": 1
+}
+
+# Templates whose answers are parsed as JSON; unparseable answers aren't cached
+STRUCTURED_TEMPLATES = frozenset({"profile_summary", "code_quality"})
+
 
 class AIService:
     """
@@ -41,7 +55,8 @@ class AIService:
         self,
         provider: str = "openai",
         model: Optional[str] = None,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        cache: Optional[LLMCache] = None
     ):
         """
         Initialize AI service.
@@ -50,8 +65,10 @@ class AIService:
             provider: "openai" or "anthropic"
             model: Specific model name (optional, uses defaults)
             api_key: API key (optional, uses env vars)
+            cache: Response cache (optional, uses the shared LLM cache unless disabled)
         """
         self.provider = provider.lower()
+        self.cache = cache or get_llm_cache()
         
         # Default models
         self.default_models = {
@@ -71,6 +88,7 @@ class AIService:
                 raise ValueError("OPENAI_API_KEY not found in environment")
             
             self.client = OpenAI(api_key=api_key)
+            self.async_client = AsyncOpenAI(api_key=api_key)
             
         elif self.provider == "anthropic":
             if not ANTHROPIC_AVAILABLE:
@@ -81,50 +99,59 @@ class AIService:
                 raise ValueError("ANTHROPIC_API_KEY not found in environment")
             
             self.client = anthropic.Anthropic(api_key=api_key)
+            self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
         else:
             raise ValueError(f"Unsupported provider: {provider}")
     
-    def _call_openai(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Call OpenAI API."""
+    def _openai_request(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Arguments for chat.completions.create."""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_tokens": kwargs.get("max_tokens", 2000)
+        }
+    
+    def _anthropic_request(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Arguments for messages.create."""
+        # Convert messages format (Anthropic doesn't use system in messages array)
+        system_message = None
+        converted_messages = []
+        
+        for msg in messages:
+            if msg["role"] == "system":
+                system_message = msg["content"]
+            else:
+                converted_messages.append(msg)
+        
+        return {
+            "model": self.model,
+            "max_tokens": kwargs.get("max_tokens", 2000),
+            "temperature": kwargs.get("temperature", 0.7),
+            "system": system_message or "You are a helpful recruiting assistant.",
+            "messages": converted_messages
+        }
+    
+    def _call_openai(self, messages: List[Dict[str, str]], **kwargs) -> Tuple[str, Dict[str, int]]:
+        """Call OpenAI API; returns (text, token usage)."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=kwargs.get("temperature", 0.7),
-                max_tokens=kwargs.get("max_tokens", 2000)
-            )
-            return response.choices[0].message.content
+            response = self.client.chat.completions.create(**self._openai_request(messages, **kwargs))
+            return response.choices[0].message.content, self._usage(response)
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             raise
     
-    def _call_anthropic(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Call Anthropic Claude API."""
+    def _call_anthropic(self, messages: List[Dict[str, str]], **kwargs) -> Tuple[str, Dict[str, int]]:
+        """Call Anthropic Claude API; returns (text, token usage)."""
         try:
-            # Convert messages format (Anthropic doesn't use system in messages array)
-            system_message = None
-            converted_messages = []
-            
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_message = msg["content"]
-                else:
-                    converted_messages.append(msg)
-            
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=kwargs.get("max_tokens", 2000),
-                temperature=kwargs.get("temperature", 0.7),
-                system=system_message or "You are a helpful recruiting assistant.",
-                messages=converted_messages
-            )
-            return response.content[0].text
+            response = self.client.messages.create(**self._anthropic_request(messages, **kwargs))
+            return response.content[0].text, self._usage(response)
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
             raise
     
-    def _call_ai(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Route to appropriate AI provider."""
+    def _call_ai(self, messages: List[Dict[str, str]], **kwargs) -> Tuple[str, Dict[str, int]]:
+        """Route to appropriate AI provider; returns (text, token usage)."""
         if self.provider == "openai":
             return self._call_openai(messages, **kwargs)
         elif self.provider == "anthropic":
@@ -132,6 +159,193 @@ class AIService:
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
     
+    async def _call_ai_async(self, messages: List[Dict[str, str]], **kwargs) -> Tuple[str, Dict[str, int]]:
+        """Route to appropriate AI provider without blocking the event loop; returns (text, token usage)."""
+        try:
+            if self.provider == "openai":
+                response = await self.async_client.chat.completions.create(
+                    **self._openai_request(messages, **kwargs)
+                )
+                return response.choices[0].message.content, self._usage(response)
+            elif self.provider == "anthropic":
+                response = await self.async_client.messages.create(
+                    **self._anthropic_request(messages, **kwargs)
+                )
+                return response.content[0].text, self._usage(response)
+        except Exception as e:
+            logger.error(f"{self.provider} API error: {e}")
+            raise
+        raise ValueError(f"Unknown provider: {self.provider}")
+    
+    async def _stream_ai(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Yield completion text as the provider generates it."""
+        try:
+            if self.provider == "openai":
+                stream = await self.async_client.chat.completions.create(
+                    **self._openai_request(messages, **kwargs), stream=True
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            elif self.provider == "anthropic":
+                stream = await self.async_client.messages.create(
+                    **self._anthropic_request(messages, **kwargs), stream=True
+                )
+                async for event in stream:
+                    if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                        yield event.delta.text
+            else:
+                raise ValueError(f"Unknown provider: {self.provider}")
+        except Exception as e:
+            logger.error(f"{self.provider} streaming error: {e}")
+            raise
+    
+    async def open_stream(
+        self,
+        template: Optional[str],
+        candidate_data: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> Tuple[bool, AsyncIterator[str]]:
+        """
+        Start a streamed completion through the response cache.
+        
+        Returns (cached, text deltas). A cache hit replays the stored answer as
+        a single delta; a miss streams from the provider and stores the full
+        answer once it completes. Pass template=None to bypass the cache.
+        """
+        entry = self._cache_entry(template, candidate_data, messages) if template else None
+        if entry:
+            cached = await asyncio.to_thread(self.cache.get, entry["key"], template)
+            if cached is not None:
+                return True, self._replay(cached)
+        return False, self._stream_and_store(entry, messages, **kwargs)
+    
+    @staticmethod
+    async def _replay(text: str) -> AsyncIterator[str]:
+        yield text
+    
+    async def _stream_and_store(
+        self,
+        entry: Optional[Dict[str, Any]],
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        started = time.time()
+        parts = []
+        async for delta in self._stream_ai(messages, **kwargs):
+            parts.append(delta)
+            yield delta
+        response = "".join(parts)
+        if entry and self._cacheable(entry, response):
+            # Streams don't report token usage; the entry still saves latency
+            usage = {"prompt_tokens": 0, "completion_tokens": 0}
+            await asyncio.to_thread(self._store, entry, response, started, usage)
+    
+    @staticmethod
+    def _usage(response) -> Dict[str, int]:
+        """Token counts of one completion, for the response cache."""
+        usage = getattr(response, "usage", None)
+        return {
+            # OpenAI: prompt/completion_tokens; Anthropic: input/output_tokens
+            "prompt_tokens": getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", 0) or 0
+        }
+    
+    def _cache_entry(
+        self,
+        template: str,
+        candidate_data: Dict[str, Any],
+        messages: List[Dict[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        """Cache key and subject for a prompt, or None if it shouldn't be cached."""
+        if not self.cache or candidate_data.get("omitted_sections"):
+            return None  # Partial context: neither serve nor store
+        
+        person = candidate_data.get("person") or {}
+        return {
+            "key": fingerprint(self.provider, self.model, template, PROMPT_VERSIONS[template], messages),
+            "template": template,
+            "subject_id": str(person["person_id"]) if person.get("person_id") else None,
+            "subject_version": context_version(candidate_data)
+        }
+    
+    def _cacheable(self, entry: Dict[str, Any], response: str) -> bool:
+        """False for structured answers that don't parse, so a retry can get a good one."""
+        if entry["template"] not in STRUCTURED_TEMPLATES:
+            return True
+        try:
+            self._parse_structured(response)
+            return True
+        except json.JSONDecodeError:
+            logger.warning(f"Not caching unparseable {entry['template']} response")
+            return False
+    
+    def _store(self, entry: Dict[str, Any], response: str, started: float, usage: Dict[str, int]) -> None:
+        self.cache.put(
+            entry["key"], response,
+            provider=self.provider,
+            model=self.model,
+            template=entry["template"],
+            template_version=PROMPT_VERSIONS[entry["template"]],
+            latency_ms=int((time.time() - started) * 1000),
+            subject_id=entry["subject_id"],
+            subject_version=entry["subject_version"],
+            **usage
+        )
+    
+    def _call_ai_cached(
+        self,
+        template: str,
+        candidate_data: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> str:
+        """_call_ai() through the response cache."""
+        entry = self._cache_entry(template, candidate_data, messages)
+        if entry:
+            cached = self.cache.get(entry["key"], template)
+            if cached is not None:
+                return cached
+        
+        started = time.time()
+        response, usage = self._call_ai(messages, **kwargs)
+        if entry and self._cacheable(entry, response):
+            self._store(entry, response, started, usage)
+        return response
+    
+    async def _call_ai_cached_async(
+        self,
+        template: str,
+        candidate_data: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> str:
+        """_call_ai_async() through the response cache; cache I/O runs in a worker thread."""
+        entry = self._cache_entry(template, candidate_data, messages)
+        if entry:
+            cached = await asyncio.to_thread(self.cache.get, entry["key"], template)
+            if cached is not None:
+                return cached
+        
+        started = time.time()
+        response, usage = await self._call_ai_async(messages, **kwargs)
+        if entry and self._cacheable(entry, response):
+            await asyncio.to_thread(self._store, entry, response, started, usage)
+        return response
+    
+    @staticmethod
+    def _parse_structured(response: str) -> Dict[str, Any]:
+        """Parse a JSON answer, handling markdown code blocks if present."""
+        response = response.strip()
+        if response.startswith("```json"):
+            response = response[7:]
+        if response.startswith("```"):
+            response = response[3:]
+        if response.endswith("```"):
+            response = response[:-3]
+        return json.loads(response.strip())
+    
     def generate_profile_summary(
         self,
         candidate_data: Dict[str, Any],
@@ -147,6 +361,48 @@ class AIService:
         Returns:
             Dictionary with summary, key_strengths, domains, etc.
         """
+        try:
+            response = self._call_ai_cached(
+                "profile_summary", candidate_data,
+                self._profile_summary_messages(candidate_data, job_context), temperature=0.7
+            )
+        except Exception as e:
+            logger.error(f"Error generating profile summary: {e}")
+            raise
+        return self._profile_summary_result(response)
+    
+    async def generate_profile_summary_async(
+        self,
+        candidate_data: Dict[str, Any],
+        job_context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """generate_profile_summary() on the async client."""
+        try:
+            response = await self._call_ai_cached_async(
+                "profile_summary", candidate_data,
+                self._profile_summary_messages(candidate_data, job_context), temperature=0.7
+            )
+        except Exception as e:
+            logger.error(f"Error generating profile summary: {e}")
+            raise
+        return self._profile_summary_result(response)
+    
+    async def stream_profile_summary(
+        self,
+        candidate_data: Dict[str, Any],
+        job_context: Optional[str] = None
+    ) -> Tuple[bool, AsyncIterator[str]]:
+        """generate_profile_summary() as (cached, text deltas); parse the joined text with _profile_summary_result()."""
+        return await self.open_stream(
+            "profile_summary", candidate_data,
+            self._profile_summary_messages(candidate_data, job_context), temperature=0.7
+        )
+    
+    def _profile_summary_messages(
+        self,
+        candidate_data: Dict[str, Any],
+        job_context: Optional[str]
+    ) -> List[Dict[str, str]]:
         # Build context from candidate data
         context = self._build_candidate_context(candidate_data)
         
@@ -178,43 +434,26 @@ Provide a JSON response with:
     "recruiter_notes": "2-3 sentences of what makes them interesting or concerns to note"
 }}"""
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
-        
+    
+    def _profile_summary_result(self, response: str) -> Dict[str, Any]:
         try:
-            response = self._call_ai(messages, temperature=0.7)
-            
-            # Parse JSON response
-            # Handle markdown code blocks if present
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            summary = json.loads(response)
-            summary["generated_at"] = datetime.now().isoformat()
-            summary["model"] = self.model
-            
-            return summary
-            
+            summary = self._parse_structured(response)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             # Fallback: return raw response
             return {
-                "executive_summary": response,
+                "executive_summary": response.strip(),
                 "generated_at": datetime.now().isoformat(),
                 "model": self.model,
                 "error": "Failed to parse structured response"
             }
-        except Exception as e:
-            logger.error(f"Error generating profile summary: {e}")
-            raise
+        summary["generated_at"] = datetime.now().isoformat()
+        summary["model"] = self.model
+        return summary
     
     def analyze_code_quality(
         self,
@@ -231,6 +470,37 @@ Provide a JSON response with:
         Returns:
             Dictionary with code analysis, quality assessment, relevance
         """
+        try:
+            response = self._call_ai_cached(
+                "code_quality", candidate_data,
+                self._code_quality_messages(candidate_data, job_requirements), temperature=0.7
+            )
+        except Exception as e:
+            logger.error(f"Error analyzing code quality: {e}")
+            raise
+        return self._code_quality_result(response)
+    
+    async def analyze_code_quality_async(
+        self,
+        candidate_data: Dict[str, Any],
+        job_requirements: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """analyze_code_quality() on the async client."""
+        try:
+            response = await self._call_ai_cached_async(
+                "code_quality", candidate_data,
+                self._code_quality_messages(candidate_data, job_requirements), temperature=0.7
+            )
+        except Exception as e:
+            logger.error(f"Error analyzing code quality: {e}")
+            raise
+        return self._code_quality_result(response)
+    
+    def _code_quality_messages(
+        self,
+        candidate_data: Dict[str, Any],
+        job_requirements: Optional[str]
+    ) -> List[Dict[str, str]]:
         github_context = self._build_github_context(candidate_data)
         
         system_prompt = """You are a senior engineering manager who reviews code and technical contributions.
@@ -262,41 +532,25 @@ Provide a JSON response with:
     "concerns": ["any concerns or gaps to note"]
 }}"""
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
-        
+    
+    def _code_quality_result(self, response: str) -> Dict[str, Any]:
         try:
-            response = self._call_ai(messages, temperature=0.7)
-            
-            # Parse JSON
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-            
-            analysis = json.loads(response)
-            analysis["analyzed_at"] = datetime.now().isoformat()
-            analysis["model"] = self.model
-            
-            return analysis
-            
+            analysis = self._parse_structured(response)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             return {
-                "code_quality_assessment": response,
+                "code_quality_assessment": response.strip(),
                 "analyzed_at": datetime.now().isoformat(),
                 "model": self.model,
                 "error": "Failed to parse structured response"
             }
-        except Exception as e:
-            logger.error(f"Error analyzing code quality: {e}")
-            raise
+        analysis["analyzed_at"] = datetime.now().isoformat()
+        analysis["model"] = self.model
+        return analysis
     
     def answer_question(
         self,
@@ -315,6 +569,52 @@ Provide a JSON response with:
         Returns:
             Answer string
         """
+        try:
+            return self._call_ai_cached(
+                "question", candidate_data,
+                self._question_messages(candidate_data, question, conversation_history),
+                temperature=0.7, max_tokens=1000
+            )
+        except Exception as e:
+            logger.error(f"Error answering question: {e}")
+            raise
+    
+    async def answer_question_async(
+        self,
+        candidate_data: Dict[str, Any],
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> str:
+        """answer_question() on the async client."""
+        try:
+            return await self._call_ai_cached_async(
+                "question", candidate_data,
+                self._question_messages(candidate_data, question, conversation_history),
+                temperature=0.7, max_tokens=1000
+            )
+        except Exception as e:
+            logger.error(f"Error answering question: {e}")
+            raise
+    
+    async def stream_answer(
+        self,
+        candidate_data: Dict[str, Any],
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Tuple[bool, AsyncIterator[str]]:
+        """answer_question() as (cached, text deltas)."""
+        return await self.open_stream(
+            "question", candidate_data,
+            self._question_messages(candidate_data, question, conversation_history),
+            temperature=0.7, max_tokens=1000
+        )
+    
+    def _question_messages(
+        self,
+        candidate_data: Dict[str, Any],
+        question: str,
+        conversation_history: Optional[List[Dict[str, str]]]
+    ) -> List[Dict[str, str]]:
         context = self._build_candidate_context(candidate_data)
         github_context = self._build_github_context(candidate_data)
         
@@ -347,12 +647,7 @@ Please answer based on the information provided. If you don't have enough inform
 
         messages.append({"role": "user", "content": user_message})
         
-        try:
-            answer = self._call_ai(messages, temperature=0.7, max_tokens=1000)
-            return answer
-        except Exception as e:
-            logger.error(f"Error answering question: {e}")
-            raise
+        return messages
     
     def _build_candidate_context(self, candidate_data: Dict[str, Any]) -> str:
         """Build a text context from candidate data."""
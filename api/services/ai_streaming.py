@@ -0,0 +1,68 @@
+"""
+Server-Sent Event Streaming for AI Endpoints
+
+Turns an AI completion into an SSE event stream so clients see the first
+byte immediately instead of after context assembly plus the full LLM call.
+
+Events, in order:
+- start: sent before any work (request echo, provider, model)
+- meta:  once the prompt context is built - sources used, omitted sections,
+         whether the answer comes from the LLM cache
+- token: one per text delta from the provider ({"text": "..."})
+- done:  the complete result, same shape as the non-streaming endpoint
+- error: instead of meta/token/done when anything fails ({"status", "detail"})
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Stop nginx from buffering the stream
+}
+
+Prepare = Callable[[], Awaitable[Tuple[Dict[str, Any], AsyncIterator[str]]]]
+
+
+def sse(event: str, data: Any) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_completion(
+    start: Dict[str, Any],
+    prepare: Prepare,
+    finish: Optional[Callable[[str], Dict[str, Any]]] = None
+) -> AsyncIterator[str]:
+    """
+    SSE body for an AI completion.
+
+    Args:
+        start: Payload of the immediate start event
+        prepare: Builds the context and opens the completion; returns the
+            meta payload and the async iterator of text deltas
+        finish: Builds the done payload from the full text (default {"answer": text})
+    """
+    yield sse("start", start)
+
+    try:
+        meta, deltas = await prepare()
+        yield sse("meta", meta)
+
+        parts = []
+        async for delta in deltas:
+            parts.append(delta)
+            yield sse("token", {"text": delta})
+
+        text = "".join(parts)
+        yield sse("done", finish(text) if finish else {"answer": text})
+
+    except Exception as e:
+        # Headers are already sent, so errors travel as an event (HTTPException keeps its status)
+        status = getattr(e, "status_code", 500)
+        if status >= 500:
+            logger.error(f"AI stream failed: {e}")
+        yield sse("error", {"status": status, "detail": getattr(e, "detail", str(e))})
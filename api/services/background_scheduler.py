@@ -2,13 +2,15 @@
 Background Scheduler for AI-First Recruiting
 
 Uses APScheduler to run monitoring jobs at scheduled times.
-Runs daily monitoring at 2 AM for AI-powered talent discovery.
+Runs daily monitoring at 2 AM for AI-powered talent discovery and keeps
+the company analytics rollups fresh.
 """
 
 import logging
 import os
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -16,6 +18,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import Config, get_db_connection
+from api.services.llm_cache import LLM_CACHE_ENABLED, get_llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -28,45 +31,160 @@ def start_scheduler():
     Initialize and start the background scheduler.
     
     Sets up scheduled jobs:
-    - Daily monitoring at 2 AM
+    - Daily monitoring at 2 AM (if AI_MONITORING_ENABLED)
     - Preference updates at 3 AM (Phase 2)
+    - Company analytics rollups every COMPANY_ROLLUP_REFRESH_MINUTES (full rebuild at 4 AM)
+    - Talent flow matrix snapshot at 4:30 AM (if TALENT_FLOW_MATRIX_ENABLED)
+    - Expired LLM response cache entries purged at 5 AM
+    - LLM cache entries for changed people dropped every CHANGE_FEED_INTERVAL_MINUTES
+    - Change log entries read by every consumer purged at 5:15 AM
+    - Stats snapshot for /api/stats/quality and /coverage every STATS_SNAPSHOT_REFRESH_MINUTES
+    - Per-person network degree and network summaries every NETWORK_DEGREE_REFRESH_MINUTES
     """
     # Check if monitoring is enabled
     monitoring_enabled = os.getenv('AI_MONITORING_ENABLED', 'true').lower() == 'true'
+    rollup_minutes = int(os.getenv('COMPANY_ROLLUP_REFRESH_MINUTES', '15'))
+    test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
+    change_feed_minutes = int(os.getenv('CHANGE_FEED_INTERVAL_MINUTES', '5'))
+    stats_minutes = int(os.getenv('STATS_SNAPSHOT_REFRESH_MINUTES', '10'))
+    degree_minutes = int(os.getenv('NETWORK_DEGREE_REFRESH_MINUTES', '15'))
+    talent_flow_enabled = os.getenv('TALENT_FLOW_MATRIX_ENABLED', 'true').lower() == 'true'
     
     if not monitoring_enabled:
         logger.info("AI monitoring is disabled. Set AI_MONITORING_ENABLED=true to enable.")
+    
+    if (not monitoring_enabled and rollup_minutes <= 0 and not LLM_CACHE_ENABLED
+            and stats_minutes <= 0 and degree_minutes <= 0 and not talent_flow_enabled):
         return
     
     try:
-        # Add daily monitoring job
-        scheduler.add_job(
-            run_daily_monitoring_for_all_users,
-            CronTrigger(hour=2, minute=0),  # 2 AM daily
-            id='daily_monitoring',
-            name='Daily AI Monitoring',
-            replace_existing=True,
-            misfire_grace_time=3600  # Allow 1 hour grace if system was down
-        )
-        
-        # Add manual trigger job for testing (runs immediately if TEST_MODE=true)
-        test_mode = os.getenv('TEST_MODE', 'false').lower() == 'true'
-        if test_mode:
-            logger.info("TEST_MODE enabled - adding immediate trigger job")
+        if monitoring_enabled:
+            # Add daily monitoring job
             scheduler.add_job(
                 run_daily_monitoring_for_all_users,
-                'date',  # Run once immediately
-                id='test_monitoring',
-                name='Test Monitoring (Immediate)',
-                replace_existing=True
+                CronTrigger(hour=2, minute=0),  # 2 AM daily
+                id='daily_monitoring',
+                name='Daily AI Monitoring',
+                replace_existing=True,
+                misfire_grace_time=3600  # Allow 1 hour grace if system was down
             )
+            
+            # Add manual trigger job for testing (runs immediately if TEST_MODE=true)
+            if test_mode:
+                logger.info("TEST_MODE enabled - adding immediate trigger job")
+                scheduler.add_job(
+                    run_daily_monitoring_for_all_users,
+                    'date',  # Run once immediately
+                    id='test_monitoring',
+                    name='Test Monitoring (Immediate)',
+                    replace_existing=True
+                )
+        
+        # Company analytics rollups (0 disables; run scripts/analytics/company_rollups.py instead)
+        if rollup_minutes > 0:
+            scheduler.add_job(
+                refresh_company_rollups,
+                IntervalTrigger(minutes=rollup_minutes),
+                id='company_rollups',
+                name='Company Rollups (Incremental)',
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1
+            )
+            scheduler.add_job(
+                refresh_company_rollups,
+                CronTrigger(hour=4, minute=0),  # 4 AM daily, picks up GitHub/importance changes
+                kwargs={'full': True},
+                id='company_rollups_full',
+                name='Company Rollups (Full)',
+                replace_existing=True,
+                misfire_grace_time=3600
+            )
+        
+        # Talent flow matrix (false disables; run scripts/analytics/talent_flow_matrix.py --build instead)
+        if talent_flow_enabled:
+            scheduler.add_job(
+                rebuild_talent_flow_matrix,
+                CronTrigger(hour=4, minute=30),  # 4:30 AM daily
+                id='talent_flow_matrix',
+                name='Talent Flow Matrix',
+                replace_existing=True,
+                misfire_grace_time=3600
+            )
+        
+        if LLM_CACHE_ENABLED:
+            scheduler.add_job(
+                purge_llm_cache,
+                CronTrigger(hour=5, minute=0),  # 5 AM daily
+                id='llm_cache_purge',
+                name='LLM Cache Purge',
+                replace_existing=True,
+                misfire_grace_time=3600
+            )
+            if change_feed_minutes > 0:
+                scheduler.add_job(
+                    invalidate_changed_llm_cache,
+                    IntervalTrigger(minutes=change_feed_minutes),
+                    id='llm_cache_change_feed',
+                    name='LLM Cache Invalidation (Change Feed)',
+                    replace_existing=True,
+                    coalesce=True,
+                    max_instances=1
+                )
+        
+        # Stats snapshot (0 disables; run scripts/analytics/stats_snapshot.py instead)
+        if stats_minutes > 0:
+            scheduler.add_job(
+                refresh_stats_snapshot,
+                IntervalTrigger(minutes=stats_minutes),
+                id='stats_snapshot',
+                name='Stats Snapshot',
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+                next_run_time=datetime.now()  # Populate right away after a restart
+            )
+        
+        # Network degree (0 disables; run scripts/analytics/network_degree.py instead)
+        if degree_minutes > 0:
+            scheduler.add_job(
+                refresh_network_degree,
+                IntervalTrigger(minutes=degree_minutes),
+                id='network_degree',
+                name='Network Degree (Incremental)',
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1
+            )
+        
+        scheduler.add_job(
+            purge_change_log,
+            CronTrigger(hour=5, minute=15),  # 5:15 AM daily
+            id='change_log_purge',
+            name='Change Log Purge',
+            replace_existing=True,
+            misfire_grace_time=3600
+        )
         
         # Start scheduler
         scheduler.start()
         logger.info("✅ Background scheduler started successfully")
-        logger.info("   - Daily monitoring job: 2:00 AM")
-        if test_mode:
-            logger.info("   - Test monitoring job: Running immediately")
+        if monitoring_enabled:
+            logger.info("   - Daily monitoring job: 2:00 AM")
+            if test_mode:
+                logger.info("   - Test monitoring job: Running immediately")
+        if rollup_minutes > 0:
+            logger.info(f"   - Company rollups: every {rollup_minutes} min, full rebuild 4:00 AM")
+            logger.info("   - Talent flow matrix: 4:30 AM")
+        if LLM_CACHE_ENABLED:
+            logger.info("   - LLM cache purge: 5:00 AM")
+            if change_feed_minutes > 0:
+                logger.info(f"   - LLM cache invalidation from change log: every {change_feed_minutes} min")
+        logger.info("   - Change log purge: 5:15 AM")
+        if stats_minutes > 0:
+            logger.info(f"   - Stats snapshot: every {stats_minutes} min")
+        if degree_minutes > 0:
+            logger.info(f"   - Network degree: every {degree_minutes} min")
         
     except Exception as e:
         logger.error(f"❌ Failed to start background scheduler: {e}")
@@ -83,41 +201,31 @@ def stop_scheduler():
         logger.info("✅ Background scheduler stopped")
 
 
-async def run_daily_monitoring_for_all_users():
+def run_daily_monitoring_for_all_users():
     """
-    Run daily monitoring for all users with auto-monitor enabled searches.
+    Run new-match monitoring for every user with auto-monitor enabled searches.
     
-    For MVP (single-user), this just monitors the default user.
-    In future, this will query all users and monitor each one.
+    All due saved searches are evaluated against one scan of recently changed
+    people and users' notifications are written in parallel
+    (see api/services/monitoring_engine.py). Plain function so APScheduler
+    runs it in a worker thread, off the event loop.
     """
     logger.info("=" * 80)
     logger.info(f"Starting daily monitoring job at {datetime.utcnow().isoformat()}")
     logger.info("=" * 80)
     
-    # Import here to avoid circular imports
-    from .monitoring_service import MonitoringService
+    from .monitoring_engine import MonitoringEngine
     
-    # Get user ID (hardcoded for MVP, will query database in Phase 2)
-    user_id = os.getenv('DEFAULT_USER_ID', 'default_user')
-    
-    conn = None
     try:
-        # Get database connection
-        conn = get_db_connection(use_pool=True)
-        
-        # Initialize monitoring service
-        monitoring_service = MonitoringService(conn)
-        
-        # Run monitoring
-        results = monitoring_service.run_daily_monitoring(user_id)
+        results = MonitoringEngine().run()
         
         # Log summary
         logger.info("-" * 80)
         logger.info("Monitoring Results:")
-        logger.info(f"  - New matches: {len(results['new_matches'])}")
-        logger.info(f"  - Job changes: {len(results['job_changes'])}")
-        logger.info(f"  - GitHub activity: {len(results['github_activity'])}")
-        logger.info(f"  - Rising talent: {len(results['rising_talent'])}")
+        logger.info(f"  - Saved searches: {results['searches']} ({results['users']} users)")
+        logger.info(f"  - Changed people scanned: {results['people_scanned']}")
+        logger.info(f"  - New matches: {results['matches']}")
+        logger.info(f"  - Job changes: {results['job_changes']}")
         logger.info(f"  - Notifications created: {results['notifications_created']}")
         
         if results['errors']:
@@ -128,18 +236,151 @@ async def run_daily_monitoring_for_all_users():
         logger.info("-" * 80)
         logger.info("✅ Daily monitoring job completed successfully")
         logger.info("=" * 80)
+        return results
         
     except Exception as e:
         logger.error("=" * 80)
         logger.error(f"❌ Daily monitoring job failed: {e}")
         logger.error("=" * 80)
         raise
+
+
+def refresh_company_rollups(full: bool = False):
+    """
+    Refresh the company analytics rollups (see scripts/analytics/company_rollups.py).
+    
+    Plain function so APScheduler runs it in a worker thread, off the event loop.
+    """
+    from scripts.analytics.company_rollups import CompanyRollups
+    
+    conn = None
+    try:
+        conn = get_db_connection(use_pool=True)
+        stats = CompanyRollups(conn).refresh(full=full)
+        
+        if stats['skipped']:
+            logger.info("Company rollup refresh skipped - another refresh is running")
+        elif stats['companies'] or full:
+            logger.info(f"✅ Company rollups refreshed ({'full' if full else 'incremental'}): "
+                        f"{stats['companies']} companies in {stats['elapsed_seconds']}s")
+        return stats
+        
+    except Exception as e:
+        logger.error(f"❌ Company rollup refresh failed: {e}")
+        raise
+    finally:
+        if conn:
+            Config.return_connection(conn)
+
+
+def rebuild_talent_flow_matrix():
+    """
+    Rebuild the talent flow matrix snapshot (see scripts/analytics/talent_flow_matrix.py).
+    
+    API workers pick the new snapshot up on their next flow query.
+    """
+    from scripts.analytics.talent_flow_matrix import TalentFlowMatrix
+    
+    conn = None
+    try:
+        conn = get_db_connection(use_pool=True)
+        matrix = TalentFlowMatrix.load_from_database(conn)
+        conn.rollback()  # Read-only; don't return the connection mid-transaction
+        matrix.save()
+        logger.info(f"✅ Talent flow matrix rebuilt: {matrix.size} companies, {matrix.moves} moves")
+        
+    except Exception as e:
+        logger.error(f"❌ Talent flow matrix rebuild failed: {e}")
+        raise
     finally:
-        # Return connection to pool
         if conn:
             Config.return_connection(conn)
 
 
+def purge_llm_cache():
+    """Delete expired LLM response cache entries (see api/services/llm_cache.py)."""
+    try:
+        deleted = get_llm_cache().purge_expired()
+        logger.info(f"✅ LLM cache purged: {deleted} expired entries")
+    except Exception as e:
+        logger.error(f"❌ LLM cache purge failed: {e}")
+        raise
+
+
+def refresh_stats_snapshot():
+    """
+    Recompute the stats snapshot (see scripts/analytics/stats_snapshot.py).
+    
+    Plain function so APScheduler runs it in a worker thread, off the event loop.
+    """
+    from scripts.analytics.stats_snapshot import StatsSnapshot
+    
+    conn = None
+    try:
+        conn = get_db_connection(use_pool=True)
+        snapshot = StatsSnapshot(conn).compute()
+        logger.info(f"✅ Stats snapshot refreshed: {snapshot['total_people']:,} people in {snapshot['refresh_ms']} ms")
+        return snapshot
+        
+    except Exception as e:
+        logger.error(f"❌ Stats snapshot refresh failed: {e}")
+        raise
+    finally:
+        if conn:
+            Config.return_connection(conn)
+
+
+def refresh_network_degree(full: bool = False):
+    """
+    Refresh per-person network degree and summaries (see scripts/analytics/network_degree.py).
+    
+    Plain function so APScheduler runs it in a worker thread, off the event loop.
+    """
+    from scripts.analytics.network_degree import NetworkDegree
+    
+    conn = None
+    try:
+        conn = get_db_connection(use_pool=True)
+        stats = NetworkDegree(conn).refresh(full=full)
+        
+        if stats['skipped']:
+            logger.info("Network degree refresh skipped - another refresh is running")
+        elif stats['people'] or full:
+            logger.info(f"✅ Network degree refreshed ({'full' if full else 'incremental'}): "
+                        f"{stats['people']} people in {stats['elapsed_seconds']}s")
+        return stats
+        
+    except Exception as e:
+        logger.error(f"❌ Network degree refresh failed: {e}")
+        raise
+    finally:
+        if conn:
+            Config.return_connection(conn)
+
+
+def invalidate_changed_llm_cache():
+    """Drop LLM cache entries about people changed since the last run ('llm_cache' change feed consumer)."""
+    try:
+        deleted = get_llm_cache().invalidate_changed()
+        if deleted:
+            logger.info(f"✅ LLM cache: dropped {deleted} entries for changed people")
+    except Exception as e:
+        logger.error(f"❌ LLM cache change-feed invalidation failed: {e}")
+        raise
+
+
+def purge_change_log():
+    """Delete change log entries past retention that every consumer has read (see api/services/change_log.py)."""
+    from .change_log import purge_change_log as purge
+    
+    try:
+        deleted = purge()
+        logger.info(f"✅ Change log purged: {deleted} entries")
+    except Exception as e:
+        logger.error(f"❌ Change log purge failed: {e}")
+        raise
+
+
 def trigger_monitoring_now():
     """
     Manually trigger monitoring job (for testing/debugging).
@@ -149,25 +390,16 @@ def trigger_monitoring_now():
     """
     logger.info("Manually triggering monitoring job...")
     
-    from .monitoring_service import MonitoringService
+    from .monitoring_engine import MonitoringEngine
     
-    user_id = os.getenv('DEFAULT_USER_ID', 'default_user')
-    
-    conn = None
     try:
-        conn = get_db_connection(use_pool=True)
-        monitoring_service = MonitoringService(conn)
-        results = monitoring_service.run_daily_monitoring(user_id)
-        
+        results = MonitoringEngine().run()
         logger.info(f"Manual monitoring complete: {results['notifications_created']} notifications created")
         return results
         
     except Exception as e:
         logger.error(f"Manual monitoring failed: {e}")
         raise
-    finally:
-        if conn:
-            Config.return_connection(conn)
 
 
 def get_scheduler_status() -> dict:
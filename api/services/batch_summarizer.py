@@ -0,0 +1,478 @@
+"""
+Batch Profile Summaries
+
+Generates AI profile summaries for a whole candidate list (or search result)
+in one job instead of one blocking /api/ai/profile-summary call per person.
+
+- Candidate contexts are loaded with a handful of set-based queries per
+  chunk of people, in the same shape as the interactive endpoint builds, so
+  both share LLM cache entries.
+- LLM calls fan out concurrently under a per-provider concurrency cap and
+  requests-per-minute limit (AI_BATCH_CONCURRENCY / AI_BATCH_RPM override).
+- Results are upserted into candidate_summary as they arrive and progress is
+  tracked in summary_batch (migration_scripts/20_candidate_summaries.sql),
+  so the UI reads summaries straight from the table.
+
+Usage:
+    python -m api.services.batch_summarizer --list-id <uuid> [--job-context "..."]
+    python -m api.services.batch_summarizer --person-ids <uuid> <uuid> --concurrency 16
+
+Point OPENAI_BASE_URL / ANTHROPIC_BASE_URL at tests/fake_llm_server.py to
+measure throughput without API spend.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor, execute_values
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_context
+from api.services.ai_service import AIService, get_ai_service
+
+logger = logging.getLogger(__name__)
+
+# Default limits per provider, kept under typical tier-1 API quotas
+PROVIDER_LIMITS = {
+    "openai": {"concurrency": 8, "requests_per_minute": 500},
+    "anthropic": {"concurrency": 4, "requests_per_minute": 50}
+}
+
+MAX_BATCH_PEOPLE = int(os.getenv('AI_BATCH_MAX_PEOPLE', '1000'))
+CONTEXT_CHUNK_SIZE = 500  # People per set-based context query
+FLUSH_EVERY = 25          # Summaries per write to candidate_summary
+
+
+def provider_limits(provider: str) -> Dict[str, int]:
+    limits = dict(PROVIDER_LIMITS.get(provider, PROVIDER_LIMITS["openai"]))
+    if os.getenv('AI_BATCH_CONCURRENCY'):
+        limits["concurrency"] = int(os.getenv('AI_BATCH_CONCURRENCY'))
+    if os.getenv('AI_BATCH_RPM'):
+        limits["requests_per_minute"] = int(os.getenv('AI_BATCH_RPM'))
+    return limits
+
+
+def job_context_hash(job_context: Optional[str]) -> str:
+    """Summaries are stored per job context; '' when generated without one"""
+    if not job_context or not job_context.strip():
+        return ''
+    return hashlib.sha256(' '.join(job_context.split()).encode('utf-8')).hexdigest()[:16]
+
+
+class RateLimiter:
+    """Spaces request starts evenly so at most requests_per_minute start per minute"""
+
+    def __init__(self, requests_per_minute: Optional[int]):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# ============================================================================
+# Set-based context loading
+# ============================================================================
+
+def resolve_person_ids(
+    conn,
+    list_id: Optional[str] = None,
+    person_ids: Optional[List[str]] = None,
+    search: Optional[Any] = None,
+    limit: int = MAX_BATCH_PEOPLE
+) -> List[str]:
+    """People to summarize: a candidate list, explicit ids or an AdvancedSearchRequest"""
+    if list_id:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute("""
+            SELECT person_id::text AS person_id
+            FROM candidate_list_members
+            WHERE list_id = %s
+            ORDER BY added_at, person_id
+            LIMIT %s
+        """, (list_id, limit))
+        ids = [row['person_id'] for row in cursor.fetchall()]
+        cursor.close()
+        return ids
+
+    if search is not None:
+        from api.services.advanced_search_service import AdvancedSearchService
+        results, _, _ = AdvancedSearchService().execute_search(conn, search, offset=0, limit=limit)
+        return [str(result.person.person_id) for result in results]
+
+    return list(dict.fromkeys(person_ids or []))[:limit]
+
+
+def load_contexts(conn, person_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Candidate contexts for many people, same shape as ai._fetch_candidate_data.
+
+    Five queries per chunk of CONTEXT_CHUNK_SIZE people instead of five per person.
+    """
+    contexts = {}
+    for start in range(0, len(person_ids), CONTEXT_CHUNK_SIZE):
+        contexts.update(_load_chunk(conn, person_ids[start:start + CONTEXT_CHUNK_SIZE]))
+    return contexts
+
+
+def _load_chunk(conn, person_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cursor.execute("SELECT * FROM person WHERE person_id = ANY(%s::uuid[])", (person_ids,))
+        contexts = {
+            str(row['person_id']): {
+                "person": dict(row),
+                "employment": [],
+                "emails": [],
+                "github_profile": None,
+                "github_contributions": [],
+                "omitted_sections": []
+            }
+            for row in cursor.fetchall()
+        }
+
+        cursor.execute("""
+            SELECT e.*, c.company_name
+            FROM employment e
+            LEFT JOIN company c ON e.company_id = c.company_id
+            WHERE e.person_id = ANY(%s::uuid[])
+            ORDER BY
+                e.person_id,
+                CASE WHEN e.end_date IS NULL THEN 0 ELSE 1 END,
+                COALESCE(e.end_date, CURRENT_DATE) DESC,
+                e.start_date DESC
+        """, (person_ids,))
+        for row in cursor.fetchall():
+            contexts[str(row['person_id'])]["employment"].append(dict(row))
+
+        cursor.execute("SELECT * FROM person_email WHERE person_id = ANY(%s::uuid[])", (person_ids,))
+        for row in cursor.fetchall():
+            contexts[str(row['person_id'])]["emails"].append(dict(row))
+
+        cursor.execute("""
+            SELECT DISTINCT ON (person_id) *
+            FROM github_profile
+            WHERE person_id = ANY(%s::uuid[])
+            ORDER BY person_id, github_profile_id
+        """, (person_ids,))
+        for row in cursor.fetchall():
+            contexts[str(row['person_id'])]["github_profile"] = dict(row)
+
+        # Top 20 repositories per person, ranked like the single-person query
+        cursor.execute("""
+            SELECT *
+            FROM (
+                SELECT
+                    gp.person_id AS ranked_person_id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY gp.person_id
+                        ORDER BY gr.stars DESC, gc.contribution_count DESC
+                    ) AS ranked_position,
+                    gc.contribution_count,
+                    gc.last_contribution_date,
+                    gr.repo_id,
+                    gr.full_name as repo_full_name,
+                    gr.repo_name,
+                    gr.description,
+                    gr.language,
+                    gr.stars,
+                    gr.forks,
+                    gr.is_fork,
+                    c.company_name as owner_company_name
+                FROM (
+                    SELECT DISTINCT ON (person_id) person_id, github_profile_id
+                    FROM github_profile
+                    WHERE person_id = ANY(%s::uuid[])
+                    ORDER BY person_id, github_profile_id
+                ) gp
+                JOIN github_contribution gc ON gc.github_profile_id = gp.github_profile_id
+                JOIN github_repository gr ON gc.repo_id = gr.repo_id
+                LEFT JOIN company c ON gr.company_id = c.company_id
+            ) ranked
+            WHERE ranked_position <= 20
+            ORDER BY ranked_person_id, ranked_position
+        """, (person_ids,))
+        for row in cursor.fetchall():
+            contribution = dict(row)
+            person_id = str(contribution.pop('ranked_person_id'))
+            contribution.pop('ranked_position')
+            contexts[person_id]["github_contributions"].append(contribution)
+
+        return contexts
+    finally:
+        cursor.close()
+
+
+# ============================================================================
+# Concurrent summarization
+# ============================================================================
+
+class BatchSummarizer:
+    """Fans profile summaries out over an AIService under concurrency and rate limits"""
+
+    def __init__(
+        self,
+        ai_service: AIService,
+        concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None
+    ):
+        limits = provider_limits(ai_service.provider)
+        self.ai_service = ai_service
+        self.concurrency = concurrency or limits["concurrency"]
+        self.requests_per_minute = requests_per_minute or limits["requests_per_minute"]
+
+    async def summarize(
+        self,
+        contexts: Dict[str, Dict[str, Any]],
+        job_context: Optional[str] = None,
+        store: Optional[Callable[[List[Dict[str, Any]], Dict[str, Any]], None]] = None,
+        flush_every: int = FLUSH_EVERY
+    ) -> Dict[str, Any]:
+        """
+        Summarize every context.
+
+        Args:
+            contexts: person_id -> candidate data
+            job_context: Optional role context passed to every summary
+            store: Called in a worker thread with each batch of
+                {'person_id', 'summary'} rows and the running stats
+            flush_every: Rows per store() call
+
+        Returns:
+            Stats: counts, elapsed time, throughput, call latency percentiles
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = RateLimiter(self.requests_per_minute)
+        stats = {
+            'total': len(contexts),
+            'completed': 0,
+            'failed': 0,
+            'concurrency': self.concurrency,
+            'requests_per_minute': self.requests_per_minute,
+            'max_in_flight': 0
+        }
+        in_flight = 0
+        latencies = []
+
+        async def summarize_one(person_id: str, candidate_data: Dict[str, Any]):
+            nonlocal in_flight
+            async with semaphore:
+                await limiter.acquire()
+                in_flight += 1
+                stats['max_in_flight'] = max(stats['max_in_flight'], in_flight)
+                started = time.monotonic()
+                try:
+                    summary = await self.ai_service.generate_profile_summary_async(
+                        candidate_data=candidate_data,
+                        job_context=job_context
+                    )
+                    latencies.append(time.monotonic() - started)
+                    if summary.get('error'):
+                        # Unparseable answer: not a summary the UI can show
+                        logger.warning(f"Batch summary failed for {person_id}: {summary['error']}")
+                        return person_id, None
+                    return person_id, summary
+                except Exception as e:
+                    logger.warning(f"Batch summary failed for {person_id}: {e}")
+                    return person_id, None
+                finally:
+                    in_flight -= 1
+
+        start = time.monotonic()
+        pending_rows = []
+        tasks = [asyncio.ensure_future(summarize_one(pid, data)) for pid, data in contexts.items()]
+
+        for next_done in asyncio.as_completed(tasks):
+            person_id, summary = await next_done
+            if summary is None:
+                stats['failed'] += 1
+                continue
+            stats['completed'] += 1
+            pending_rows.append({'person_id': person_id, 'summary': summary})
+            if store and len(pending_rows) >= flush_every:
+                await asyncio.to_thread(store, pending_rows, dict(stats))
+                pending_rows = []
+
+        if store and pending_rows:
+            await asyncio.to_thread(store, pending_rows, dict(stats))
+
+        elapsed = time.monotonic() - start
+        latencies.sort()
+        stats.update({
+            'elapsed_seconds': round(elapsed, 2),
+            'throughput_per_minute': round(stats['completed'] / elapsed * 60, 1) if elapsed else 0.0,
+            'latency_p50_seconds': round(latencies[len(latencies) // 2], 3) if latencies else None,
+            'latency_p95_seconds': round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None
+        })
+        return stats
+
+
+# ============================================================================
+# Batch bookkeeping (summary_batch / candidate_summary)
+# ============================================================================
+
+def create_batch(
+    conn,
+    person_ids: List[str],
+    source: str,
+    job_context: Optional[str],
+    provider: str,
+    model: Optional[str],
+    list_id: Optional[str] = None
+) -> str:
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor.execute("""
+        INSERT INTO summary_batch (list_id, source, job_context, provider, model, total)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING batch_id::text AS batch_id
+    """, (list_id, source, job_context, provider, model, len(person_ids)))
+    batch_id = cursor.fetchone()['batch_id']
+    conn.commit()
+    cursor.close()
+    return batch_id
+
+
+def _update_batch(batch_id: str, status: str, stats: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+    stats = stats or {}
+    with get_db_context() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE summary_batch
+            SET status = %s,
+                completed = COALESCE(%s, completed),
+                failed = COALESCE(%s, failed),
+                stats = COALESCE(%s::jsonb, stats),
+                error = %s,
+                started_at = CASE WHEN %s = 'running' THEN NOW() ELSE started_at END,
+                finished_at = CASE WHEN %s IN ('completed', 'failed') THEN NOW() ELSE finished_at END
+            WHERE batch_id = %s
+        """, (
+            status, stats.get('completed'), stats.get('failed'),
+            json.dumps(stats) if 'elapsed_seconds' in stats else None,
+            error, status, status, batch_id
+        ))
+        conn.commit()
+        cursor.close()
+
+
+def summary_writer(batch_id: str, job_context: Optional[str], ai_service: AIService):
+    """store() callback for BatchSummarizer.summarize: upserts summaries and reports progress"""
+    context_hash = job_context_hash(job_context)
+
+    def store(rows: List[Dict[str, Any]], stats: Dict[str, Any]):
+        with get_db_context() as conn:
+            cursor = conn.cursor()
+            execute_values(cursor, """
+                INSERT INTO candidate_summary (
+                    person_id, job_context_hash, summary, provider, model, batch_id, generated_at
+                ) VALUES %s
+                ON CONFLICT (person_id, job_context_hash) DO UPDATE SET
+                    summary = EXCLUDED.summary,
+                    provider = EXCLUDED.provider,
+                    model = EXCLUDED.model,
+                    batch_id = EXCLUDED.batch_id,
+                    generated_at = NOW()
+            """, [
+                (row['person_id'], context_hash, json.dumps(row['summary']),
+                 ai_service.provider, ai_service.model, batch_id)
+                for row in rows
+            ], template="(%s, %s, %s::jsonb, %s, %s, %s, NOW())")
+            cursor.execute("""
+                UPDATE summary_batch SET completed = %s, failed = %s WHERE batch_id = %s
+            """, (stats['completed'], stats['failed'], batch_id))
+            conn.commit()
+            cursor.close()
+
+    return store
+
+
+async def run_batch(
+    batch_id: str,
+    person_ids: List[str],
+    ai_service: AIService,
+    job_context: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    requests_per_minute: Optional[int] = None
+) -> Dict[str, Any]:
+    """Load contexts, summarize and record the outcome on the summary_batch row"""
+    try:
+        await asyncio.to_thread(_update_batch, batch_id, 'running')
+
+        def load():
+            with get_db_context() as conn:
+                try:
+                    return load_contexts(conn, person_ids)
+                finally:
+                    conn.rollback()
+
+        contexts = await asyncio.to_thread(load)
+        summarizer = BatchSummarizer(ai_service, concurrency, requests_per_minute)
+        stats = await summarizer.summarize(
+            contexts, job_context, store=summary_writer(batch_id, job_context, ai_service)
+        )
+        stats['missing_people'] = len(person_ids) - len(contexts)
+
+        await asyncio.to_thread(_update_batch, batch_id, 'completed', stats)
+        logger.info(f"✅ Summary batch {batch_id}: {stats['completed']}/{stats['total']} in "
+                    f"{stats['elapsed_seconds']}s ({stats['throughput_per_minute']}/min)")
+        return stats
+
+    except Exception as e:
+        logger.error(f"❌ Summary batch {batch_id} failed: {e}")
+        await asyncio.to_thread(_update_batch, batch_id, 'failed', None, str(e))
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate AI profile summaries for a candidate list')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--list-id', help='Candidate list to summarize')
+    source.add_argument('--person-ids', nargs='+', help='Explicit person ids')
+    parser.add_argument('--job-context', help='Role context for every summary')
+    parser.add_argument('--provider', default='openai', choices=['openai', 'anthropic'])
+    parser.add_argument('--model', help='Specific model (optional)')
+    parser.add_argument('--concurrency', type=int, help='Concurrent LLM calls (default per provider)')
+    parser.add_argument('--rpm', type=int, help='Requests per minute (default per provider)')
+    parser.add_argument('--limit', type=int, default=MAX_BATCH_PEOPLE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    ai_service = get_ai_service(provider=args.provider, model=args.model)
+    with get_db_context() as conn:
+        person_ids = resolve_person_ids(conn, list_id=args.list_id, person_ids=args.person_ids, limit=args.limit)
+        batch_id = create_batch(
+            conn, person_ids, 'list' if args.list_id else 'person_ids',
+            args.job_context, ai_service.provider, ai_service.model, args.list_id
+        )
+
+    logger.info(f"📋 Summarizing {len(person_ids)} people (batch {batch_id})")
+    stats = asyncio.run(run_batch(batch_id, person_ids, ai_service, args.job_context, args.concurrency, args.rpm))
+
+    print("\n" + "=" * 60)
+    print("BATCH SUMMARY THROUGHPUT")
+    print("=" * 60)
+    for key in ('total', 'completed', 'failed', 'missing_people', 'concurrency', 'requests_per_minute',
+                'max_in_flight', 'elapsed_seconds', 'throughput_per_minute',
+                'latency_p50_seconds', 'latency_p95_seconds'):
+        print(f"  {key:24s} {stats.get(key)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+Change Feed
+
+Incremental reader over change_log (migration_scripts/22_change_log.sql),
+which triggers on person, person_email, employment, github_profile and
+github_contribution append to.
+
+Each consumer keeps its own cursor in change_consumer. A cursor is the
+transaction snapshot the consumer last read up to; a batch is every change
+committed after that snapshot and visible in the current one, so changes
+from transactions that commit out of change_id order are never skipped.
+The cursor only moves when the consumer's batch commits - a consumer that
+fails re-reads the same changes next time. A new consumer starts at "now".
+
+Purging keeps everything a consumer hasn't read, except for consumers idle
+longer than CHANGE_CONSUMER_STALE_DAYS (a retired consumer must not pin the
+log forever); drop_consumer() removes one outright.
+
+Usage:
+    with get_db_context() as conn:
+        with ChangeFeed(conn, 'llm_cache') as feed:
+            for row in feed.changed_people():
+                ...
+
+    python -m api.services.change_log --status
+    python -m api.services.change_log --drop old_consumer
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_context
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_RETENTION_DAYS = float(os.getenv('CHANGE_LOG_RETENTION_DAYS', '7'))
+# Consumers that haven't committed a batch for this long no longer hold back purging
+CHANGE_CONSUMER_STALE_DAYS = float(os.getenv('CHANGE_CONSUMER_STALE_DAYS', '30'))
+
+# Changes committed after snapshot %(previous)s and visible in %(current)s
+WINDOW_SQL = """
+    xid >= txid_snapshot_xmin(%(previous)s::txid_snapshot)
+    AND xid < txid_snapshot_xmax(%(current)s::txid_snapshot)
+    AND NOT txid_visible_in_snapshot(xid, %(previous)s::txid_snapshot)
+    AND txid_visible_in_snapshot(xid, %(current)s::txid_snapshot)
+"""
+
+# Changes visible in %(current)s and committed after at least one of the
+# %(previous)s snapshots (text[]), for readers with several cursors at once
+WINDOWS_SQL = """
+    xid >= %(oldest_xmin)s
+    AND xid < txid_snapshot_xmax(%(current)s::txid_snapshot)
+    AND txid_visible_in_snapshot(xid, %(current)s::txid_snapshot)
+    AND EXISTS (
+        SELECT 1 FROM unnest(%(previous)s::text[]) AS p(snapshot)
+        WHERE NOT txid_visible_in_snapshot(xid, p.snapshot::txid_snapshot)
+    )
+"""
+
+
+@lru_cache(maxsize=256)
+def parse_snapshot(snapshot: str) -> Tuple[int, int, FrozenSet[int]]:
+    """txid_snapshot text 'xmin:xmax:xip,...' -> (xmin, xmax, in-progress xids)"""
+    xmin, xmax, xip = snapshot.split(':')
+    return int(xmin), int(xmax), frozenset(int(x) for x in xip.split(',') if x)
+
+
+def visible_in_snapshot(xid: int, snapshot: str) -> bool:
+    """txid_visible_in_snapshot for a change_log xid, without a round trip"""
+    xmin, xmax, in_progress = parse_snapshot(snapshot)
+    return xid < xmin or (xid < xmax and xid not in in_progress)
+
+
+class ChangeFeed:
+    """
+    One consumer's batch of changes.
+
+    Opening the feed locks the consumer's cursor row (a second run of the
+    same consumer waits instead of double-processing); leaving the `with`
+    block commits the new cursor, or rolls back on an exception.
+    """
+
+    def __init__(self, conn, consumer: str):
+        self.conn = conn
+        self.consumer = consumer
+        self.previous = None
+        self.current = None
+        self.last_change_id = None
+        self.read = 0
+
+    def open(self) -> 'ChangeFeed':
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT txid_current_snapshot()::text AS snapshot")
+        self.current = cursor.fetchone()['snapshot']
+        cursor.execute("""
+            INSERT INTO change_consumer (consumer, snapshot)
+            VALUES (%s, %s)
+            ON CONFLICT (consumer) DO NOTHING
+        """, (self.consumer, self.current))
+        cursor.execute(
+            "SELECT snapshot FROM change_consumer WHERE consumer = %s FOR UPDATE",
+            (self.consumer,)
+        )
+        self.previous = cursor.fetchone()['snapshot']
+        cursor.close()
+        return self
+
+    def window(self) -> Dict[str, Any]:
+        """Parameters for WINDOW_SQL, for consumers that filter the batch in their own query"""
+        return {'previous': self.previous, 'current': self.current}
+
+    def _params(self, tables: Optional[Sequence[str]], ops: Optional[Sequence[str]]) -> Dict[str, Any]:
+        return {
+            **self.window(),
+            'tables': list(tables) if tables else None,
+            'ops': list(ops) if ops else None
+        }
+
+    def _track(self, rows: List[Dict[str, Any]], last_change_id: Optional[int]):
+        self.read += len(rows)
+        if last_change_id is not None:
+            self.last_change_id = max(self.last_change_id or 0, last_change_id)
+
+    def changes(
+        self,
+        tables: Optional[Sequence[str]] = None,
+        ops: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Raw change rows in the batch, in change_id order"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT change_id, table_name, op, row_id, person_id, changed_columns, changed_at
+            FROM change_log
+            WHERE {WINDOW_SQL}
+            AND (%(tables)s::text[] IS NULL OR table_name = ANY(%(tables)s::text[]))
+            AND (%(ops)s::text[] IS NULL OR op = ANY(%(ops)s::text[]))
+            ORDER BY change_id
+        """, self._params(tables, ops))
+        rows = cursor.fetchall()
+        cursor.close()
+        self._track(rows, rows[-1]['change_id'] if rows else None)
+        return rows
+
+    def changed_people(self, tables: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """People touched by the batch: person_id, tables changed, latest change time"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT
+                person_id,
+                array_agg(DISTINCT table_name) AS tables,
+                MAX(changed_at) AS changed_at,
+                MAX(change_id) AS last_change_id
+            FROM change_log
+            WHERE {WINDOW_SQL}
+            AND person_id IS NOT NULL
+            AND (%(tables)s::text[] IS NULL OR table_name = ANY(%(tables)s::text[]))
+            GROUP BY person_id
+        """, self._params(tables, None))
+        rows = cursor.fetchall()
+        cursor.close()
+        self._track(rows, max((row['last_change_id'] for row in rows), default=None))
+        return rows
+
+    def commit(self):
+        """Advance the consumer's cursor to this batch's snapshot"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE change_consumer
+            SET snapshot = %s,
+                last_change_id = COALESCE(%s, last_change_id),
+                changes_read = changes_read + %s,
+                updated_at = NOW()
+            WHERE consumer = %s
+        """, (self.current, self.last_change_id, self.read, self.consumer))
+        cursor.close()
+        self.conn.commit()
+
+    def __enter__(self) -> 'ChangeFeed':
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.conn.rollback()
+        return False
+
+
+def purge_change_log(
+    retention_days: float = CHANGE_LOG_RETENTION_DAYS,
+    stale_days: float = CHANGE_CONSUMER_STALE_DAYS
+) -> int:
+    """Delete changes older than the retention window that every active consumer has read"""
+    with get_db_context() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT consumer, updated_at FROM change_consumer
+            WHERE updated_at < NOW() - %s * INTERVAL '1 day'
+        """, (stale_days,))
+        for row in cursor.fetchall():
+            logger.warning(f"⚠️  Change consumer '{row['consumer']}' idle since {row['updated_at']} "
+                           f"- not holding back the change log purge")
+        cursor.execute("""
+            DELETE FROM change_log
+            WHERE changed_at < NOW() - %(retention)s * INTERVAL '1 day'
+            AND xid < COALESCE(
+                (SELECT MIN(txid_snapshot_xmin(snapshot::txid_snapshot)) FROM change_consumer
+                 WHERE updated_at >= NOW() - %(stale)s * INTERVAL '1 day'),
+                txid_snapshot_xmin(txid_current_snapshot())
+            )
+        """, {'retention': retention_days, 'stale': stale_days})
+        deleted = cursor.rowcount
+        conn.commit()
+        cursor.close()
+    return deleted
+
+
+def drop_consumer(consumer: str) -> bool:
+    """Remove a retired consumer's cursor; returns whether it existed"""
+    with get_db_context() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM change_consumer WHERE consumer = %s", (consumer,))
+        dropped = cursor.rowcount > 0
+        conn.commit()
+        cursor.close()
+    return dropped
+
+
+def consumer_status() -> List[Dict[str, Any]]:
+    """Each consumer's position and how far the log has moved past it"""
+    with get_db_context() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                c.consumer,
+                c.last_change_id,
+                c.changes_read,
+                c.updated_at,
+                (SELECT MAX(change_id) FROM change_log) AS head_change_id,
+                (SELECT COUNT(*) FROM change_log l
+                 WHERE l.xid >= txid_snapshot_xmin(c.snapshot::txid_snapshot)
+                 AND NOT txid_visible_in_snapshot(l.xid, c.snapshot::txid_snapshot)) AS pending
+            FROM change_consumer c
+            ORDER BY c.consumer
+        """)
+        rows = cursor.fetchall()
+        conn.rollback()
+        cursor.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or purge the change log')
+    parser.add_argument('--status', action='store_true', help='Show consumer cursors and pending changes')
+    parser.add_argument('--purge', action='store_true', help='Delete changes past retention read by every consumer')
+    parser.add_argument('--drop', metavar='CONSUMER', help='Remove a retired consumer so it stops holding back purges')
+    args = parser.parse_args()
+
+    if args.drop:
+        print(f"{'Dropped' if drop_consumer(args.drop) else 'No such'} consumer {args.drop}")
+    if args.purge:
+        print(f"Deleted {purge_change_log()} change_log rows")
+    if args.status or not (args.purge or args.drop):
+        print(json.dumps(consumer_status(), indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
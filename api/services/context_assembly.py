@@ -0,0 +1,102 @@
+"""
+Context Assembly for AI Prompts
+
+Runs the independent data sections of an AI prompt (hiring patterns, talent
+flow, candidate employment, ...) concurrently instead of one after another
+on the request's connection.
+
+Each section gets its own pooled connection in a worker thread and a time
+budget. The budget is also set as the section's statement_timeout, so a
+slow query is cancelled by Postgres rather than left running. Sections that
+time out or fail are left out of the context instead of stalling the
+request - except required sections, whose errors (other than timeouts) are
+raised to the caller.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import Config, get_db_context
+
+logger = logging.getLogger(__name__)
+
+# Seconds each section may take before it is omitted
+DEFAULT_SECTION_BUDGET = float(os.getenv('AI_CONTEXT_SECTION_BUDGET_SECONDS', '5'))
+
+Section = Callable[[Any], Any]
+
+# SQLSTATE query_canceled, raised when statement_timeout fires
+QUERY_CANCELED = '57014'
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    return getattr(exc, 'pgcode', None) == QUERY_CANCELED
+
+
+def _run_section(name: str, fetch: Section, budget: float) -> Any:
+    """Worker thread: run one section on its own pooled connection"""
+    start = time.time()
+    with get_db_context() as conn:
+        try:
+            if Config.DB_TYPE == 'postgresql':
+                cursor = conn.cursor()
+                # SET LOCAL ends with the transaction, so the pooled connection keeps its default
+                cursor.execute("SET LOCAL statement_timeout = %s", (f"{int(budget * 1000)}ms",))
+                cursor.close()
+            return fetch(conn)
+        finally:
+            conn.rollback()  # Read-only; hand the connection back idle
+            logger.debug(f"Context section '{name}' took {time.time() - start:.2f}s")
+
+
+async def fetch_sections(
+    sections: Dict[str, Section],
+    budget: Optional[float] = None,
+    required: Sequence[str] = ()
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Run context sections concurrently.
+
+    Args:
+        sections: Section name -> function taking a connection and returning the section data
+        budget: Seconds each section may take (default AI_CONTEXT_SECTION_BUDGET_SECONDS)
+        required: Sections whose errors are raised instead of omitted; a
+            required section that times out is still only omitted
+
+    Returns:
+        (results by section name, names of sections omitted after a timeout or error)
+    """
+    budget = budget or DEFAULT_SECTION_BUDGET
+    tasks = {
+        asyncio.ensure_future(asyncio.to_thread(_run_section, name, fetch, budget)): name
+        for name, fetch in sections.items()
+    }
+    if not tasks:
+        return {}, []
+
+    done, pending = await asyncio.wait(tasks, timeout=budget)
+
+    results = {}
+    omitted = []
+    for task in pending:
+        # The thread finishes on its own once statement_timeout fires
+        task.cancel()
+        omitted.append(tasks[task])
+        logger.warning(f"Context section '{tasks[task]}' exceeded {budget}s budget - omitted")
+    for task in done:
+        error = task.exception()
+        if error and tasks[task] in required and not _is_timeout(error):
+            raise error
+        if error:
+            omitted.append(tasks[task])
+            logger.warning(f"Context section '{tasks[task]}' failed - omitted: {error}")
+        else:
+            results[tasks[task]] = task.result()
+
+    return results, sorted(omitted)
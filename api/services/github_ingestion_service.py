@@ -4,29 +4,39 @@ Handles ingestion of individual GitHub users and organizations
 Matches profiles with existing database records or creates new ones
 """
 
-import os
+import threading
 import uuid
 import logging
 from typing import Dict, List, Optional, Tuple
-import requests
 from datetime import datetime
 from psycopg2.extras import RealDictCursor
 from fuzzywuzzy import fuzz
 
+from github_automation.github_client import GitHubClient
+
 logger = logging.getLogger(__name__)
 
+# One client per API process: shared keep-alive pool and rate-limit bucket
+_github_client: Optional[GitHubClient] = None
+_github_client_lock = threading.Lock()
+
+
+def get_github_client() -> GitHubClient:
+    """Process-wide GitHubClient, created on first use"""
+    global _github_client
+    with _github_client_lock:
+        if _github_client is None:
+            _github_client = GitHubClient()
+        return _github_client
+
 
 class GitHubIngestionService:
     """Service for ingesting GitHub users and organizations"""
     
-    def __init__(self, db_conn):
+    def __init__(self, db_conn, github_client: Optional[GitHubClient] = None):
         self.db = db_conn
         self.cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-        self.github_token = os.environ.get('GITHUB_TOKEN', '')
-        self.headers = {
-            'Authorization': f'token {self.github_token}' if self.github_token else '',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+        self.client = github_client or get_github_client()
         
         # Stats tracking
         self.stats = {
@@ -148,62 +158,25 @@ class GitHubIngestionService:
     
     def _fetch_github_user(self, username: str) -> Optional[Dict]:
         """Fetch user data from GitHub API"""
-        try:
-            response = requests.get(
-                f'https://api.github.com/users/{username}',
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error fetching GitHub user {username}: {str(e)}")
-            return None
+        user = self.client.get_user(username)
+        if not user:
+            logger.error(f"Error fetching GitHub user {username}")
+        return user
     
     def _fetch_user_repos(self, username: str) -> List[Dict]:
         """Fetch user's repositories from GitHub API"""
-        try:
-            response = requests.get(
-                f'https://api.github.com/users/{username}/repos',
-                headers=self.headers,
-                params={'sort': 'updated', 'per_page': 100},
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error fetching repos for {username}: {str(e)}")
-            return []
+        return self.client.get(
+            f'/users/{username}/repos',
+            params={'sort': 'updated', 'per_page': 100}
+        ) or []
     
     def _fetch_org_members(self, org_name: str) -> List[Dict]:
         """Fetch organization members from GitHub API"""
-        try:
-            response = requests.get(
-                f'https://api.github.com/orgs/{org_name}/members',
-                headers=self.headers,
-                params={'per_page': 100},
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error fetching members for {org_name}: {str(e)}")
-            return []
+        return self.client.get(f'/orgs/{org_name}/members', params={'per_page': 100}) or []
     
     def _fetch_org_repos(self, org_name: str) -> List[Dict]:
         """Fetch organization repositories from GitHub API"""
-        try:
-            response = requests.get(
-                f'https://api.github.com/orgs/{org_name}/repos',
-                headers=self.headers,
-                params={'per_page': 100},
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error fetching repos for {org_name}: {str(e)}")
-            return []
+        return self.client.get(f'/orgs/{org_name}/repos', params={'per_page': 100}) or []
     
     def _match_or_create_person(self, user_data: Dict) -> str:
         """
@@ -453,14 +426,10 @@ class GitHubIngestionService:
             
             # Fetch user's recent events (last 300 events, 3 pages)
             for page in range(1, 4):
-                response = requests.get(
-                    f'https://api.github.com/users/{username}/events',
-                    headers=self.headers,
-                    params={'per_page': 100, 'page': page},
-                    timeout=10
+                events = self.client.get(
+                    f'/users/{username}/events',
+                    params={'per_page': 100, 'page': page}
                 )
-                response.raise_for_status()
-                events = response.json()
                 
                 if not events:
                     break
@@ -471,16 +440,9 @@ class GitHubIngestionService:
                         repo_name = event['repo']['name']
                         # Fetch full repo details
                         if repo_name not in contributed_repos:
-                            try:
-                                repo_response = requests.get(
-                                    f'https://api.github.com/repos/{repo_name}',
-                                    headers=self.headers,
-                                    timeout=10
-                                )
-                                if repo_response.status_code == 200:
-                                    contributed_repos[repo_name] = repo_response.json()
-                            except:
-                                continue
+                            repo_data = self.client.get(f'/repos/{repo_name}')
+                            if repo_data:
+                                contributed_repos[repo_name] = repo_data
             
             logger.info(f"Found {len(contributed_repos)} contributed repos from events for {username}")
             return list(contributed_repos.values())
@@ -491,5 +453,7 @@ class GitHubIngestionService:
     
     def get_stats(self) -> Dict:
         """Get ingestion statistics"""
+        if self.client.cache:
+            return {**self.stats, 'http_cache': self.client.cache.get_stats()}
         return self.stats
 
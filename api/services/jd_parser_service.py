@@ -11,6 +11,7 @@ from api.models.advanced_search import (
     ParsedJobDescription,
     AdvancedSearchRequest
 )
+from api.services.llm_cache import fingerprint, get_llm_cache
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -22,12 +23,16 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
+JD_MODEL = "gpt-4o-mini"  # Using mini for cost efficiency
+JD_PROMPT_VERSION = 1  # Bump when the parsing prompt changes
+
 
 class JobDescriptionParser:
     """Parse job descriptions and extract structured requirements using AI"""
     
     def __init__(self):
         self.logger = logger
+        self.cache = get_llm_cache()
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             self.logger.warning("OPENAI_API_KEY not set - JD parsing will not work")
@@ -62,38 +67,60 @@ class JobDescriptionParser:
         try:
             # Build prompt for GPT-4
             prompt = self._build_parsing_prompt(jd_text)
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You are an expert technical recruiter who extracts structured data from job descriptions."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
             
-            self.logger.info("Calling OpenAI API (GPT-4)...")
-            api_start = time.time()
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Using mini for cost efficiency
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert technical recruiter who extracts structured data from job descriptions."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,  # Low temperature for more consistent extraction
-                max_tokens=1500
-            )
-            
-            api_elapsed = time.time() - api_start
-            self.logger.info(f"✓ OpenAI API call completed in {api_elapsed:.2f}s")
+            cache_key = fingerprint("openai", JD_MODEL, "jd_parse", JD_PROMPT_VERSION, messages)
+            content = self.cache.get(cache_key, "jd_parse") if self.cache else None
+            from_cache = content is not None
             
-            # Log token usage
-            usage = response.usage
-            self.logger.info(f"Token usage: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion = {usage.total_tokens} total")
+            if from_cache:
+                self.logger.info("✓ Parsed JD served from LLM cache")
+            else:
+                self.logger.info("Calling OpenAI API (GPT-4)...")
+                api_start = time.time()
+                
+                response = self.client.chat.completions.create(
+                    model=JD_MODEL,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.3,  # Low temperature for more consistent extraction
+                    max_tokens=1500
+                )
+                
+                api_elapsed = time.time() - api_start
+                self.logger.info(f"✓ OpenAI API call completed in {api_elapsed:.2f}s")
+                
+                # Log token usage
+                usage = response.usage
+                self.logger.info(f"Token usage: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion = {usage.total_tokens} total")
+                
+                content = response.choices[0].message.content
             
             # Parse response
-            content = response.choices[0].message.content
             parsed_data = json.loads(content)
             
+            # Only cache answers that parsed
+            if self.cache and not from_cache:
+                self.cache.put(
+                    cache_key, content,
+                    provider="openai",
+                    model=JD_MODEL,
+                    template="jd_parse",
+                    template_version=JD_PROMPT_VERSION,
+                    latency_ms=int(api_elapsed * 1000),
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens
+                )
+            
             self.logger.info("Extracted fields:")
             self.logger.info(f"  Technologies: {parsed_data.get('technologies', [])}")
             self.logger.info(f"  Companies: {parsed_data.get('companies', [])}")
@@ -0,0 +1,280 @@
+"""
+LLM Response Cache
+
+Content-addressed cache for AI service responses, stored in Postgres
+(llm_response_cache, migration_scripts/19_llm_response_cache.sql).
+
+Entries are keyed by a fingerprint of provider, model, prompt template,
+template version and the normalized prompt, so the same candidate with
+unchanged data never pays for a second call. Each entry is tagged with the
+subject it describes (e.g. a person_id) and a version hash of that subject's
+data; storing a response for a new version drops the subject's older entries
+for the template, and the scheduler drops entries about people the change log
+reports as changed. Expired entries are ignored on lookup and purged daily by
+the background scheduler.
+
+Cache errors never fail a request - they count as a miss.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_context
+from api.services.change_log import ChangeFeed
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_TTL_HOURS = float(os.getenv('LLM_CACHE_TTL_HOURS', '168'))
+
+# change_log consumer that drops entries about changed people
+CHANGE_FEED_CONSUMER = 'llm_cache'
+
+# USD per 1M tokens (input, output), used to report cost saved by hits
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+}
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace in strings so formatting-only changes keep the same key"""
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(_normalize(value), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def fingerprint(provider: str, model: str, template: str, template_version: int, prompt: Any) -> str:
+    """Cache key for a prompt (messages list or any JSON-able payload)"""
+    return _digest([provider, model, template, template_version, prompt])
+
+
+def context_version(data: Dict[str, Any]) -> str:
+    """Version of a subject's data: changes whenever any field the prompt could use changes"""
+    return _digest({k: v for k, v in data.items() if k != 'omitted_sections'})[:16]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+class LLMCache:
+    """Postgres-backed response cache with per-template hit/miss counters for this process"""
+
+    def __init__(self, ttl_hours: float = LLM_CACHE_TTL_HOURS):
+        self.ttl_hours = ttl_hours
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, float]] = {}
+
+    def _count(self, template: str, **increments):
+        with self._lock:
+            counters = self._counters.setdefault(template, {
+                'hits': 0, 'misses': 0, 'latency_saved_ms': 0, 'tokens_saved': 0, 'cost_saved_usd': 0.0
+            })
+            for name, amount in increments.items():
+                counters[name] += amount
+
+    def get(self, key: str, template: str) -> Optional[str]:
+        """Cached response text, or None on a miss"""
+        try:
+            with get_db_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE llm_response_cache
+                    SET hit_count = hit_count + 1, last_hit_at = NOW()
+                    WHERE cache_key = %s AND expires_at > NOW()
+                    RETURNING response, latency_ms, prompt_tokens, completion_tokens, cost_usd
+                """, (key,))
+                row = cursor.fetchone()
+                conn.commit()
+                cursor.close()
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            row = None
+
+        if row is None:
+            self._count(template, misses=1)
+            return None
+
+        self._count(
+            template, hits=1,
+            latency_saved_ms=row['latency_ms'] or 0,
+            tokens_saved=(row['prompt_tokens'] or 0) + (row['completion_tokens'] or 0),
+            cost_saved_usd=row['cost_usd'] or 0.0
+        )
+        return row['response']
+
+    def put(
+        self,
+        key: str,
+        response: str,
+        *,
+        provider: str,
+        model: str,
+        template: str,
+        template_version: int,
+        latency_ms: int,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        subject_id: Optional[str] = None,
+        subject_version: Optional[str] = None
+    ) -> bool:
+        """Store a response; drops the subject's entries for older versions of its data"""
+        try:
+            with get_db_context() as conn:
+                cursor = conn.cursor()
+                if subject_id:
+                    cursor.execute("""
+                        DELETE FROM llm_response_cache
+                        WHERE subject_id = %s AND template = %s AND subject_version IS DISTINCT FROM %s
+                    """, (subject_id, template, subject_version))
+                cursor.execute("""
+                    INSERT INTO llm_response_cache (
+                        cache_key, provider, model, template, template_version,
+                        subject_id, subject_version, response,
+                        prompt_tokens, completion_tokens, latency_ms, cost_usd, expires_at
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW() + %s * INTERVAL '1 hour')
+                    ON CONFLICT (cache_key) DO UPDATE SET
+                        response = EXCLUDED.response,
+                        prompt_tokens = EXCLUDED.prompt_tokens,
+                        completion_tokens = EXCLUDED.completion_tokens,
+                        latency_ms = EXCLUDED.latency_ms,
+                        cost_usd = EXCLUDED.cost_usd,
+                        created_at = NOW(),
+                        expires_at = EXCLUDED.expires_at
+                """, (
+                    key, provider, model, template, template_version,
+                    subject_id, subject_version, response,
+                    prompt_tokens, completion_tokens, latency_ms,
+                    estimate_cost(model, prompt_tokens, completion_tokens), self.ttl_hours
+                ))
+                conn.commit()
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+            return False
+
+    def invalidate(self, subject_id: str) -> int:
+        """Drop every cached response about a subject"""
+        with get_db_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM llm_response_cache WHERE subject_id = %s", (subject_id,))
+            deleted = cursor.rowcount
+            conn.commit()
+            cursor.close()
+        return deleted
+
+    def invalidate_changed(self) -> int:
+        """
+        Drop cached responses about people changed since the last call
+        ('llm_cache' consumer of the change log).
+        """
+        with get_db_context() as conn:
+            with ChangeFeed(conn, CHANGE_FEED_CONSUMER) as feed:
+                subject_ids = [str(row['person_id']) for row in feed.changed_people()]
+                if not subject_ids:
+                    return 0
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM llm_response_cache WHERE subject_id = ANY(%s)", (subject_ids,)
+                )
+                deleted = cursor.rowcount
+                cursor.close()
+        return deleted
+
+    def purge_expired(self) -> int:
+        with get_db_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM llm_response_cache WHERE expires_at <= NOW()")
+            deleted = cursor.rowcount
+            conn.commit()
+            cursor.close()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit rate and savings for this process, plus lifetime totals of the stored entries.
+        """
+        with self._lock:
+            session = {}
+            for template, counters in self._counters.items():
+                lookups = counters['hits'] + counters['misses']
+                session[template] = {
+                    'hits': counters['hits'],
+                    'misses': counters['misses'],
+                    'hit_rate': round(counters['hits'] / lookups * 100, 2) if lookups else 0.0,
+                    'latency_saved_seconds': round(counters['latency_saved_ms'] / 1000, 2),
+                    'tokens_saved': counters['tokens_saved'],
+                    'cost_saved_usd': round(counters['cost_saved_usd'], 4)
+                }
+
+        stored = {}
+        try:
+            with get_db_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT
+                        template,
+                        COUNT(*) AS entries,
+                        COALESCE(SUM(hit_count), 0) AS hits,
+                        COALESCE(SUM(hit_count * latency_ms), 0) AS latency_saved_ms,
+                        COALESCE(SUM(hit_count * (prompt_tokens + completion_tokens)), 0) AS tokens_saved,
+                        COALESCE(SUM(hit_count * cost_usd), 0) AS cost_saved_usd
+                    FROM llm_response_cache
+                    WHERE expires_at > NOW()
+                    GROUP BY template
+                """)
+                for row in cursor.fetchall():
+                    stored[row['template']] = {
+                        'entries': row['entries'],
+                        'hits': int(row['hits']),
+                        'latency_saved_seconds': round(float(row['latency_saved_ms']) / 1000, 2),
+                        'tokens_saved': int(row['tokens_saved']),
+                        'cost_saved_usd': round(float(row['cost_saved_usd']), 4)
+                    }
+                conn.rollback()
+                cursor.close()
+        except Exception as e:
+            logger.warning(f"LLM cache stats failed: {e}")
+
+        return {
+            'enabled': True,
+            'ttl_hours': self.ttl_hours,
+            'session': session,
+            'stored': stored
+        }
+
+
+# Global cache instance
+_llm_cache = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Shared cache instance, or None when LLM_CACHE_ENABLED=false"""
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
@@ -5,15 +5,63 @@ Provides insights about hiring patterns, talent flow, and market trends.
 Powered by AI for natural language queries.
 """
 
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, AsyncIterator, Tuple
 from datetime import datetime, timedelta
 from psycopg2.extras import RealDictCursor
 import logging
 
 from api.services.ai_service import get_ai_service
+from api.services.ai_streaming import stream_completion
+from api.services.context_assembly import fetch_sections
+from scripts.analytics.talent_flow_matrix import TalentFlowMatrix
 
 logger = logging.getLogger(__name__)
 
+# Direct moves, defined as in talent_flow_matrix.transitions: each stint is
+# paired with the person's latest stint that ended on or before it started,
+# and distinct people are counted per (from, to) company pair
+PREVIOUS_STINT = """
+    CROSS JOIN LATERAL (
+        SELECT f.company_id
+        FROM employment f
+        WHERE f.person_id = t.person_id
+        AND f.company_id IS NOT NULL
+        AND f.end_date <= t.start_date
+        ORDER BY f.end_date DESC
+        LIMIT 1
+    ) prev
+"""
+
+FEEDER_COMPANIES_SQL = f"""
+    SELECT prev.company_id, c.company_name, COUNT(DISTINCT t.person_id) AS person_count
+    FROM employment t
+    {PREVIOUS_STINT}
+    JOIN company c ON c.company_id = prev.company_id
+    WHERE t.company_id = %(company_id)s
+    AND t.start_date IS NOT NULL
+    AND prev.company_id <> t.company_id
+    GROUP BY prev.company_id, c.company_name
+    ORDER BY person_count DESC
+    LIMIT 20
+"""
+
+DESTINATION_COMPANIES_SQL = f"""
+    SELECT t.company_id, c.company_name, COUNT(DISTINCT t.person_id) AS person_count
+    FROM employment t
+    {PREVIOUS_STINT}
+    JOIN company c ON c.company_id = t.company_id
+    WHERE t.person_id IN (
+        SELECT person_id FROM employment
+        WHERE company_id = %(company_id)s AND end_date IS NOT NULL
+    )
+    AND t.start_date IS NOT NULL
+    AND prev.company_id = %(company_id)s
+    AND t.company_id <> %(company_id)s
+    GROUP BY t.company_id, c.company_name
+    ORDER BY person_count DESC
+    LIMIT 20
+"""
+
 
 class MarketIntelligenceService:
     """
@@ -71,22 +119,20 @@ class MarketIntelligenceService:
             )
             company = cursor.fetchone()
             
-            # Hiring volume by month
+            # Hiring volume by month (company_monthly_rollup, see scripts/analytics/company_rollups.py)
             cursor.execute(
                 """
-                SELECT 
-                    DATE_TRUNC('month', start_date) as month,
-                    COUNT(*) as hires
-                FROM employment
+                SELECT month, hires
+                FROM company_monthly_rollup
                 WHERE company_id = %s
-                AND start_date >= NOW() - INTERVAL '%s months'
-                AND start_date IS NOT NULL
-                GROUP BY DATE_TRUNC('month', start_date)
+                AND month >= DATE_TRUNC('month', NOW() - INTERVAL '%s months')
+                AND hires > 0
                 ORDER BY month
                 """,
                 (company_id, time_period_months)
             )
             monthly_hires = cursor.fetchall()
+            total_hires = sum(m['hires'] for m in monthly_hires)
             
             # Most common roles
             cursor.execute(
@@ -106,27 +152,9 @@ class MarketIntelligenceService:
             )
             top_roles = cursor.fetchall()
             
-            # Total hires in period
-            cursor.execute(
-                """
-                SELECT COUNT(*) as total
-                FROM employment
-                WHERE company_id = %s
-                AND start_date >= NOW() - INTERVAL '%s months'
-                """,
-                (company_id, time_period_months)
-            )
-            total_hires = cursor.fetchone()['total']
-            
             # Average tenure (for those who left)
             cursor.execute(
-                """
-                SELECT AVG(DATE_PART('day', end_date::timestamp - start_date::timestamp)) as avg_tenure_days
-                FROM employment
-                WHERE company_id = %s
-                AND end_date IS NOT NULL
-                AND start_date IS NOT NULL
-                """,
+                "SELECT avg_tenure_days FROM company_summary_rollup WHERE company_id = %s AND scope = 'all'",
                 (company_id,)
             )
             avg_tenure_result = cursor.fetchone()
@@ -200,92 +228,127 @@ class MarketIntelligenceService:
                 "company_name": company['company_name']
             }
             
-            # Inbound flow (feeder companies)
+            flows = []
             if direction in ["inbound", "both"]:
-                cursor.execute(
-                    """
-                    WITH target_company_joins AS (
-                        SELECT person_id, start_date
-                        FROM employment
-                        WHERE company_id = %s
-                        AND start_date IS NOT NULL
-                    ),
-                    previous_employers AS (
-                        SELECT 
-                            e.company_id,
-                            c.company_name,
-                            COUNT(DISTINCT e.person_id) as person_count
-                        FROM employment e
-                        JOIN company c ON e.company_id = c.company_id
-                        JOIN target_company_joins tcj ON e.person_id = tcj.person_id
-                        WHERE e.company_id != %s
-                        AND e.end_date IS NOT NULL
-                        AND e.end_date <= tcj.start_date
-                        GROUP BY e.company_id, c.company_name
-                        ORDER BY person_count DESC
-                        LIMIT 20
-                    )
-                    SELECT * FROM previous_employers
-                    """,
-                    (company_id, company_id)
-                )
-                inbound = cursor.fetchall()
-                result["feeder_companies"] = [
+                flows.append(("feeder_companies", "inbound", FEEDER_COMPANIES_SQL))
+            if direction in ["outbound", "both"]:
+                flows.append(("destination_companies", "outbound", DESTINATION_COMPANIES_SQL))
+            
+            # Direct moves from the in-memory flow matrix (scripts/analytics/talent_flow_matrix.py);
+            # the same moves counted from employment until the first snapshot is built
+            matrix = TalentFlowMatrix.shared()
+            result["flow_source"] = "matrix" if matrix else "employment"
+            
+            for key, flow_direction, flow_sql in flows:
+                if matrix:
+                    top = matrix.top(company_id, flow_direction, k=20)
+                    names = self._company_names(cursor, [other_id for other_id, _ in top])
+                    result[key] = [
+                        {
+                            "company_id": other_id,
+                            "company_name": names.get(other_id),
+                            "person_count": count
+                        }
+                        for other_id, count in top
+                    ]
+                    continue
+                
+                cursor.execute(flow_sql, {"company_id": company_id})
+                result[key] = [
                     {
                         "company_id": str(f['company_id']),
                         "company_name": f['company_name'],
                         "person_count": f['person_count']
                     }
-                    for f in inbound
+                    for f in cursor.fetchall()
                 ]
             
-            # Outbound flow (destination companies)
-            if direction in ["outbound", "both"]:
+            cursor.close()
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error getting talent flow: {e}")
+            cursor.close()
+            raise
+    
+    def get_multi_hop_flow(
+        self,
+        company_id: Optional[str] = None,
+        company_name: Optional[str] = None,
+        hops: int = 2,
+        direction: str = "outbound",  # "inbound" or "outbound"
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Where a company's leavers end up after `hops` moves (outbound), or
+        where its hires were `hops` moves earlier (inbound).
+        
+        Returns:
+        - Companies with the share of the company's moves reaching them
+        """
+        matrix = TalentFlowMatrix.shared()
+        if matrix is None:
+            return {"error": "Talent flow matrix not built (run scripts/analytics/talent_flow_matrix.py --build)"}
+        
+        cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+        
+        try:
+            # Get company ID if name provided
+            if company_name and not company_id:
                 cursor.execute(
-                    """
-                    WITH target_company_departures AS (
-                        SELECT person_id, end_date
-                        FROM employment
-                        WHERE company_id = %s
-                        AND end_date IS NOT NULL
-                    ),
-                    next_employers AS (
-                        SELECT 
-                            e.company_id,
-                            c.company_name,
-                            COUNT(DISTINCT e.person_id) as person_count
-                        FROM employment e
-                        JOIN company c ON e.company_id = c.company_id
-                        JOIN target_company_departures tcd ON e.person_id = tcd.person_id
-                        WHERE e.company_id != %s
-                        AND e.start_date IS NOT NULL
-                        AND e.start_date >= tcd.end_date
-                        GROUP BY e.company_id, c.company_name
-                        ORDER BY person_count DESC
-                        LIMIT 20
-                    )
-                    SELECT * FROM next_employers
-                    """,
-                    (company_id, company_id)
+                    "SELECT company_id FROM company WHERE company_name ILIKE %s LIMIT 1",
+                    (f"%{company_name}%",)
                 )
-                outbound = cursor.fetchall()
-                result["destination_companies"] = [
+                result = cursor.fetchone()
+                if result:
+                    company_id = result['company_id']
+            
+            if not company_id:
+                return {"error": "Company ID or name required"}
+            
+            cursor.execute(
+                "SELECT company_name FROM company WHERE company_id = %s",
+                (company_id,)
+            )
+            company = cursor.fetchone()
+            
+            reached = matrix.multi_hop(company_id, hops=hops, direction=direction, k=limit)
+            names = self._company_names(cursor, [other_id for other_id, _ in reached])
+            
+            cursor.close()
+            
+            return {
+                "company_id": str(company_id),
+                "company_name": company['company_name'] if company else None,
+                "hops": hops,
+                "direction": direction,
+                "matrix_built_at": datetime.fromtimestamp(matrix.built_at).isoformat(),
+                "companies": [
                     {
-                        "company_id": str(d['company_id']),
-                        "company_name": d['company_name'],
-                        "person_count": d['person_count']
+                        "company_id": other_id,
+                        "company_name": names.get(other_id),
+                        "share": round(share, 4)
                     }
-                    for d in outbound
+                    for other_id, share in reached
                 ]
-            
-            cursor.close()
-            return result
+            }
             
         except Exception as e:
-            logger.error(f"Error getting talent flow: {e}")
+            logger.error(f"Error getting multi-hop flow: {e}")
             cursor.close()
             raise
     
+    @staticmethod
+    def _company_names(cursor, company_ids: List[str]) -> Dict[str, str]:
+        """company_id -> company_name for a handful of ids"""
+        if not company_ids:
+            return {}
+        cursor.execute(
+            "SELECT company_id::text AS company_id, company_name FROM company WHERE company_id = ANY(%s::uuid[])",
+            (company_ids,)
+        )
+        return {row['company_id']: row['company_name'] for row in cursor.fetchall()}
+    
     def get_university_pipelines(
         self,
         company_id: Optional[str] = None,
@@ -337,34 +400,14 @@ class MarketIntelligenceService:
             )
             company = cursor.fetchone()
             
-            # Get languages from GitHub profiles of employees
+            # Languages from employees' GitHub activity (company_language_rollup)
             cursor.execute(
                 """
-                WITH company_employees AS (
-                    SELECT DISTINCT person_id
-                    FROM employment
-                    WHERE company_id = %s
-                ),
-                employee_github AS (
-                    SELECT gp.github_profile_id
-                    FROM github_profile gp
-                    JOIN company_employees ce ON gp.person_id = ce.person_id
-                ),
-                repo_languages AS (
-                    SELECT 
-                        gr.language,
-                        COUNT(DISTINCT gc.github_profile_id) as developer_count,
-                        SUM(gc.contribution_count) as total_contributions,
-                        COUNT(DISTINCT gr.repo_id) as repo_count
-                    FROM github_contribution gc
-                    JOIN employee_github eg ON gc.github_profile_id = eg.github_profile_id
-                    JOIN github_repository gr ON gc.repo_id = gr.repo_id
-                    WHERE gr.language IS NOT NULL
-                    GROUP BY gr.language
-                    ORDER BY developer_count DESC, total_contributions DESC
-                    LIMIT %s
-                )
-                SELECT * FROM repo_languages
+                SELECT language, developer_count, total_contributions, repo_count
+                FROM company_language_rollup
+                WHERE company_id = %s
+                ORDER BY developer_count DESC, total_contributions DESC
+                LIMIT %s
                 """,
                 (company_id, limit)
             )
@@ -391,7 +434,7 @@ class MarketIntelligenceService:
             cursor.close()
             raise
     
-    def ask_market_intelligence(
+    async def ask_market_intelligence(
         self,
         question: str,
         company_id: Optional[str] = None,
@@ -408,40 +451,88 @@ class MarketIntelligenceService:
         - "Where does Coinbase get most of its engineers from?"
         - "What technologies are popular at DeFi companies?"
         - "How does talent flow between Uniswap and Coinbase?"
+        
+        The data sections are fetched concurrently on their own pooled
+        connections; a section that exceeds its time budget is left out.
         """
         try:
-            # Gather relevant data
-            context_data = {}
-            
-            if company_id or company_name:
-                # Get company-specific data
-                hiring_patterns = self.get_hiring_patterns(
-                    company_id=company_id,
-                    company_name=company_name
-                )
-                talent_flow = self.get_talent_flow(
-                    company_id=company_id,
-                    company_name=company_name
-                )
-                tech_dist = self.get_technology_distribution(
-                    company_id=company_id,
-                    company_name=company_name
-                )
-                
-                context_data = {
-                    "hiring_patterns": hiring_patterns,
-                    "talent_flow": talent_flow,
-                    "technology_distribution": tech_dist
-                }
-            
-            # Build context for AI
-            context = self._build_market_context(context_data)
+            context_data, omitted = await self._gather_market_data(company_id, company_name)
             
             # Get AI service
             ai_service = get_ai_service(provider=provider)
             
-            # Build prompt
-            system_prompt = """You are a market intelligence analyst specializing in tech talent and hiring patterns.
+            messages = self._market_messages(question, self._build_market_context(context_data))
+            answer, _ = await ai_service._call_ai_async(messages, temperature=0.7, max_tokens=1500)
+            
+            return {
+                "question": question,
+                "answer": answer,
+                **self._market_sources(context_data, omitted, company_name),
+                "generated_at": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"Error answering market intelligence question: {e}")
+            raise
+    
+    def stream_market_intelligence(
+        self,
+        question: str,
+        company_id: Optional[str] = None,
+        company_name: Optional[str] = None,
+        provider: str = "openai"
+    ) -> AsyncIterator[str]:
+        """
+        ask_market_intelligence() as a server-sent event stream.
+        
+        The start event goes out before the data sections are fetched; meta
+        carries the data sources, then the answer streams token by token.
+        """
+        ai_service = get_ai_service(provider=provider)
+        
+        async def prepare():
+            context_data, omitted = await self._gather_market_data(company_id, company_name)
+            messages = self._market_messages(question, self._build_market_context(context_data))
+            # Market data changes continuously, so answers aren't cached
+            cached, deltas = await ai_service.open_stream(None, {}, messages, temperature=0.7, max_tokens=1500)
+            return {**self._market_sources(context_data, omitted, company_name), "cached": cached}, deltas
+        
+        return stream_completion(
+            {"question": question, "provider": ai_service.provider, "model": ai_service.model},
+            prepare,
+            lambda text: {"question": question, "answer": text, "generated_at": datetime.now().isoformat()}
+        )
+    
+    async def _gather_market_data(
+        self,
+        company_id: Optional[str],
+        company_name: Optional[str]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Company data sections for a market question, fetched concurrently."""
+        if not (company_id or company_name):
+            return {}, []
+        
+        # Get company-specific data
+        company = {"company_id": company_id, "company_name": company_name}
+        return await fetch_sections({
+            "hiring_patterns": lambda conn: MarketIntelligenceService(conn).get_hiring_patterns(**company),
+            "talent_flow": lambda conn: MarketIntelligenceService(conn).get_talent_flow(**company),
+            "technology_distribution":
+                lambda conn: MarketIntelligenceService(conn).get_technology_distribution(**company),
+        })
+    
+    @staticmethod
+    def _market_sources(context_data: Dict[str, Any], omitted: List[str], company_name: Optional[str]) -> Dict[str, Any]:
+        return {
+            "data_sources": list(context_data.keys()),
+            "omitted_sections": omitted,
+            "company_name": company_name or (context_data.get("hiring_patterns", {}).get("company_name"))
+        }
+    
+    @staticmethod
+    def _market_messages(question: str, context: str) -> List[Dict[str, str]]:
+        # Build prompt
+        system_prompt = """You are a market intelligence analyst specializing in tech talent and hiring patterns.
 
 Your job is to:
 1. Answer questions about hiring trends, talent flow, and market dynamics
@@ -451,7 +542,7 @@ Your job is to:
 
 Focus on insights that help with recruiting strategy and competitive intelligence."""
 
-            user_prompt = f"""Market Intelligence Data:
+        user_prompt = f"""Market Intelligence Data:
 {context}
 
 Question: {question}
@@ -462,24 +553,10 @@ Please provide a clear, strategic answer based on the data. Include:
 3. Strategic implications for recruiting
 4. Recommendations if applicable"""
 
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-            
-            answer = ai_service._call_ai(messages, temperature=0.7, max_tokens=1500)
-            
-            return {
-                "question": question,
-                "answer": answer,
-                "data_sources": list(context_data.keys()),
-                "company_name": company_name or (context_data.get("hiring_patterns", {}).get("company_name")),
-                "generated_at": datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Error answering market intelligence question: {e}")
-            raise
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
     
     def _build_market_context(self, data: Dict[str, Any]) -> str:
         """Build text context from market intelligence data."""
@@ -0,0 +1,570 @@
+"""
+Set-Based Saved Search Monitoring
+
+Replaces the per-user, per-search loop of MonitoringService for the nightly
+new-match job:
+
+- Every due auto-monitored saved search, for all users, is loaded and
+  compiled in one query.
+- Each search has its own change feed cursor (consumer 'saved_search:<id>'):
+  the txid snapshot of the run that last monitored it, so daily and weekly
+  searches each see every change committed since their own last run. One
+  delta scan reads the people the change log (migration 22) has changes for
+  after any due search's cursor, with the fields the matcher needs, and
+  every compiled search is evaluated against that set in memory. A search
+  monitored for the first time looks back FIRST_RUN_LOOKBACK_HOURS.
+- Job changes of people on users' candidate lists come from the 'monitoring'
+  change feed consumer: new current employment rows, or current rows whose
+  company/title changed.
+- Users are then independent: a bounded thread pool writes each user's
+  notifications with one bulk insert and advances that user's
+  saved_searches.last_monitored_at and search cursors in the same
+  transaction, so a failed user is simply retried (same delta window) on the
+  next run. The change feed
+  cursor only advances when every user was written, so job changes are
+  delivered at least once.
+- Cursors of searches that were deleted or stopped being monitored are
+  dropped in the same transaction, so they don't hold back the change log
+  purge.
+
+Usage:
+    python -m api.services.monitoring_engine [--workers 8]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_context
+from api.services.change_log import WINDOW_SQL, WINDOWS_SQL, ChangeFeed, parse_snapshot, visible_in_snapshot
+
+logger = logging.getLogger(__name__)
+
+MONITORING_WORKERS = int(os.getenv('MONITORING_WORKERS', '4'))
+
+# Look-back for a search that has never been monitored
+FIRST_RUN_LOOKBACK_HOURS = 24
+
+# Most notifications one search can raise per run
+MAX_MATCHES_PER_SEARCH = 50
+
+CHANGE_FEED_CONSUMER = 'monitoring'
+# Per-search cursors in change_consumer: SEARCH_CONSUMER_PREFIX || search_id
+SEARCH_CONSUMER_PREFIX = 'saved_search:'
+
+# Saved searches (alias s) the nightly run monitors; only these keep a cursor
+MONITORED_SQL = """
+    s.auto_monitor = TRUE
+    AND s.notification_enabled IS NOT FALSE
+    AND s.user_id IS NOT NULL
+    AND COALESCE(s.monitor_frequency, 'daily') <> 'manual'
+"""
+
+# Employment updates that mean a new role rather than a data fix
+JOB_CHANGE_COLUMNS = {'company_id', 'title', 'start_date'}
+
+# Points per criterion; a match scores the share of points its search can award
+CRITERIA_POINTS = {
+    'has_email': 30,
+    'has_github': 20,
+    'companies': 20,
+    'locations': 15,
+    'skills': 15
+}
+MAX_SKILLS_SCORED = 3
+
+
+def _lower_list(values: Any) -> List[str]:
+    if isinstance(values, str):
+        values = [values]
+    return [str(v).strip().lower() for v in values or [] if str(v).strip()]
+
+
+def compile_search(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Saved search row -> lowercased criteria the matcher can test without re-parsing"""
+    filters = row.get('filters') or {}
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
+    search = {
+        'search_id': str(row['search_id']),
+        'user_id': str(row['user_id']),
+        'name': row.get('name') or 'Unnamed Search',
+        'since': row['since'],
+        'snapshot': row.get('snapshot'),
+        'min_match_score': row.get('min_match_score') or 0,
+        'companies': set(_lower_list(filters.get('companies'))),
+        'locations': _lower_list(filters.get('locations')),
+        'skills': _lower_list(filters.get('skills')),
+        'has_email': bool(filters.get('has_email')),
+        'has_github': bool(filters.get('has_github'))
+    }
+    search['possible_points'] = sum(
+        points for criterion, points in CRITERIA_POINTS.items() if search[criterion]
+    )
+    return search
+
+
+def score_match(person: Dict[str, Any], search: Dict[str, Any]) -> Optional[Tuple[int, str]]:
+    """
+    (match score 0-100, reason) for a person against a compiled search, or
+    None when a criterion fails or the score is under the search's minimum.
+    """
+    if not search['possible_points']:
+        return None
+
+    points = 0
+    reasons = []
+
+    if search['has_email']:
+        if not person['has_email']:
+            return None
+        points += CRITERIA_POINTS['has_email']
+        reasons.append('has email')
+
+    if search['has_github']:
+        if not person['has_github']:
+            return None
+        points += CRITERIA_POINTS['has_github']
+        reasons.append('has GitHub profile')
+
+    if search['companies']:
+        current = [c for c in person['current_companies'] or [] if c and c.lower() in search['companies']]
+        if not current:
+            return None
+        points += CRITERIA_POINTS['companies']
+        reasons.append(f"works at {current[0]}")
+
+    if search['locations']:
+        location = (person['location'] or '').lower()
+        if not any(loc in location for loc in search['locations']):
+            return None
+        points += CRITERIA_POINTS['locations']
+        reasons.append(f"located in {person['location']}")
+
+    if search['skills']:
+        headline = (person['headline'] or '').lower()
+        matched = [skill for skill in search['skills'] if skill in headline]
+        if not matched:
+            return None
+        # Full skill points once every listed skill (or MAX_SKILLS_SCORED of them) is matched
+        points += CRITERIA_POINTS['skills'] * min(len(matched), MAX_SKILLS_SCORED) \
+            // min(len(search['skills']), MAX_SKILLS_SCORED)
+        reasons.append(f"matches skills: {', '.join(matched[:3])}")
+
+    score = round(points / search['possible_points'] * 100)
+    if score < search['min_match_score']:
+        return None
+    return score, ' • '.join(reasons)
+
+
+def changed_since(person: Dict[str, Any], search: Dict[str, Any], current: str) -> bool:
+    """
+    Whether the person has a change in `current` that the search hasn't seen:
+    committed after the search's cursor snapshot, or - for a search without a
+    cursor yet - logged after its first-run look-back.
+    """
+    if search['snapshot'] is None:
+        return person['changed_at'] > search['since'] and any(
+            visible_in_snapshot(xid, current) for xid in person['xids']
+        )
+    return any(
+        visible_in_snapshot(xid, current) and not visible_in_snapshot(xid, search['snapshot'])
+        for xid in person['xids']
+    )
+
+
+def evaluate(
+    searches: List[Dict[str, Any]],
+    people: List[Dict[str, Any]],
+    current: str
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Match every changed person against every compiled search.
+
+    A person only counts for searches that haven't seen their change yet
+    (see changed_since; `current` is this run's snapshot). Returns matches
+    grouped by user, best first.
+    """
+    discovered_at = datetime.utcnow().isoformat()
+    per_search: Dict[str, List[Dict[str, Any]]] = {}
+
+    for person in people:
+        # Searches advance together, so most share a cursor: test each cursor once
+        unseen: Dict[Any, bool] = {}
+        for search in searches:
+            cursor = search['snapshot'] or search['since']
+            if cursor not in unseen:
+                unseen[cursor] = changed_since(person, search, current)
+            if not unseen[cursor]:
+                continue
+            result = score_match(person, search)
+            if result is None:
+                continue
+            score, reason = result
+            per_search.setdefault(search['search_id'], []).append({
+                'user_id': search['user_id'],
+                'search_id': search['search_id'],
+                'person_id': str(person['person_id']),
+                'person_name': person['full_name'] or 'Unknown',
+                'headline': person['headline'] or '',
+                'location': person['location'],
+                'match_score': score,
+                'pattern_name': search['name'],
+                'reason': reason,
+                'discovered_at': discovered_at
+            })
+
+    by_user: Dict[str, List[Dict[str, Any]]] = {}
+    for matches in per_search.values():
+        matches.sort(key=lambda m: m['match_score'], reverse=True)
+        for match in matches[:MAX_MATCHES_PER_SEARCH]:
+            by_user.setdefault(match['user_id'], []).append(match)
+    for matches in by_user.values():
+        matches.sort(key=lambda m: m['match_score'], reverse=True)
+    return by_user
+
+
+def notification_row(match: Dict[str, Any]) -> Tuple:
+    """notifications row for a new match (same content as MonitoringService.process_new_match)"""
+    score = match['match_score']
+    if score >= 90:
+        priority = 'high'
+    elif score >= 80:
+        priority = 'medium'
+    else:
+        priority = 'low'
+
+    person_id = match['person_id']
+    person_name = match['person_name']
+    return (
+        match['user_id'], 'new_match', priority,
+        f"🎯 New Match: {person_name} ({score}% match)",
+        f"Found a {score}% match for '{match['pattern_name']}': {person_name} {match['headline']}",
+        person_id, person_name,
+        f"/profile/{person_id}", 'View Profile',
+        json.dumps({
+            'match_score': score,
+            'search_id': match['search_id'],
+            'search_name': match['pattern_name'],
+            'reason': match['reason'],
+            'discovered_at': match['discovered_at']
+        })
+    )
+
+
+def job_change_row(change: Dict[str, Any]) -> Tuple:
+    """notifications row for a job change (same content as MonitoringService.process_job_change)"""
+    person_id = str(change['person_id'])
+    person_name = change['person_name'] or 'Unknown'
+    new_company = change['new_company'] or 'a new company'
+    new_title = change['new_title'] or ''
+    return (
+        str(change['user_id']), 'job_change', 'urgent',
+        f"🔔 {person_name} joined {new_company}",
+        f"{person_name} just started as {new_title} at {new_company}. Perfect time to reach out!",
+        person_id, person_name,
+        f"/profile/{person_id}", 'Reach Out',
+        json.dumps({
+            'new_company': new_company,
+            'new_title': new_title,
+            'employment_id': str(change['employment_id']),
+            'detected_at': change['detected_at'].isoformat(),
+            'suggestion': 'Reach out to congratulate on new role'
+        })
+    )
+
+
+class MonitoringEngine:
+    """Nightly new-match monitoring for all users in one pass"""
+
+    def __init__(self, workers: int = MONITORING_WORKERS):
+        self.workers = max(1, workers)
+
+    def load_searches(self, conn) -> Tuple[datetime, List[Dict[str, Any]]]:
+        """Database time of this run and the compiled searches that are due"""
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT
+                NOW() AS run_at,
+                s.search_id, s.user_id, s.name, s.filters, s.min_match_score,
+                COALESCE(s.last_monitored_at, NOW() - %s * INTERVAL '1 hour') AS since,
+                cc.snapshot
+            FROM saved_searches s
+            LEFT JOIN change_consumer cc ON cc.consumer = %s || s.search_id::text
+            WHERE {MONITORED_SQL}
+            AND (
+                last_monitored_at IS NULL
+                -- An hour of slack so a daily cron a few seconds early still counts as due
+                OR last_monitored_at <= NOW() - CASE WHEN monitor_frequency = 'weekly'
+                    THEN INTERVAL '7 days' ELSE INTERVAL '1 day' END + INTERVAL '1 hour'
+            )
+        """, (FIRST_RUN_LOOKBACK_HOURS, SEARCH_CONSUMER_PREFIX))
+        rows = cursor.fetchall()
+        cursor.close()
+
+        if not rows:
+            cursor = conn.cursor()
+            cursor.execute("SELECT NOW() AS run_at")
+            run_at = cursor.fetchone()['run_at']
+            cursor.close()
+            return run_at, []
+        return rows[0]['run_at'], [compile_search(row) for row in rows]
+
+    def drop_search_cursors(self, conn) -> int:
+        """Delete the cursors of searches that were deleted or are no longer monitored"""
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            DELETE FROM change_consumer cc
+            WHERE cc.consumer LIKE %(prefix)s || '%%'
+            AND NOT EXISTS (
+                SELECT 1 FROM saved_searches s
+                WHERE cc.consumer = %(prefix)s || s.search_id::text
+                AND {MONITORED_SQL}
+            )
+        """, {'prefix': SEARCH_CONSUMER_PREFIX})
+        dropped = cursor.rowcount
+        cursor.close()
+        return dropped
+
+    def scan_changed_people(self, conn, feed: ChangeFeed, searches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        One delta scan: everyone with a logged change (profile, emails,
+        employment, GitHub) that some due search hasn't seen, up to the feed's
+        current snapshot, with the changes' xids, latest change time and
+        matchable fields.
+        """
+        snapshots = sorted({s['snapshot'] for s in searches if s['snapshot']})
+        first_runs = [s['since'] for s in searches if not s['snapshot']]
+        windows = []
+        if snapshots:
+            windows.append(f"({WINDOWS_SQL})")
+        if first_runs:
+            windows.append("(changed_at > %(since)s AND txid_visible_in_snapshot(xid, %(current)s::txid_snapshot))")
+        params = {
+            'current': feed.current,
+            'previous': snapshots,
+            'oldest_xmin': min((parse_snapshot(snapshot)[0] for snapshot in snapshots), default=0),
+            'since': min(first_runs, default=None)
+        }
+
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            WITH changed AS (
+                SELECT person_id, MAX(changed_at) AS changed_at, array_agg(DISTINCT xid) AS xids
+                FROM change_log
+                WHERE ({' OR '.join(windows)}) AND person_id IS NOT NULL
+                GROUP BY person_id
+            )
+            SELECT
+                p.person_id,
+                p.full_name,
+                p.headline,
+                p.location,
+                ch.changed_at,
+                ch.xids,
+                EXISTS (SELECT 1 FROM person_email pe WHERE pe.person_id = p.person_id) AS has_email,
+                EXISTS (SELECT 1 FROM github_profile gp WHERE gp.person_id = p.person_id) AS has_github,
+                ARRAY(
+                    SELECT DISTINCT c.company_name
+                    FROM employment e
+                    JOIN company c ON c.company_id = e.company_id
+                    WHERE e.person_id = p.person_id AND e.end_date IS NULL
+                ) AS current_companies
+            FROM changed ch
+            JOIN person p ON p.person_id = ch.person_id
+        """, params)
+        people = cursor.fetchall()
+        cursor.close()
+        return people
+
+    def scan_job_changes(self, conn, feed: ChangeFeed) -> Dict[str, List[Dict[str, Any]]]:
+        """New roles in the feed batch for people on candidate lists, grouped by watching user"""
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            WITH changed AS (
+                SELECT DISTINCT row_id::uuid AS employment_id
+                FROM change_log
+                WHERE {WINDOW_SQL}
+                AND table_name = 'employment'
+                AND (op = 'I' OR (op = 'U' AND changed_columns && %(columns)s::text[]))
+            )
+            SELECT DISTINCT
+                cl.user_id,
+                e.employment_id,
+                e.person_id,
+                p.full_name AS person_name,
+                e.title AS new_title,
+                c.company_name AS new_company,
+                NOW() AS detected_at
+            FROM changed ch
+            JOIN employment e ON e.employment_id = ch.employment_id
+            JOIN candidate_list_members clm ON clm.person_id = e.person_id
+            JOIN candidate_lists cl ON cl.list_id = clm.list_id
+            JOIN person p ON p.person_id = e.person_id
+            LEFT JOIN company c ON c.company_id = e.company_id
+            WHERE e.end_date IS NULL
+            AND cl.user_id IS NOT NULL
+        """, {**feed.window(), 'columns': sorted(JOB_CHANGE_COLUMNS)})
+
+        by_user: Dict[str, List[Dict[str, Any]]] = {}
+        for row in cursor.fetchall():
+            by_user.setdefault(str(row['user_id']), []).append(row)
+        cursor.close()
+        return by_user
+
+    def write_user(
+        self,
+        user_id: str,
+        matches: List[Dict[str, Any]],
+        job_changes: List[Dict[str, Any]],
+        search_ids: List[str],
+        run_at: datetime,
+        snapshot: str
+    ) -> int:
+        """Bulk-insert one user's notifications and advance their search watermarks and cursors"""
+        rows = [notification_row(match) for match in matches] + [job_change_row(c) for c in job_changes]
+        with get_db_context() as conn:
+            cursor = conn.cursor()
+            try:
+                if rows:
+                    execute_values(cursor, """
+                        INSERT INTO notifications (
+                            user_id, notification_type, priority,
+                            title, message,
+                            person_id, person_name,
+                            action_url, action_label,
+                            metadata
+                        ) VALUES %s
+                    """, rows,
+                        template="(%s::uuid, %s, %s, %s, %s, %s::uuid, %s, %s, %s, %s::jsonb)",
+                        page_size=500)
+                if search_ids:
+                    cursor.execute("""
+                        UPDATE saved_searches
+                        SET last_monitored_at = %s
+                        WHERE search_id = ANY(%s::uuid[])
+                    """, (run_at, search_ids))
+                    cursor.execute("""
+                        INSERT INTO change_consumer (consumer, snapshot)
+                        SELECT %s || search_id, %s FROM unnest(%s::text[]) AS search_id
+                        ON CONFLICT (consumer) DO UPDATE SET
+                            snapshot = EXCLUDED.snapshot,
+                            updated_at = NOW()
+                    """, (SEARCH_CONSUMER_PREFIX, snapshot, search_ids))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        return len(rows)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run new-match and job-change monitoring for every user.
+
+        Returns:
+            Counts, per-user notification totals and errors for the run
+        """
+        start = time.perf_counter()
+
+        with get_db_context() as conn:
+            feed = ChangeFeed(conn, CHANGE_FEED_CONSUMER)
+            try:
+                feed.open()
+                run_at, searches = self.load_searches(conn)
+                people = self.scan_changed_people(conn, feed, searches) if searches else []
+                job_changes_by_user = self.scan_job_changes(conn, feed)
+                scanned = time.perf_counter()
+
+                results = self._write(searches, people, job_changes_by_user, run_at, feed.current)
+                results['search_cursors_dropped'] = self.drop_search_cursors(conn)
+
+                if results['errors']:
+                    conn.rollback()  # Keep the feed cursor; job changes are re-read next run
+                else:
+                    feed.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        results['scan_seconds'] = round(scanned - start, 3)
+        results['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+        logger.info(
+            f"✅ Monitoring: {results['searches']} searches for {results['users']} users over "
+            f"{results['people_scanned']} changed people, {results['job_changes']} job changes -> "
+            f"{results['notifications_created']} notifications in {results['elapsed_seconds']}s"
+        )
+        return results
+
+    def _write(
+        self,
+        searches: List[Dict[str, Any]],
+        people: List[Dict[str, Any]],
+        job_changes_by_user: Dict[str, List[Dict[str, Any]]],
+        run_at: datetime,
+        snapshot: str
+    ) -> Dict[str, Any]:
+        """Evaluate the searches and write every user's notifications on the worker pool"""
+        matches_by_user = evaluate(searches, people, snapshot)
+
+        search_ids_by_user: Dict[str, List[str]] = {user_id: [] for user_id in job_changes_by_user}
+        for search in searches:
+            search_ids_by_user.setdefault(search['user_id'], []).append(search['search_id'])
+
+        results = {
+            'run_at': run_at.isoformat(),
+            'searches': len(searches),
+            'users': len(search_ids_by_user),
+            'people_scanned': len(people),
+            'matches': sum(len(m) for m in matches_by_user.values()),
+            'job_changes': sum(len(c) for c in job_changes_by_user.values()),
+            'notifications_created': 0,
+            'notifications_by_user': {},
+            'errors': []
+        }
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='monitoring') as pool:
+            futures = {
+                pool.submit(
+                    self.write_user, user_id, matches_by_user.get(user_id, []),
+                    job_changes_by_user.get(user_id, []), search_ids, run_at, snapshot
+                ): user_id
+                for user_id, search_ids in search_ids_by_user.items()
+            }
+            for future in as_completed(futures):
+                user_id = futures[future]
+                try:
+                    created = future.result()
+                    results['notifications_by_user'][user_id] = created
+                    results['notifications_created'] += created
+                except Exception as e:
+                    logger.error(f"❌ Monitoring notifications failed for user {user_id}: {e}")
+                    results['errors'].append(f"User {user_id}: {e}")
+
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run saved search monitoring for all users')
+    parser.add_argument('--workers', type=int, default=MONITORING_WORKERS, help='Users written in parallel')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    results = MonitoringEngine(workers=args.workers).run()
+    print(json.dumps({k: v for k, v in results.items() if k != 'notifications_by_user'}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
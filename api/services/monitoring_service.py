@@ -8,6 +8,10 @@ Runs background monitoring jobs to discover:
 - Rising talent signals
 
 Creates notifications for all discoveries.
+
+The nightly new-match job for all users runs through monitoring_engine.py
+(one delta scan, bulk notification inserts); this service remains the
+per-user entry point.
 """
 
 import logging
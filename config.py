@@ -121,6 +121,10 @@ class Config:
     EXPORT_DIR = BASE_DIR / "exports"
     EXPORT_DIR.mkdir(exist_ok=True)
     
+    # Columnar/binary snapshots used by batch analytics jobs
+    SNAPSHOT_DIR = BASE_DIR / "snapshots"
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    
     @classmethod
     def get_csv_files(cls, category: str = None) -> list:
         """Get list of CSV files from specified category or all categories"""
@@ -246,8 +250,11 @@ CSV Sources Found:
         
         data['timestamp'] = datetime.now().isoformat()
         
-        with open(checkpoint_file, 'w') as f:
+        # Write then rename, so a crash mid-write never leaves a corrupt checkpoint
+        temp_file = checkpoint_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(temp_file, checkpoint_file)
     
     @classmethod
     def load_checkpoint(cls, checkpoint_name: str) -> Optional[Dict[str, Any]]:
@@ -272,7 +279,8 @@ CSV Sources Found:
     def get_connection_pool(cls):
         """
         Get or create connection pool for PostgreSQL
-        Uses SimpleConnectionPool for thread-safe connection management
+        Uses ThreadedConnectionPool: API routes and AI context sections take
+        connections from worker threads concurrently
         """
         if cls.DB_TYPE != 'postgresql':
             raise ValueError("Connection pooling only available for PostgreSQL")
@@ -281,7 +289,7 @@ CSV Sources Found:
             import psycopg2.pool
             
             try:
-                cls._connection_pool = psycopg2.pool.SimpleConnectionPool(
+                cls._connection_pool = psycopg2.pool.ThreadedConnectionPool(
                     cls.PG_POOL_MIN,
                     cls.PG_POOL_MAX,
                     host=cls.PG_HOST,
@@ -328,7 +336,13 @@ CSV Sources Found:
     def return_connection(cls, conn):
         """Return a connection to the pool"""
         if cls._connection_pool is not None:
-            cls._connection_pool.putconn(conn)
+            import psycopg2.pool
+            
+            try:
+                cls._connection_pool.putconn(conn)
+            except psycopg2.pool.PoolError:
+                # Direct connection handed out by get_db_connection() while the pool was exhausted
+                conn.close()
     
     @classmethod
     def check_pool_health(cls):
@@ -12,13 +12,13 @@ Features:
 - Collects lines added/deleted (code volume)
 - Tracks PR merge dates (recency)
 - Calculates contribution quality scores
-- Respects GitHub API rate limits (5000/hour)
+- Fetches 25 users per aliased GraphQL query; pacing follows GitHub's
+  rate-limit headers across all configured tokens
 """
 
 import os
 import sys
 import argparse
-import requests
 import time
 import logging
 from datetime import datetime, timedelta
@@ -27,6 +27,9 @@ from typing import Dict, List, Optional
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from github_automation.config import GitHubAutomationConfig
+from github_automation.github_client import GitHubClient
+from github_automation.graphql_batcher import GraphQLUserBatcher, to_pr_data
 
 # Setup logging
 logging.basicConfig(
@@ -35,59 +38,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# GitHub API configuration
+# GitHub API configuration (GraphQL requires a token)
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-if not GITHUB_TOKEN:
+if not GITHUB_TOKEN and not os.getenv("GITHUB_TOKENS"):
     logger.error("❌ GITHUB_TOKEN environment variable not set!")
     logger.error("   Get a token from: https://github.com/settings/tokens")
     logger.error("   Required scopes: repo, read:user")
     sys.exit(1)
 
-GRAPHQL_URL = "https://api.github.com/graphql"
-HEADERS = {
-    "Authorization": f"Bearer {GITHUB_TOKEN}",
-    "Content-Type": "application/json"
-}
+# One aliased query fetches batch_size users (see github_automation/graphql_batcher.py);
+# one batcher per requested size, all on the same GitHubClient
+_client: Optional[GitHubClient] = None
+_batchers: Dict[int, GraphQLUserBatcher] = {}
 
-# GraphQL Query to fetch PR data
-GRAPHQL_QUERY = """
-query($username: String!, $first: Int!) {
-  user(login: $username) {
-    contributionsCollection {
-      pullRequestContributions(first: $first) {
-        totalCount
-        nodes {
-          pullRequest {
-            repository {
-              nameWithOwner
-              isFork
-            }
-            merged
-            mergedAt
-            additions
-            deletions
-            changedFiles
-            state
-            createdAt
-          }
-        }
-      }
-    }
-    sponsorshipsAsMaintainer {
-      totalCount
-    }
-    repositories(first: 100, privacy: PUBLIC, ownerAffiliations: OWNER) {
-      nodes {
-        stargazerCount
-      }
-    }
-  }
-  rateLimit {
-    remaining
-    resetAt
-  }
-}
-"""
+
+def get_batcher(batch_size: int = GitHubAutomationConfig.GRAPHQL_BATCH_SIZE) -> GraphQLUserBatcher:
+    """Shared batcher for batch_size over a GitHubClient (token pool, rate limiting)"""
+    global _client
+    if batch_size not in _batchers:
+        if _client is None:
+            _client = GitHubClient()
+        _batchers[batch_size] = GraphQLUserBatcher(_client, batch_size=batch_size)
+    return _batchers[batch_size]
+
+
+def fetch_github_pr_data_batch(usernames: List[str],
+                               batch_size: int = GitHubAutomationConfig.GRAPHQL_BATCH_SIZE) -> Dict[str, Optional[Dict]]:
+    """
+    Fetch PR data for many GitHub users with batched GraphQL queries
+    
+    Returns:
+        username -> dict with PR stats, lines changed, and other metrics
+        (None if user not found or API error)
+    """
+    try:
+        nodes = get_batcher(batch_size).fetch_users(usernames)
+    except Exception as e:
+        logger.error(f"❌ GraphQL batch of {len(usernames)} users failed: {e}")
+        nodes = {}
+    
+    results = {}
+    for username in usernames:
+        if username not in nodes:
+            logger.error(f"❌ Could not fetch {username} from GitHub (query failed)")
+            results[username] = None
+            continue
+        node = nodes[username]
+        if not node:
+            logger.warning(f"User {username} not found on GitHub")
+            results[username] = None
+            continue
+        try:
+            results[username] = parse_pr_data(to_pr_data(node))
+        except Exception as e:
+            logger.error(f"Error parsing data for {username}: {e}")
+            results[username] = None
+    
+    return results
 
 
 def fetch_github_pr_data(username: str) -> Optional[Dict]:
@@ -98,38 +105,7 @@ def fetch_github_pr_data(username: str) -> Optional[Dict]:
         Dict with PR stats, lines changed, and other metrics
         None if user not found or API error
     """
-    variables = {
-        "username": username,
-        "first": 100  # Get up to 100 PRs
-    }
-    
-    try:
-        response = requests.post(
-            GRAPHQL_URL,
-            json={"query": GRAPHQL_QUERY, "variables": variables},
-            headers=HEADERS,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"GitHub API error for {username}: {response.status_code}")
-            return None
-        
-        data = response.json()
-        
-        if "errors" in data:
-            logger.error(f"GraphQL errors for {username}: {data['errors']}")
-            return None
-        
-        if "data" not in data or "user" not in data["data"] or not data["data"]["user"]:
-            logger.warning(f"User {username} not found on GitHub")
-            return None
-        
-        return parse_pr_data(data["data"])
-        
-    except Exception as e:
-        logger.error(f"Error fetching data for {username}: {e}")
-        return None
+    return fetch_github_pr_data_batch([username]).get(username)
 
 
 def parse_pr_data(data: Dict) -> Dict:
@@ -284,14 +260,19 @@ def calculate_quality_score(contrib: Dict) -> float:
     return max(0, min(score, 100))  # Clamp to 0-100
 
 
-def enrich_github_profiles(batch_size: int = 50, rate_limit_delay: float = 0.8):
+def enrich_github_profiles(batch_size: int = 50, rate_limit_delay: float = 0.0,
+                           graphql_batch_size: int = GitHubAutomationConfig.GRAPHQL_BATCH_SIZE):
     """
     Enrich GitHub profiles with PR data
     
     Args:
         batch_size: Number of profiles to process
-        rate_limit_delay: Seconds between requests (default keeps us under 5000/hour)
+        rate_limit_delay: Extra seconds to sleep between GraphQL batches
+            (rate limiting itself follows GitHub's headers)
+        graphql_batch_size: Users per aliased GraphQL query
     """
+    batcher = get_batcher(graphql_batch_size)
+
     conn = Config.get_pooled_connection()
     cursor = conn.cursor()
     
@@ -316,18 +297,25 @@ def enrich_github_profiles(batch_size: int = 50, rate_limit_delay: float = 0.8):
             return
         
         logger.info(f"📊 Processing {len(profiles)} GitHub profiles...")
-        logger.info(f"⏱️  Rate limit delay: {rate_limit_delay}s between requests")
-        logger.info(f"⏰ Estimated time: {len(profiles) * rate_limit_delay / 60:.1f} minutes")
+        logger.info(f"🔗 {batcher.batch_size} users per GraphQL query")
         
         success_count = 0
         error_count = 0
+        pr_data_by_user: Dict[str, Optional[Dict]] = {}
+        chunk_size = batcher.batch_size
         
         for i, (profile_id, username, full_name) in enumerate(profiles, 1):
+            # Fetch the next GraphQL batch when we reach it
+            if (i - 1) % chunk_size == 0:
+                if i > 1 and rate_limit_delay:
+                    time.sleep(rate_limit_delay)
+                chunk = [row[1] for row in profiles[i - 1:i - 1 + chunk_size]]
+                pr_data_by_user = fetch_github_pr_data_batch(chunk, graphql_batch_size)
+            
             logger.info(f"\n[{i}/{len(profiles)}] Processing: {full_name} (@{username})")
             
             try:
-                # Fetch PR data from GitHub
-                pr_data = fetch_github_pr_data(username)
+                pr_data = pr_data_by_user.get(username)
                 
                 if not pr_data:
                     error_count += 1
@@ -392,7 +380,8 @@ def enrich_github_profiles(batch_size: int = 50, rate_limit_delay: float = 0.8):
                             lines_deleted = %s,
                             files_changed = %s,
                             last_merged_pr_date = %s,
-                            contribution_quality_score = %s
+                            contribution_quality_score = %s,
+                            updated_at = NOW()
                         WHERE github_profile_id = %s 
                         AND repo_id = %s
                     """, (
@@ -415,9 +404,6 @@ def enrich_github_profiles(batch_size: int = 50, rate_limit_delay: float = 0.8):
                 success_count += 1
                 logger.info(f"  ✅ Successfully enriched {username}")
                 
-                # Rate limiting
-                time.sleep(rate_limit_delay)
-                
             except Exception as e:
                 logger.error(f"  ❌ Error processing {username}: {e}")
                 conn.rollback()
@@ -429,6 +415,7 @@ def enrich_github_profiles(batch_size: int = 50, rate_limit_delay: float = 0.8):
         logger.info(f"   Success: {success_count}/{len(profiles)}")
         logger.info(f"   Errors: {error_count}/{len(profiles)}")
         logger.info(f"{'='*60}")
+        batcher.log_stats()
         
     finally:
         cursor.close()
@@ -446,8 +433,14 @@ def main():
     parser.add_argument(
         "--rate-limit-delay",
         type=float,
-        default=0.8,
-        help="Seconds between API requests (default: 0.8 = 4500/hour)"
+        default=0.0,
+        help="Extra seconds between GraphQL batches (default: 0; pacing follows GitHub's rate-limit headers)"
+    )
+    parser.add_argument(
+        "--graphql-batch-size",
+        type=int,
+        default=GitHubAutomationConfig.GRAPHQL_BATCH_SIZE,
+        help=f"Users per GraphQL query (default: {GitHubAutomationConfig.GRAPHQL_BATCH_SIZE}, 25-50 recommended)"
     )
     parser.add_argument(
         "--test",
@@ -470,7 +463,8 @@ def main():
     
     enrich_github_profiles(
         batch_size=args.batch_size,
-        rate_limit_delay=args.rate_limit_delay
+        rate_limit_delay=args.rate_limit_delay,
+        graphql_batch_size=args.graphql_batch_size
     )
 
 
@@ -13,7 +13,6 @@ This data is crucial for recruiters/investors to assess developer quality.
 import os
 import sys
 import time
-import requests
 from datetime import datetime
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -22,6 +21,7 @@ from psycopg2.extras import RealDictCursor
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.logging_utils import Logger
 from scripts.progress_reporter import ProgressReporter
+from github_automation.github_client import GitHubClient
 
 logger = Logger("GitHubEnhancer")
 
@@ -29,19 +29,16 @@ logger = Logger("GitHubEnhancer")
 class GitHubStatsEnricher:
     """Enriches GitHub profiles with detailed contribution statistics"""
     
-    def __init__(self, db_conn):
+    def __init__(self, db_conn, github_client=None):
         self.db = db_conn
         self.cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-        self.github_token = os.environ.get('GITHUB_TOKEN', '')
+        # Rate limiting, token rotation and the shared ETag cache live in the client;
+        # re-enriching an unchanged profile's repos costs no quota
+        self.client = github_client or GitHubClient()
         
-        if not self.github_token:
+        if not self.client.pool.authenticated:
             logger.warning("⚠️  No GITHUB_TOKEN found. API rate limits will be very restrictive (60/hour vs 5000/hour)")
         
-        self.headers = {
-            'Authorization': f'token {self.github_token}' if self.github_token else '',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        
         self.stats = {
             'processed': 0,
             'enriched': 0,
@@ -179,27 +176,16 @@ class GitHubStatsEnricher:
             
             return {'success': True, 'stats': stats}
             
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 403:
-                logger.warning(f"⚠️  Rate limited. Waiting 60 seconds...")
-                time.sleep(60)
-                return {'success': False, 'error': 'Rate limited'}
-            else:
-                return {'success': False, 'error': str(e)}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
     def _get_user_repos(self, username):
         """Get user's repositories"""
         try:
-            response = requests.get(
-                f'https://api.github.com/users/{username}/repos',
-                headers=self.headers,
-                params={'per_page': 100, 'sort': 'updated'},
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+            return self.client.get(
+                f'/users/{username}/repos',
+                params={'per_page': 100, 'sort': 'updated'}
+            ) or []
         except Exception as e:
             logger.error(f"Error fetching repos for {username}: {str(e)}")
             return []
@@ -213,17 +199,14 @@ class GitHubStatsEnricher:
             if not owner or not repo_name:
                 return []
             
-            response = requests.get(
-                f'https://api.github.com/search/issues',
-                headers=self.headers,
+            result = self.client.get(
+                '/search/issues',
                 params={
                     'q': f'type:pr author:{username} repo:{owner}/{repo_name} is:merged',
                     'per_page': 100
-                },
-                timeout=10
+                }
             )
-            response.raise_for_status()
-            return response.json().get('items', [])
+            return (result or {}).get('items', [])
             
         except Exception as e:
             return []
@@ -237,14 +220,8 @@ class GitHubStatsEnricher:
             if not owner or not repo_name:
                 return 0
             
-            response = requests.get(
-                f'https://api.github.com/repos/{owner}/{repo_name}/stats/contributors',
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            contributors = response.json()
+            # 202 (stats still being computed) comes back as an empty dict
+            contributors = self.client.get(f'/repos/{owner}/{repo_name}/stats/contributors')
             if not isinstance(contributors, list):
                 return 0
             
@@ -268,6 +245,11 @@ class GitHubStatsEnricher:
         logger.warning(f"⚠️  Rate limited: {self.stats['rate_limited']:,}")
         logger.error(f"❌ Errors: {self.stats['errors']:,}")
         logger.info(f"⏭️  Skipped: {self.stats['skipped']:,}")
+        
+        if self.client.cache:
+            cache = self.client.cache.get_stats()
+            logger.info(f"🗄️  HTTP cache: {cache['hits']:,} not-modified responses reused, "
+                        f"{cache['quota_saved']:,} API requests saved ({cache['hit_rate']:.0%} hit rate)")
 
 
 def main():
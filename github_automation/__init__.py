@@ -5,6 +5,11 @@ Automated discovery, enrichment, and matching of GitHub profiles.
 
 Main components:
 - GitHubClient: Rate-limited GitHub API wrapper
+- AsyncGitHubClient: Concurrent asyncio client with the same methods (benchmark only so far)
+- TokenBucket: Adaptive rate limiter shared by both clients
+- CredentialPool: Multi-token / GitHub App quota scheduling
+- ResponseCache: On-disk ETag cache for conditional requests
+- GraphQLUserBatcher: Many users per aliased GraphQL query
 - EnrichmentEngine: Core profile enrichment
 - ProfileMatcher: Match profiles to people
 - QueueManager: Priority queue management
@@ -15,12 +20,22 @@ __version__ = "1.0.0"
 __author__ = "Talent Intelligence"
 
 from .github_client import GitHubClient
+from .async_client import AsyncGitHubClient
+from .rate_limiter import TokenBucket
+from .credential_pool import CredentialPool
+from .http_cache import ResponseCache
+from .graphql_batcher import GraphQLUserBatcher
 from .enrichment_engine import EnrichmentEngine
 from .matcher import ProfileMatcher
 from .queue_manager import QueueManager
 
 __all__ = [
     "GitHubClient",
+    "AsyncGitHubClient",
+    "TokenBucket",
+    "CredentialPool",
+    "ResponseCache",
+    "GraphQLUserBatcher",
     "EnrichmentEngine",
     "ProfileMatcher",
     "QueueManager",
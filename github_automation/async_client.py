@@ -0,0 +1,302 @@
+"""
+Async GitHub API client with bounded concurrency
+
+Same methods as GitHubClient, as coroutines. Requests share one keep-alive
+httpx connection pool, at most max_concurrency are in flight, and every
+request first takes a token from the CredentialPool (the credential with
+the most headroom), so throughput follows the quota GitHub reports instead
+of a fixed 0.72s delay.
+
+Nothing in the pipeline uses it yet: enrichment and the API run on the
+sync GitHubClient, and this client is only exercised by benchmark_client.py
+and the tests. Wire it into a caller before relying on it in production.
+
+Usage:
+    async with AsyncGitHubClient() as client:
+        users = await client.map(client.get_user, usernames)
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .config import GitHubAutomationConfig as Config
+from .credential_pool import Credential, CredentialPool, resource_for
+from .http_cache import ResponseCache, get_response_cache
+from .rate_limiter import is_secondary_rate_limit, retry_delay
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGitHubClient:
+    """
+    Concurrent GitHub API client
+
+    Features:
+    - Pooled keep-alive connections (httpx.AsyncClient)
+    - Bounded concurrency (asyncio.Semaphore)
+    - Adaptive token bucket per credential from X-RateLimit headers
+    - Multi-token CredentialPool routing by remaining quota
+    - Secondary rate limit backoff shared by all requests on that credential
+    - Conditional GETs against the shared on-disk ResponseCache
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: int = Config.MAX_CONCURRENCY,
+        pool: Optional[CredentialPool] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncGitHubClient (pip install httpx)")
+
+        self.pool = pool or (CredentialPool.from_tokens([token]) if token else CredentialPool.from_env())
+        self.token = token or Config.GITHUB_TOKEN
+        self.base_url = base_url or Config.GITHUB_API_BASE
+        self.max_concurrency = max_concurrency
+        self.cache = cache or get_response_cache()
+
+        # Authorization is added per request from the chosen credential
+        headers = {
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': 'Talent-Intelligence-Automation'
+        }
+
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            )
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'rate_limit_waits': 0,
+            'retries': 0
+        }
+
+        if not self.pool.authenticated:
+            logger.warning("⚠️  No token - rate limit will be 60/hour")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _acquire_credential(self, resource: str) -> Credential:
+        while True:
+            credential, wait = self.pool.try_acquire(resource)
+            if credential:
+                return credential
+            await asyncio.sleep(wait)
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+        retry_server_errors: bool = True
+    ) -> Optional[Any]:
+        """
+        Make a request with rate limiting and retries
+
+        5xx responses and timeouts are only retried if retry_server_errors
+        (GraphQL batches split on failure instead).
+
+        Returns:
+            Response JSON or None on error
+        """
+        resource = resource_for(endpoint)
+
+        cache_key = cached = None
+        if method == 'GET' and self.cache:
+            cache_key = self.cache.key(self.pool.cache_scope, f"{self.base_url}{endpoint}", params)
+            cached = self.cache.lookup(cache_key)
+
+        for attempt in range(Config.MAX_RETRIES + 1):
+            credential = await self._acquire_credential(resource)
+
+            headers = credential.auth_header()
+            if cached:
+                headers.update(cached.validators())
+
+            try:
+                async with self._semaphore:
+                    self.stats['requests'] += 1
+                    response = await self.http.request(
+                        method, endpoint, params=params, json=json_body, headers=headers
+                    )
+
+                self.pool.update(credential, response.headers)
+
+                if response.status_code in (403, 429):
+                    wait_time = retry_delay(
+                        response.status_code, response.headers, response.text, attempt
+                    )
+                    if wait_time is not None and attempt < Config.MAX_RETRIES:
+                        logger.warning(f"⚠️  Rate limited (HTTP {response.status_code}), "
+                                       f"backing off {wait_time:.0f}s")
+                        self.stats['rate_limit_waits'] += 1
+                        # Holds back every request on this credential; others keep going
+                        credential.buckets[resource].pause(
+                            wait_time,
+                            slow_down=is_secondary_rate_limit(response.headers, response.text)
+                        )
+                        continue
+
+                if response.status_code == 304 and cached:
+                    self.cache.record_hit(cache_key)
+                    return cached.json()
+
+                if response.status_code >= 500 and retry_server_errors and attempt < Config.MAX_RETRIES:
+                    self.stats['errors'] += 1
+                    self.stats['retries'] += 1
+                    await asyncio.sleep(Config.RETRY_BACKOFF ** attempt)
+                    continue
+
+                if response.status_code >= 400:
+                    if response.status_code != 404:
+                        logger.error(f"❌ HTTP {response.status_code}: {endpoint}")
+                    self.stats['errors'] += 1
+                    return None
+
+                credential.buckets[resource].record_success()
+                if cache_key and response.status_code == 200:
+                    self.cache.store(cache_key, f"{self.base_url}{endpoint}", response.headers, response.text)
+                return response.json()
+
+            except httpx.TimeoutException:
+                logger.error(f"⏱️  Timeout: {endpoint}")
+                self.stats['errors'] += 1
+                if not retry_server_errors:
+                    return None
+                self.stats['retries'] += 1
+
+            except httpx.HTTPError as e:
+                logger.error(f"❌ Request error: {e}")
+                self.stats['errors'] += 1
+                return None
+
+        return None
+
+    async def _paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        per_page: int = 100,
+        max_items: Optional[int] = None
+    ) -> List[Dict]:
+        items = []
+        page = 1
+
+        while max_items is None or len(items) < max_items:
+            result = await self._make_request(
+                'GET', endpoint, params={**(params or {}), 'per_page': per_page, 'page': page}
+            )
+            if not result:
+                break
+
+            items.extend(result)
+
+            if len(result) < per_page:
+                break
+
+            page += 1
+
+        return items if max_items is None else items[:max_items]
+
+    # API Methods (same names as GitHubClient)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        return await self._make_request('GET', endpoint, params=params)
+
+    async def graphql(self, query: str, variables: Optional[Dict] = None) -> Optional[Dict]:
+        return await self._make_request(
+            'POST', '/graphql', json_body={'query': query, 'variables': variables or {}},
+            retry_server_errors=False
+        )
+
+    async def get_user(self, username: str) -> Optional[Dict]:
+        return await self._make_request('GET', f'/users/{username}')
+
+    async def get_user_repos(self, username: str, per_page: int = 100) -> List[Dict]:
+        return await self._paginate(f'/users/{username}/repos', {'sort': 'updated'}, per_page)
+
+    async def get_org(self, org_name: str) -> Optional[Dict]:
+        return await self._make_request('GET', f'/orgs/{org_name}')
+
+    async def get_org_members(self, org_name: str, per_page: int = 100) -> List[Dict]:
+        return await self._paginate(f'/orgs/{org_name}/members', None, per_page)
+
+    async def get_org_repos(self, org_name: str, per_page: int = 100) -> List[Dict]:
+        return await self._paginate(
+            f'/orgs/{org_name}/repos', {'sort': 'updated'}, per_page,
+            max_items=Config.MAX_REPOS_PER_ORG
+        )
+
+    async def get_repo_contributors(self, owner: str, repo: str, per_page: int = 100) -> List[Dict]:
+        return await self._paginate(
+            f'/repos/{owner}/{repo}/contributors', None, per_page,
+            max_items=Config.MAX_CONTRIBUTORS_PER_REPO
+        )
+
+    async def search_users(self, query: str, per_page: int = 100) -> List[Dict]:
+        result = await self._make_request(
+            'GET', '/search/users', params={'q': query, 'per_page': per_page}
+        )
+        if result and 'items' in result:
+            return result['items']
+        return []
+
+    async def map(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any]
+    ) -> List[Any]:
+        """Run fn over items concurrently; results keep input order"""
+        return await asyncio.gather(*(fn(item) for item in items))
+
+    def get_stats(self) -> Dict[str, Any]:
+        utilization = self.pool.utilization()
+        resets = [c['core']['reset'] for c in utilization['per_credential'] if c['core']['reset']]
+        return {
+            **self.stats,
+            'rate_limit_remaining': utilization['resources']['core']['remaining'],
+            'rate_limit_reset': datetime.fromtimestamp(min(resets)) if resets else None,
+            'credential_pool': utilization['resources'],
+            'cache': self.cache.get_stats() if self.cache else None
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info("=" * 60)
+        logger.info("📊 Async GitHub API Client Statistics")
+        logger.info("=" * 60)
+        logger.info(f"Requests made: {stats['requests']:,}")
+        logger.info(f"Errors: {stats['errors']:,}")
+        logger.info(f"Retries: {stats['retries']:,}")
+        logger.info(f"Rate limit waits: {stats['rate_limit_waits']:,}")
+        logger.info(f"Rate limit remaining: {stats['rate_limit_remaining']}")
+        self.pool.log_utilization()
+        if self.cache:
+            self.cache.log_stats()
+        logger.info("=" * 60)
+
+    async def close(self):
+        await self.http.aclose()
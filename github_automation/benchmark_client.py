@@ -0,0 +1,114 @@
+"""
+Throughput benchmark: sync GitHubClient vs AsyncGitHubClient
+
+Runs against the local mock server, so no quota is used.
+
+Usage:
+    python3 -m github_automation.benchmark_client --requests 300 --latency 0.05
+    python3 -m github_automation.benchmark_client --legacy-delay   # include old fixed 0.72s sleep
+    python3 -m github_automation.benchmark_client --graphql        # REST per user vs batched GraphQL
+"""
+
+import argparse
+import asyncio
+import time
+
+from .async_client import AsyncGitHubClient
+from .config import GitHubAutomationConfig as Config
+from .github_client import GitHubClient
+from .graphql_batcher import GraphQLUserBatcher
+from .mock_server import MockGitHubServer
+
+
+def run_sync(base_url: str, usernames, legacy_delay: bool) -> float:
+    client = GitHubClient(token='mock-token', base_url=base_url)
+    start = time.time()
+    for username in usernames:
+        if legacy_delay:
+            time.sleep(Config.REQUEST_DELAY)
+        client.get_user(username)
+    elapsed = time.time() - start
+    client.close()
+    return elapsed
+
+
+def run_rest_profiles(base_url: str, usernames, legacy_delay: bool) -> float:
+    """EnrichmentEngine.enrich_profile's fetches: user + repos per profile"""
+    client = GitHubClient(token='mock-token', base_url=base_url)
+    start = time.time()
+    for username in usernames:
+        if legacy_delay:
+            time.sleep(Config.REQUEST_DELAY)
+        client.get_user(username)
+        client.get_user_repos(username)
+    elapsed = time.time() - start
+    client.close()
+    return elapsed
+
+
+def run_graphql_profiles(base_url: str, usernames) -> float:
+    client = GitHubClient(token='mock-token', base_url=base_url)
+    start = time.time()
+    GraphQLUserBatcher(client).fetch_users(usernames)
+    elapsed = time.time() - start
+    client.close()
+    return elapsed
+
+
+async def run_async(base_url: str, usernames, concurrency: int) -> float:
+    async with AsyncGitHubClient(token='mock-token', base_url=base_url,
+                                 max_concurrency=concurrency) as client:
+        start = time.time()
+        await client.map(client.get_user, usernames)
+        return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GitHub client throughput against the mock API')
+    parser.add_argument('--requests', type=int, default=300, help='Users to fetch per client')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock server latency (seconds)')
+    parser.add_argument('--concurrency', type=int, default=Config.MAX_CONCURRENCY,
+                        help=f'Async in-flight requests (default: {Config.MAX_CONCURRENCY})')
+    parser.add_argument('--limit', type=int, default=5000, help='Mock quota per window')
+    parser.add_argument('--legacy-delay', action='store_true',
+                        help=f'Sleep REQUEST_DELAY ({Config.REQUEST_DELAY}s) before each sync request, like the old client')
+    parser.add_argument('--graphql', action='store_true',
+                        help='Compare per-profile REST fetches with batched GraphQL instead')
+    args = parser.parse_args()
+
+    server = MockGitHubServer(latency=args.latency, limit=args.limit * 3).start()
+    usernames = [f"user-{i}" for i in range(args.requests)]
+
+    try:
+        print(f"\n🧪 Mock GitHub API: {server.base_url} ({args.latency * 1000:.0f}ms latency)")
+        print("=" * 60)
+
+        if args.graphql:
+            rest_seconds = run_rest_profiles(server.base_url, usernames, args.legacy_delay)
+            label = 'REST user+repos' + (' (legacy delay)' if args.legacy_delay else '')
+            print(f"{label:<28} {args.requests / rest_seconds:>8.1f} profiles/s  ({rest_seconds:.1f}s)")
+
+            graphql_seconds = run_graphql_profiles(server.base_url, usernames)
+            label = f"GraphQL ({Config.GRAPHQL_BATCH_SIZE}/query)"
+            print(f"{label:<28} {args.requests / graphql_seconds:>8.1f} profiles/s  ({graphql_seconds:.1f}s)")
+
+            print("=" * 60)
+            print(f"Speedup: {rest_seconds / graphql_seconds:.1f}x")
+            return
+
+        sync_seconds = run_sync(server.base_url, usernames, args.legacy_delay)
+        label = 'sync (legacy delay)' if args.legacy_delay else 'sync (token bucket)'
+        print(f"{label:<28} {args.requests / sync_seconds:>8.1f} req/s  ({sync_seconds:.1f}s)")
+
+        async_seconds = asyncio.run(run_async(server.base_url, usernames, args.concurrency))
+        label = f"async (concurrency {args.concurrency})"
+        print(f"{label:<28} {args.requests / async_seconds:>8.1f} req/s  ({async_seconds:.1f}s)")
+
+        print("=" * 60)
+        print(f"Speedup: {sync_seconds / async_seconds:.1f}x")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,18 +11,44 @@ class GitHubAutomationConfig:
     
     # GitHub API
     GITHUB_TOKEN: Optional[str] = os.environ.get('GITHUB_TOKEN')
+    # Extra tokens / GitHub App installations for the CredentialPool (see credential_pool.py)
+    GITHUB_TOKENS = [t.strip() for t in os.environ.get('GITHUB_TOKENS', '').split(',') if t.strip()]
+    GITHUB_APP_ID: Optional[str] = os.environ.get('GITHUB_APP_ID')
     GITHUB_API_BASE = 'https://api.github.com'
     
     # Rate Limiting
     RATE_LIMIT_BUFFER = 100  # Keep this many requests in reserve
-    RATE_LIMIT_CHECK_INTERVAL = 50  # Check rate limit every N requests
-    REQUEST_DELAY = 0.72  # Seconds between requests (5000/hour)
+    REQUEST_DELAY = 0.72  # Legacy fixed delay (5000/hour); clients now use the adaptive TokenBucket
+    RATE_LIMIT_BURST = 20  # Requests the token bucket may send back-to-back
+    MAX_REQUESTS_PER_SECOND = 25  # Token bucket ceiling; halved on secondary rate limits
+    SECONDARY_RATE_LIMIT_BACKOFF = 60  # Seconds; doubled per retry when no Retry-After
+    MAX_CONCURRENCY = 16  # In-flight requests for AsyncGitHubClient
+    USE_GRAPHQL_BATCHING = True  # EnrichmentEngine.enrich_batch fetches users via aliased GraphQL
+    GRAPHQL_BATCH_SIZE = 25  # Users per aliased GraphQL query
+    GRAPHQL_MAX_COST = 10  # GraphQL points one batched query may cost
     MAX_RETRIES = 3
     RETRY_BACKOFF = 2  # Exponential backoff multiplier
     
+    # Conditional-request (ETag) cache - 304 responses don't use quota
+    HTTP_CACHE_ENABLED = os.environ.get('GITHUB_HTTP_CACHE', '1') != '0'
+    HTTP_CACHE_PATH = Path(os.environ.get(
+        'GITHUB_HTTP_CACHE_PATH',
+        Path(__file__).parent.parent / 'github_automation' / 'status' / 'http_cache.sqlite3'
+    ))
+    HTTP_CACHE_TTL_DAYS = float(os.environ.get('GITHUB_HTTP_CACHE_TTL_DAYS', '30'))  # Unvalidated entries expire
+    HTTP_CACHE_MAX_ENTRIES = int(os.environ.get('GITHUB_HTTP_CACHE_MAX_ENTRIES', '200000'))  # Least recently validated evicted
+    
     # Enrichment Settings
     BATCH_SIZE = 100  # Process this many profiles before checkpointing
+    PIPELINE_FETCH_WORKERS = 4  # Concurrent fetchers in EnrichmentEngine.enrich_batch
+    PIPELINE_QUEUE_SIZE = 200  # Capacity of each inter-stage queue (backpressure)
+    PIPELINE_WRITE_BATCH_SIZE = 50  # Profiles per batched UPDATE / commit
+    PIPELINE_FLUSH_INTERVAL = 2.0  # Seconds before a partial write batch is flushed
     MAX_PROFILES_PER_RUN = 10000  # Max profiles to process in one run
+    JOB_LEASE_SECONDS = 900  # Claimed enrichment jobs return to the queue after this without a heartbeat
+    JOB_MAX_ATTEMPTS = 3  # Claims per job before it is marked failed
+    JOB_FAILED_RETRY_HOURS = 24  # Failed jobs of stale profiles are re-queued after this
+    JOB_REFILL_INTERVAL_SECONDS = 300  # Minimum gap between one worker's enqueue_stale scans
     STALE_DAYS = 30  # Re-enrich profiles older than this
     
     # Matching Settings
@@ -62,8 +88,8 @@ class GitHubAutomationConfig:
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration"""
-        if not cls.GITHUB_TOKEN:
-            print("⚠️  WARNING: GITHUB_TOKEN not set. Rate limit will be 60/hour instead of 5000/hour")
+        if not (cls.GITHUB_TOKEN or cls.GITHUB_TOKENS or cls.GITHUB_APP_ID):
+            print("⚠️  WARNING: GITHUB_TOKEN / GITHUB_TOKENS not set. Rate limit will be 60/hour instead of 5000/hour")
             return False
         return True
 
@@ -0,0 +1,297 @@
+"""
+Multi-credential pool for GitHub API clients
+
+Every job used to read one GITHUB_TOKEN and sleep until its reset once the
+5,000 requests were gone. The pool holds any number of personal access
+tokens and GitHub App installations, tracks the remaining quota of each one
+separately for REST (core), search and GraphQL, and routes every request to
+the credential with the most headroom - so a job only waits when *every*
+credential is exhausted.
+
+Configure with environment variables:
+    GITHUB_TOKENS=ghp_a,ghp_b,ghp_c        # plus GITHUB_TOKEN, if set
+    GITHUB_APP_ID=12345
+    GITHUB_APP_PRIVATE_KEY_PATH=/path/app.pem
+    GITHUB_APP_INSTALLATION_IDS=111,222
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import GitHubAutomationConfig as Config
+from .rate_limiter import TokenBucket
+
+# Signing GitHub App JWTs needs PyJWT + cryptography; tokens work without it
+try:
+    import jwt
+    JWT_AVAILABLE = True
+except ImportError:
+    JWT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ('core', 'search', 'graphql')
+
+# Quota of a fresh credential before GitHub has told us otherwise
+DEFAULT_LIMITS = {'core': 5000, 'search': 30, 'graphql': 5000}
+
+
+def resource_for(endpoint: str) -> str:
+    """GitHub rate-limit resource an endpoint draws from"""
+    if endpoint.startswith('/graphql'):
+        return 'graphql'
+    if endpoint.startswith('/search/'):
+        return 'search'
+    return 'core'
+
+
+class Credential:
+    """A personal access token with one rate-limit bucket per resource"""
+
+    def __init__(self, token: Optional[str], name: Optional[str] = None):
+        self._token = token
+        self.name = name or (f"token …{token[-4:]}" if token else 'anonymous')
+        self.buckets: Dict[str, TokenBucket] = {
+            resource: TokenBucket(
+                buffer=Config.RATE_LIMIT_BUFFER if resource != 'search' else 2,
+                burst=Config.RATE_LIMIT_BURST
+            )
+            for resource in RESOURCES
+        }
+        self.requests = 0
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @property
+    def authenticated(self) -> bool:
+        return self._token is not None
+
+    def auth_header(self) -> Dict[str, str]:
+        token = self.token
+        return {'Authorization': f'token {token}'} if token else {}
+
+    def headroom(self, resource: str) -> int:
+        """Requests left before this credential hits its buffer"""
+        bucket = self.buckets[resource]
+        snapshot = bucket.snapshot()
+
+        if snapshot['remaining'] is None or (snapshot['reset'] and snapshot['reset'] <= time.time()):
+            remaining = snapshot['limit'] or DEFAULT_LIMITS[resource]
+        else:
+            remaining = snapshot['remaining']
+
+        return remaining - bucket.buffer
+
+
+class GitHubAppCredential(Credential):
+    """
+    GitHub App installation
+
+    Installation tokens last an hour; a new one is minted from the app's
+    private key a few minutes before expiry. Installations get their own
+    quota (up to 12,500/hour for large orgs).
+    """
+
+    def __init__(self, app_id: str, private_key: str, installation_id: str,
+                 api_base: str = Config.GITHUB_API_BASE):
+        if not JWT_AVAILABLE:
+            raise ImportError("PyJWT is required for GitHub App credentials (pip install pyjwt cryptography)")
+
+        super().__init__(None, name=f"app {app_id}/installation {installation_id}")
+        self.app_id = app_id
+        self.private_key = private_key
+        self.installation_id = installation_id
+        self.api_base = api_base
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _app_jwt(self) -> str:
+        now = int(time.time())
+        return jwt.encode(
+            {'iat': now - 60, 'exp': now + 540, 'iss': self.app_id},
+            self.private_key,
+            algorithm='RS256'
+        )
+
+    @property
+    def authenticated(self) -> bool:
+        return True
+
+    @property
+    def token(self) -> Optional[str]:
+        with self._lock:
+            if self._token is None or time.time() > self._expires_at - 300:
+                self._refresh()
+            return self._token
+
+    def _refresh(self):
+        import requests
+        from datetime import datetime
+
+        response = requests.post(
+            f"{self.api_base}/app/installations/{self.installation_id}/access_tokens",
+            headers={
+                'Authorization': f'Bearer {self._app_jwt()}',
+                'Accept': 'application/vnd.github.v3+json'
+            },
+            timeout=30
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        self._token = data['token']
+        self._expires_at = datetime.strptime(data['expires_at'], '%Y-%m-%dT%H:%M:%SZ').timestamp()
+        logger.info(f"🔑 Refreshed installation token for {self.name}")
+
+
+class CredentialPool:
+    """
+    Routes requests to the credential with the most remaining quota
+
+    try_acquire() never blocks (usable from sync and async code); it returns
+    a credential, or how long until any credential frees up.
+    """
+
+    def __init__(self, credentials: List[Credential]):
+        if not credentials:
+            credentials = [Credential(None)]
+        self.credentials = credentials
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_tokens(cls, tokens: List[Optional[str]]) -> 'CredentialPool':
+        seen, credentials = set(), []
+        for token in tokens:
+            if token and token not in seen:
+                seen.add(token)
+                credentials.append(Credential(token, name=f"token {len(credentials) + 1} (…{token[-4:]})"))
+        return cls(credentials)
+
+    @classmethod
+    def from_env(cls) -> 'CredentialPool':
+        """All tokens and App installations configured in the environment"""
+        tokens = [t.strip() for t in os.environ.get('GITHUB_TOKENS', '').split(',') if t.strip()]
+        tokens.append(os.environ.get('GITHUB_TOKEN') or Config.GITHUB_TOKEN)
+        pool = cls.from_tokens(tokens)
+
+        app_id = os.environ.get('GITHUB_APP_ID')
+        key_path = os.environ.get('GITHUB_APP_PRIVATE_KEY_PATH')
+        installations = [i.strip() for i in os.environ.get('GITHUB_APP_INSTALLATION_IDS', '').split(',') if i.strip()]
+
+        if app_id and key_path and installations:
+            try:
+                with open(key_path) as f:
+                    private_key = f.read()
+                apps = [GitHubAppCredential(app_id, private_key, i) for i in installations]
+                anonymous = len(pool.credentials) == 1 and pool.credentials[0].token is None
+                pool.credentials = apps if anonymous else pool.credentials + apps
+            except (ImportError, OSError) as e:
+                logger.warning(f"⚠️  GitHub App credentials not loaded: {e}")
+
+        logger.info(f"🔑 Credential pool: {len(pool.credentials)} credential(s)")
+        return pool
+
+    def __len__(self):
+        return len(self.credentials)
+
+    @property
+    def authenticated(self) -> bool:
+        return any(c.authenticated for c in self.credentials)
+
+    @property
+    def cache_scope(self) -> str:
+        """Stable id of this credential set, for keying cached responses"""
+        if not self.authenticated:
+            return 'anonymous'
+        names = '|'.join(sorted(c.name for c in self.credentials))
+        return hashlib.sha256(names.encode()).hexdigest()[:16]
+
+    def try_acquire(self, resource: str = 'core') -> Tuple[Optional[Credential], float]:
+        """
+        Take a request slot from the credential with the most headroom
+
+        Returns:
+            (credential, 0) on success, (None, seconds to wait) otherwise
+        """
+        with self._lock:
+            ranked = sorted(self.credentials, key=lambda c: c.headroom(resource), reverse=True)
+
+            shortest_wait = None
+            for credential in ranked:
+                wait = credential.buckets[resource].try_acquire()
+                if wait <= 0:
+                    credential.requests += 1
+                    return credential, 0.0
+                shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+
+            return None, shortest_wait
+
+    def acquire(self, resource: str = 'core') -> Credential:
+        """Blocking acquire for synchronous clients"""
+        while True:
+            credential, wait = self.try_acquire(resource)
+            if credential:
+                return credential
+            time.sleep(wait)
+
+    def update(self, credential: Credential, headers: Dict[str, str]):
+        """Record the quota a response reported for the credential that sent it"""
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        if resource in credential.buckets:
+            credential.buckets[resource].update(headers)
+
+    def update_from_rate_limit(self, credential: Credential, data: Dict):
+        """Seed all buckets from a /rate_limit response (free to call)"""
+        for resource, quota in data.get('resources', {}).items():
+            if resource in credential.buckets:
+                credential.buckets[resource].update({
+                    'X-RateLimit-Remaining': str(quota['remaining']),
+                    'X-RateLimit-Reset': str(quota['reset']),
+                    'X-RateLimit-Limit': str(quota['limit']),
+                })
+
+    def utilization(self) -> Dict:
+        """Pool-wide and per-credential quota usage"""
+        per_credential = []
+        totals = {resource: {'remaining': 0, 'limit': 0} for resource in RESOURCES}
+
+        for credential in self.credentials:
+            entry = {'name': credential.name, 'requests': credential.requests}
+            for resource in RESOURCES:
+                snapshot = credential.buckets[resource].snapshot()
+                limit = snapshot['limit'] or DEFAULT_LIMITS[resource]
+                remaining = limit if snapshot['remaining'] is None else snapshot['remaining']
+                entry[resource] = {'remaining': remaining, 'limit': limit, 'reset': snapshot['reset']}
+                totals[resource]['remaining'] += remaining
+                totals[resource]['limit'] += limit
+            per_credential.append(entry)
+
+        for resource, total in totals.items():
+            total['used_pct'] = round(
+                100 * (1 - total['remaining'] / total['limit']), 1
+            ) if total['limit'] else 0.0
+            total['exhausted_credentials'] = sum(
+                1 for c in self.credentials if c.headroom(resource) <= 0
+            )
+
+        return {
+            'credentials': len(self.credentials),
+            'resources': totals,
+            'per_credential': per_credential,
+        }
+
+    def log_utilization(self):
+        stats = self.utilization()
+        logger.info(f"🔑 Credential pool: {stats['credentials']} credential(s)")
+        for resource, total in stats['resources'].items():
+            logger.info(f"   {resource:<8} {total['remaining']:>7,}/{total['limit']:<7,} remaining "
+                        f"({total['used_pct']}% used, {total['exhausted_credentials']} exhausted)")
+        for entry in stats['per_credential']:
+            logger.info(f"   {entry['name']:<32} {entry['requests']:>7,} requests, "
+                        f"core {entry['core']['remaining']:,}/{entry['core']['limit']:,}")
@@ -9,11 +9,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import psycopg2
+import queue
+import threading
+import time
+from psycopg2.extras import execute_values
 from typing import Dict, Optional, List
 from datetime import datetime
 from config import Config, get_db_connection
 from .github_client import GitHubClient
+from .graphql_batcher import GraphQLUserBatcher, to_rest_repos, to_rest_user
 from .config import GitHubAutomationConfig as AutoConfig
+from .pipeline import SENTINEL, MeteredQueue, StageMetrics
 import logging
 import json
 
@@ -29,18 +35,46 @@ class EnrichmentEngine:
     2. Extracting relevant fields
     3. Updating database
     4. Logging results
+    
+    enrich_batch() fetches users in aliased GraphQL batches (one query per
+    GRAPHQL_BATCH_SIZE users instead of two REST calls each) when the
+    client is authenticated; enrich_profile() is the single-user REST path.
     """
     
-    def __init__(self, github_client: Optional[GitHubClient] = None):
+    # Columns enrich_batch writes with one execute_values UPDATE
+    WRITE_COLUMNS = [
+        'github_name', 'github_email', 'github_company', 'bio', 'blog', 'location',
+        'twitter_username', 'followers', 'following', 'public_repos', 'hireable',
+        'avatar_url', 'created_at_github', 'updated_at_github'
+    ]
+    # Casts keep all-NULL columns in the VALUES list correctly typed
+    WRITE_TEMPLATE = (
+        "(%s::uuid, %s::text, %s::text, %s::text, %s::text, %s::text, %s::text, "
+        "%s::text, %s::int, %s::int, %s::int, %s::boolean, "
+        "%s::text, %s::timestamptz, %s::timestamptz)"
+    )
+    
+    def __init__(
+        self,
+        github_client: Optional[GitHubClient] = None,
+        use_graphql: bool = AutoConfig.USE_GRAPHQL_BATCHING
+    ):
         self.client = github_client or GitHubClient()
         self.conn = get_db_connection(use_pool=False)
         
+        # GraphQL requires authentication
+        self.batcher = GraphQLUserBatcher(self.client) \
+            if use_graphql and self.client.pool.authenticated else None
+        
         self.stats = {
             'enriched': 0,
             'failed': 0,
             'skipped': 0,
             'api_calls': 0
         }
+        # enrich_batch stages update stats from several threads
+        self._stats_lock = threading.Lock()
+        self.last_pipeline_metrics = None
     
     def enrich_profile(self, profile: Dict) -> bool:
         """
@@ -55,55 +89,68 @@ class EnrichmentEngine:
         username = profile.get('github_username')
         if not username:
             logger.error("Profile missing username")
-            self.stats['skipped'] += 1
+            self._count('skipped')
             return False
         
         try:
             # Get user data from GitHub API
             user_data = self.client.get_user(username)
-            self.stats['api_calls'] += 1
+            self._count('api_calls')
             
             if not user_data:
                 logger.warning(f"⚠️  No data for {username}")
-                self.stats['failed'] += 1
+                self._count('failed')
                 return False
             
-            # Extract and normalize data
-            enriched_data = self._extract_user_data(user_data)
-            
             # Get user's top repositories for language analysis
             repos = self.client.get_user_repos(username, per_page=100)
-            self.stats['api_calls'] += 1
-            
-            if repos:
-                enriched_data['top_languages'] = self._analyze_languages(repos)
-                enriched_data['public_repos'] = len(repos)
-                enriched_data['top_repos'] = [
-                    {
-                        'name': r['name'],
-                        'stars': r['stargazers_count'],
-                        'language': r['language']
-                    }
-                    for r in sorted(repos, key=lambda x: x['stargazers_count'], reverse=True)[:5]
-                ]
-            
-            # Update database
-            success = self._update_profile(profile['github_profile_id'], enriched_data)
-            
-            if success:
-                self.stats['enriched'] += 1
-                logger.info(f"✅ Enriched {username}")
-            else:
-                self.stats['failed'] += 1
-                logger.error(f"❌ Failed to update {username}")
+            self._count('api_calls')
             
-            return success
+            enriched_data = self._build_enriched_data(user_data, repos)
+            return self._save_enriched(profile, enriched_data)
             
         except Exception as e:
             logger.error(f"❌ Error enriching {username}: {e}")
-            self.stats['failed'] += 1
+            self._count('failed')
             return False
     
+    def _build_enriched_data(self, user_data: Dict, repos: List[Dict], repos_complete: bool = True) -> Dict:
+        """
+        Normalized profile fields plus language / top-repo analysis
+        
+        repos_complete: repos is every repository (REST) rather than the top
+        N (GraphQL), so its length is the public repo count
+        """
+        enriched_data = self._extract_user_data(user_data)
+        
+        if repos:
+            enriched_data['top_languages'] = self._analyze_languages(repos)
+            if repos_complete:
+                enriched_data['public_repos'] = len(repos)
+            enriched_data['top_repos'] = [
+                {
+                    'name': r['name'],
+                    'stars': r['stargazers_count'],
+                    'language': r['language']
+                }
+                for r in sorted(repos, key=lambda x: x['stargazers_count'], reverse=True)[:5]
+            ]
+        
+        return enriched_data
+    
+    def _save_enriched(self, profile: Dict, enriched_data: Dict) -> bool:
+        username = profile.get('github_username')
+        success = self._update_profile(profile['github_profile_id'], enriched_data)
+        
+        if success:
+            self._count('enriched')
+            logger.info(f"✅ Enriched {username}")
+        else:
+            self._count('failed')
+            logger.error(f"❌ Failed to update {username}")
+        
+        return success
+    
     def _extract_user_data(self, user_data: Dict) -> Dict:
         """
         Extract relevant fields from GitHub user API response
@@ -228,17 +275,37 @@ class EnrichmentEngine:
             self.conn.rollback()
             return False
     
-    def enrich_batch(self, profiles: List[Dict]) -> Dict[str, int]:
+    def enrich_batch(
+        self,
+        profiles: List[Dict],
+        fetch_workers: int = AutoConfig.PIPELINE_FETCH_WORKERS,
+        write_batch_size: int = AutoConfig.PIPELINE_WRITE_BATCH_SIZE,
+        queue_size: int = AutoConfig.PIPELINE_QUEUE_SIZE
+    ) -> Dict[str, int]:
         """
-        Enrich a batch of profiles
+        Enrich a batch of profiles through a staged pipeline
+        
+            feeder -> [fetch queue] -> N fetchers -> [parse queue] -> parser
+                   -> [write queue] -> writer (execute_values, one transaction
+                      per write_batch_size profiles)
+        
+        Queues are bounded, so a slow writer holds back the fetchers instead
+        of buffering the whole batch in memory. Fetchers use GraphQL batches
+        when available, REST otherwise. Ctrl-C stops fetching; everything
+        already fetched is still written.
         
         Args:
             profiles: List of profile dicts
+            fetch_workers: Concurrent fetcher threads
+            write_batch_size: Profiles per UPDATE / commit
+            queue_size: Capacity of each inter-stage queue
             
         Returns:
-            Dict with counts of success/failure
+            Dict with counts of success/failure, the github_profile_ids written
+            ('enriched_ids') and per-stage 'pipeline' metrics
         """
-        logger.info(f"🔄 Enriching batch of {len(profiles)} profiles...")
+        logger.info(f"🔄 Enriching batch of {len(profiles)} profiles "
+                    f"({fetch_workers} fetchers, writes of {write_batch_size})...")
         
         batch_stats = {
             'success': 0,
@@ -246,25 +313,249 @@ class EnrichmentEngine:
             'skipped': 0
         }
         
-        for i, profile in enumerate(profiles, 1):
-            username = profile.get('github_username', 'unknown')
-            logger.info(f"  [{i}/{len(profiles)}] {username}")
+        fetch_q = MeteredQueue('fetch', queue_size)
+        parse_q = MeteredQueue('parse', queue_size)
+        write_q = MeteredQueue('write', queue_size)
+        stages = {
+            'fetch': StageMetrics('fetch', fetch_workers),
+            'parse': StageMetrics('parse'),
+            'write': StageMetrics('write'),
+        }
+        stop = threading.Event()
+        lock = threading.Lock()
+        
+        enriched_ids = []
+        
+        def count(key: str, n: int = 1):
+            with lock:
+                batch_stats[key] += n
+        
+        # A fetch unit is one GraphQL batch, or one profile for REST
+        unit_size = self.batcher.batch_size if self.batcher else 1
+        queries_before = self.batcher.stats['queries'] if self.batcher else 0
+        
+        def fetcher():
+            while True:
+                unit = fetch_q.get()
+                if unit is SENTINEL:
+                    parse_q.put(SENTINEL)
+                    return
+                if stop.is_set():
+                    continue  # Shutting down: drop unfetched work
+                
+                started = time.time()
+                for item in self._fetch_unit(unit):
+                    parse_q.put(item)
+                stages['fetch'].record(len(unit), time.time() - started)
+        
+        def parser():
+            finished_fetchers = 0
+            while finished_fetchers < fetch_workers:
+                item = parse_q.get()
+                if item is SENTINEL:
+                    finished_fetchers += 1
+                    continue
+                
+                started = time.time()
+                profile, user_data, repos, repos_complete = item
+                try:
+                    if user_data is None:
+                        raise ValueError('no data returned')
+                    data = self._build_enriched_data(user_data, repos, repos_complete)
+                except Exception as e:
+                    # A dead parser would stall the whole pipeline - count and move on
+                    logger.warning(f"⚠️  Skipping {profile['github_username']}: {e}")
+                    self._count('failed')
+                    count('failed')
+                else:
+                    write_q.put((profile, data))
+                stages['parse'].record(1, time.time() - started)
+            
+            write_q.put(SENTINEL)
+            stages['parse'].finish()
+        
+        def writer():
+            pending = []
+            done = False
+            while not done:
+                try:
+                    item = write_q.get(timeout=AutoConfig.PIPELINE_FLUSH_INTERVAL)
+                except queue.Empty:
+                    item = None
+                
+                if item is SENTINEL:
+                    done = True
+                elif item is not None:
+                    pending.append(item)
+                
+                # Flush when the batch is full, the input stalls, or at the end
+                if pending and (len(pending) >= write_batch_size or item is None or done):
+                    started = time.time()
+                    written = self._write_profiles(pending)
+                    with lock:
+                        enriched_ids.extend(written)
+                    count('success', len(written))
+                    count('failed', len(pending) - len(written))
+                    stages['write'].record(len(pending), time.time() - started)
+                    pending = []
             
-            success = self.enrich_profile(profile)
+            stages['write'].finish()
+        
+        threads = [threading.Thread(target=fetcher, name=f"enrich-fetch-{i}", daemon=True)
+                   for i in range(fetch_workers)]
+        threads.append(threading.Thread(target=parser, name='enrich-parse', daemon=True))
+        threads.append(threading.Thread(target=writer, name='enrich-write', daemon=True))
+        for thread in threads:
+            thread.start()
+        
+        # Each fetcher exits on its first SENTINEL; extra ones would sit in
+        # fetch_q with no reader, and block once it is full
+        sentinels_sent = 0
+        
+        def send_sentinels():
+            nonlocal sentinels_sent
+            while sentinels_sent < fetch_workers:
+                fetch_q.put(SENTINEL)
+                sentinels_sent += 1
+        
+        try:
+            # Feeding blocks when the fetch queue is full (backpressure)
+            usable = []
+            for profile in profiles:
+                if profile.get('github_username'):
+                    usable.append(profile)
+                else:
+                    logger.error("Profile missing username")
+                    self._count('skipped')
+                    count('failed')
             
-            if success:
-                batch_stats['success'] += 1
-            else:
-                batch_stats['failed'] += 1
+            for start in range(0, len(usable), unit_size):
+                if stop.is_set():
+                    break
+                fetch_q.put(usable[start:start + unit_size])
+            send_sentinels()
             
-            # Log progress every 10 profiles
-            if i % 10 == 0:
-                logger.info(f"  Progress: {i}/{len(profiles)} ({i/len(profiles)*100:.1f}%)")
+            while any(t.is_alive() for t in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            logger.warning("⏹️  Interrupted - finishing in-flight profiles...")
+            stop.set()
+            send_sentinels()  # Fetchers drop queued units once stopped, so this doesn't block
+            for thread in threads:
+                thread.join()
+        
+        stages['fetch'].finish()
+        if self.batcher:
+            self._count('api_calls', self.batcher.stats['queries'] - queries_before)
+        batch_stats['enriched_ids'] = enriched_ids
+        batch_stats['pipeline'] = {
+            'stages': {name: stage.snapshot() for name, stage in stages.items()},
+            'queues': {q.name: q.snapshot() for q in (fetch_q, parse_q, write_q)},
+        }
+        self.last_pipeline_metrics = batch_stats['pipeline']
         
         logger.info(f"✅ Batch complete: {batch_stats['success']} success, {batch_stats['failed']} failed")
+        self.log_pipeline_metrics()
         
         return batch_stats
     
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+    
+    def _fetch_unit(self, unit: List[Dict]) -> List[tuple]:
+        """Fetch one unit of profiles -> [(profile, user_data or None, repos, repos_complete)]"""
+        if self.batcher:
+            # GraphQL queries are added to api_calls once the batch finishes
+            try:
+                nodes = self.batcher.fetch_users(p['github_username'] for p in unit)
+            except Exception as e:
+                logger.error(f"❌ GraphQL batch failed: {e}")
+                nodes = {}
+            
+            items = []
+            for profile in unit:
+                node = nodes.get(profile['github_username'])
+                if node:
+                    # Only the top repos are fetched, so keep GitHub's full repo count
+                    items.append((profile, to_rest_user(node), to_rest_repos(node), False))
+                else:
+                    items.append((profile, None, [], False))
+            return items
+        
+        items = []
+        for profile in unit:
+            username = profile['github_username']
+            try:
+                user_data = self.client.get_user(username)
+                self._count('api_calls')
+                repos = []
+                if user_data:
+                    repos = self.client.get_user_repos(username, per_page=100)
+                    self._count('api_calls')
+                items.append((profile, user_data, repos, True))
+            except Exception as e:
+                logger.error(f"❌ Error fetching {username}: {e}")
+                items.append((profile, None, [], True))
+        return items
+    
+    def _write_profiles(self, rows: List[tuple]) -> List:
+        """
+        Write many enriched profiles in one UPDATE ... FROM (VALUES ...)
+        
+        Null values keep the existing column, matching _update_profile.
+        If the batch fails, rows are retried one at a time so a single bad
+        row doesn't lose the rest.
+        
+        Returns:
+            github_profile_ids written
+        """
+        values = []
+        for profile, data in rows:
+            values.append((
+                str(profile['github_profile_id']),
+                *(data.get(column) for column in self.WRITE_COLUMNS)
+            ))
+            if data.get('linkedin_url'):
+                logger.info(f"  📎 Found LinkedIn: {data['linkedin_url']}")
+        
+        cursor = self.conn.cursor()
+        try:
+            execute_values(cursor, f"""
+                UPDATE github_profile AS gp SET
+                    {', '.join(f"{c} = COALESCE(v.{c}, gp.{c})" for c in self.WRITE_COLUMNS)},
+                    last_enriched = NOW(),
+                    updated_at = NOW()
+                FROM (VALUES %s) AS v(github_profile_id, {', '.join(self.WRITE_COLUMNS)})
+                WHERE gp.github_profile_id = v.github_profile_id
+            """, values, template=self.WRITE_TEMPLATE, page_size=len(values))
+            self.conn.commit()
+            
+            self._count('enriched', len(rows))
+            for profile, _ in rows:
+                logger.info(f"✅ Enriched {profile['github_username']}")
+            return [profile['github_profile_id'] for profile, _ in rows]
+            
+        except Exception as e:
+            logger.error(f"❌ Batched write of {len(rows)} profiles failed ({e}); retrying individually")
+            self.conn.rollback()
+            return [profile['github_profile_id'] for profile, data in rows
+                    if self._save_enriched(profile, dict(data))]
+        finally:
+            cursor.close()
+    
+    def log_pipeline_metrics(self):
+        metrics = self.last_pipeline_metrics
+        if not metrics:
+            return
+        for name, stage in metrics['stages'].items():
+            logger.info(f"   {name:<6} {stage['items']:>6,} items  {stage['items_per_second']:>7.1f}/s  "
+                        f"utilization {stage['utilization']:.0%} ({stage['workers']} worker(s))")
+        for name, q in metrics['queues'].items():
+            logger.info(f"   {name:<6} queue max {q['max_depth']}/{q['maxsize']}  avg {q['avg_depth']}  "
+                        f"blocked {q['blocked_puts']}x ({q['blocked_seconds']}s)")
+    
     def get_stats(self) -> Dict:
         """Get enrichment statistics"""
         return {
@@ -285,6 +576,9 @@ class EnrichmentEngine:
         logger.info(f"API calls made: {stats['api_calls']:,}")
         logger.info("=" * 60)
         
+        if self.batcher:
+            self.batcher.log_stats()
+        
         # Log API client stats
         self.client.log_stats()
     
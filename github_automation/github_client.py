@@ -3,10 +3,14 @@ GitHub API Client with rate limiting and error handling
 """
 
 import requests
+import threading
 import time
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from .config import GitHubAutomationConfig as Config
+from .credential_pool import CredentialPool, resource_for
+from .http_cache import ResponseCache, get_response_cache
+from .rate_limiter import is_secondary_rate_limit, retry_delay
 import logging
 
 # Setup logging
@@ -32,23 +36,45 @@ class GitHubClient:
     GitHub API client with automatic rate limiting and retry logic
     
     Features:
-    - Automatic rate limit management
+    - Adaptive token bucket driven by X-RateLimit headers (no fixed delay)
+    - Multi-token CredentialPool: each request uses the credential with the
+      most remaining quota for its resource (core / search / graphql)
+    - Secondary rate limit backoff (Retry-After / exponential)
+    - Conditional GETs against the shared on-disk ResponseCache; 304s
+      reuse the stored body without spending quota
+    - Pooled keep-alive Session per thread (requests.Session isn't
+      thread-safe, and EnrichmentEngine.enrich_batch fetches from several
+      threads); counters are updated under a lock
     - Exponential backoff on errors
-    - Request caching (optional)
     - Comprehensive error handling
+    
+    AsyncGitHubClient (async_client.py) has the same methods as coroutines;
+    so far only benchmark_client.py uses it.
     """
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        pool: Optional[CredentialPool] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        # An explicit token pins the client to it; otherwise use every
+        # credential configured in the environment
+        self.pool = pool or (CredentialPool.from_tokens([token]) if token else CredentialPool.from_env())
+        self.cache = cache or get_response_cache()
         self.token = token or Config.GITHUB_TOKEN
-        self.base_url = Config.GITHUB_API_BASE
+        self.base_url = base_url or Config.GITHUB_API_BASE
         
+        # Authorization is added per request from the chosen credential
         self.headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'Talent-Intelligence-Automation'
         }
         
-        if self.token:
-            self.headers['Authorization'] = f'token {self.token}'
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
         
         self.rate_limit_remaining = None
         self.rate_limit_reset = None
@@ -63,8 +89,8 @@ class GitHubClient:
             'retries': 0
         }
         
-        logger.info("🔑 GitHub API Client initialized")
-        if not self.token:
+        logger.info(f"🔑 GitHub API Client initialized ({len(self.pool)} credential(s))")
+        if not self.pool.authenticated:
             logger.warning("⚠️  No token - rate limit will be 60/hour")
         else:
             self.check_rate_limit()
@@ -74,7 +100,11 @@ class GitHubClient:
         method: str,
         endpoint: str,
         params: Optional[Dict] = None,
-        retry_count: int = 0
+        retry_count: int = 0,
+        json_body: Optional[Dict] = None,
+        etag: Optional[str] = None,
+        meta: Optional[Dict] = None,
+        retry_server_errors: bool = True
     ) -> Optional[Dict]:
         """
         Make a request to GitHub API with error handling and retries
@@ -84,78 +114,138 @@ class GitHubClient:
             endpoint: API endpoint (e.g., '/users/username')
             params: Query parameters
             retry_count: Current retry attempt
+            json_body: JSON request body (GraphQL queries)
+            etag: Caller-held ETag to send as If-None-Match
+            meta: If given, filled with the response 'status' and 'etag'
+            retry_server_errors: Retry 5xx responses and timeouts; off for
+                callers that handle failures themselves (GraphQL batches split instead)
             
         Returns:
             Response JSON or None on error
         """
         url = f"{self.base_url}{endpoint}"
+        resource = resource_for(endpoint)
         
-        # Check rate limit periodically
-        if self.requests_made % Config.RATE_LIMIT_CHECK_INTERVAL == 0:
-            if not self.check_rate_limit():
-                self.wait_for_rate_limit()
+        cache_key = cached = None
+        if method == 'GET' and self.cache:
+            cache_key = self.cache.key(self.pool.cache_scope, url, params)
+            cached = self.cache.lookup(cache_key)
         
-        # Add delay between requests
-        time.sleep(Config.REQUEST_DELAY)
+        # Wait for a slot on the credential with the most headroom - paced by
+        # the quota GitHub reports, not a fixed delay
+        credential = self.pool.acquire(resource)
         
         try:
-            self.stats['requests'] += 1
-            self.requests_made += 1
+            with self._lock:
+                self.stats['requests'] += 1
+                self.requests_made += 1
+            
+            headers = credential.auth_header()
+            if cached:
+                headers.update(cached.validators())
+            if etag:
+                headers['If-None-Match'] = etag
             
-            response = requests.request(
+            response = self.session.request(
                 method,
                 url,
-                headers=self.headers,
                 params=params,
+                json=json_body,
+                headers=headers,
                 timeout=30
             )
             
             # Update rate limit info from headers
+            self.pool.update(credential, response.headers)
             self._update_rate_limit(response.headers)
+            if meta is not None:
+                meta['status'] = response.status_code
+                meta['etag'] = response.headers.get('ETag', etag)
             
-            # Handle rate limiting
-            if response.status_code == 403:
-                if 'rate limit' in response.text.lower():
-                    logger.warning("⚠️  Rate limit exceeded")
-                    self.stats['rate_limit_waits'] += 1
-                    self.wait_for_rate_limit()
-                    # Retry after waiting
-                    return self._make_request(method, endpoint, params, retry_count + 1)
+            # Handle primary and secondary rate limiting
+            if response.status_code in (403, 429):
+                wait_time = retry_delay(
+                    response.status_code, response.headers, response.text, retry_count
+                )
+                if wait_time is not None and retry_count < Config.MAX_RETRIES:
+                    logger.warning(f"⚠️  Rate limited (HTTP {response.status_code}), "
+                                   f"backing off {wait_time:.0f}s")
+                    self._count('rate_limit_waits')
+                    # Only this credential backs off; the retry goes to another one if available
+                    credential.buckets[resource].pause(
+                        wait_time,
+                        slow_down=is_secondary_rate_limit(response.headers, response.text)
+                    )
+                    return self._make_request(
+                        method, endpoint, params, retry_count + 1, json_body, etag, meta, retry_server_errors
+                    )
+            
+            # Unchanged since we cached it - free, reuse the stored body
+            if response.status_code == 304:
+                if cached:
+                    self.cache.record_hit(cache_key)
+                    return cached.json()
+                return None
             
             # Handle other errors
             if response.status_code >= 400:
-                logger.error(f"❌ HTTP {response.status_code}: {url}")
-                self.stats['errors'] += 1
+                if response.status_code != 404:
+                    logger.error(f"❌ HTTP {response.status_code}: {url}")
+                self._count('errors')
                 
                 # Retry on server errors
-                if response.status_code >= 500 and retry_count < Config.MAX_RETRIES:
+                if (response.status_code >= 500 and retry_server_errors
+                        and retry_count < Config.MAX_RETRIES):
                     wait_time = (Config.RETRY_BACKOFF ** retry_count)
                     logger.info(f"🔄 Retrying in {wait_time}s...")
                     time.sleep(wait_time)
-                    self.stats['retries'] += 1
-                    return self._make_request(method, endpoint, params, retry_count + 1)
+                    self._count('retries')
+                    return self._make_request(
+                        method, endpoint, params, retry_count + 1, json_body, etag, meta, retry_server_errors
+                    )
                 
                 return None
             
+            credential.buckets[resource].record_success()
+            if cache_key and response.status_code == 200:
+                self.cache.store(cache_key, url, response.headers, response.text)
             return response.json()
             
         except requests.exceptions.Timeout:
             logger.error(f"⏱️  Timeout: {url}")
-            self.stats['errors'] += 1
-            if retry_count < Config.MAX_RETRIES:
-                return self._make_request(method, endpoint, params, retry_count + 1)
+            self._count('errors')
+            if retry_server_errors and retry_count < Config.MAX_RETRIES:
+                return self._make_request(
+                    method, endpoint, params, retry_count + 1, json_body, etag, meta, retry_server_errors
+                )
             return None
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Request error: {e}")
-            self.stats['errors'] += 1
+            self._count('errors')
             return None
         
         except Exception as e:
             logger.error(f"❌ Unexpected error: {e}")
-            self.stats['errors'] += 1
+            self._count('errors')
             return None
     
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's keep-alive Session"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+    
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+    
     def _update_rate_limit(self, headers: Dict[str, str]):
         """Update rate limit info from response headers"""
         if 'X-RateLimit-Remaining' in headers:
@@ -165,32 +255,33 @@ class GitHubClient:
     
     def check_rate_limit(self) -> bool:
         """
-        Check current rate limit status
+        Check current rate limit status of every credential
+        
+        /rate_limit calls don't count against the quota.
         
         Returns:
-            True if we have sufficient requests remaining
+            True if any credential has sufficient requests remaining
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/rate_limit",
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                core = data['resources']['core']
-                self.rate_limit_remaining = core['remaining']
-                self.rate_limit_reset = core['reset']
-                
-                logger.info(f"📊 Rate limit: {self.rate_limit_remaining:,} remaining")
-                
-                return self.rate_limit_remaining > Config.RATE_LIMIT_BUFFER
+        for credential in self.pool.credentials:
+            try:
+                response = self.session.get(
+                    f"{self.base_url}/rate_limit",
+                    headers=credential.auth_header(),
+                    timeout=10
+                )
                 
-        except Exception as e:
-            logger.error(f"Error checking rate limit: {e}")
+                if response.status_code == 200:
+                    self.pool.update_from_rate_limit(credential, response.json())
+                    
+            except Exception as e:
+                logger.error(f"Error checking rate limit for {credential.name}: {e}")
+        
+        core = self.pool.utilization()['resources']['core']
+        self.rate_limit_remaining = core['remaining']
+        logger.info(f"📊 Rate limit: {self.rate_limit_remaining:,} remaining "
+                    f"across {len(self.pool)} credential(s)")
         
-        return True
+        return any(c.headroom('core') > 0 for c in self.pool.credentials)
     
     def wait_for_rate_limit(self):
         """Wait until rate limit resets"""
@@ -203,6 +294,47 @@ class GitHubClient:
     
     # API Methods
     
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """GET any endpoint (e.g. '/repos/owner/name/contributors')"""
+        return self._make_request('GET', endpoint, params=params)
+    
+    def get_if_changed(
+        self,
+        endpoint: str,
+        etag: Optional[str],
+        params: Optional[Dict] = None
+    ) -> Tuple[bool, Optional[Any], Optional[str]]:
+        """
+        Conditional GET against an ETag the caller stored itself
+        
+        A 304 costs no quota, so this is the cheap way to ask "has this
+        changed since I last looked?"
+        
+        Returns:
+            (changed, body, etag) - changed is False on 304 Not Modified
+        """
+        meta = {}
+        body = self._make_request('GET', endpoint, params=params, etag=etag, meta=meta)
+        return meta.get('status') != 304, body, meta.get('etag')
+    
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Run a GraphQL query (charged against the separate GraphQL point quota)
+        
+        Returns:
+            The full response ({'data': ..., 'errors': [...]}) - GraphQL
+            reports per-field errors alongside partial data - or None on
+            HTTP error
+            
+        Server errors and timeouts are not retried here: on GraphQL they
+        usually mean the query was too expensive, and GraphQLUserBatcher
+        splits it instead.
+        """
+        return self._make_request(
+            'POST', '/graphql', json_body={'query': query, 'variables': variables or {}},
+            retry_server_errors=False
+        )
+    
     def get_user(self, username: str) -> Optional[Dict]:
         """Get user profile"""
         return self._make_request('GET', f'/users/{username}')
@@ -324,10 +456,14 @@ class GitHubClient:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get client statistics"""
+        with self._lock:
+            stats = dict(self.stats)
         return {
-            **self.stats,
+            **stats,
             'rate_limit_remaining': self.rate_limit_remaining,
-            'rate_limit_reset': datetime.fromtimestamp(self.rate_limit_reset) if self.rate_limit_reset else None
+            'rate_limit_reset': datetime.fromtimestamp(self.rate_limit_reset) if self.rate_limit_reset else None,
+            'credential_pool': self.pool.utilization()['resources'],
+            'cache': self.cache.get_stats() if self.cache else None
         }
     
     def log_stats(self):
@@ -343,5 +479,15 @@ class GitHubClient:
         logger.info(f"Rate limit remaining: {stats['rate_limit_remaining']:,}")
         if stats['rate_limit_reset']:
             logger.info(f"Rate limit resets: {stats['rate_limit_reset']}")
+        self.pool.log_utilization()
+        if self.cache:
+            self.cache.log_stats()
         logger.info("=" * 60)
-
+    
+    def close(self):
+        """Close every thread's pooled connections"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
@@ -0,0 +1,309 @@
+"""
+Batched GraphQL user fetching
+
+REST enrichment costs two requests per user (/users/{u} and
+/users/{u}/repos) and the PR enrichment script one GraphQL query per user.
+GraphQLUserBatcher packs many users into one query using aliases:
+
+    query($u0: String!, $u1: String!, ...) {
+      rateLimit { cost remaining resetAt }
+      u0: user(login: $u0) { ...UserFields }
+      u1: user(login: $u1) { ...UserFields }
+    }
+
+so profile, top repositories/languages and pull-request contributions for
+25-50 users come back in one round trip for a point or two of GraphQL
+quota. Batches are sized to stay under a per-query point budget; a query
+that fails outright (GitHub times out expensive queries with a 502) is
+split in half and retried (later batches stay at the smaller size), and
+aliases that error on their own are retried one user per query.
+
+Results are plain GraphQL user nodes; to_rest_user / to_rest_repos /
+to_pr_data adapt them for EnrichmentEngine._update_profile and
+07_github_pr_enrichment.parse_pr_data.
+"""
+
+import logging
+import math
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .config import GitHubAutomationConfig as Config
+
+logger = logging.getLogger(__name__)
+
+USER_FIELDS = """
+fragment UserFields on User {
+  login
+  name
+  email
+  company
+  bio
+  websiteUrl
+  location
+  twitterUsername
+  isHireable
+  avatarUrl
+  createdAt
+  updatedAt
+  followers { totalCount }
+  following { totalCount }
+  repositories(first: $repoCount, privacy: PUBLIC, ownerAffiliations: OWNER,
+               orderBy: {field: STARGAZERS, direction: DESC}) {
+    totalCount
+    nodes {
+      name
+      stargazerCount
+      forkCount
+      isFork
+      primaryLanguage { name }
+    }
+  }
+  contributionsCollection {
+    pullRequestContributions(first: $prCount) {
+      totalCount
+      nodes {
+        pullRequest {
+          repository {
+            nameWithOwner
+            isFork
+          }
+          merged
+          mergedAt
+          additions
+          deletions
+          changedFiles
+          state
+          createdAt
+        }
+      }
+    }
+  }
+  sponsorshipsAsMaintainer {
+    totalCount
+  }
+}
+"""
+
+# Connections GitHub's cost calculator counts per user: repositories,
+# pullRequestContributions, sponsorshipsAsMaintainer
+CONNECTIONS_PER_USER = 3
+
+# Error types that mean "retrying won't help"
+PERMANENT_ERRORS = {'NOT_FOUND', 'FORBIDDEN'}
+
+
+def build_query(count: int) -> str:
+    """Aliased query for `count` users; aliases match variable names (u0, u1, ...)"""
+    aliases = [f"u{i}" for i in range(count)]
+    declarations = ', '.join(f"${alias}: String!" for alias in aliases)
+    fields = '\n'.join(f"  {alias}: user(login: ${alias}) {{ ...UserFields }}" for alias in aliases)
+    return (
+        f"query({declarations}, $repoCount: Int!, $prCount: Int!) {{\n"
+        f"  rateLimit {{ cost remaining resetAt }}\n"
+        f"{fields}\n"
+        f"}}\n"
+        f"{USER_FIELDS}"
+    )
+
+
+def estimate_cost(count: int) -> int:
+    """
+    GraphQL points a query for `count` users should cost
+
+    GitHub charges one point per 100 connection requests (minimum 1).
+    """
+    return max(1, math.ceil(count * CONNECTIONS_PER_USER / 100))
+
+
+class GraphQLUserBatcher:
+    """
+    Fetch GitHub users in aliased GraphQL batches
+
+    Args:
+        client: GitHubClient (anything with graphql(query, variables))
+        batch_size: Users per query (25-50 works well; larger queries
+            risk GitHub's query timeout)
+        max_cost: Point budget per query; batch_size is reduced to fit
+        repo_count: Top repositories (by stars) fetched per user
+        pr_count: Pull request contributions fetched per user
+    """
+
+    def __init__(
+        self,
+        client,
+        batch_size: int = Config.GRAPHQL_BATCH_SIZE,
+        max_cost: int = Config.GRAPHQL_MAX_COST,
+        repo_count: int = 100,
+        pr_count: int = 100
+    ):
+        self.client = client
+        self.repo_count = repo_count
+        self.pr_count = pr_count
+
+        self.batch_size = max(1, batch_size)
+        while self.batch_size > 1 and estimate_cost(self.batch_size) > max_cost:
+            self.batch_size -= 1
+
+        self.stats = {
+            'users': 0,
+            'fetched': 0,
+            'not_found': 0,
+            'failed': 0,
+            'queries': 0,
+            'splits': 0,
+            'alias_retries': 0,
+            'points_used': 0,
+            'points_remaining': None,
+        }
+        # Shared by EnrichmentEngine.enrich_batch's fetcher threads
+        self._stats_lock = threading.Lock()
+
+    def fetch_users(self, usernames: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch many users
+
+        Returns:
+            username -> GraphQL user node, or None if not found; users whose
+            query failed are left out
+        """
+        logins = list(dict.fromkeys(u for u in usernames if u))
+        results: Dict[str, Optional[Dict]] = {}
+        self._count('users', len(logins))
+
+        start = 0
+        while start < len(logins):
+            # batch_size may shrink while we go if GitHub rejects large queries
+            chunk = logins[start:start + self.batch_size]
+            self._fetch_chunk(chunk, results)
+            start += len(chunk)
+
+        return results
+
+    def _fetch_chunk(self, logins: List[str], results: Dict[str, Optional[Dict]], attempt: int = 0):
+        variables = {f"u{i}": login for i, login in enumerate(logins)}
+        variables.update({'repoCount': self.repo_count, 'prCount': self.pr_count})
+
+        self._count('queries')
+        response = self.client.graphql(build_query(len(logins)), variables)
+        data = response.get('data') if response else None
+        errors = (response or {}).get('errors') or []
+
+        if data is None:
+            rate_limited = any(e.get('type') == 'RATE_LIMITED' for e in errors)
+            if rate_limited and attempt < Config.MAX_RETRIES:
+                # The client's pool has seen the exhausted quota and waits for it
+                return self._fetch_chunk(logins, results, attempt + 1)
+
+            if len(logins) == 1:
+                logger.warning(f"⚠️  GraphQL query failed for {logins[0]}: "
+                               f"{errors[0].get('message') if errors else 'no response'}")
+                self._count('failed')
+                return
+
+            # Too expensive or timed out - halve, retry, and keep later batches smaller
+            self._count('splits')
+            middle = len(logins) // 2
+            if middle < self.batch_size:
+                logger.info(f"🔗 GraphQL batch of {len(logins)} failed, batch size now {middle}")
+                self.batch_size = middle
+            self._fetch_chunk(logins[:middle], results)
+            self._fetch_chunk(logins[middle:], results)
+            return
+
+        self._record_cost(data.get('rateLimit'))
+
+        errors_by_alias: Dict[str, List[Dict]] = {}
+        for error in errors:
+            path = error.get('path') or []
+            if path:
+                errors_by_alias.setdefault(path[0], []).append(error)
+
+        retry = []
+        for i, login in enumerate(logins):
+            alias = f"u{i}"
+            node = data.get(alias)
+            alias_errors = errors_by_alias.get(alias, [])
+
+            if node is not None and not alias_errors:
+                results[login] = node
+                self._count('fetched')
+            elif node is None and (not alias_errors or
+                                   any(e.get('type') in PERMANENT_ERRORS for e in alias_errors)):
+                results[login] = None
+                self._count('not_found')
+            elif len(logins) > 1:
+                retry.append(login)
+            else:
+                # Already on its own and still erroring: give up on this user
+                logger.warning(f"⚠️  GraphQL errors for {login}: {alias_errors[0].get('message')}")
+                self._count('failed')
+
+        for login in retry:
+            self._count('alias_retries')
+            self._fetch_chunk([login], results)
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _record_cost(self, rate_limit: Optional[Dict]):
+        if not rate_limit:
+            return
+        self._count('points_used', rate_limit.get('cost') or 0)
+        self.stats['points_remaining'] = rate_limit.get('remaining')
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['users_per_query'] = round(stats['users'] / stats['queries'], 1) if stats['queries'] else 0.0
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"🔗 GraphQL batches: {stats['fetched']:,}/{stats['users']:,} users in "
+                    f"{stats['queries']:,} queries ({stats['users_per_query']} users/query), "
+                    f"{stats['points_used']:,} points, {stats['splits']} splits, "
+                    f"{stats['alias_retries']} alias retries, {stats['not_found']} not found, "
+                    f"{stats['failed']} failed")
+
+
+def to_rest_user(node: Dict) -> Dict:
+    """GraphQL user node in the shape of GET /users/{username}"""
+    return {
+        'login': node.get('login'),
+        'name': node.get('name'),
+        # GraphQL returns '' where REST returns null
+        'email': node.get('email') or None,
+        'company': node.get('company'),
+        'bio': node.get('bio'),
+        'blog': node.get('websiteUrl') or '',
+        'location': node.get('location'),
+        'twitter_username': node.get('twitterUsername'),
+        'followers': (node.get('followers') or {}).get('totalCount', 0),
+        'following': (node.get('following') or {}).get('totalCount', 0),
+        'public_repos': (node.get('repositories') or {}).get('totalCount', 0),
+        'hireable': node.get('isHireable'),
+        'avatar_url': node.get('avatarUrl'),
+        'created_at': node.get('createdAt'),
+        'updated_at': node.get('updatedAt'),
+    }
+
+
+def to_rest_repos(node: Dict) -> List[Dict]:
+    """Top repositories in the shape of GET /users/{username}/repos"""
+    return [
+        {
+            'name': repo['name'],
+            'stargazers_count': repo.get('stargazerCount', 0),
+            'forks_count': repo.get('forkCount', 0),
+            'fork': repo.get('isFork', False),
+            'language': (repo.get('primaryLanguage') or {}).get('name'),
+        }
+        for repo in (node.get('repositories') or {}).get('nodes') or []
+    ]
+
+
+def to_pr_data(node: Dict) -> Dict:
+    """GraphQL user node in the shape 07_github_pr_enrichment.parse_pr_data expects"""
+    return {'user': node}
@@ -0,0 +1,227 @@
+"""
+Persistent conditional-request cache for GitHub REST responses
+
+Re-enrichment fetches /users/{u} and /users/{u}/repos again every
+STALE_DAYS even when nothing changed. GitHub answers a request carrying
+If-None-Match / If-Modified-Since with 304 Not Modified when the resource
+is unchanged, and 304s don't count against the rate limit. ResponseCache
+stores each GET's ETag, Last-Modified and body in SQLite so clients can
+send those validators and reuse the stored body on a 304.
+
+One file is shared by every GitHubClient / AsyncGitHubClient in all
+processes (GitHubIngestionService, GitHubStatsEnricher, the discovery and
+enrichment scripts); SQLite in WAL mode handles the concurrent writers.
+
+Entries not validated for HTTP_CACHE_TTL_DAYS are ignored and pruned, and
+the file is held to HTTP_CACHE_MAX_ENTRIES by evicting the least recently
+validated entries (a 304 counts as a use).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlencode
+
+from .config import GitHubAutomationConfig as Config
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """A stored response and its validators"""
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], body: str):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+
+    def validators(self) -> Dict[str, str]:
+        """Headers that turn the next request into a conditional one"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    """
+    SQLite-backed ETag / Last-Modified cache
+
+    Keys combine a credential scope, the URL and its query parameters, so
+    responses fetched with one set of credentials are never served to
+    another. Thread-safe.
+
+    Args:
+        path: SQLite file (default Config.HTTP_CACHE_PATH)
+        ttl_days: Entries not validated for this long are treated as absent
+        max_entries: Size bound; pruning evicts the least recently validated
+    """
+
+    PRUNE_EVERY = 1000  # Stores between prunes
+
+    def __init__(self, path: Union[str, Path, None] = None, ttl_days: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.path = str(path or Config.HTTP_CACHE_PATH)
+        self.ttl_seconds = (Config.HTTP_CACHE_TTL_DAYS if ttl_days is None else ttl_days) * 86400
+        self.max_entries = Config.HTTP_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    validated_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_validated_at ON http_cache (validated_at)")
+            self._conn.commit()
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,      # 304 Not Modified - body reused, no quota spent
+            'misses': 0,
+            'stores': 0,
+            'evicted': 0,
+        }
+        self.prune()
+
+    @staticmethod
+    def key(scope: str, url: str, params: Optional[Dict] = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        raw = f"{scope}\n{url}?{query}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            self.stats['lookups'] += 1
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE key = ? AND validated_at >= ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return CachedResponse(*row)
+
+    def store(self, key: str, url: str, headers: Dict[str, str], body: str):
+        """Record a full (charged) response; save it if GitHub gave it a validator"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        with self._lock:
+            self.stats['misses'] += 1
+        if not etag and not last_modified:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO http_cache (key, url, etag, last_modified, body, stored_at, validated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body = excluded.body,
+                    stored_at = excluded.stored_at,
+                    validated_at = excluded.validated_at
+            """, (key, url, etag, last_modified, body, now, now))
+            self._conn.commit()
+            self.stats['stores'] += 1
+            prune = self.stats['stores'] % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def record_hit(self, key: str):
+        """A 304 confirmed the stored body is still current"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET validated_at = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+            self.stats['hits'] += 1
+
+    def prune(self) -> int:
+        """Delete expired entries, then the least recently validated beyond max_entries"""
+        with self._lock:
+            evicted = self._conn.execute(
+                "DELETE FROM http_cache WHERE validated_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            evicted += self._conn.execute("""
+                DELETE FROM http_cache WHERE key IN (
+                    SELECT key FROM http_cache
+                    ORDER BY validated_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+            self._conn.commit()
+            self.stats['evicted'] += evicted
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+            stats = dict(self.stats)
+
+        served = stats['hits'] + stats['misses']
+        return {
+            **stats,
+            'entries': entries,
+            # Every 304 is a request GitHub didn't charge
+            'quota_saved': stats['hits'],
+            'hit_rate': round(stats['hits'] / served, 3) if served else 0.0,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"🗄️  HTTP cache: {stats['hits']:,} hits / {stats['misses']:,} misses "
+                    f"({stats['hit_rate']:.0%}), {stats['quota_saved']:,} requests of quota saved, "
+                    f"{stats['entries']:,} entries ({stats['evicted']:,} evicted)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(path: Union[str, Path, None] = None) -> Optional[ResponseCache]:
+    """
+    Process-wide cache for a path (default Config.HTTP_CACHE_PATH)
+
+    Returns None when the cache is disabled (GITHUB_HTTP_CACHE=0).
+    """
+    if not Config.HTTP_CACHE_ENABLED and path is None:
+        return None
+
+    path = str(path or Config.HTTP_CACHE_PATH)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ResponseCache(path)
+        return _caches[path]
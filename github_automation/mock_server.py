@@ -0,0 +1,381 @@
+"""
+Local mock of the GitHub REST API for throughput benchmarks and tests
+
+Serves deterministic fake users, repos, orgs and contributors with
+realistic X-RateLimit headers (a separate quota per token and resource),
+ETags with free 304 Not Modified responses, aliased GraphQL user queries,
+optional per-request latency, and optional secondary-rate-limit responses.
+
+GraphQL logins starting with "ghost-" don't exist; "flaky-" logins error
+unless queried on their own.
+
+Usage:
+    python3 -m github_automation.mock_server --port 8765 --latency 0.05
+
+    server = MockGitHubServer(latency=0.05).start()
+    client = GitHubClient(base_url=server.base_url)
+    ...
+    server.stop()
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _fake_user(login: str) -> Dict:
+    n = sum(ord(c) for c in login)
+    return {
+        'login': login,
+        'id': n,
+        'type': 'User',
+        'name': login.replace('-', ' ').title(),
+        'email': f"{login}@example.com" if n % 3 == 0 else None,
+        'company': '@mockorg' if n % 2 == 0 else None,
+        'bio': None,
+        'blog': '',
+        'location': 'Remote',
+        'twitter_username': None,
+        'followers': n % 500,
+        'following': n % 50,
+        'public_repos': 5,
+        'hireable': None,
+        'avatar_url': f"https://avatars.example.com/{login}",
+        'html_url': f"https://github.com/{login}",
+        'created_at': '2015-01-01T00:00:00Z',
+        'updated_at': '2025-01-01T00:00:00Z',
+    }
+
+
+def _fake_repo(owner: str, i: int) -> Dict:
+    languages = ['Python', 'Rust', 'Solidity', 'TypeScript', 'Go']
+    return {
+        'name': f"repo-{i}",
+        'full_name': f"{owner}/repo-{i}",
+        'owner': {'login': owner},
+        'stargazers_count': (i * 37) % 1000,
+        'forks_count': i % 40,
+        'language': languages[i % len(languages)],
+        'description': None,
+        'html_url': f"https://github.com/{owner}/repo-{i}",
+        'fork': False,
+    }
+
+
+def _fake_graphql_user(login: str) -> Dict:
+    user = _fake_user(login)
+    repos = [_fake_repo(login, i) for i in range(5)]
+    return {
+        'login': login,
+        'name': user['name'],
+        'email': user['email'] or '',
+        'company': user['company'],
+        'bio': None,
+        'websiteUrl': None,
+        'location': user['location'],
+        'twitterUsername': None,
+        'isHireable': False,
+        'avatarUrl': user['avatar_url'],
+        'createdAt': user['created_at'],
+        'updatedAt': user['updated_at'],
+        'followers': {'totalCount': user['followers']},
+        'following': {'totalCount': user['following']},
+        'repositories': {
+            'totalCount': len(repos),
+            'nodes': [
+                {'name': r['name'], 'stargazerCount': r['stargazers_count'], 'forkCount': r['forks_count'],
+                 'isFork': False, 'primaryLanguage': {'name': r['language']}}
+                for r in sorted(repos, key=lambda r: r['stargazers_count'], reverse=True)
+            ],
+        },
+        'contributionsCollection': {'pullRequestContributions': {
+            'totalCount': 2,
+            'nodes': [
+                {'pullRequest': {
+                    'repository': {'nameWithOwner': f"{login}/repo-{i}", 'isFork': False},
+                    'merged': i == 0,
+                    'mergedAt': '2025-01-01T00:00:00Z' if i == 0 else None,
+                    'additions': 120, 'deletions': 30, 'changedFiles': 4,
+                    'state': 'MERGED' if i == 0 else 'OPEN',
+                    'createdAt': '2024-12-01T00:00:00Z',
+                }}
+                for i in range(2)
+            ],
+        }},
+        'sponsorshipsAsMaintainer': {'totalCount': 0},
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'MockGitHubServer'
+    protocol_version = 'HTTP/1.1'  # keep-alive, like api.github.com
+
+    def log_message(self, format, *args):
+        pass
+
+    def _quota_key(self, path: str):
+        if path == '/graphql':
+            resource = 'graphql'
+        elif path.startswith('/search/'):
+            resource = 'search'
+        else:
+            resource = 'core'
+        return self.headers.get('Authorization', ''), resource
+
+    def _send(self, status: int, body, extra_headers: Optional[Dict] = None):
+        payload = json.dumps(body).encode() if status != 304 else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        headers = self.server.rate_limit_headers(*self._quota_key(urlparse(self.path).path))
+        for key, value in {**headers, **(extra_headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _page(self, items, query):
+        per_page = int(query.get('per_page', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        return items[(page - 1) * per_page:page * per_page]
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+
+        if path == '/rate_limit':
+            token = self.headers.get('Authorization', '')
+            self._send(200, {'resources': {
+                resource: server.quota(token, resource) for resource in ('core', 'search')
+            }})
+            return
+
+        routes = [
+            (r'^/users/([^/]+)$', lambda m: _fake_user(m.group(1))),
+            (r'^/users/([^/]+)/repos$',
+             lambda m: self._page([_fake_repo(m.group(1), i) for i in range(server.repos_per_owner)], query)),
+            (r'^/orgs/([^/]+)$', lambda m: {'login': m.group(1), 'name': m.group(1).title()}),
+            (r'^/orgs/([^/]+)/members$',
+             lambda m: self._page([_fake_user(f"{m.group(1)}-member-{i}") for i in range(25)], query)),
+            (r'^/orgs/([^/]+)/repos$',
+             lambda m: self._page([_fake_repo(m.group(1), i) for i in range(server.repos_per_owner)], query)),
+            (r'^/repos/([^/]+)/([^/]+)$', lambda m: {
+                'full_name': f"{m.group(1)}/{m.group(2)}",
+                'pushed_at': server.pushed_at.get(f"{m.group(1)}/{m.group(2)}", '2025-01-01T00:00:00Z'),
+            }),
+            (r'^/repos/([^/]+)/([^/]+)/contributors$',
+             lambda m: self._page([
+                 {**_fake_user(f"{m.group(2)}-dev-{i}"), 'contributions': 500 - i}
+                 for i in range(server.contributors_per_repo)
+             ], query)),
+            (r'^/search/users$',
+             lambda m: {'total_count': 3, 'items': [_fake_user(f"search-{i}") for i in range(3)]}),
+        ]
+
+        body, status_code = {'message': 'Not Found'}, 404
+        for pattern, build in routes:
+            match = re.match(pattern, path)
+            if match:
+                body, status_code = build(match), 200
+                break
+
+        # Like GitHub: a matching If-None-Match gets a 304 that costs no quota
+        etag = None
+        if status_code == 200:
+            etag = f'"{hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                server.count_not_modified()
+                self._send(304, None, {'ETag': etag})
+                return
+
+        status = server.count_request(*self._quota_key(path))
+        if status == 'secondary':
+            self._send(403, {'message': 'You have exceeded a secondary rate limit.'},
+                       {'Retry-After': str(server.retry_after)})
+            return
+        if status == 'exhausted':
+            self._send(403, {'message': 'API rate limit exceeded'})
+            return
+
+        self._send(status_code, body, {'ETag': etag} if etag else None)
+
+    def do_POST(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if urlparse(self.path).path != '/graphql':
+            self._send(404, {'message': 'Not Found'})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        variables = json.loads(self.rfile.read(length) or b'{}').get('variables') or {}
+        aliases = {k: v for k, v in variables.items() if re.match(r'^u\d+$', k)}
+
+        server.count_graphql_query(len(aliases))
+        if server.graphql_max_users and len(aliases) > server.graphql_max_users:
+            # GitHub's answer to an over-expensive query
+            self._send(502, {'message': 'Server Error'})
+            return
+
+        status = server.count_request(*self._quota_key('/graphql'))
+        if status == 'exhausted':
+            self._send(200, {'data': None, 'errors': [
+                {'type': 'RATE_LIMITED', 'message': 'API rate limit exceeded'}
+            ]})
+            return
+
+        data = {'rateLimit': {'cost': max(1, -(-len(aliases) * 3 // 100)), 'remaining': 5000,
+                              'resetAt': '2030-01-01T00:00:00Z'}}
+        errors = []
+        for alias, login in aliases.items():
+            if login.startswith('ghost-'):
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                               'message': f"Could not resolve to a User with the login of '{login}'."})
+            elif login.startswith('flaky-') and len(aliases) > 1:
+                data[alias] = None
+                errors.append({'path': [alias, 'contributionsCollection'],
+                               'message': 'Something went wrong while executing your query.'})
+            else:
+                data[alias] = _fake_graphql_user(login)
+
+        self._send(200, {'data': data, **({'errors': errors} if errors else {})})
+
+
+
+class MockGitHubServer(ThreadingHTTPServer):
+    """
+    Threaded fake GitHub API
+
+    Args:
+        latency: Seconds to sleep per request (simulates network RTT)
+        limit: Requests per rate-limit window, per token (search gets 30)
+        window: Seconds until the window resets
+        secondary_every: Return a secondary rate limit on every Nth request (0 = never)
+        graphql_max_users: Fail GraphQL queries with more aliases than this with 502 (0 = never)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 limit: int = 5000, window: float = 3600, secondary_every: int = 0,
+                 retry_after: int = 1, repos_per_owner: int = 12, contributors_per_repo: int = 150,
+                 graphql_max_users: int = 0):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.secondary_every = secondary_every
+        self.retry_after = retry_after
+        self.repos_per_owner = repos_per_owner
+        self.contributors_per_repo = contributors_per_repo
+
+        self.requests = 0
+        self.requests_by_token: Dict[str, int] = {}
+        self.not_modified = 0
+        self.graphql_max_users = graphql_max_users
+        self.graphql_queries = []  # users per GraphQL query, in order
+        self.pushed_at: Dict[str, str] = {}  # full_name -> pushed_at override, to simulate pushes
+        self._quotas: Dict = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _window(self, token: str, resource: str) -> Dict:
+        """Current quota window for a token/resource; caller holds the lock"""
+        now = time.time()
+        window = self._quotas.get((token, resource))
+        if window is None or now >= window['reset']:
+            limit = 30 if resource == 'search' else self.limit
+            window = {'limit': limit, 'remaining': limit, 'reset': now + self.window}
+            self._quotas[(token, resource)] = window
+        return window
+
+    def set_remaining(self, token: str, remaining: int, resource: str = 'core'):
+        """Start a token's window with only `remaining` requests left"""
+        with self._lock:
+            self._window(f"token {token}", resource)['remaining'] = remaining
+
+    def quota(self, token: str, resource: str = 'core') -> Dict:
+        with self._lock:
+            window = self._window(token, resource)
+            return {'limit': window['limit'], 'remaining': window['remaining'],
+                    'reset': int(window['reset'])}
+
+    def count_request(self, token: str = '', resource: str = 'core') -> str:
+        """Account one request; returns 'ok', 'secondary' or 'exhausted'"""
+        with self._lock:
+            window = self._window(token, resource)
+
+            self.requests += 1
+            self.requests_by_token[token] = self.requests_by_token.get(token, 0) + 1
+            if self.secondary_every and self.requests % self.secondary_every == 0:
+                return 'secondary'
+            if window['remaining'] <= 0:
+                return 'exhausted'
+
+            window['remaining'] -= 1
+            return 'ok'
+
+    def count_graphql_query(self, users: int):
+        with self._lock:
+            self.graphql_queries.append(users)
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def rate_limit_headers(self, token: str = '', resource: str = 'core') -> Dict[str, str]:
+        quota = self.quota(token, resource)
+        return {
+            'X-RateLimit-Limit': str(quota['limit']),
+            'X-RateLimit-Remaining': str(quota['remaining']),
+            'X-RateLimit-Reset': str(quota['reset']),
+            'X-RateLimit-Resource': resource,
+        }
+
+    def start(self) -> 'MockGitHubServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local mock GitHub API')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per request')
+    parser.add_argument('--limit', type=int, default=5000, help='Requests per window')
+    parser.add_argument('--secondary-every', type=int, default=0,
+                        help='Return a secondary rate limit every N requests')
+    args = parser.parse_args()
+
+    server = MockGitHubServer(port=args.port, latency=args.latency, limit=args.limit,
+                              secondary_every=args.secondary_every)
+    print(f"🧪 Mock GitHub API on {server.base_url} (latency {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Metrics helpers for staged, queue-connected pipelines
+
+EnrichmentEngine.enrich_batch runs fetchers, a parser and a batched writer
+as threads joined by bounded queues. MeteredQueue records how full each
+queue gets and how long producers were blocked on it (backpressure);
+StageMetrics records items and busy time per stage, so a run shows which
+stage is the bottleneck.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Marks the end of a stage's input
+SENTINEL = object()
+
+
+class MeteredQueue(queue.Queue):
+    """Bounded queue that tracks depth and producer blocking"""
+
+    def __init__(self, name: str, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.name = name
+        self._metrics_lock = threading.Lock()
+        self.max_depth = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        full = self.full()
+        started = time.time()
+        super().put(item, block, timeout)
+        depth = self.qsize()
+
+        with self._metrics_lock:
+            if full:
+                self.blocked_puts += 1
+                self.blocked_seconds += time.time() - started
+            self.max_depth = max(self.max_depth, depth)
+            self.depth_total += depth
+            self.depth_samples += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                'maxsize': self.maxsize,
+                'depth': self.qsize(),
+                'max_depth': self.max_depth,
+                'avg_depth': round(self.depth_total / self.depth_samples, 1) if self.depth_samples else 0.0,
+                'blocked_puts': self.blocked_puts,
+                'blocked_seconds': round(self.blocked_seconds, 2),
+            }
+
+
+class StageMetrics:
+    """Items handled and time spent working by one stage (all its threads)"""
+
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, items: int, seconds: float):
+        with self._lock:
+            self.items += items
+            self.busy_seconds += seconds
+
+    def finish(self):
+        with self._lock:
+            self.finished = self.finished or time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = (self.finished or time.time()) - self.started
+            return {
+                'workers': self.workers,
+                'items': self.items,
+                'busy_seconds': round(self.busy_seconds, 2),
+                'items_per_second': round(self.items / elapsed, 1) if elapsed > 0 else 0.0,
+                # Share of the run this stage's threads spent working
+                'utilization': round(self.busy_seconds / (elapsed * self.workers), 2) if elapsed > 0 else 0.0,
+            }
@@ -1,13 +1,24 @@
 """
 Queue Manager for GitHub profile enrichment
 
-Manages priority queue of profiles to enrich, with status tracking
+Manages priority queue of profiles to enrich, with status tracking.
+
+Work is claimed from the enrichment_job table
+(migration_scripts/15_enrichment_job_queue.sql) with FOR UPDATE SKIP LOCKED,
+so any number of workers can run at once without processing the same
+profiles. Each claim is a lease; a worker that dies stops heartbeating and
+its jobs return to pending once the lease expires.
 """
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
 import psycopg2
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
@@ -17,26 +28,47 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Arbitrary key for pg_try_advisory_xact_lock so only one worker refills the queue at a time
+ENQUEUE_LOCK_ID = 15_0001
+
 
 class QueueManager:
     """
     Manages the queue of GitHub profiles for enrichment
     
     Features:
-    - Priority-based queueing
-    - Status tracking
-    - Checkpoint/resume support
+    - Priority-based queueing (priority materialized on enrichment_job)
+    - Multi-worker claiming with FOR UPDATE SKIP LOCKED
+    - Leases with heartbeats; expired leases are recovered
     - Statistics and monitoring
     """
     
-    def __init__(self):
+    # Columns handed to EnrichmentEngine for each claimed job
+    PROFILE_COLUMNS = """
+        gp.github_profile_id,
+        gp.github_username,
+        gp.github_email,
+        gp.github_name,
+        gp.github_company,
+        gp.location,
+        gp.bio,
+        gp.followers,
+        gp.last_enriched
+    """
+    
+    def __init__(self, worker_id: Optional[str] = None):
         self.conn = get_db_connection(use_pool=False)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
         self.stats = {
             'queued': 0,
             'processing': 0,
             'completed': 0,
-            'failed': 0
+            'failed': 0,
+            'claimed': 0,
+            'recovered': 0
         }
+        # time.monotonic() of this worker's last enqueue_stale scan
+        self.last_refill: Optional[float] = None
     
     def calculate_priority(self, profile: Dict) -> int:
         """
@@ -73,6 +105,37 @@ class QueueManager:
         
         return priority
     
+    @staticmethod
+    def priority_sql(alias: str = '') -> str:
+        """
+        calculate_priority as a SQL expression, so priority can be computed
+        and materialized in the database instead of in Python
+        """
+        c = f"{alias}." if alias else ''
+        high_followers = int(AutoConfig.PRIORITY_HIGH_FOLLOWERS)
+        return f"""(
+            CASE WHEN NULLIF({c}github_email, '') IS NOT NULL THEN {int(AutoConfig.PRIORITY_HAS_EMAIL)} ELSE 0 END
+            + CASE WHEN NULLIF({c}location, '') IS NOT NULL THEN {int(AutoConfig.PRIORITY_HAS_LOCATION)} ELSE 0 END
+            + CASE WHEN {c}followers > 1000 THEN {high_followers}
+                   WHEN {c}followers > 100 THEN {high_followers // 2}
+                   ELSE 0 END
+            + CASE WHEN COALESCE(NULLIF({c}bio, ''), NULLIF({c}github_name, ''),
+                                 NULLIF({c}github_company, '')) IS NOT NULL
+                   THEN {int(AutoConfig.PRIORITY_RECENT_ACTIVITY)} ELSE 0 END
+        )"""
+    
+    @staticmethod
+    def base_priority_sql(alias: str = '') -> str:
+        c = f"{alias}." if alias else ''
+        return f"""(
+            CASE
+                WHEN {c}last_enriched IS NULL THEN 100
+                WHEN {c}bio IS NULL THEN 90
+                WHEN {c}github_email IS NULL THEN 80
+                ELSE 50
+            END
+        )"""
+    
     def get_unenriched_profiles(self, limit: Optional[int] = None) -> List[Dict]:
         """
         Get profiles that need enrichment, ordered by priority
@@ -82,6 +145,9 @@ class QueueManager:
         - Stale (last_enriched > STALE_DAYS ago)
         - Has minimal data (bio IS NULL, etc.)
         
+        Read-only preview; workers should use get_batch(), which claims
+        the profiles it returns.
+        
         Returns:
             List of profile dicts with priority scores
         """
@@ -89,63 +155,222 @@ class QueueManager:
         
         stale_date = datetime.now() - timedelta(days=AutoConfig.STALE_DAYS)
         
-        query = """
-            SELECT 
-                github_profile_id,
-                github_username,
-                github_email,
-                github_name,
-                github_company,
-                location,
-                bio,
-                followers,
-                last_enriched,
-                CASE
-                    WHEN last_enriched IS NULL THEN 100
-                    WHEN bio IS NULL THEN 90
-                    WHEN github_email IS NULL THEN 80
-                    ELSE 50
-                END as base_priority
-            FROM github_profile
+        query = f"""
+            SELECT {self.PROFILE_COLUMNS},
+                {self.base_priority_sql('gp')} AS base_priority,
+                {self.priority_sql('gp')} AS priority
+            FROM github_profile gp
             WHERE 
-                (last_enriched IS NULL OR last_enriched < %s)
-                AND github_username IS NOT NULL
-            ORDER BY base_priority DESC, followers DESC NULLS LAST
+                (gp.last_enriched IS NULL OR gp.last_enriched < %s)
+                AND gp.github_username IS NOT NULL
+            ORDER BY priority DESC, base_priority DESC, gp.followers DESC NULLS LAST
         """
         
+        params = [stale_date]
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT %s"
+            params.append(limit)
         
-        cursor.execute(query, (stale_date,))
+        cursor.execute(query, params)
+        profiles = [dict(row) for row in cursor.fetchall()]
+        
+        logger.info(f"📋 Found {len(profiles):,} profiles needing enrichment")
         
-        profiles = []
-        for row in cursor.fetchall():
-            profile = dict(row)
-            # Calculate dynamic priority
-            profile['priority'] = self.calculate_priority(profile)
-            profiles.append(profile)
+        return profiles
+    
+    def enqueue_stale(self) -> int:
+        """
+        Add every profile needing enrichment to enrichment_job
         
-        # Sort by calculated priority
-        profiles.sort(key=lambda x: x['priority'], reverse=True)
+        Finished jobs whose profile has gone stale again are re-queued, and
+        so are failed jobs once JOB_FAILED_RETRY_HOURS have passed since
+        they failed; pending and running jobs are left alone.
         
-        logger.info(f"📋 Found {len(profiles):,} profiles needing enrichment")
+        The scan locks every matching job row, so it runs under an advisory
+        lock: when another worker is already refilling, this returns 0
+        instead of queueing behind it.
+        
+        Returns:
+            Number of jobs queued
+        """
+        cursor = self.conn.cursor()
+        stale_date = datetime.now() - timedelta(days=AutoConfig.STALE_DAYS)
+        self.last_refill = time.monotonic()
+        
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (ENQUEUE_LOCK_ID,))
+        if not cursor.fetchone()['locked']:
+            self.conn.rollback()
+            return 0
+        
+        cursor.execute(f"""
+            INSERT INTO enrichment_job (github_profile_id, priority, base_priority)
+            SELECT gp.github_profile_id, {self.priority_sql('gp')}, {self.base_priority_sql('gp')}
+            FROM github_profile gp
+            WHERE 
+                (gp.last_enriched IS NULL OR gp.last_enriched < %s)
+                AND gp.github_username IS NOT NULL
+            ON CONFLICT (github_profile_id) DO UPDATE SET
+                status = 'pending',
+                priority = EXCLUDED.priority,
+                base_priority = EXCLUDED.base_priority,
+                attempts = 0,
+                last_error = NULL,
+                enqueued_at = NOW(),
+                updated_at = NOW()
+            WHERE enrichment_job.status = 'done'
+               OR (enrichment_job.status = 'failed'
+                   AND enrichment_job.updated_at < NOW() - make_interval(hours => %s))
+        """, (stale_date, AutoConfig.JOB_FAILED_RETRY_HOURS))
+        
+        queued = cursor.rowcount
+        self.conn.commit()
+        self.stats['queued'] += queued
+        
+        if queued:
+            logger.info(f"📥 Queued {queued:,} profiles for enrichment")
+        return queued
+    
+    def recover_expired_leases(self) -> int:
+        """Return jobs of workers that stopped heartbeating to pending"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE enrichment_job
+            SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                leased_by = NULL,
+                lease_expires_at = NULL,
+                last_error = COALESCE(last_error, 'lease expired'),
+                updated_at = NOW()
+            WHERE status = 'running' AND lease_expires_at < NOW()
+        """, (AutoConfig.JOB_MAX_ATTEMPTS,))
+        
+        recovered = cursor.rowcount
+        self.conn.commit()
+        self.stats['recovered'] += recovered
+        
+        if recovered:
+            logger.warning(f"♻️  Recovered {recovered:,} jobs with expired leases")
+        return recovered
+    
+    def claim_batch(self, batch_size: int) -> List[Dict]:
+        """
+        Lease the next batch_size pending jobs for this worker
+        
+        Rows locked by other workers' claims are skipped rather than waited
+        on, and the pending-only index means the cost is O(batch_size).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            WITH next_jobs AS (
+                SELECT github_profile_id
+                FROM enrichment_job
+                WHERE status = 'pending'
+                ORDER BY priority DESC, base_priority DESC, enqueued_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ), leased AS (
+                UPDATE enrichment_job j
+                SET status = 'running',
+                    leased_by = %s,
+                    lease_expires_at = NOW() + make_interval(secs => %s),
+                    heartbeat_at = NOW(),
+                    attempts = j.attempts + 1,
+                    updated_at = NOW()
+                FROM next_jobs
+                WHERE j.github_profile_id = next_jobs.github_profile_id
+                RETURNING j.github_profile_id, j.priority, j.base_priority
+            )
+            SELECT {self.PROFILE_COLUMNS}, leased.priority, leased.base_priority
+            FROM leased
+            JOIN github_profile gp ON gp.github_profile_id = leased.github_profile_id
+            ORDER BY leased.priority DESC, leased.base_priority DESC
+        """, (batch_size, self.worker_id, AutoConfig.JOB_LEASE_SECONDS))
+        
+        profiles = [dict(row) for row in cursor.fetchall()]
+        self.conn.commit()
         
+        self.stats['claimed'] += len(profiles)
+        self.stats['processing'] = len(profiles)
         return profiles
     
     def get_batch(self, batch_size: int = None) -> List[Dict]:
         """
-        Get next batch of profiles to process
+        Claim the next batch of profiles to process
+        
+        Recovers expired leases, claims pending jobs, and refills the queue
+        from github_profile when it has run dry (at most once per
+        JOB_REFILL_INTERVAL_SECONDS per worker, so short claims at the tail
+        of the queue don't rescan github_profile every batch).
         
         Args:
             batch_size: Number of profiles to return
             
         Returns:
-            List of profiles to enrich
+            List of profiles to enrich (leased to this worker)
         """
         if batch_size is None:
             batch_size = AutoConfig.BATCH_SIZE
         
-        return self.get_unenriched_profiles(limit=batch_size)
+        self.recover_expired_leases()
+        profiles = self.claim_batch(batch_size)
+        
+        if len(profiles) < batch_size and self.refill_due() and self.enqueue_stale():
+            profiles += self.claim_batch(batch_size - len(profiles))
+        
+        logger.info(f"📋 Claimed {len(profiles):,} profiles as {self.worker_id}")
+        return profiles
+    
+    def refill_due(self) -> bool:
+        """Whether JOB_REFILL_INTERVAL_SECONDS have passed since this worker's last refill"""
+        return (self.last_refill is None
+                or time.monotonic() - self.last_refill >= AutoConfig.JOB_REFILL_INTERVAL_SECONDS)
+    
+    def heartbeat(self, profile_ids: List[str]) -> int:
+        """Extend this worker's lease on jobs it is still processing"""
+        if not profile_ids:
+            return 0
+        
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE enrichment_job
+            SET lease_expires_at = NOW() + make_interval(secs => %s),
+                heartbeat_at = NOW()
+            WHERE github_profile_id = ANY(%s::uuid[])
+              AND status = 'running'
+              AND leased_by = %s
+        """, (AutoConfig.JOB_LEASE_SECONDS, [str(pid) for pid in profile_ids], self.worker_id))
+        
+        extended = cursor.rowcount
+        self.conn.commit()
+        return extended
+    
+    @contextmanager
+    def lease_heartbeat(self, profile_ids: List[str]):
+        """
+        Heartbeat profile_ids in the background while the block runs
+        
+        Uses its own connection so it never interleaves with the caller's
+        transactions.
+        """
+        stop = threading.Event()
+        interval = AutoConfig.JOB_LEASE_SECONDS / 3
+        
+        def beat():
+            heartbeat_queue = QueueManager(worker_id=self.worker_id)
+            try:
+                while not stop.wait(interval):
+                    heartbeat_queue.heartbeat(profile_ids)
+            except Exception as e:
+                logger.error(f"❌ Lease heartbeat failed: {e}")
+            finally:
+                heartbeat_queue.close()
+        
+        thread = threading.Thread(target=beat, name='enrichment-heartbeat', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
     
     def mark_enriched(
         self,
@@ -156,6 +381,10 @@ class QueueManager:
         """
         Mark a profile as enriched
         
+        Only updates the job (and the profile's last_enriched) while this
+        worker still holds its lease; a worker whose lease expired must not
+        overwrite the outcome of the worker that took the job over.
+        
         Args:
             profile_id: GitHub profile ID
             success: Whether enrichment succeeded
@@ -165,19 +394,38 @@ class QueueManager:
         
         if success:
             cursor.execute("""
-                UPDATE github_profile
-                SET 
-                    last_enriched = NOW(),
-                    updated_at = NOW()
-                WHERE github_profile_id = %s
-            """, (profile_id,))
+                UPDATE enrichment_job
+                SET status = 'done', leased_by = NULL, lease_expires_at = NULL,
+                    last_error = NULL, updated_at = NOW()
+                WHERE github_profile_id = %s AND leased_by = %s
+            """, (profile_id, self.worker_id))
+            leased = cursor.rowcount
+            if leased:
+                cursor.execute("""
+                    UPDATE github_profile
+                    SET 
+                        last_enriched = NOW(),
+                        updated_at = NOW()
+                    WHERE github_profile_id = %s
+                """, (profile_id,))
             self.stats['completed'] += 1
         else:
             # Log failure but don't update last_enriched
-            # This allows retry on next run
+            # The job goes back to pending until it runs out of attempts
             logger.error(f"❌ Failed to enrich {profile_id}: {error}")
+            cursor.execute("""
+                UPDATE enrichment_job
+                SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+                    leased_by = NULL, lease_expires_at = NULL,
+                    last_error = %s, updated_at = NOW()
+                WHERE github_profile_id = %s AND leased_by = %s
+            """, (AutoConfig.JOB_MAX_ATTEMPTS, error, profile_id, self.worker_id))
+            leased = cursor.rowcount
             self.stats['failed'] += 1
         
+        if not leased:
+            logger.warning(f"⚠️  Lease on {profile_id} was lost - job left to its current worker")
+        
         self.conn.commit()
     
     def get_statistics(self) -> Dict:
@@ -215,11 +463,21 @@ class QueueManager:
         """)
         matched = cursor.fetchone()['count']
         
+        # Job queue
+        cursor.execute("""
+            SELECT status, COUNT(*) as count
+            FROM enrichment_job
+            GROUP BY status
+        """)
+        jobs = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        jobs.update({row['status']: row['count'] for row in cursor.fetchall()})
+        
         return {
             'total': total,
             'enriched': enriched,
             'stale': stale,
             'matched': matched,
+            'jobs': jobs,
             'enrichment_coverage': (enriched / total * 100) if total > 0 else 0,
             'match_rate': (matched / total * 100) if total > 0 else 0,
             **self.stats
@@ -236,8 +494,11 @@ class QueueManager:
         logger.info(f"Enriched: {stats['enriched']:,} ({stats['enrichment_coverage']:.1f}%)")
         logger.info(f"Stale/Pending: {stats['stale']:,}")
         logger.info(f"Matched to people: {stats['matched']:,} ({stats['match_rate']:.1f}%)")
+        logger.info(f"Jobs: {stats['jobs']['pending']:,} pending, {stats['jobs']['running']:,} running, "
+                    f"{stats['jobs']['failed']:,} failed")
         logger.info("")
         logger.info(f"This session:")
+        logger.info(f"  Claimed: {stats['claimed']:,}")
         logger.info(f"  Completed: {stats['completed']:,}")
         logger.info(f"  Failed: {stats['failed']:,}")
         logger.info("=" * 60)
@@ -261,6 +522,14 @@ class QueueManager:
         """, (cutoff_date,))
         
         reset_count = cursor.rowcount
+        
+        # Jobs that ran out of attempts get another round
+        cursor.execute("""
+            UPDATE enrichment_job
+            SET status = 'pending', attempts = 0, updated_at = NOW()
+            WHERE status = 'failed' AND updated_at < %s
+        """, (cutoff_date,))
+        reset_count += cursor.rowcount
         self.conn.commit()
         
         logger.info(f"🔄 Reset {reset_count:,} stale/failed profiles for retry")
@@ -0,0 +1,194 @@
+"""
+Adaptive rate limiting for GitHub API clients
+
+The old clients slept a fixed 0.72s before every call (~1.4 req/s) whatever
+the quota said. TokenBucket instead:
+
+- treats the quota GitHub reports (X-RateLimit-Remaining / Reset) as the
+  hard budget: requests flow freely until only `buffer` remain, then wait
+  for the reset
+- smooths bursts with a token bucket whose rate adapts AIMD-style: halved
+  when GitHub returns a secondary rate limit, crept back up on success
+
+Shared by the sync GitHubClient and AsyncGitHubClient.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .config import GitHubAutomationConfig as Config
+
+
+class TokenBucket:
+    """
+    Token bucket gated by GitHub's rate-limit headers
+
+    Thread-safe; try_acquire() never blocks, it returns how long the caller
+    should wait before trying again, so the same bucket serves both
+    time.sleep() and asyncio.sleep() callers.
+    """
+
+    def __init__(
+        self,
+        buffer: int = Config.RATE_LIMIT_BUFFER,
+        burst: int = Config.RATE_LIMIT_BURST,
+        max_rate: float = Config.MAX_REQUESTS_PER_SECOND,
+        min_rate: float = 1.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.buffer = buffer
+        self.burst = burst
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.clock = clock
+
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+        self.limit: Optional[int] = None
+
+        self.tokens = float(burst)
+        self.last_refill = clock()
+        self.cooldown_until = 0.0
+
+        self._lock = threading.Lock()
+
+    def update(self, headers: Dict[str, str]):
+        """Adopt the quota reported by a response"""
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        limit = headers.get('X-RateLimit-Limit')
+
+        with self._lock:
+            new_reset = float(reset) if reset is not None else self.reset
+
+            if remaining is not None:
+                remaining = int(remaining)
+                # Responses can arrive out of order; within one window the
+                # smallest remaining count is the freshest
+                if self.remaining is None or new_reset != self.reset or remaining < self.remaining:
+                    self.remaining = remaining
+
+            self.reset = new_reset
+            if limit is not None:
+                self.limit = int(limit)
+
+    def record_success(self):
+        """Additive increase back towards max_rate"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def pause(self, seconds: float, slow_down: bool = True):
+        """
+        Stop handing out tokens for a while
+
+        slow_down halves the request rate as well (multiplicative decrease),
+        which is what a secondary rate limit asks for.
+        """
+        with self._lock:
+            self.cooldown_until = max(self.cooldown_until, self.clock() + seconds)
+            if slow_down:
+                self.rate = max(self.min_rate, self.rate / 2)
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available
+
+        Returns:
+            0 if the request may go ahead, otherwise seconds to wait
+        """
+        with self._lock:
+            now = self.clock()
+
+            if now < self.cooldown_until:
+                return self.cooldown_until - now
+
+            # New window: quota is back until headers say otherwise
+            if self.reset is not None and now >= self.reset:
+                self.remaining = None
+                self.reset = None
+
+            if self.remaining is not None and self.remaining <= self.buffer:
+                return max(self.reset - now, 0) + 1
+
+            self.tokens = min(float(self.burst), self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                if self.remaining is not None:
+                    # Count the request now so concurrent callers can't overshoot
+                    self.remaining -= 1
+                return 0.0
+
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Blocking acquire for synchronous clients"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'remaining': self.remaining,
+                'reset': self.reset,
+                'limit': self.limit,
+                'rate': round(self.rate, 2),
+                'tokens': round(self.tokens, 2),
+            }
+
+
+def is_secondary_rate_limit(headers: Dict[str, str], body: str) -> bool:
+    """Secondary (abuse) limit, as opposed to exhausted primary quota"""
+    text = (body or '').lower()
+    return headers.get('Retry-After') is not None or \
+        'secondary rate limit' in text or 'abuse' in text
+
+
+def retry_delay(
+    status_code: int,
+    headers: Dict[str, str],
+    body: str,
+    attempt: int,
+    now: Optional[float] = None
+) -> Optional[float]:
+    """
+    How long to wait before retrying a rate-limited response
+
+    Returns None when the response is not rate limited. Secondary
+    (abuse) limits honour Retry-After, otherwise back off exponentially
+    from SECONDARY_RATE_LIMIT_BACKOFF; exhausted primary quota waits
+    for X-RateLimit-Reset.
+    """
+    if status_code not in (403, 429):
+        return None
+
+    now = time.time() if now is None else now
+    text = (body or '').lower()
+
+    retry_after = headers.get('Retry-After')
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 1.0)
+        except ValueError:
+            pass
+
+    if 'secondary rate limit' in text or 'abuse' in text:
+        return min(Config.SECONDARY_RATE_LIMIT_BACKOFF * (2 ** attempt), 900)
+
+    if headers.get('X-RateLimit-Remaining') == '0' or 'rate limit' in text:
+        reset = headers.get('X-RateLimit-Reset')
+        if reset is not None:
+            return max(float(reset) - now, 0) + 1
+        return Config.SECONDARY_RATE_LIMIT_BACKOFF
+
+    if status_code == 429:
+        return Config.SECONDARY_RATE_LIMIT_BACKOFF * (2 ** attempt)
+
+    # Plain 403 (forbidden resource) - not a rate limit
+    return None
@@ -0,0 +1,188 @@
+"""
+Incremental contributor sync for discovery
+
+Discovery used to re-walk every repo's full contributor list each cycle.
+RepoSyncTracker keeps per-repo state in github_repo_sync
+(migration_scripts/16_github_repo_sync.sql) and decides with one
+conditional request whether a repo needs walking at all:
+
+    GET /repos/{owner}/{name} with If-None-Match: <stored ETag>
+      304                          -> unchanged, skip (costs no quota)
+      200, pushed_at not moved     -> no new commits, skip
+      otherwise                    -> fetch contributors, process only the
+                                      ones that are new or whose count changed
+
+The contributors API has no `since` parameter, so pushed_at is the cursor.
+"""
+
+import hashlib
+import json
+import logging
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTRIBUTORS_PER_PAGE = 100
+
+
+def contributors_hash(contributors: List[Dict], key: str = 'login') -> str:
+    """Order-independent hash of the (login, contributions) set"""
+    pairs = sorted((c[key].lower(), c.get('contributions', 0)) for c in contributors)
+    return hashlib.sha256(json.dumps(pairs).encode()).hexdigest()
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class RepoSyncTracker:
+    """
+    Per-repo sync state and skip decisions
+
+    Args:
+        conn: Database connection (callers commit)
+        client: GitHubClient
+        dry_run: Make the skip decisions without writing any state
+    """
+
+    def __init__(self, conn, client, dry_run: bool = False):
+        self.conn = conn
+        self.client = client
+        self.dry_run = dry_run
+        self._states: Dict = {}
+        self._checked: Dict = {}  # repo_id -> (etag, pushed_at) from check()
+
+        self.stats = {
+            'repos_checked': 0,
+            'repos_skipped': 0,
+            'repos_changed': 0,
+            'contributors_changed': 0,
+            'contributors_unchanged': 0,
+            'api_calls': 0,
+            'api_calls_saved': 0,
+        }
+
+    def load(self, repo_id) -> Optional[Dict]:
+        if repo_id not in self._states:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT etag, pushed_at, contributors_hash, contributor_count
+                FROM github_repo_sync
+                WHERE repo_id = %s
+            """, (repo_id,))
+            row = cursor.fetchone()
+            cursor.close()
+            self._states[repo_id] = dict(row) if row else None
+        return self._states[repo_id]
+
+    def check(self, repo_id, full_name: str) -> bool:
+        """
+        Cheap change check for one repo
+
+        Returns:
+            True if its contributors should be fetched
+        """
+        state = self.load(repo_id)
+        changed, repo, etag = self.client.get_if_changed(
+            f"/repos/{full_name}", state['etag'] if state else None
+        )
+        self.stats['repos_checked'] += 1
+        if changed:
+            self.stats['api_calls'] += 1  # 304s are free
+
+        pushed_at = _parse_time((repo or {}).get('pushed_at'))
+        synced = bool(state and state['contributors_hash'])
+
+        if synced and (not changed or (pushed_at and pushed_at == state['pushed_at'])):
+            self._touch(repo_id, etag)
+            self.stats['repos_skipped'] += 1
+            # The contributor pages we didn't walk, less the check itself
+            pages = max(1, math.ceil((state['contributor_count'] or 0) / CONTRIBUTORS_PER_PAGE))
+            self.stats['api_calls_saved'] += max(0, pages - (1 if changed else 0))
+            logger.info(f"  ⏭️  {full_name} unchanged since last sync, skipping")
+            return False
+
+        self._checked[repo_id] = (etag, pushed_at)
+        self.stats['repos_changed'] += 1
+        return True
+
+    def delta(self, repo_id, contributors: List[Dict], key: str = 'login') -> List[Dict]:
+        """Contributors that are new to this repo or whose count changed"""
+        state = self.load(repo_id)
+        if state and state['contributors_hash'] == contributors_hash(contributors, key):
+            self.stats['contributors_unchanged'] += len(contributors)
+            return []
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT lower(gp.github_username) AS username, gc.contribution_count
+            FROM github_contribution gc
+            JOIN github_profile gp ON gp.github_profile_id = gc.github_profile_id
+            WHERE gc.repo_id = %s
+        """, (repo_id,))
+        known = {row['username']: row['contribution_count'] for row in cursor.fetchall()}
+        cursor.close()
+
+        changed = [c for c in contributors if known.get(c[key].lower()) != c.get('contributions')]
+        self.stats['contributors_changed'] += len(changed)
+        self.stats['contributors_unchanged'] += len(contributors) - len(changed)
+        return changed
+
+    def record(self, repo_id, contributors: List[Dict], key: str = 'login'):
+        """Save state after a contributor walk"""
+        etag, pushed_at = self._checked.pop(repo_id, (None, None))
+        if self.dry_run:
+            return
+        new_hash = contributors_hash(contributors, key)
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO github_repo_sync (
+                repo_id, etag, pushed_at, contributors_hash, contributor_count,
+                checked_at, changed_at
+            ) VALUES (%s, %s, %s, %s, %s, NOW(), NOW())
+            ON CONFLICT (repo_id) DO UPDATE SET
+                etag = EXCLUDED.etag,
+                pushed_at = EXCLUDED.pushed_at,
+                contributor_count = EXCLUDED.contributor_count,
+                checked_at = NOW(),
+                changed_at = CASE
+                    WHEN github_repo_sync.contributors_hash IS DISTINCT FROM EXCLUDED.contributors_hash
+                    THEN NOW() ELSE github_repo_sync.changed_at
+                END,
+                contributors_hash = EXCLUDED.contributors_hash
+        """, (repo_id, etag, pushed_at, new_hash, len(contributors)))
+        cursor.close()
+
+        self._states[repo_id] = {
+            'etag': etag, 'pushed_at': pushed_at,
+            'contributors_hash': new_hash, 'contributor_count': len(contributors),
+        }
+
+    def _touch(self, repo_id, etag: Optional[str]):
+        if self.dry_run:
+            return
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE github_repo_sync
+            SET etag = COALESCE(%s, etag), checked_at = NOW()
+            WHERE repo_id = %s
+        """, (etag, repo_id))
+        cursor.close()
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        checked = stats['repos_checked']
+        stats['skip_rate'] = round(stats['repos_skipped'] / checked, 3) if checked else 0.0
+        return stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"⏭️  Incremental sync: {stats['repos_skipped']:,}/{stats['repos_checked']:,} repos "
+                    f"unchanged ({stats['skip_rate']:.0%}), {stats['api_calls_saved']:,} API calls saved, "
+                    f"{stats['contributors_changed']:,} contributors changed / "
+                    f"{stats['contributors_unchanged']:,} unchanged")
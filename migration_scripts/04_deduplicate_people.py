@@ -3,13 +3,22 @@
 Person Deduplication Script
 Identifies and merges duplicate people in PostgreSQL talent database
 Uses moderate strategy: merge on LinkedIn URL OR email match
+
+--probabilistic additionally finds near-duplicates (same person, no shared
+LinkedIn/email) with LSH blocking + calculate_match_score, and merges all
+groups in parallel set-based batches. See person_resolution.py.
+It only reports (writes a CSV of matched pairs) unless --confirm is given,
+and even then only pairs sharing a strong identifier are merged.
 """
 
 import sys
 import os
+import csv
+import threading
 import psycopg2
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,11 +28,40 @@ from migration_utils import (
     log_migration_event,
     print_progress
 )
+from person_resolution import (
+    DEFAULT_MIN_SCORE,
+    REVIEW_MIN_SCORE,
+    VectorizedMatchScorer,
+    candidate_pairs,
+    is_auto_merge,
+    score_candidate_pairs
+)
+from entity_resolution import StageTimer, UnionFind
+
+# Columns returned by get_person_data, in order
+PERSON_FIELDS = [
+    'person_id', 'full_name', 'first_name', 'last_name', 'linkedin_url',
+    'normalized_linkedin_url', 'location', 'headline', 'description',
+    'followers_count', 'refreshed_at'
+]
+
 
 class PersonDeduplicator:
-    def __init__(self, pg_conn_params: dict, dry_run: bool = False):
+    def __init__(self, pg_conn_params: dict, dry_run: bool = False,
+                 probabilistic: bool = False, min_score: float = DEFAULT_MIN_SCORE,
+                 workers: int = 4, merge_batch_size: int = 500, max_block_size: int = 200,
+                 confirm: bool = False, report_path: Optional[str] = None):
         self.pg_params = pg_conn_params
-        self.dry_run = dry_run
+        self.probabilistic = probabilistic
+        # Probabilistic merges delete person rows - report only until confirmed
+        self.dry_run = dry_run or (probabilistic and not confirm)
+        self.min_score = min_score
+        self.report_path = report_path or (
+            f"probabilistic_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        self.workers = workers
+        self.merge_batch_size = merge_batch_size
+        self.max_block_size = max_block_size
         self.stats = {
             'people_analyzed': 0,
             'duplicates_found': 0,
@@ -31,9 +69,16 @@ class PersonDeduplicator:
             'emails_transferred': 0,
             'github_profiles_transferred': 0,
             'employment_transferred': 0,
-            'education_transferred': 0
+            'education_transferred': 0,
+            'candidate_pairs': 0,
+            'probabilistic_matches': 0,
+            'probabilistic_review': 0
         }
         self.duplicate_groups = []
+        self.timer = StageTimer()
+        self._stats_lock = threading.Lock()
+        self._worker_local = threading.local()
+        self._worker_conns = []
         
     def connect_database(self):
         """Establish PostgreSQL connection"""
@@ -177,34 +222,43 @@ class PersonDeduplicator:
             'refreshed_at': row[10]
         }
     
-    def choose_primary_person(self, person_ids: List[str]) -> str:
+    @staticmethod
+    def score_person(person: Dict) -> float:
+        """Primary-record score: recency, completeness, followers"""
+        score = 0
+        # Recency (up to 30 points)
+        if person['refreshed_at']:
+            score += 30
+        # Completeness (up to 50 points)
+        non_null_fields = sum(1 for v in person.values() if v not in [None, '', 0])
+        score += (non_null_fields / len(person)) * 50
+        # Followers (up to 20 points, capped at 1000 followers)
+        score += min(person['followers_count'] / 1000 * 20, 20)
+        return score
+    
+    def choose_primary_person(self, person_ids: List[str],
+                              people_by_id: Optional[Dict[str, Dict]] = None) -> str:
         """
         Choose which person record to keep as primary
         Criteria:
         1. Most recent refreshed_at
         2. Most complete data (more non-null fields)
         3. Higher follower count
+        
+        people_by_id (person_id -> get_person_data-shaped dict) avoids one
+        query per person when the records are already loaded.
         """
-        people_data = [self.get_person_data(pid) for pid in person_ids]
+        if people_by_id is not None:
+            people_data = [people_by_id.get(pid) for pid in person_ids]
+        else:
+            people_data = [self.get_person_data(pid) for pid in person_ids]
         people_data = [p for p in people_data if p]  # Remove None
         
         if not people_data:
             return person_ids[0]
         
-        def score_person(person):
-            score = 0
-            # Recency (up to 30 points)
-            if person['refreshed_at']:
-                score += 30
-            # Completeness (up to 50 points)
-            non_null_fields = sum(1 for v in person.values() if v not in [None, '', 0])
-            score += (non_null_fields / len(person)) * 50
-            # Followers (up to 20 points, capped at 1000 followers)
-            score += min(person['followers_count'] / 1000 * 20, 20)
-            return score
-        
         # Sort by score descending
-        people_data.sort(key=score_person, reverse=True)
+        people_data.sort(key=self.score_person, reverse=True)
         
         return people_data[0]['person_id']
     
@@ -275,8 +329,358 @@ class PersonDeduplicator:
         
         self.stats['people_merged'] += len(secondary_ids)
     
+    # ========================================================================
+    # PROBABILISTIC MODE
+    # ========================================================================
+    
+    def load_person_records(self) -> List[Dict]:
+        """
+        Load every person in one query, with one email and current company
+        
+        Records carry the get_person_data fields (for choosing the primary)
+        plus 'email' and 'company' (for calculate_match_score) and every
+        email / GitHub login (strong identifiers for auto-merging).
+        """
+        print("\n📥 Loading person records...")
+        
+        cursor = self.pg_conn.cursor()
+        cursor.execute("""
+            SELECT 
+                p.person_id::text,
+                p.full_name,
+                p.first_name,
+                p.last_name,
+                p.linkedin_url,
+                p.normalized_linkedin_url,
+                p.location,
+                p.headline,
+                p.description,
+                p.followers_count,
+                p.refreshed_at,
+                pe.email,
+                co.company_name,
+                ARRAY(
+                    SELECT email FROM person_email WHERE person_id = p.person_id
+                    UNION
+                    SELECT github_email FROM github_profile
+                    WHERE person_id = p.person_id AND github_email IS NOT NULL
+                ) AS emails,
+                ARRAY(
+                    SELECT github_username FROM github_profile WHERE person_id = p.person_id
+                ) AS github_logins
+            FROM person p
+            LEFT JOIN LATERAL (
+                SELECT email FROM person_email
+                WHERE person_id = p.person_id
+                ORDER BY is_primary DESC, created_at
+                LIMIT 1
+            ) pe ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT c.company_name
+                FROM employment e
+                JOIN company c ON c.company_id = e.company_id
+                WHERE e.person_id = p.person_id
+                ORDER BY (e.end_date IS NULL) DESC, e.start_date DESC NULLS LAST
+                LIMIT 1
+            ) co ON TRUE
+        """)
+        
+        records = []
+        for row in cursor.fetchall():
+            record = dict(zip(PERSON_FIELDS, row[:len(PERSON_FIELDS)]))
+            record['followers_count'] = record['followers_count'] or 0
+            record['email'] = row[-4]
+            record['company'] = row[-3]
+            record['emails'] = row[-2] or []
+            record['github_logins'] = row[-1] or []
+            records.append(record)
+        
+        print(f"   Loaded {len(records):,} people")
+        return records
+    
+    def find_probabilistic_duplicates(self, records: List[Dict]) -> List[Tuple[str, str]]:
+        """
+        Auto-mergeable person_id pairs from blocked, vectorized scoring
+        
+        Every pair scoring at least REVIEW_MIN_SCORE is written to the report
+        CSV; only pairs that clear min_score and share a strong identifier
+        are returned for merging.
+        """
+        print("\n🔍 Finding probabilistic duplicates (LSH blocking)...")
+        
+        with self.timer.stage('block'):
+            left, right, index = candidate_pairs(records, max_block_size=self.max_block_size)
+        
+        self.stats['candidate_pairs'] = len(left)
+        all_pairs = len(records) * (len(records) - 1) // 2
+        block_stats = index.stats()
+        print(f"   Blocks: {block_stats['multi_record_blocks']:,} with 2+ people "
+              f"(largest {block_stats['largest_block']:,}, "
+              f"{index.oversized_blocks:,} skipped as oversized)")
+        print(f"   Candidate pairs: {len(left):,} (vs {all_pairs:,} all-pairs)")
+        
+        with self.timer.stage('score'):
+            scorer = VectorizedMatchScorer(records)
+            scored = [
+                (i, j, score, is_auto_merge(scorer, i, j, score, self.min_score))
+                for i, j, score in score_candidate_pairs(
+                    scorer, left, right, min_score=min(self.min_score, REVIEW_MIN_SCORE)
+                )
+            ]
+        
+        matches = [(records[i]['person_id'], records[j]['person_id']) for i, j, _, merge in scored if merge]
+        self.stats['probabilistic_matches'] = len(matches)
+        self.stats['probabilistic_review'] = len(scored) - len(matches)
+        print(f"   Auto-merge pairs (score >= {self.min_score} + shared identifier): {len(matches):,}")
+        print(f"   Review-only pairs (name/company evidence): {self.stats['probabilistic_review']:,}")
+        
+        self.write_match_report(records, scored)
+        return matches
+    
+    def write_match_report(self, records: List[Dict], scored: List[Tuple[int, int, float, bool]]):
+        """CSV of every scored pair with its action, for review before --confirm"""
+        with open(self.report_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['action', 'score', 'person_id_a', 'full_name_a', 'company_a',
+                             'person_id_b', 'full_name_b', 'company_b'])
+            for i, j, score, merge in sorted(scored, key=lambda row: -row[2]):
+                a, b = records[i], records[j]
+                writer.writerow(['merge' if merge else 'review', f"{score:.2f}",
+                                 a['person_id'], a['full_name'], a['company'],
+                                 b['person_id'], b['full_name'], b['company']])
+        print(f"   Report: {self.report_path}")
+    
+    def _worker_connection(self):
+        """One connection per merge worker thread"""
+        conn = getattr(self._worker_local, 'conn', None)
+        if conn is None:
+            conn = psycopg2.connect(**self.pg_params)
+            conn.autocommit = False
+            self._worker_local.conn = conn
+            with self._stats_lock:
+                self._worker_conns.append(conn)
+        return conn
+    
+    def merge_batch(self, merges: List[Tuple[str, str]]) -> int:
+        """
+        Merge (secondary_id, primary_id) pairs in one set-based transaction
+        
+        Groups are disjoint, so batches running on different connections
+        never touch the same person rows.
+        """
+        conn = self._worker_connection()
+        cursor = conn.cursor()
+        counts = {}
+        
+        try:
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS person_merge_map (
+                    secondary_id UUID PRIMARY KEY,
+                    primary_id UUID NOT NULL
+                ) ON COMMIT DELETE ROWS
+            """)
+            cursor.executemany(
+                "INSERT INTO person_merge_map VALUES (%s::uuid, %s::uuid)", merges
+            )
+            
+            # Emails the primary doesn't already have (one copy per address)
+            cursor.execute("""
+                UPDATE person_email pe
+                SET person_id = m.primary_id
+                FROM person_merge_map m
+                WHERE pe.person_id = m.secondary_id
+                AND pe.email_id IN (
+                    SELECT DISTINCT ON (m2.primary_id, lower(pe2.email)) pe2.email_id
+                    FROM person_email pe2
+                    JOIN person_merge_map m2 ON pe2.person_id = m2.secondary_id
+                    ORDER BY m2.primary_id, lower(pe2.email), pe2.email_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM person_email p
+                    WHERE p.person_id = m.primary_id
+                    AND lower(p.email) = lower(pe.email)
+                )
+            """)
+            counts['emails_transferred'] = cursor.rowcount
+            
+            # github_username is globally unique, so profiles never collide
+            cursor.execute("""
+                UPDATE github_profile gp
+                SET person_id = m.primary_id
+                FROM person_merge_map m
+                WHERE gp.person_id = m.secondary_id
+            """)
+            counts['github_profiles_transferred'] = cursor.rowcount
+            
+            cursor.execute("""
+                UPDATE employment e
+                SET person_id = m.primary_id
+                FROM person_merge_map m
+                WHERE e.person_id = m.secondary_id
+                AND e.employment_id IN (
+                    SELECT DISTINCT ON (m2.primary_id, e2.company_id, e2.title, e2.start_date)
+                        e2.employment_id
+                    FROM employment e2
+                    JOIN person_merge_map m2 ON e2.person_id = m2.secondary_id
+                    ORDER BY m2.primary_id, e2.company_id, e2.title, e2.start_date, e2.employment_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM employment e3
+                    WHERE e3.person_id = m.primary_id
+                    AND e3.company_id = e.company_id
+                    AND e3.title = e.title
+                    AND e3.start_date = e.start_date
+                )
+            """)
+            counts['employment_transferred'] = cursor.rowcount
+            
+            cursor.execute("""
+                UPDATE education ed
+                SET person_id = m.primary_id
+                FROM person_merge_map m
+                WHERE ed.person_id = m.secondary_id
+            """)
+            counts['education_transferred'] = cursor.rowcount
+            
+            cursor.execute("""
+                DELETE FROM person p
+                USING person_merge_map m
+                WHERE p.person_id = m.secondary_id
+            """)
+            counts['people_merged'] = cursor.rowcount
+            
+            conn.commit()
+            
+        except Exception:
+            conn.rollback()
+            raise
+        
+        with self._stats_lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+        
+        return len(merges)
+    
+    def merge_groups_parallel(self, groups: List[List[str]], people_by_id: Dict[str, Dict]):
+        """Choose primaries and merge all groups in parallel batches"""
+        # Keep each group inside a single batch
+        batches, batch, total = [], [], 0
+        for group in groups:
+            primary_id = self.choose_primary_person(group, people_by_id)
+            group_merges = [(pid, primary_id) for pid in group if pid != primary_id]
+            
+            if batch and len(batch) + len(group_merges) > self.merge_batch_size:
+                batches.append(batch)
+                batch = []
+            batch.extend(group_merges)
+            total += len(group_merges)
+        if batch:
+            batches.append(batch)
+        
+        print(f"\n🔄 Merging {total:,} people in {len(batches):,} batches "
+              f"({self.workers} workers)...")
+        
+        done = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(self.merge_batch, b) for b in batches]
+                for future in as_completed(futures):
+                    done += future.result()
+                    print_progress(done, total, 'Merging')
+        finally:
+            for conn in self._worker_conns:
+                conn.close()
+            self._worker_conns = []
+    
+    def deduplicate_probabilistic(self):
+        """Exact + probabilistic deduplication with parallel set-based merges"""
+        print("\n" + "=" * 80)
+        print("PERSON DEDUPLICATION - PostgreSQL talent database")
+        print("Strategy: Probabilistic (LinkedIn/email + LSH-blocked match score)")
+        print("=" * 80)
+        
+        if self.dry_run:
+            print("🔍 REPORT ONLY - No changes will be made (pass --confirm to merge)")
+        
+        self.connect_database()
+        
+        log_migration_event(
+            self.pg_conn,
+            'person_deduplication',
+            'probabilistic_deduplication',
+            'started'
+        )
+        
+        try:
+            with self.timer.stage('load'):
+                records = self.load_person_records()
+            
+            with self.timer.stage('exact'):
+                linkedin_dupes = self.find_duplicates_by_linkedin()
+                email_dupes = self.find_duplicates_by_email()
+            
+            fuzzy_pairs = self.find_probabilistic_duplicates(records)
+            
+            with self.timer.stage('cluster'):
+                uf = UnionFind()
+                for dupe_group in linkedin_dupes + email_dupes:
+                    for person_id in dupe_group[1:]:
+                        uf.union(dupe_group[0], person_id)
+                for person_a, person_b in fuzzy_pairs:
+                    uf.union(person_a, person_b)
+                
+                duplicate_groups = uf.groups(min_size=2)
+            
+            self.stats['duplicates_found'] = len(duplicate_groups)
+            self.stats['people_analyzed'] = len(records)
+            print(f"\n🔗 {len(duplicate_groups):,} duplicate groups "
+                  f"({sum(len(g) for g in duplicate_groups):,} people)")
+            
+            if duplicate_groups and not self.dry_run:
+                people_by_id = {
+                    r['person_id']: {k: r[k] for k in PERSON_FIELDS} for r in records
+                }
+                with self.timer.stage('merge'):
+                    self.merge_groups_parallel(duplicate_groups, people_by_id)
+            
+            log_migration_event(
+                self.pg_conn,
+                'person_deduplication',
+                'probabilistic_deduplication',
+                'completed',
+                records_processed=self.stats['people_analyzed'],
+                records_updated=self.stats['people_merged'],
+                metadata=self.stats
+            )
+            
+            print("\n⏱️  Stage timings:")
+            for line in self.timer.summary():
+                print(f"   {line}")
+            
+            self.print_summary()
+            
+        except Exception as e:
+            print(f"\n❌ Error during deduplication: {e}")
+            
+            log_migration_event(
+                self.pg_conn,
+                'person_deduplication',
+                'probabilistic_deduplication',
+                'failed',
+                error_message=str(e),
+                metadata=self.stats
+            )
+            
+            raise
+        
+        finally:
+            self.pg_conn.close()
+    
     def deduplicate(self):
         """Main deduplication process"""
+        if self.probabilistic:
+            return self.deduplicate_probabilistic()
+        
         print("\n" + "=" * 80)
         print("PERSON DEDUPLICATION - PostgreSQL talent database")
         print("Strategy: Moderate (merge on LinkedIn URL OR email match)")
@@ -378,6 +782,10 @@ class PersonDeduplicator:
         print("=" * 80)
         print(f"People analyzed:           {self.stats['people_analyzed']:,}")
         print(f"Duplicate groups found:    {self.stats['duplicates_found']:,}")
+        if self.probabilistic:
+            print(f"Candidate pairs scored:    {self.stats['candidate_pairs']:,}")
+            print(f"Probabilistic matches:     {self.stats['probabilistic_matches']:,}")
+            print(f"Review-only pairs:         {self.stats['probabilistic_review']:,}")
         print(f"People merged (removed):   {self.stats['people_merged']:,}")
         print(f"\nData transferred:")
         print(f"  Emails:                  {self.stats['emails_transferred']:,}")
@@ -408,6 +816,18 @@ def main():
                        help='PostgreSQL user')
     parser.add_argument('--dry-run', action='store_true',
                        help='Dry run without actually merging')
+    parser.add_argument('--probabilistic', action='store_true',
+                       help='Also find near-duplicates by LSH blocking + match score (report only without --confirm)')
+    parser.add_argument('--confirm', action='store_true',
+                       help='With --probabilistic: actually merge pairs that share a strong identifier')
+    parser.add_argument('--report', default=None,
+                       help='With --probabilistic: CSV of scored pairs (default: probabilistic_matches_<time>.csv)')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                       help=f'Minimum calculate_match_score for a probabilistic auto-merge (default: {DEFAULT_MIN_SCORE})')
+    parser.add_argument('--workers', type=int, default=4,
+                       help='Parallel merge workers (default: 4)')
+    parser.add_argument('--merge-batch-size', type=int, default=500,
+                       help='People merged per transaction (default: 500)')
     
     args = parser.parse_args()
     
@@ -418,7 +838,16 @@ def main():
         'user': args.pg_user
     }
     
-    deduplicator = PersonDeduplicator(pg_params, dry_run=args.dry_run)
+    deduplicator = PersonDeduplicator(
+        pg_params,
+        dry_run=args.dry_run,
+        probabilistic=args.probabilistic,
+        min_score=args.min_score,
+        workers=args.workers,
+        merge_batch_size=args.merge_batch_size,
+        confirm=args.confirm,
+        report_path=args.report
+    )
     deduplicator.deduplicate()
 
 
@@ -0,0 +1,40 @@
+/*
+GitHub Enrichment Job Queue
+Durable work queue for github_automation.QueueManager so several
+enrich_github_continuous.py workers can run at once without enriching the
+same profiles. Workers claim jobs with FOR UPDATE SKIP LOCKED and hold a
+lease that they extend with heartbeats; jobs whose lease expires (crashed
+or killed worker) go back to pending.
+*/
+
+CREATE TABLE IF NOT EXISTS enrichment_job (
+    github_profile_id UUID PRIMARY KEY REFERENCES github_profile(github_profile_id) ON DELETE CASCADE,
+    priority INTEGER NOT NULL DEFAULT 0,           -- QueueManager.calculate_priority, materialized
+    base_priority INTEGER NOT NULL DEFAULT 0,      -- Never enriched > no bio > no email > stale
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_by TEXT,                                -- Worker id (host:pid)
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    last_error TEXT,
+    enqueued_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Claim path: next pending jobs by priority, without touching finished rows
+CREATE INDEX IF NOT EXISTS idx_enrichment_job_pending
+  ON enrichment_job(priority DESC, base_priority DESC, enqueued_at)
+  WHERE status = 'pending';
+
+-- Lease recovery: running jobs whose worker stopped heartbeating
+CREATE INDEX IF NOT EXISTS idx_enrichment_job_lease
+  ON enrichment_job(lease_expires_at)
+  WHERE status = 'running';
+
+COMMENT ON TABLE enrichment_job IS 'GitHub profile enrichment work queue (claimed with FOR UPDATE SKIP LOCKED)';
+COMMENT ON COLUMN enrichment_job.lease_expires_at IS 'Job returns to pending if the worker has not heartbeated by then';
+
+ANALYZE enrichment_job;
+
+SELECT 'Enrichment job queue created successfully!' AS status;
@@ -0,0 +1,21 @@
+/*
+GitHub Repository Sync State
+Per-repo state for incremental contributor discovery
+(github_automation/repo_sync.py). A repo is re-walked only when a
+conditional GET of /repos/{owner}/{name} comes back changed AND its
+pushed_at moved; otherwise the cycle skips it.
+*/
+
+CREATE TABLE IF NOT EXISTS github_repo_sync (
+    repo_id UUID PRIMARY KEY REFERENCES github_repository(repo_id) ON DELETE CASCADE,
+    etag TEXT,                                  -- ETag of GET /repos/{owner}/{name}
+    pushed_at TIMESTAMP WITH TIME ZONE,         -- pushed_at at the last contributor walk (the sync cursor)
+    contributors_hash TEXT,                     -- sha256 of the (login, contributions) set
+    contributor_count INTEGER DEFAULT 0,
+    checked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    changed_at TIMESTAMP WITH TIME ZONE         -- Last time the contributor set actually changed
+);
+
+COMMENT ON TABLE github_repo_sync IS 'Incremental contributor sync state (ETag, pushed_at, contributor set hash)';
+
+SELECT 'GitHub repo sync state created successfully!' AS status;
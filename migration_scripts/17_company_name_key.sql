@@ -0,0 +1,35 @@
+/*
+Company Name Registry
+One row per normalized company name (LOWER(TRIM(company_name))) for the
+bulk CSV importer (scripts/imports/bulk_import.py). company itself has no
+unique name constraint (existing duplicates are merged by
+deduplicate_companies.py), so parallel import workers claim a name here
+with INSERT ... ON CONFLICT DO NOTHING before creating the company: the
+first claim wins and everyone else reads its company_id back, without
+explicit locks.
+
+Names missing from the registry (companies created by other writers) are
+registered by the importer the first time it sees them.
+*/
+
+CREATE TABLE IF NOT EXISTS company_name_key (
+    name_key TEXT PRIMARY KEY,                  -- LOWER(TRIM(company_name))
+    company_id UUID NOT NULL
+        REFERENCES company(company_id) ON DELETE CASCADE
+        DEFERRABLE INITIALLY DEFERRED,          -- Claimed before the company row is inserted
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_company_name_key_company ON company_name_key(company_id);
+
+-- Seed from existing companies (lowest company_id wins among duplicates)
+INSERT INTO company_name_key (name_key, company_id)
+SELECT DISTINCT ON (LOWER(TRIM(company_name))) LOWER(TRIM(company_name)), company_id
+FROM company
+WHERE company_name IS NOT NULL AND TRIM(company_name) <> ''
+ORDER BY LOWER(TRIM(company_name)), company_id
+ON CONFLICT (name_key) DO NOTHING;
+
+COMMENT ON TABLE company_name_key IS 'Normalized company name -> company_id, claimed with ON CONFLICT by parallel importers';
+
+SELECT 'Company name registry created successfully!' AS status;
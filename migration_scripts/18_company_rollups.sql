@@ -0,0 +1,128 @@
+/*
+Company Analytics Rollups
+Precomputed per-company aggregates for the market intelligence service and
+the /market/deep/company/{id}/... endpoints, which used to scan employment
+and join the GitHub tables on every request.
+
+- company_monthly_rollup: hires / departures per month
+- company_talent_flow_rollup: person moves from one company to the next
+- company_language_rollup: language mix from employees' GitHub contributions
+- company_summary_rollup: headcount, tenure and GitHub totals, for all
+  employees ('all') and current employees only ('current')
+
+Statement-level triggers on employment append the touched company_ids to
+company_rollup_dirty (append-only, so writers never wait on each other);
+scripts/analytics/company_rollups.py recomputes just those companies.
+GitHub profile / importance changes are not tracked - run a full refresh
+(company_rollups.py --full) after rescoring or enrichment.
+*/
+
+CREATE TABLE IF NOT EXISTS company_monthly_rollup (
+    company_id UUID NOT NULL REFERENCES company(company_id) ON DELETE CASCADE,
+    month DATE NOT NULL,                        -- First day of the month
+    hires INTEGER NOT NULL DEFAULT 0,           -- Employment rows starting this month
+    departures INTEGER NOT NULL DEFAULT 0,      -- Employment rows ending this month
+    hire_importance_sum FLOAT NOT NULL DEFAULT 0,
+    hire_importance_n INTEGER NOT NULL DEFAULT 0,
+    departure_importance_sum FLOAT NOT NULL DEFAULT 0,
+    departure_importance_n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, month)
+);
+
+CREATE TABLE IF NOT EXISTS company_talent_flow_rollup (
+    from_company_id UUID NOT NULL REFERENCES company(company_id) ON DELETE CASCADE,
+    to_company_id UUID NOT NULL REFERENCES company(company_id) ON DELETE CASCADE,
+    left_month DATE NOT NULL,                   -- Month the stint at from_company ended
+    joined_month DATE NOT NULL,                 -- Month the stint at to_company started
+    moves INTEGER NOT NULL DEFAULT 0,           -- People who joined to_company on/after leaving from_company
+    moves_within_6mo INTEGER NOT NULL DEFAULT 0,
+    importance_sum FLOAT NOT NULL DEFAULT 0,
+    importance_n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (from_company_id, to_company_id, left_month, joined_month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_company_talent_flow_to ON company_talent_flow_rollup(to_company_id, joined_month);
+
+CREATE TABLE IF NOT EXISTS company_language_rollup (
+    company_id UUID NOT NULL REFERENCES company(company_id) ON DELETE CASCADE,
+    language TEXT NOT NULL,
+    developer_count INTEGER NOT NULL DEFAULT 0,
+    total_contributions BIGINT NOT NULL DEFAULT 0,
+    repo_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, language)
+);
+
+CREATE TABLE IF NOT EXISTS company_summary_rollup (
+    company_id UUID NOT NULL REFERENCES company(company_id) ON DELETE CASCADE,
+    scope TEXT NOT NULL CHECK (scope IN ('all', 'current')),
+    total_employees INTEGER NOT NULL DEFAULT 0,
+    current_employees INTEGER NOT NULL DEFAULT 0,
+    former_employees INTEGER NOT NULL DEFAULT 0,
+    avg_tenure_days FLOAT,                      -- Over ended stints
+    median_tenure_days FLOAT,
+    with_github INTEGER NOT NULL DEFAULT 0,     -- GitHub profiles
+    importance_sum FLOAT NOT NULL DEFAULT 0,
+    importance_n INTEGER NOT NULL DEFAULT 0,
+    total_merged_prs BIGINT NOT NULL DEFAULT 0,
+    total_stars_earned BIGINT NOT NULL DEFAULT 0,
+    total_contributions BIGINT NOT NULL DEFAULT 0,
+    unique_repos INTEGER NOT NULL DEFAULT 0,
+    contribution_quality_sum FLOAT NOT NULL DEFAULT 0,
+    contribution_quality_n INTEGER NOT NULL DEFAULT 0,
+    email_count INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (company_id, scope)
+);
+
+-- Companies whose employment changed since the last refresh (duplicates are fine)
+CREATE TABLE IF NOT EXISTS company_rollup_dirty (
+    dirty_id BIGSERIAL PRIMARY KEY,
+    company_id UUID NOT NULL,
+    marked_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION mark_company_rollup_dirty()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO company_rollup_dirty (company_id)
+        SELECT DISTINCT company_id FROM new_rows WHERE company_id IS NOT NULL;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO company_rollup_dirty (company_id)
+        SELECT company_id FROM new_rows WHERE company_id IS NOT NULL
+        UNION
+        SELECT company_id FROM old_rows WHERE company_id IS NOT NULL;
+    ELSE
+        INSERT INTO company_rollup_dirty (company_id)
+        SELECT DISTINCT company_id FROM old_rows WHERE company_id IS NOT NULL;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event
+DROP TRIGGER IF EXISTS trg_employment_rollup_insert ON employment;
+CREATE TRIGGER trg_employment_rollup_insert
+    AFTER INSERT ON employment
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_company_rollup_dirty();
+
+DROP TRIGGER IF EXISTS trg_employment_rollup_update ON employment;
+CREATE TRIGGER trg_employment_rollup_update
+    AFTER UPDATE ON employment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_company_rollup_dirty();
+
+DROP TRIGGER IF EXISTS trg_employment_rollup_delete ON employment;
+CREATE TRIGGER trg_employment_rollup_delete
+    AFTER DELETE ON employment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_company_rollup_dirty();
+
+COMMENT ON TABLE company_monthly_rollup IS 'Monthly hires/departures per company (refreshed by company_rollups.py)';
+COMMENT ON TABLE company_talent_flow_rollup IS 'Company-to-company moves by leave/join month (refreshed by company_rollups.py)';
+COMMENT ON TABLE company_language_rollup IS 'Language mix from employees'' GitHub contributions (refreshed by company_rollups.py)';
+COMMENT ON TABLE company_summary_rollup IS 'Headcount, tenure and GitHub totals per company and scope (refreshed by company_rollups.py)';
+COMMENT ON TABLE company_rollup_dirty IS 'Companies with employment changes not yet rolled up';
+
+SELECT 'Company analytics rollups created successfully! Run scripts/analytics/company_rollups.py --full to populate.' AS status;
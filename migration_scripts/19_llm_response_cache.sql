@@ -0,0 +1,40 @@
+/*
+LLM Response Cache
+Stores AI service responses (profile summaries, code analysis, candidate Q&A,
+job description parsing) so repeated prompts with unchanged data are served
+without another OpenAI/Anthropic call.
+
+- cache_key: sha256 of provider, model, prompt template, template version and
+  the normalized prompt (see api/services/llm_cache.py)
+- subject_id / subject_version: the person the response is about and a hash
+  of their data; storing a newer version drops the older entries
+- hit_count, latency_ms, tokens and cost_usd give the latency and spend saved
+  by cache hits (GET /api/cache/llm)
+*/
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    template TEXT NOT NULL,                     -- profile_summary, code_quality, question, jd_parse
+    template_version INTEGER NOT NULL,
+    subject_id TEXT,                            -- person_id, NULL for subject-less prompts
+    subject_version TEXT,                       -- Hash of the subject's data when generated
+    response TEXT NOT NULL,                     -- Raw model output
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms INTEGER NOT NULL DEFAULT 0,      -- Time the original call took
+    cost_usd FLOAT NOT NULL DEFAULT 0,          -- Estimated cost of the original call
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_hit_at TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_subject ON llm_response_cache(subject_id, template)
+    WHERE subject_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires ON llm_response_cache(expires_at);
+
+COMMENT ON TABLE llm_response_cache IS 'Content-addressed cache of AI service responses (api/services/llm_cache.py)';
+
+SELECT 'LLM response cache created successfully!' AS status;
@@ -0,0 +1,46 @@
+/*
+Candidate Summaries
+Stores AI profile summaries generated in bulk (api/services/batch_summarizer.py)
+so list views read them straight from the table instead of calling
+/api/ai/profile-summary once per candidate.
+
+- candidate_summary: latest summary per person and job context
+  (job_context_hash is '' for summaries generated without one)
+- summary_batch: one row per batch job with progress and throughput stats
+*/
+
+CREATE TABLE IF NOT EXISTS summary_batch (
+    batch_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    list_id UUID REFERENCES candidate_lists(list_id) ON DELETE SET NULL,
+    source TEXT NOT NULL,                       -- list, search, person_ids
+    job_context TEXT,
+    provider TEXT NOT NULL,
+    model TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',      -- queued, running, completed, failed
+    total INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    stats JSONB,                                -- Elapsed time, throughput, latency percentiles
+    error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS candidate_summary (
+    person_id UUID NOT NULL REFERENCES person(person_id) ON DELETE CASCADE,
+    job_context_hash TEXT NOT NULL DEFAULT '',
+    summary JSONB NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT,
+    batch_id UUID REFERENCES summary_batch(batch_id) ON DELETE SET NULL,
+    generated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (person_id, job_context_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_batch_list ON summary_batch(list_id, created_at DESC);
+
+COMMENT ON TABLE candidate_summary IS 'AI profile summaries per person and job context (written by batch_summarizer.py)';
+COMMENT ON TABLE summary_batch IS 'Batch profile summary jobs and their throughput';
+
+SELECT 'Candidate summary tables created successfully!' AS status;
@@ -0,0 +1,20 @@
+/*
+Monitoring Delta Indexes
+Supports the nightly saved search monitoring scan
+(api/services/monitoring_engine.py), which reads everyone changed since the
+oldest due search's last_monitored_at in one query:
+
+- person.refreshed_at, person_email created/updated and github_profile.updated_at
+  range scans for the changed-people set
+- due auto-monitored searches looked up across all users
+*/
+
+CREATE INDEX IF NOT EXISTS idx_person_refreshed_at ON person(refreshed_at);
+CREATE INDEX IF NOT EXISTS idx_person_email_changed_at ON person_email((GREATEST(created_at, updated_at)));
+CREATE INDEX IF NOT EXISTS idx_github_profile_updated_at ON github_profile(updated_at) WHERE person_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_saved_searches_monitor_due
+    ON saved_searches(last_monitored_at NULLS FIRST)
+    WHERE auto_monitor = TRUE;
+
+SELECT 'Monitoring delta indexes created successfully!' AS status;
@@ -0,0 +1,116 @@
+/*
+Change Data Capture
+Append-only log of row changes on the people tables so background consumers
+(monitoring, LLM cache invalidation, ...) work incrementally instead of
+rescanning with updated_at >= since. Read it through api/services/change_log.py.
+
+- change_log: one row per inserted/updated/deleted row, in change_id order,
+  with the writing transaction id (xid), the affected person and, for
+  updates, the columns that actually changed (no-op updates are skipped)
+- change_consumer: each consumer's cursor, stored as the transaction
+  snapshot it last read up to. Reading "committed after my last snapshot"
+  instead of "change_id > N" means a long transaction that commits late is
+  never skipped.
+
+Statement-level triggers with transition tables, like the rollup dirty
+marking in 18_company_rollups.sql, so bulk imports pay one INSERT ... SELECT
+per statement. The scheduler purges entries older than
+CHANGE_LOG_RETENTION_DAYS once every consumer has read them.
+*/
+
+CREATE TABLE IF NOT EXISTS change_log (
+    change_id BIGSERIAL PRIMARY KEY,
+    xid BIGINT NOT NULL DEFAULT txid_current(),
+    table_name TEXT NOT NULL,
+    op CHAR(1) NOT NULL CHECK (op IN ('I', 'U', 'D')),
+    row_id TEXT NOT NULL,                       -- Primary key of the changed row
+    person_id UUID,                             -- Person the row belongs to (NULL if unknown)
+    changed_columns TEXT[],                     -- UPDATE only
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_xid ON change_log(xid);
+CREATE INDEX IF NOT EXISTS idx_change_log_changed_at ON change_log(changed_at);
+
+CREATE TABLE IF NOT EXISTS change_consumer (
+    consumer TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL,                     -- txid_snapshot read up to
+    last_change_id BIGINT,
+    changes_read BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- TG_ARGV[0]: primary key column; TG_ARGV[1]: person_id expression over the row alias r
+CREATE OR REPLACE FUNCTION record_row_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    pk TEXT := TG_ARGV[0];
+    person_expr TEXT := COALESCE(TG_ARGV[1], 'r.person_id');
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format(
+            'INSERT INTO change_log (table_name, op, row_id, person_id)
+             SELECT %L, ''I'', r.%I::text, %s FROM new_rows r',
+            TG_TABLE_NAME, pk, person_expr);
+    ELSIF TG_OP = 'UPDATE' THEN
+        EXECUTE format(
+            'INSERT INTO change_log (table_name, op, row_id, person_id, changed_columns)
+             SELECT %L, ''U'', r.%I::text, %s,
+                    ARRAY(SELECT c.key FROM jsonb_each(to_jsonb(r)) c
+                          WHERE c.value IS DISTINCT FROM to_jsonb(o) -> c.key)
+             FROM new_rows r
+             JOIN old_rows o ON o.%I = r.%I
+             WHERE to_jsonb(r) IS DISTINCT FROM to_jsonb(o)',
+            TG_TABLE_NAME, pk, person_expr, pk, pk);
+    ELSE
+        EXECUTE format(
+            'INSERT INTO change_log (table_name, op, row_id, person_id)
+             SELECT %L, ''D'', r.%I::text, %s FROM old_rows r',
+            TG_TABLE_NAME, pk, person_expr);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    tracked RECORD;
+BEGIN
+    FOR tracked IN
+        SELECT * FROM (VALUES
+            ('person', 'person_id', 'r.person_id'),
+            ('person_email', 'email_id', 'r.person_id'),
+            ('employment', 'employment_id', 'r.person_id'),
+            ('github_profile', 'github_profile_id', 'r.person_id'),
+            ('github_contribution', 'contribution_id',
+             '(SELECT gp.person_id FROM github_profile gp WHERE gp.github_profile_id = r.github_profile_id)')
+        ) AS t(table_name, pk, person_expr)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_change_log_insert ON %I', tracked.table_name, tracked.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_change_log_insert AFTER INSERT ON %I
+             REFERENCING NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION record_row_changes(%L, %L)',
+            tracked.table_name, tracked.table_name, tracked.pk, tracked.person_expr);
+
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_change_log_update ON %I', tracked.table_name, tracked.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_change_log_update AFTER UPDATE ON %I
+             REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION record_row_changes(%L, %L)',
+            tracked.table_name, tracked.table_name, tracked.pk, tracked.person_expr);
+
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_change_log_delete ON %I', tracked.table_name, tracked.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_change_log_delete AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION record_row_changes(%L, %L)',
+            tracked.table_name, tracked.table_name, tracked.pk, tracked.person_expr);
+    END LOOP;
+END $$;
+
+COMMENT ON TABLE change_log IS 'Append-only row changes on person/email/employment/GitHub tables (read via api/services/change_log.py)';
+COMMENT ON TABLE change_consumer IS 'Per-consumer change_log cursors (transaction snapshot read up to)';
+
+SELECT 'Change log and triggers created successfully!' AS status;
@@ -0,0 +1,31 @@
+/*
+Stats Snapshot
+Precomputed people counts for /api/stats/quality and /api/stats/coverage,
+which used to run full-table COUNT(*) / COUNT(DISTINCT) scans of person,
+person_email, github_profile, employment and education on every request.
+
+- stats_snapshot: one row ('people') of counts with the time it was computed
+  and how long the computation took
+
+Refreshed by scripts/analytics/stats_snapshot.py (the API scheduler runs it
+every STATS_SNAPSHOT_REFRESH_MINUTES); ?fresh=true on the endpoints
+recomputes it on demand under a short statement_timeout.
+*/
+
+CREATE TABLE IF NOT EXISTS stats_snapshot (
+    snapshot_key TEXT PRIMARY KEY,
+    total_people BIGINT NOT NULL DEFAULT 0,
+    with_linkedin BIGINT NOT NULL DEFAULT 0,
+    with_location BIGINT NOT NULL DEFAULT 0,
+    with_headline BIGINT NOT NULL DEFAULT 0,
+    with_email BIGINT NOT NULL DEFAULT 0,
+    with_github BIGINT NOT NULL DEFAULT 0,
+    with_employment BIGINT NOT NULL DEFAULT 0,
+    with_education BIGINT NOT NULL DEFAULT 0,
+    refresh_ms INTEGER,                         -- Time the counts took to compute
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE stats_snapshot IS 'Precomputed people coverage counts (refreshed by stats_snapshot.py)';
+
+SELECT 'Stats snapshot table created successfully! Run scripts/analytics/stats_snapshot.py to populate.' AS status;
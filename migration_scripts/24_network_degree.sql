@@ -0,0 +1,123 @@
+/*
+Network Degree
+Precomputed per-person connection counts and network-wide summaries for
+/api/graph/stats, /api/graph/top-connected and /market/deep/network-density,
+which used to UNION ALL both sides of the edge tables and GROUP BY person
+on every request.
+
+- person_network_degree: co-employment and GitHub collaboration degree per
+  person, with collaboration strength / shared repo totals (for averages)
+- network_summary: one row per network ('coemployment', 'github') with
+  people, edges and the degree distribution
+
+Statement-level triggers on edge_coemployment and edge_github_collaboration
+append both endpoints of every changed edge to network_degree_dirty;
+scripts/analytics/network_degree.py recomputes just those people and then
+the summaries. TRUNCATE is not tracked - the edge builders run a full
+refresh (network_degree.py --full) when they finish.
+*/
+
+CREATE TABLE IF NOT EXISTS person_network_degree (
+    person_id UUID PRIMARY KEY REFERENCES person(person_id) ON DELETE CASCADE,
+    coemployment_degree INTEGER NOT NULL DEFAULT 0,     -- edge_coemployment rows touching the person
+    github_degree INTEGER NOT NULL DEFAULT 0,           -- edge_github_collaboration rows touching the person
+    github_strength_sum FLOAT NOT NULL DEFAULT 0,       -- Over edges with a collaboration_strength
+    github_strength_n INTEGER NOT NULL DEFAULT 0,
+    github_shared_repos_sum BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Top hubs per network
+CREATE INDEX IF NOT EXISTS idx_person_network_degree_coemployment
+    ON person_network_degree(coemployment_degree DESC) WHERE coemployment_degree > 0;
+CREATE INDEX IF NOT EXISTS idx_person_network_degree_github
+    ON person_network_degree(github_degree DESC) WHERE github_degree > 0;
+
+CREATE TABLE IF NOT EXISTS network_summary (
+    network TEXT PRIMARY KEY CHECK (network IN ('coemployment', 'github')),
+    people INTEGER NOT NULL DEFAULT 0,                  -- People with at least one edge
+    edges BIGINT NOT NULL DEFAULT 0,
+    min_degree INTEGER,
+    max_degree INTEGER,
+    avg_degree FLOAT,
+    median_degree FLOAT,
+    avg_strength FLOAT,                                 -- GitHub only
+    avg_shared_repos FLOAT,                             -- GitHub only
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- People whose edges changed since the last refresh (duplicates are fine)
+CREATE TABLE IF NOT EXISTS network_degree_dirty (
+    dirty_id BIGSERIAL PRIMARY KEY,
+    person_id UUID NOT NULL,
+    marked_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION mark_network_degree_dirty()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO network_degree_dirty (person_id)
+        SELECT src_person_id FROM new_rows
+        UNION
+        SELECT dst_person_id FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO network_degree_dirty (person_id)
+        SELECT src_person_id FROM new_rows
+        UNION
+        SELECT dst_person_id FROM new_rows
+        UNION
+        SELECT src_person_id FROM old_rows
+        UNION
+        SELECT dst_person_id FROM old_rows;
+    ELSE
+        INSERT INTO network_degree_dirty (person_id)
+        SELECT src_person_id FROM old_rows
+        UNION
+        SELECT dst_person_id FROM old_rows;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event
+DROP TRIGGER IF EXISTS trg_edge_coemployment_degree_insert ON edge_coemployment;
+CREATE TRIGGER trg_edge_coemployment_degree_insert
+    AFTER INSERT ON edge_coemployment
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_network_degree_dirty();
+
+DROP TRIGGER IF EXISTS trg_edge_coemployment_degree_update ON edge_coemployment;
+CREATE TRIGGER trg_edge_coemployment_degree_update
+    AFTER UPDATE ON edge_coemployment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_network_degree_dirty();
+
+DROP TRIGGER IF EXISTS trg_edge_coemployment_degree_delete ON edge_coemployment;
+CREATE TRIGGER trg_edge_coemployment_degree_delete
+    AFTER DELETE ON edge_coemployment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_network_degree_dirty();
+
+DROP TRIGGER IF EXISTS trg_edge_github_degree_insert ON edge_github_collaboration;
+CREATE TRIGGER trg_edge_github_degree_insert
+    AFTER INSERT ON edge_github_collaboration
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_network_degree_dirty();
+
+DROP TRIGGER IF EXISTS trg_edge_github_degree_update ON edge_github_collaboration;
+CREATE TRIGGER trg_edge_github_degree_update
+    AFTER UPDATE ON edge_github_collaboration
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_network_degree_dirty();
+
+DROP TRIGGER IF EXISTS trg_edge_github_degree_delete ON edge_github_collaboration;
+CREATE TRIGGER trg_edge_github_degree_delete
+    AFTER DELETE ON edge_github_collaboration
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_network_degree_dirty();
+
+COMMENT ON TABLE person_network_degree IS 'Per-person network degree (refreshed by network_degree.py)';
+COMMENT ON TABLE network_summary IS 'Network-wide degree distribution (refreshed by network_degree.py)';
+
+SELECT 'Network degree tables created successfully! Run scripts/analytics/network_degree.py --full to populate.' AS status;
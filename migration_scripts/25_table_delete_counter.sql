@@ -0,0 +1,63 @@
+/*
+Table Delete Counters
+Per-table count of deleted rows, bumped by statement-level triggers.
+
+The lookup cache snapshots (scripts/lookup_cache.py) refresh by merging the
+rows written since the snapshot, which can't see deletes. After a person or
+company deduplication they would keep handing out ids of the deleted rows
+until the daily rebuild; a changed counter makes them rebuild instead.
+
+Like the change_log triggers in 22_change_log.sql, one UPDATE per statement
+(not per row). TRUNCATE counts as a delete too.
+*/
+
+CREATE TABLE IF NOT EXISTS table_delete_counter (
+    table_name TEXT PRIMARY KEY,
+    deletes BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION count_deleted_rows()
+RETURNS TRIGGER AS $$
+DECLARE
+    deleted BIGINT := 1;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        SELECT COUNT(*) INTO deleted FROM old_rows;
+    END IF;
+
+    IF deleted > 0 THEN
+        INSERT INTO table_delete_counter (table_name, deletes)
+        VALUES (TG_TABLE_NAME, deleted)
+        ON CONFLICT (table_name) DO UPDATE SET
+            deletes = table_delete_counter.deletes + EXCLUDED.deletes,
+            updated_at = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    tracked TEXT;
+BEGIN
+    FOREACH tracked IN ARRAY ARRAY['person', 'company', 'github_profile', 'github_repository']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_delete_counter ON %I', tracked, tracked);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_delete_counter AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION count_deleted_rows()',
+            tracked, tracked);
+
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_truncate_counter ON %I', tracked, tracked);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_truncate_counter AFTER TRUNCATE ON %I
+             FOR EACH STATEMENT EXECUTE FUNCTION count_deleted_rows()',
+            tracked, tracked);
+    END LOOP;
+END $$;
+
+COMMENT ON TABLE table_delete_counter IS 'Rows deleted per table, so lookup cache snapshots know to rebuild (scripts/lookup_cache.py)';
+
+SELECT 'Table delete counters created successfully!' AS status;
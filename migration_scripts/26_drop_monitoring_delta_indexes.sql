@@ -0,0 +1,16 @@
+/*
+Drop Unused Monitoring Delta Indexes
+21_monitoring_delta_indexes.sql added change-time indexes on person,
+person_email and github_profile for the nightly monitoring scan. Since the
+scan reads the change log (22_change_log.sql) only occasional reports filter
+on those columns, so the indexes mostly slowed down writes to the three
+tables.
+
+The partial index for due auto-monitored saved searches stays.
+*/
+
+DROP INDEX IF EXISTS idx_person_refreshed_at;
+DROP INDEX IF EXISTS idx_person_email_changed_at;
+DROP INDEX IF EXISTS idx_github_profile_updated_at;
+
+SELECT 'Unused monitoring delta indexes dropped successfully!' AS status;
@@ -99,6 +99,15 @@ def generate_person_id(linkedin_url: Optional[str] = None,
     return str(uuid.UUID(hash_digest[:32]))
 
 
+def synthetic_twitter_id(username: str) -> int:
+    """
+    Stable twitter_id for a profile known only by username
+    (blake2b of the lowercased handle, so it is the same in every process)
+    """
+    digest = hashlib.blake2b(username.lower().encode(), digest_size=8).hexdigest()
+    return int(digest, 16) % (10 ** 15)
+
+
 def calculate_match_score(record1: dict, record2: dict) -> float:
     """
     Calculate similarity score between two person records
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Probabilistic Person Resolution
+Blocking + vectorized match scoring for near-duplicate people
+
+calculate_match_score() is a per-pair Python function; running it over all
+155K x 155K pairs is impossible. Instead:
+
+1. Each person gets blocking keys: MinHash LSH bands over name trigrams,
+   name + location, and last name + current company
+2. Only pairs sharing a block are scored
+3. Scores are computed for whole batches of pairs at once with numpy and
+   produce exactly the same values as calculate_match_score()
+4. A pair is only merged automatically if it clears DEFAULT_MIN_SCORE and
+   the two people share a strong identifier (LinkedIn URL, any email, or a
+   GitHub login / GitHub email). Name + company alone is never enough -
+   namesakes at the same company are exactly what the co: blocking key
+   pairs up - so those pairs are only reported for review.
+
+Used by 04_deduplicate_people.py --probabilistic
+"""
+
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from migration_utils import normalize_linkedin_url, normalize_email
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from entity_resolution import BlockIndex, MinHashLSH, char_ngrams
+
+# Auto-merge bar on the calculate_match_score scale: shared email (0.3) + similar
+# name (0.1), or a shared LinkedIn URL (0.5). Name + company tops out at 0.2.
+DEFAULT_MIN_SCORE = 0.4
+# Pairs from here up (same name + same company) are reported for review only
+REVIEW_MIN_SCORE = 0.2
+DEFAULT_SCORE_BATCH_SIZE = 100_000
+
+
+def _normalize_name_key(name: Optional[str]) -> str:
+    """Lowercase name with punctuation removed, for blocking only"""
+    if not name:
+        return ''
+    return ' '.join(re.sub(r'[^\w\s]', ' ', name.lower()).split())
+
+
+def _normalize_location_key(location: Optional[str]) -> str:
+    """City part of a location ("San Francisco, CA" -> "san francisco")"""
+    if not location:
+        return ''
+    return location.split(',')[0].strip().lower()
+
+
+def _encode(values: List[Optional[str]]) -> np.ndarray:
+    """Integer code per value, -1 for missing; equal values share a code"""
+    codes = {}
+    return np.array(
+        [-1 if v is None else codes.setdefault(v, len(codes)) for v in values],
+        dtype=np.int64
+    )
+
+
+def identity_keys(record: Dict) -> Set[str]:
+    """
+    Strong identifiers of one person: LinkedIn URL, emails (including GitHub
+    profile emails) and GitHub logins, each prefixed by kind
+    """
+    keys = set()
+    if record.get('linkedin_url'):
+        linkedin = normalize_linkedin_url(record['linkedin_url'])
+        if linkedin:
+            keys.add(f"li:{linkedin}")
+    for email in [record.get('email')] + list(record.get('emails') or []):
+        email = normalize_email(email) if email else None
+        if email:
+            keys.add(f"em:{email}")
+    for login in record.get('github_logins') or []:
+        if login and login.strip():
+            keys.add(f"gh:{login.strip().lower()}")
+    return keys
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a 2-D uint64 array"""
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1)
+
+
+class VectorizedMatchScorer:
+    """
+    Batch equivalent of migration_utils.calculate_match_score
+
+    Records use the same keys as calculate_match_score (linkedin_url, email,
+    full_name, company), plus optional 'emails' and 'github_logins' lists
+    that only feed shares_identifier(). Every field is pre-normalized once into integer
+    codes; name_similarity's character-set Jaccard uses per-record bitmasks
+    over the character vocabulary, so a batch of pairs is scored with a few
+    array operations.
+    """
+
+    def __init__(self, records: List[Dict]):
+        linkedin, emails, names, companies, char_sets = [], [], [], [], []
+
+        for record in records:
+            linkedin.append(normalize_linkedin_url(record['linkedin_url'])
+                            if record.get('linkedin_url') else None)
+            emails.append(normalize_email(record['email'])
+                          if record.get('email') else None)
+
+            name = record['full_name'].lower().strip() if record.get('full_name') else None
+            names.append(name)
+            char_sets.append(set(name.replace(' ', '')) if name else set())
+
+            companies.append(record['company'].lower().strip()
+                             if record.get('company') else None)
+
+        self.linkedin = _encode(linkedin)
+        self.email = _encode(emails)
+        self.name = _encode(names)
+        self.company = _encode(companies)
+        self.company_text = companies
+        self.identities = [identity_keys(record) for record in records]
+
+        vocabulary = {}
+        for chars in char_sets:
+            for char in chars:
+                vocabulary.setdefault(char, len(vocabulary))
+
+        num_words = max(1, (len(vocabulary) + 63) // 64)
+        self.char_masks = np.zeros((len(records), num_words), dtype=np.uint64)
+        for i, chars in enumerate(char_sets):
+            for char in chars:
+                bit = vocabulary[char]
+                self.char_masks[i, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+
+    def score(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Match score for each (left[k], right[k]) pair of record indices"""
+        scores = np.zeros(len(left), dtype=np.float64)
+
+        li_l, li_r = self.linkedin[left], self.linkedin[right]
+        scores += np.where((li_l >= 0) & (li_l == li_r), 0.5, 0.0)
+
+        em_l, em_r = self.email[left], self.email[right]
+        scores += np.where((em_l >= 0) & (em_l == em_r), 0.3, 0.0)
+
+        name_l, name_r = self.name[left], self.name[right]
+        both_names = (name_l >= 0) & (name_r >= 0)
+        exact_name = both_names & (name_l == name_r)
+
+        masks_l, masks_r = self.char_masks[left], self.char_masks[right]
+        intersection = _popcount(masks_l & masks_r)
+        union = _popcount(masks_l | masks_r)
+        similarity = np.divide(intersection, union, out=np.zeros(len(left)), where=union > 0)
+
+        scores += np.where(exact_name, 0.15,
+                           np.where(both_names & (similarity > 0.8), 0.1, 0.0))
+
+        co_l, co_r = self.company[left], self.company[right]
+        company_overlap = (co_l >= 0) & (co_l == co_r)
+        # Substring containment can't be vectorized; only differing pairs need it
+        differing = np.flatnonzero((co_l >= 0) & (co_r >= 0) & (co_l != co_r))
+        for k in differing:
+            a, b = self.company_text[left[k]], self.company_text[right[k]]
+            company_overlap[k] = a in b or b in a
+
+        scores += np.where(company_overlap, 0.05, 0.0)
+        return scores
+
+    def shares_identifier(self, i: int, j: int) -> bool:
+        """True if records i and j share a LinkedIn URL, an email or a GitHub login"""
+        return not self.identities[i].isdisjoint(self.identities[j])
+
+    def conflicting_linkedin(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Pairs where both people have LinkedIn URLs and they differ"""
+        li_l, li_r = self.linkedin[left], self.linkedin[right]
+        return (li_l >= 0) & (li_r >= 0) & (li_l != li_r)
+
+
+def person_blocking_keys(record: Dict, lsh: MinHashLSH) -> List[str]:
+    """
+    Blocking keys for one person
+
+    Common names ("john smith") put hundreds of people in the same LSH
+    buckets, which BlockIndex skips as oversized; the name + location and
+    last name + company keys still pair those people up in small blocks.
+    """
+    name = _normalize_name_key(record.get('full_name'))
+    if not name:
+        return []
+
+    keys = lsh.band_keys(lsh.signature(char_ngrams(name)), prefix='name')
+
+    tokens = name.split()
+    initial_last = f"{tokens[0][0]}{tokens[-1]}"
+
+    location = _normalize_location_key(record.get('location'))
+    if location:
+        keys.append(f"loc:{initial_last}|{location}")
+
+    company = (record.get('company') or '').lower().strip()
+    if company:
+        keys.append(f"co:{tokens[-1]}|{company}")
+
+    return keys
+
+
+def candidate_pairs(records: List[Dict], max_block_size: int = 200,
+                    lsh: Optional[MinHashLSH] = None) -> Tuple[np.ndarray, np.ndarray, BlockIndex]:
+    """Blocked candidate pairs as two index arrays, plus the index for stats"""
+    lsh = lsh or MinHashLSH(num_perm=64, bands=16)
+    index = BlockIndex(max_block_size=max_block_size)
+
+    for i, record in enumerate(records):
+        index.add(i, person_blocking_keys(record, lsh))
+
+    pairs = np.fromiter(
+        (i for pair in index.candidate_pairs() for i in pair), dtype=np.int64
+    ).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1], index
+
+
+def score_candidate_pairs(scorer: VectorizedMatchScorer, left: np.ndarray, right: np.ndarray,
+                          min_score: float = REVIEW_MIN_SCORE,
+                          batch_size: int = DEFAULT_SCORE_BATCH_SIZE
+                          ) -> Iterator[Tuple[int, int, float]]:
+    """
+    Yield (left_index, right_index, score) for pairs scoring >= min_score
+
+    Pairs with two different LinkedIn profiles are never matched - they are
+    namesakes, not duplicates.
+    """
+    for start in range(0, len(left), batch_size):
+        batch_left = left[start:start + batch_size]
+        batch_right = right[start:start + batch_size]
+
+        scores = scorer.score(batch_left, batch_right)
+        keep = (scores >= min_score) & ~scorer.conflicting_linkedin(batch_left, batch_right)
+
+        for k in np.flatnonzero(keep):
+            yield int(batch_left[k]), int(batch_right[k]), float(scores[k])
+
+
+def is_auto_merge(scorer: VectorizedMatchScorer, i: int, j: int, score: float,
+                  min_score: float = DEFAULT_MIN_SCORE) -> bool:
+    """
+    Whether a scored pair may be merged without review: it clears min_score
+    and shares a strong identifier. Lowering min_score never lets a
+    name-only match through.
+    """
+    return score >= min_score and scorer.shares_identifier(i, j)
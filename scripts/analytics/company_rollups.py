@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: Refreshes the precomputed company analytics rollups (migration 18)
+ABOUTME: Incremental by default: only companies whose employment changed since the last run
+
+Company Rollups
+===============
+The market intelligence endpoints read hires/departures per month, the
+company-to-company flow matrix, language mix and headcount/tenure/GitHub
+totals from rollup tables instead of aggregating employment per request.
+
+Triggers on employment append changed company_ids to company_rollup_dirty.
+A refresh claims those rows, deletes the rollup rows of the claimed
+companies and re-aggregates them - all in one transaction, so readers
+always see a consistent set and a failed refresh leaves the dirty rows
+for the next run. Flows are recomputed wherever either end is claimed.
+
+GitHub profile changes (enrichment, importance rescoring) are not
+tracked; use --full after those. The API scheduler runs the incremental
+refresh every COMPANY_ROLLUP_REFRESH_MINUTES (default 15) and a full one
+nightly.
+
+Usage:
+    python3 scripts/analytics/company_rollups.py           # Dirty companies only
+    python3 scripts/analytics/company_rollups.py --full    # Rebuild everything
+    python3 scripts/analytics/company_rollups.py --stats   # Show pending / row counts
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_connection
+
+# Arbitrary key for pg_try_advisory_xact_lock so overlapping refreshes don't collide
+REFRESH_LOCK_ID = 18_0001
+
+ROLLUP_TABLES = (
+    'company_monthly_rollup',
+    'company_talent_flow_rollup',
+    'company_language_rollup',
+    'company_summary_rollup',
+)
+
+CLAIM_DIRTY_SQL = """
+    WITH claimed AS (
+        DELETE FROM company_rollup_dirty RETURNING company_id
+    )
+    INSERT INTO rollup_batch (company_id)
+    SELECT DISTINCT claimed.company_id
+    FROM claimed
+    JOIN company c ON c.company_id = claimed.company_id
+"""
+
+CLAIM_ALL_SQL = """
+    INSERT INTO rollup_batch (company_id)
+    SELECT DISTINCT company_id FROM employment WHERE company_id IS NOT NULL
+"""
+
+# Highest importance_score across a person's GitHub profiles
+PERSON_IMPORTANCE = """
+    LEFT JOIN LATERAL (
+        SELECT MAX(gp.importance_score) AS importance
+        FROM github_profile gp
+        WHERE gp.person_id = {person}.person_id
+    ) pi ON TRUE
+"""
+
+INSERT_MONTHLY_SQL = f"""
+    INSERT INTO company_monthly_rollup (
+        company_id, month, hires, departures,
+        hire_importance_sum, hire_importance_n, departure_importance_sum, departure_importance_n
+    )
+    WITH stints AS (
+        SELECT e.company_id, e.start_date, e.end_date, pi.importance
+        FROM employment e
+        JOIN rollup_batch b ON b.company_id = e.company_id
+        {PERSON_IMPORTANCE.format(person='e')}
+    ),
+    events AS (
+        SELECT company_id, DATE_TRUNC('month', start_date)::date AS month, TRUE AS is_hire, importance
+        FROM stints WHERE start_date IS NOT NULL
+        UNION ALL
+        SELECT company_id, DATE_TRUNC('month', end_date)::date, FALSE, importance
+        FROM stints WHERE end_date IS NOT NULL
+    )
+    SELECT
+        company_id,
+        month,
+        COUNT(*) FILTER (WHERE is_hire),
+        COUNT(*) FILTER (WHERE NOT is_hire),
+        COALESCE(SUM(importance) FILTER (WHERE is_hire), 0),
+        COUNT(importance) FILTER (WHERE is_hire),
+        COALESCE(SUM(importance) FILTER (WHERE NOT is_hire), 0),
+        COUNT(importance) FILTER (WHERE NOT is_hire)
+    FROM events
+    GROUP BY company_id, month
+"""
+
+INSERT_FLOW_SQL = f"""
+    INSERT INTO company_talent_flow_rollup (
+        from_company_id, to_company_id, left_month, joined_month,
+        moves, moves_within_6mo, importance_sum, importance_n
+    )
+    SELECT
+        f.company_id,
+        t.company_id,
+        DATE_TRUNC('month', f.end_date)::date,
+        DATE_TRUNC('month', t.start_date)::date,
+        COUNT(DISTINCT f.person_id),
+        COUNT(DISTINCT f.person_id) FILTER (WHERE t.start_date <= f.end_date + INTERVAL '6 months'),
+        COALESCE(SUM(pi.importance), 0),
+        COUNT(pi.importance)
+    FROM employment f
+    JOIN employment t
+        ON t.person_id = f.person_id
+        AND t.company_id <> f.company_id
+        AND t.start_date >= f.end_date
+    {PERSON_IMPORTANCE.format(person='f')}
+    WHERE f.end_date IS NOT NULL
+    AND EXISTS (
+        SELECT 1 FROM rollup_batch b WHERE b.company_id IN (f.company_id, t.company_id)
+    )
+    GROUP BY 1, 2, 3, 4
+"""
+
+INSERT_LANGUAGE_SQL = """
+    INSERT INTO company_language_rollup (company_id, language, developer_count, total_contributions, repo_count)
+    SELECT
+        ce.company_id,
+        gr.language,
+        COUNT(DISTINCT gc.github_profile_id),
+        COALESCE(SUM(gc.contribution_count), 0),
+        COUNT(DISTINCT gr.repo_id)
+    FROM (
+        SELECT DISTINCT e.company_id, e.person_id
+        FROM employment e
+        JOIN rollup_batch b ON b.company_id = e.company_id
+    ) ce
+    JOIN github_profile gp ON gp.person_id = ce.person_id
+    JOIN github_contribution gc ON gc.github_profile_id = gp.github_profile_id
+    JOIN github_repository gr ON gr.repo_id = gc.repo_id
+    WHERE gr.language IS NOT NULL
+    GROUP BY ce.company_id, gr.language
+"""
+
+INSERT_SUMMARY_SQL = """
+    INSERT INTO company_summary_rollup (
+        company_id, scope, total_employees, current_employees, former_employees,
+        avg_tenure_days, median_tenure_days, with_github, importance_sum, importance_n,
+        total_merged_prs, total_stars_earned, total_contributions,
+        unique_repos, contribution_quality_sum, contribution_quality_n, email_count
+    )
+    WITH scoped AS (
+        SELECT e.company_id, 'all' AS scope, e.person_id, e.start_date, e.end_date
+        FROM employment e
+        JOIN rollup_batch b ON b.company_id = e.company_id
+        UNION ALL
+        SELECT e.company_id, 'current', e.person_id, e.start_date, e.end_date
+        FROM employment e
+        JOIN rollup_batch b ON b.company_id = e.company_id
+        WHERE e.end_date IS NULL
+    ),
+    staff AS (
+        SELECT
+            company_id,
+            scope,
+            COUNT(DISTINCT person_id) AS total_employees,
+            COUNT(DISTINCT person_id) FILTER (WHERE end_date IS NULL) AS current_employees,
+            COUNT(DISTINCT person_id) FILTER (WHERE end_date IS NOT NULL) AS former_employees,
+            AVG(end_date::date - start_date::date) AS avg_tenure_days,
+            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY end_date::date - start_date::date)
+                FILTER (WHERE start_date IS NOT NULL AND end_date IS NOT NULL) AS median_tenure_days
+        FROM scoped
+        GROUP BY company_id, scope
+    ),
+    people AS (
+        SELECT DISTINCT company_id, scope, person_id FROM scoped
+    ),
+    profiles AS (
+        SELECT
+            p.company_id,
+            p.scope,
+            COUNT(*) AS with_github,
+            COALESCE(SUM(gp.importance_score), 0) AS importance_sum,
+            COUNT(gp.importance_score) AS importance_n,
+            COALESCE(SUM(gp.total_merged_prs), 0) AS total_merged_prs,
+            COALESCE(SUM(gp.total_stars_earned), 0) AS total_stars_earned,
+            COALESCE(SUM(gp.total_contributions), 0) AS total_contributions
+        FROM people p
+        JOIN github_profile gp ON gp.person_id = p.person_id
+        GROUP BY p.company_id, p.scope
+    ),
+    contributions AS (
+        SELECT
+            p.company_id,
+            p.scope,
+            COUNT(DISTINCT gc.repo_id) AS unique_repos,
+            COALESCE(SUM(gc.contribution_quality_score), 0) AS contribution_quality_sum,
+            COUNT(gc.contribution_quality_score) AS contribution_quality_n
+        FROM people p
+        JOIN github_profile gp ON gp.person_id = p.person_id
+        JOIN github_contribution gc ON gc.github_profile_id = gp.github_profile_id
+        GROUP BY p.company_id, p.scope
+    ),
+    emails AS (
+        SELECT p.company_id, p.scope, COUNT(DISTINCT pe.email) AS email_count
+        FROM people p
+        JOIN person_email pe ON pe.person_id = p.person_id
+        GROUP BY p.company_id, p.scope
+    )
+    SELECT
+        s.company_id, s.scope, s.total_employees, s.current_employees, s.former_employees,
+        s.avg_tenure_days, s.median_tenure_days,
+        COALESCE(g.with_github, 0), COALESCE(g.importance_sum, 0), COALESCE(g.importance_n, 0),
+        COALESCE(g.total_merged_prs, 0), COALESCE(g.total_stars_earned, 0), COALESCE(g.total_contributions, 0),
+        COALESCE(c.unique_repos, 0), COALESCE(c.contribution_quality_sum, 0), COALESCE(c.contribution_quality_n, 0),
+        COALESCE(m.email_count, 0)
+    FROM staff s
+    LEFT JOIN profiles g ON g.company_id = s.company_id AND g.scope = s.scope
+    LEFT JOIN contributions c ON c.company_id = s.company_id AND c.scope = s.scope
+    LEFT JOIN emails m ON m.company_id = s.company_id AND m.scope = s.scope
+"""
+
+# (table, rows of the batch to replace, aggregate insert)
+REFRESH_STEPS = (
+    ('company_monthly_rollup',
+     "DELETE FROM company_monthly_rollup r USING rollup_batch b WHERE r.company_id = b.company_id",
+     INSERT_MONTHLY_SQL),
+    ('company_talent_flow_rollup',
+     """DELETE FROM company_talent_flow_rollup r
+        WHERE r.from_company_id IN (SELECT company_id FROM rollup_batch)
+        OR r.to_company_id IN (SELECT company_id FROM rollup_batch)""",
+     INSERT_FLOW_SQL),
+    ('company_language_rollup',
+     "DELETE FROM company_language_rollup r USING rollup_batch b WHERE r.company_id = b.company_id",
+     INSERT_LANGUAGE_SQL),
+    ('company_summary_rollup',
+     "DELETE FROM company_summary_rollup r USING rollup_batch b WHERE r.company_id = b.company_id",
+     INSERT_SUMMARY_SQL),
+)
+
+
+class CompanyRollups:
+    """Recomputes company rollup rows for dirty (or all) companies"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def refresh(self, full: bool = False) -> Dict:
+        """
+        Refresh the rollups in a single transaction
+
+        Args:
+            full: Rebuild every company (also picks up GitHub / importance changes)
+
+        Returns:
+            Stats: companies refreshed and rows written per table; 'skipped' if
+            another refresh holds the lock
+        """
+        start = time.time()
+        stats = {'full': full, 'companies': 0, 'skipped': False}
+        cursor = self.conn.cursor()
+
+        try:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (REFRESH_LOCK_ID,))
+            if not cursor.fetchone()['locked']:
+                self.conn.rollback()
+                stats['skipped'] = True
+                return stats
+
+            cursor.execute("CREATE TEMP TABLE rollup_batch (company_id UUID PRIMARY KEY) ON COMMIT DROP")
+            if full:
+                # DELETE rather than TRUNCATE: readers keep seeing the old rows until commit
+                cursor.execute("DELETE FROM company_rollup_dirty")
+                cursor.execute(CLAIM_ALL_SQL)
+            else:
+                cursor.execute(CLAIM_DIRTY_SQL)
+            stats['companies'] = cursor.rowcount
+            cursor.execute("ANALYZE rollup_batch")
+
+            if stats['companies'] or full:
+                for table, delete_sql, insert_sql in REFRESH_STEPS:
+                    cursor.execute(f"DELETE FROM {table}" if full else delete_sql)
+                    cursor.execute(insert_sql)
+                    stats[table] = cursor.rowcount
+
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        stats['elapsed_seconds'] = round(time.time() - start, 2)
+        return stats
+
+    def status(self) -> Dict:
+        """Pending dirty companies and current row counts"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT COUNT(DISTINCT company_id) AS pending, MIN(marked_at) AS oldest
+                FROM company_rollup_dirty
+            """)
+            dirty = cursor.fetchone()
+            counts = {}
+            for table in ROLLUP_TABLES:
+                cursor.execute(f"SELECT COUNT(*) AS count FROM {table}")
+                counts[table] = cursor.fetchone()['count']
+            return {'pending_companies': dirty['pending'], 'oldest_change': dirty['oldest'], 'rows': counts}
+        finally:
+            cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh precomputed company analytics rollups')
+    parser.add_argument('--full', action='store_true', help='Rebuild all companies, not just changed ones')
+    parser.add_argument('--stats', action='store_true', help='Show pending changes and row counts only')
+    args = parser.parse_args()
+
+    conn = get_db_connection(use_pool=False)
+    try:
+        rollups = CompanyRollups(conn)
+
+        if args.stats:
+            status = rollups.status()
+            print(f"\n📋 Pending companies: {status['pending_companies']:,}"
+                  f"{' (oldest change ' + str(status['oldest_change']) + ')' if status['oldest_change'] else ''}")
+            for table, count in status['rows'].items():
+                print(f"   {table}: {count:,} rows")
+            return
+
+        print(f"\n🔄 Refreshing company rollups ({'full' if args.full else 'incremental'})...")
+        stats = rollups.refresh(full=args.full)
+
+        if stats['skipped']:
+            print("⚠️  Another refresh is running - skipped")
+            return
+        print(f"✅ {stats['companies']:,} companies refreshed in {stats['elapsed_seconds']}s")
+        for table in ROLLUP_TABLES:
+            if table in stats:
+                print(f"   {table}: {stats[table]:,} rows")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,9 @@ Usage:
     python3 compute_all_importance_scores.py --developers
     python3 compute_all_importance_scores.py --all
     python3 compute_all_importance_scores.py --limit 1000
+    python3 compute_all_importance_scores.py --vectorized   # Snapshot + bulk load (fast)
+
+For what-if experiments with different weights see importance_model.py.
 
 Author: AI Assistant (Tier 1 Data Completion)
 Date: October 24, 2025
@@ -370,6 +373,8 @@ def main():
     parser.add_argument('--all', action='store_true', help='Compute all scores')
     parser.add_argument('--limit', type=int, help='Limit number to process (for testing)')
     parser.add_argument('--report', action='store_true', help='Generate report only (no computation)')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='Rescore everything from a fresh feature snapshot in one pass (ignores --limit)')
     args = parser.parse_args()
     
     print("\n" + "📊 " + "=" * 66)
@@ -383,6 +388,20 @@ def main():
             print("\n📋 Generating report only...")
             computer.generate_report()
         
+        elif args.vectorized:
+            from importance_model import ImportanceFeatureSnapshot, ImportanceModel
+            
+            print("\n📋 Rescoring all repos and developers from a feature snapshot...")
+            snapshot = ImportanceFeatureSnapshot().load_from_database(computer.conn)
+            snapshot.save()
+            result = ImportanceModel(snapshot).write(computer.conn)
+            
+            computer.stats['repos_processed'] = len(snapshot.repositories)
+            computer.stats['repos_scored'] = result['repos_updated']
+            computer.stats['developers_processed'] = len(snapshot.developers)
+            computer.stats['developers_scored'] = result['developers_updated']
+            computer.create_indexes()
+        
         elif args.all or (not args.repos and not args.developers):
             print("\n📋 Computing importance scores for repos and developers...")
             
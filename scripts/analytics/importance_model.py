@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: Vectorized importance-score model over a columnar feature snapshot
+ABOUTME: Recomputes repo/developer scores in one pass and bulk-loads them back
+
+Importance Score Model
+======================
+The SQL functions compute_repository_importance() and
+compute_developer_importance() (migration 09) are called once per row, which
+makes a full rescore of 333K repos and 100K developers take a long time and
+makes experimenting with different weights impractical.
+
+This module reproduces the same formulas with NumPy/pandas:
+
+1. Load a feature snapshot (stars, forks, followers, merged PRs, contribution
+   counts, ...) with two set-based queries
+2. Persist the snapshot as Parquet in Config.SNAPSHOT_DIR
+3. Score every repository and developer in one vectorized pass
+4. Bulk-load the scores back with COPY + a single UPDATE ... FROM per table
+
+Because the snapshot lives on disk, "what-if" runs with new weights need no
+database round trips at all.
+
+Weights are plain dicts (JSON-friendly). A weights file only needs to contain
+the keys it overrides, e.g.:
+
+    {"repository": {"linear": {"stars": [200, 40]}, "ecosystem_bonus": 15}}
+
+Usage:
+    python3 importance_model.py --refresh-snapshot          # Pull features from DB
+    python3 importance_model.py --what-if weights.json      # Compare against current weights
+    python3 importance_model.py --write                     # Score + bulk-load into DB
+    python3 importance_model.py --weights weights.json --write
+"""
+
+import argparse
+import copy
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import Config, get_db_connection, load_env_file
+load_env_file()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Mirrors compute_repository_importance() in 09_ai_discovery_schema.sql.
+# 'linear' terms are {column: [divisor, cap]} -> LEAST(column / divisor, cap)
+DEFAULT_REPOSITORY_WEIGHTS = {
+    'linear': {
+        'stars': [100.0, 50.0],
+        'forks': [50.0, 20.0],
+        'contributor_count': [10.0, 20.0],
+    },
+    'ecosystem_bonus': 10.0,        # Flat bonus if the repo is in any ecosystem
+    'recency_points': 10.0,         # Full bonus for a push today...
+    'recency_window_days': 365.0,   # ...decaying linearly to 0 over this window
+    'max_score': 100.0,
+}
+
+# Mirrors compute_developer_importance() in 09_ai_discovery_schema.sql
+DEFAULT_DEVELOPER_WEIGHTS = {
+    'linear': {
+        'followers': [50.0, 20.0],
+        'total_merged_prs': [10.0, 30.0],
+        'total_lines_contributed': [5000.0, 20.0],
+        'repo_count': [5.0, 15.0],
+    },
+    'points_per_ecosystem': 5.0,
+    'ecosystem_cap': 15.0,
+    'orbit_bonus': 5.0,             # Flat bonus if in the orbit of a notable dev
+    'max_score': 100.0,
+}
+
+REPOSITORY_SNAPSHOT = 'importance_repository_features.parquet'
+DEVELOPER_SNAPSHOT = 'importance_developer_features.parquet'
+
+
+def merge_weights(base: Dict, overrides: Optional[Dict]) -> Dict:
+    """Return a copy of base with overrides applied (linear terms merged per column)"""
+    merged = copy.deepcopy(base)
+    if not overrides:
+        return merged
+
+    for key, value in overrides.items():
+        if key == 'linear':
+            merged['linear'].update(value)
+        else:
+            merged[key] = value
+
+    return merged
+
+
+def load_weights_file(path: Path) -> Tuple[Dict, Dict]:
+    """Load repository/developer weight overrides from a JSON file"""
+    with open(path, 'r') as f:
+        overrides = json.load(f)
+
+    return (
+        merge_weights(DEFAULT_REPOSITORY_WEIGHTS, overrides.get('repository')),
+        merge_weights(DEFAULT_DEVELOPER_WEIGHTS, overrides.get('developer')),
+    )
+
+
+def _linear_terms(df: pd.DataFrame, linear: Dict) -> np.ndarray:
+    """Sum of capped linear terms: sum(min(col / divisor, cap))"""
+    total = np.zeros(len(df), dtype=np.float64)
+
+    for column, (divisor, cap) in linear.items():
+        if column not in df.columns:
+            raise KeyError(f"Feature '{column}' is not in the snapshot")
+        values = df[column].fillna(0).to_numpy(dtype=np.float64)
+        total += np.minimum(values / float(divisor), float(cap))
+
+    return total
+
+
+def score_repositories(df: pd.DataFrame, weights: Dict = None) -> np.ndarray:
+    """
+    Vectorized compute_repository_importance()
+
+    Expects the columns produced by ImportanceFeatureSnapshot (stars, forks,
+    contributor_count, ecosystem_count, days_since_push). Missing values count
+    as 0 rather than inheriting SQL's LEAST(NULL, cap) = cap behaviour.
+    """
+    weights = weights or DEFAULT_REPOSITORY_WEIGHTS
+    score = _linear_terms(df, weights['linear'])
+
+    in_ecosystem = df['ecosystem_count'].fillna(0).to_numpy() > 0
+    score += np.where(in_ecosystem, weights['ecosystem_bonus'], 0.0)
+
+    # Recency only applies when we know when the repo was last pushed
+    days = df['days_since_push'].to_numpy(dtype=np.float64)
+    points = weights['recency_points']
+    per_day = points / weights['recency_window_days']
+    recency = np.maximum(points - days * per_day, 0.0)
+    score += np.where(np.isnan(days), 0.0, recency)
+
+    return np.minimum(score, weights['max_score'])
+
+
+def score_developers(df: pd.DataFrame, weights: Dict = None) -> np.ndarray:
+    """
+    Vectorized compute_developer_importance()
+
+    Expects the columns produced by ImportanceFeatureSnapshot (followers,
+    total_merged_prs, total_lines_contributed, repo_count, ecosystem_count,
+    orbit_count).
+    """
+    weights = weights or DEFAULT_DEVELOPER_WEIGHTS
+    score = _linear_terms(df, weights['linear'])
+
+    ecosystems = df['ecosystem_count'].fillna(0).to_numpy(dtype=np.float64)
+    score += np.minimum(ecosystems * weights['points_per_ecosystem'], weights['ecosystem_cap'])
+
+    in_orbit = df['orbit_count'].fillna(0).to_numpy() > 0
+    score += np.where(in_orbit, weights['orbit_bonus'], 0.0)
+
+    return np.minimum(score, weights['max_score'])
+
+
+class ImportanceFeatureSnapshot:
+    """
+    Columnar snapshot of every feature the importance formulas use
+
+    Loaded from the database once (two queries) and cached as Parquet so
+    repeated scoring runs are purely in-memory.
+    """
+
+    def __init__(self, snapshot_dir: Path = None):
+        self.snapshot_dir = Path(snapshot_dir or Config.SNAPSHOT_DIR)
+        self.repositories: Optional[pd.DataFrame] = None
+        self.developers: Optional[pd.DataFrame] = None
+
+    @property
+    def repository_path(self) -> Path:
+        return self.snapshot_dir / REPOSITORY_SNAPSHOT
+
+    @property
+    def developer_path(self) -> Path:
+        return self.snapshot_dir / DEVELOPER_SNAPSHOT
+
+    def exists(self) -> bool:
+        return self.repository_path.exists() and self.developer_path.exists()
+
+    def load_from_database(self, conn) -> 'ImportanceFeatureSnapshot':
+        """Pull all features in two set-based queries"""
+        cursor = conn.cursor()
+
+        start = time.time()
+        # days_since_push is resolved at snapshot time so offline recomputes
+        # match what the SQL function would have returned at that moment
+        cursor.execute("""
+            SELECT
+                r.repo_id::text AS repo_id,
+                COALESCE(r.stars, 0) AS stars,
+                COALESCE(r.forks, 0) AS forks,
+                COALESCE(r.contributor_count, 0) AS contributor_count,
+                COALESCE(cardinality(r.ecosystem_ids), 0) AS ecosystem_count,
+                EXTRACT(EPOCH FROM (NOW() - r.last_pushed_at)) / 86400 AS days_since_push
+            FROM github_repository r
+        """)
+        self.repositories = pd.DataFrame.from_records(
+            [dict(row) for row in cursor.fetchall()],
+            columns=['repo_id', 'stars', 'forks', 'contributor_count',
+                     'ecosystem_count', 'days_since_push']
+        )
+        self.repositories['days_since_push'] = self.repositories['days_since_push'].astype('float64')
+        logger.info(f"Loaded {len(self.repositories):,} repositories in {time.time() - start:.1f}s")
+
+        start = time.time()
+        cursor.execute("""
+            SELECT
+                gp.github_profile_id::text AS github_profile_id,
+                COALESCE(gp.followers, 0) AS followers,
+                COALESCE(gp.total_merged_prs, 0) AS total_merged_prs,
+                COALESCE(gp.total_lines_contributed, 0) AS total_lines_contributed,
+                COALESCE(gc.repo_count, 0) AS repo_count,
+                COALESCE(gc.total_contributions, 0) AS total_contributions,
+                COALESCE(cardinality(gp.ecosystem_tags), 0) AS ecosystem_count,
+                COALESCE(cardinality(gp.orbit_of), 0) AS orbit_count
+            FROM github_profile gp
+            LEFT JOIN (
+                SELECT
+                    github_profile_id,
+                    COUNT(*) AS repo_count,
+                    SUM(contribution_count) AS total_contributions
+                FROM github_contribution
+                GROUP BY github_profile_id
+            ) gc ON gc.github_profile_id = gp.github_profile_id
+        """)
+        self.developers = pd.DataFrame.from_records(
+            [dict(row) for row in cursor.fetchall()],
+            columns=['github_profile_id', 'followers', 'total_merged_prs',
+                     'total_lines_contributed', 'repo_count', 'total_contributions',
+                     'ecosystem_count', 'orbit_count']
+        )
+        logger.info(f"Loaded {len(self.developers):,} developers in {time.time() - start:.1f}s")
+
+        cursor.close()
+        return self
+
+    def save(self) -> None:
+        """Persist the snapshot as Parquet"""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.repositories.to_parquet(self.repository_path, index=False)
+        self.developers.to_parquet(self.developer_path, index=False)
+
+        logger.info(f"Snapshot saved to {self.snapshot_dir}")
+
+    def load(self) -> 'ImportanceFeatureSnapshot':
+        """Load a previously saved Parquet snapshot"""
+        if not self.exists():
+            raise FileNotFoundError(
+                f"No importance snapshot in {self.snapshot_dir} (run with --refresh-snapshot)"
+            )
+
+        self.repositories = pd.read_parquet(self.repository_path)
+        self.developers = pd.read_parquet(self.developer_path)
+        return self
+
+
+class ImportanceModel:
+    """Scores a feature snapshot and writes results back in bulk"""
+
+    def __init__(self, snapshot: ImportanceFeatureSnapshot,
+                 repository_weights: Dict = None, developer_weights: Dict = None):
+        self.snapshot = snapshot
+        self.repository_weights = repository_weights or DEFAULT_REPOSITORY_WEIGHTS
+        self.developer_weights = developer_weights or DEFAULT_DEVELOPER_WEIGHTS
+
+    def score(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Score all repositories and developers; returns (repo_scores, developer_scores)"""
+        start = time.time()
+
+        repos = self.snapshot.repositories[['repo_id']].copy()
+        repos['importance_score'] = score_repositories(
+            self.snapshot.repositories, self.repository_weights
+        )
+
+        developers = self.snapshot.developers[['github_profile_id']].copy()
+        developers['importance_score'] = score_developers(
+            self.snapshot.developers, self.developer_weights
+        )
+
+        logger.info(
+            f"Scored {len(repos):,} repositories and {len(developers):,} developers "
+            f"in {time.time() - start:.2f}s"
+        )
+        return repos, developers
+
+    @staticmethod
+    def bulk_load(conn, table: str, id_column: str, scores: pd.DataFrame) -> int:
+        """
+        COPY scores into a temp table and apply them with one UPDATE ... FROM
+
+        Only rows whose score actually changed are touched, which keeps WAL
+        and index churn down on repeated runs.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE tmp_importance_score (
+                id UUID PRIMARY KEY,
+                importance_score FLOAT NOT NULL
+            ) ON COMMIT DROP
+        """)
+
+        buffer = io.StringIO()
+        scores[[id_column, 'importance_score']].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY tmp_importance_score (id, importance_score) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+        # table/id_column come from the fixed call sites below, never user input
+        cursor.execute(f"""
+            UPDATE {table} t
+            SET importance_score = s.importance_score
+            FROM tmp_importance_score s
+            WHERE t.{id_column} = s.id
+            AND t.importance_score IS DISTINCT FROM s.importance_score
+        """)
+        updated = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        return updated
+
+    def write(self, conn) -> Dict[str, int]:
+        """Score everything and bulk-load the results into the database"""
+        repos, developers = self.score()
+
+        start = time.time()
+        repos_updated = self.bulk_load(conn, 'github_repository', 'repo_id', repos)
+        developers_updated = self.bulk_load(conn, 'github_profile', 'github_profile_id', developers)
+        logger.info(f"Bulk-loaded scores in {time.time() - start:.1f}s")
+
+        return {
+            'repos_updated': repos_updated,
+            'developers_updated': developers_updated,
+        }
+
+
+def compare_scores(baseline: pd.DataFrame, candidate: pd.DataFrame, id_column: str,
+                   top_n: int = 20) -> Dict:
+    """Summarize how a what-if scoring run differs from the baseline"""
+    merged = baseline.merge(candidate, on=id_column, suffixes=('_baseline', '_candidate'))
+    delta = merged['importance_score_candidate'] - merged['importance_score_baseline']
+
+    baseline_top = set(merged.nlargest(top_n, 'importance_score_baseline')[id_column])
+    candidate_top = set(merged.nlargest(top_n, 'importance_score_candidate')[id_column])
+
+    return {
+        'rows': len(merged),
+        'changed': int((delta.abs() > 1e-9).sum()),
+        'mean_delta': float(delta.mean()) if len(delta) else 0.0,
+        'max_increase': float(delta.max()) if len(delta) else 0.0,
+        'max_decrease': float(delta.min()) if len(delta) else 0.0,
+        'rank_correlation': float(
+            merged['importance_score_baseline'].rank().corr(
+                merged['importance_score_candidate'].rank()
+            )
+        ) if len(merged) > 1 else 1.0,
+        f'top_{top_n}_overlap': len(baseline_top & candidate_top),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized importance-score model')
+    parser.add_argument('--refresh-snapshot', action='store_true',
+                        help='Reload features from the database before scoring')
+    parser.add_argument('--weights', type=Path, help='JSON file with weight overrides to score with')
+    parser.add_argument('--what-if', type=Path, metavar='WEIGHTS',
+                        help='JSON file with weight overrides to compare against --weights (no DB writes)')
+    parser.add_argument('--write', action='store_true', help='Bulk-load scores into the database')
+    parser.add_argument('--snapshot-dir', type=Path, help=f'Snapshot directory (default: {Config.SNAPSHOT_DIR})')
+    args = parser.parse_args()
+
+    print("\n" + "📊 " + "=" * 66)
+    print("📊  Importance Score Model")
+    print("📊 " + "=" * 66)
+
+    snapshot = ImportanceFeatureSnapshot(args.snapshot_dir)
+    conn = None
+
+    try:
+        if args.refresh_snapshot or not snapshot.exists():
+            conn = get_db_connection(use_pool=False)
+            snapshot.load_from_database(conn)
+            snapshot.save()
+        else:
+            snapshot.load()
+            logger.info(
+                f"Using snapshot: {len(snapshot.repositories):,} repositories, "
+                f"{len(snapshot.developers):,} developers"
+            )
+
+        if args.weights:
+            repo_weights, dev_weights = load_weights_file(args.weights)
+        else:
+            repo_weights, dev_weights = DEFAULT_REPOSITORY_WEIGHTS, DEFAULT_DEVELOPER_WEIGHTS
+
+        model = ImportanceModel(snapshot, repo_weights, dev_weights)
+
+        if args.what_if:
+            baseline_repos, baseline_devs = model.score()
+            what_if_repo_weights, what_if_dev_weights = load_weights_file(args.what_if)
+            candidate = ImportanceModel(snapshot, what_if_repo_weights, what_if_dev_weights)
+            candidate_repos, candidate_devs = candidate.score()
+
+            print("\nRepositories:")
+            for key, value in compare_scores(baseline_repos, candidate_repos, 'repo_id').items():
+                print(f"  {key}: {value}")
+            print("\nDevelopers:")
+            for key, value in compare_scores(baseline_devs, candidate_devs, 'github_profile_id').items():
+                print(f"  {key}: {value}")
+
+        elif args.write:
+            if conn is None:
+                conn = get_db_connection(use_pool=False)
+            result = model.write(conn)
+            print(f"\n✅ Repositories updated: {result['repos_updated']:,}")
+            print(f"✅ Developers updated: {result['developers_updated']:,}")
+
+        else:
+            repos, developers = model.score()
+            print(f"\nRepositories scored: {len(repos):,} (mean {repos['importance_score'].mean():.2f})")
+            print(f"Developers scored: {len(developers):,} (mean {developers['importance_score'].mean():.2f})")
+            print("\nRun with --write to bulk-load the scores")
+
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: Refreshes the per-person network degree table and network summaries (migration 24)
+ABOUTME: Incremental by default: only people whose co-employment or collaboration edges changed
+
+Network Degree
+==============
+The graph stats, top-connected and network-density endpoints read
+connection counts from person_network_degree and the degree distribution
+from network_summary instead of grouping both edge tables per request.
+
+Triggers on edge_coemployment and edge_github_collaboration append both
+endpoints of changed edges to network_degree_dirty. A refresh claims those
+rows, recounts the claimed people's edges through the src/dst indexes and
+recomputes the two summary rows from the degree table - all in one
+transaction, so a failed refresh leaves the dirty rows for the next run.
+
+TRUNCATE is not tracked; the edge builders run a full refresh when they
+finish. The API scheduler runs the incremental refresh every
+NETWORK_DEGREE_REFRESH_MINUTES (default 15).
+
+Usage:
+    python3 scripts/analytics/network_degree.py           # Dirty people only
+    python3 scripts/analytics/network_degree.py --full    # Rebuild everything
+    python3 scripts/analytics/network_degree.py --stats   # Show pending / summaries
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_connection
+
+# Arbitrary key for pg_try_advisory_xact_lock so overlapping refreshes don't collide
+REFRESH_LOCK_ID = 24_0001
+
+NETWORKS = ('coemployment', 'github')
+
+CLAIM_DIRTY_SQL = """
+    WITH claimed AS (
+        DELETE FROM network_degree_dirty RETURNING person_id
+    )
+    INSERT INTO degree_batch (person_id)
+    SELECT DISTINCT person_id FROM claimed
+"""
+
+DEGREE_COLUMNS = """
+    person_id, coemployment_degree, github_degree,
+    github_strength_sum, github_strength_n, github_shared_repos_sum
+"""
+
+# Recount the batch's edges one person at a time through the src/dst indexes
+INSERT_BATCH_SQL = f"""
+    INSERT INTO person_network_degree ({DEGREE_COLUMNS})
+    SELECT b.person_id, ce.degree, gh.degree, gh.strength_sum, gh.strength_n, gh.shared_repos_sum
+    FROM degree_batch b
+    JOIN person p ON p.person_id = b.person_id
+    CROSS JOIN LATERAL (
+        SELECT
+            (SELECT COUNT(*) FROM edge_coemployment WHERE src_person_id = b.person_id)
+            + (SELECT COUNT(*) FROM edge_coemployment WHERE dst_person_id = b.person_id) AS degree
+    ) ce
+    CROSS JOIN LATERAL (
+        SELECT
+            COUNT(*) AS degree,
+            COALESCE(SUM(collaboration_strength), 0) AS strength_sum,
+            COUNT(collaboration_strength) AS strength_n,
+            COALESCE(SUM(shared_repos), 0) AS shared_repos_sum
+        FROM (
+            SELECT collaboration_strength, shared_repos
+            FROM edge_github_collaboration WHERE src_person_id = b.person_id
+            UNION ALL
+            SELECT collaboration_strength, shared_repos
+            FROM edge_github_collaboration WHERE dst_person_id = b.person_id
+        ) edges
+    ) gh
+    WHERE ce.degree > 0 OR gh.degree > 0
+"""
+
+# Aggregate each side before combining, so the full rebuild is two grouped scans per table
+INSERT_ALL_SQL = f"""
+    INSERT INTO person_network_degree ({DEGREE_COLUMNS})
+    WITH coemployment AS (
+        SELECT person_id, SUM(degree) AS degree
+        FROM (
+            SELECT src_person_id AS person_id, COUNT(*) AS degree FROM edge_coemployment GROUP BY 1
+            UNION ALL
+            SELECT dst_person_id, COUNT(*) FROM edge_coemployment GROUP BY 1
+        ) sides
+        GROUP BY person_id
+    ),
+    github AS (
+        SELECT
+            person_id,
+            SUM(degree) AS degree,
+            SUM(strength_sum) AS strength_sum,
+            SUM(strength_n) AS strength_n,
+            SUM(shared_repos_sum) AS shared_repos_sum
+        FROM (
+            SELECT src_person_id AS person_id, COUNT(*) AS degree,
+                   COALESCE(SUM(collaboration_strength), 0) AS strength_sum,
+                   COUNT(collaboration_strength) AS strength_n,
+                   COALESCE(SUM(shared_repos), 0) AS shared_repos_sum
+            FROM edge_github_collaboration GROUP BY 1
+            UNION ALL
+            SELECT dst_person_id, COUNT(*),
+                   COALESCE(SUM(collaboration_strength), 0),
+                   COUNT(collaboration_strength),
+                   COALESCE(SUM(shared_repos), 0)
+            FROM edge_github_collaboration GROUP BY 1
+        ) sides
+        GROUP BY person_id
+    )
+    SELECT
+        COALESCE(c.person_id, g.person_id),
+        COALESCE(c.degree, 0),
+        COALESCE(g.degree, 0),
+        COALESCE(g.strength_sum, 0),
+        COALESCE(g.strength_n, 0),
+        COALESCE(g.shared_repos_sum, 0)
+    FROM coemployment c
+    FULL JOIN github g ON g.person_id = c.person_id
+"""
+
+# Every edge adds one to the degree of each endpoint, so edges = SUM(degree) / 2
+SUMMARY_SQL = """
+    INSERT INTO network_summary (
+        network, people, edges, min_degree, max_degree, avg_degree, median_degree,
+        avg_strength, avg_shared_repos, refreshed_at
+    )
+    SELECT
+        'coemployment',
+        COUNT(*),
+        COALESCE(SUM(coemployment_degree), 0) / 2,
+        MIN(coemployment_degree),
+        MAX(coemployment_degree),
+        AVG(coemployment_degree),
+        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY coemployment_degree),
+        NULL,
+        NULL,
+        NOW()
+    FROM person_network_degree
+    WHERE coemployment_degree > 0
+    UNION ALL
+    SELECT
+        'github',
+        COUNT(*),
+        COALESCE(SUM(github_degree), 0) / 2,
+        MIN(github_degree),
+        MAX(github_degree),
+        AVG(github_degree),
+        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY github_degree),
+        SUM(github_strength_sum) / NULLIF(SUM(github_strength_n), 0),
+        SUM(github_shared_repos_sum)::float / NULLIF(SUM(github_degree), 0),
+        NOW()
+    FROM person_network_degree
+    WHERE github_degree > 0
+    ON CONFLICT (network) DO UPDATE SET
+        people = EXCLUDED.people,
+        edges = EXCLUDED.edges,
+        min_degree = EXCLUDED.min_degree,
+        max_degree = EXCLUDED.max_degree,
+        avg_degree = EXCLUDED.avg_degree,
+        median_degree = EXCLUDED.median_degree,
+        avg_strength = EXCLUDED.avg_strength,
+        avg_shared_repos = EXCLUDED.avg_shared_repos,
+        refreshed_at = EXCLUDED.refreshed_at
+"""
+
+
+class NetworkDegree:
+    """Recomputes person_network_degree for dirty (or all) people and the network summaries"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def refresh(self, full: bool = False, wait: bool = False) -> Dict:
+        """
+        Refresh degrees and summaries in a single transaction
+
+        Args:
+            full: Rebuild every person (needed after an edge table is truncated)
+            wait: Wait for a running refresh to finish instead of skipping
+
+        Returns:
+            Stats: people recounted, degree rows written and elapsed seconds;
+            'skipped' if another refresh holds the lock and wait is False
+        """
+        start = time.time()
+        stats = {'full': full, 'people': 0, 'skipped': False}
+        cursor = self.conn.cursor()
+
+        try:
+            if wait:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (REFRESH_LOCK_ID,))
+            else:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (REFRESH_LOCK_ID,))
+                if not cursor.fetchone()['locked']:
+                    self.conn.rollback()
+                    stats['skipped'] = True
+                    stats['elapsed_seconds'] = round(time.time() - start, 2)
+                    return stats
+
+            if full:
+                # DELETE rather than TRUNCATE: readers keep seeing the old rows until commit
+                cursor.execute("DELETE FROM network_degree_dirty")
+                cursor.execute("DELETE FROM person_network_degree")
+                cursor.execute(INSERT_ALL_SQL)
+                stats['people'] = stats['degree_rows'] = cursor.rowcount
+            else:
+                cursor.execute("CREATE TEMP TABLE degree_batch (person_id UUID PRIMARY KEY) ON COMMIT DROP")
+                cursor.execute(CLAIM_DIRTY_SQL)
+                stats['people'] = cursor.rowcount
+                if stats['people']:
+                    cursor.execute("ANALYZE degree_batch")
+                    cursor.execute("""
+                        DELETE FROM person_network_degree d
+                        USING degree_batch b
+                        WHERE d.person_id = b.person_id
+                    """)
+                    cursor.execute(INSERT_BATCH_SQL)
+                    stats['degree_rows'] = cursor.rowcount
+
+            if stats['people'] or full:
+                cursor.execute(SUMMARY_SQL)
+
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        stats['elapsed_seconds'] = round(time.time() - start, 2)
+        return stats
+
+    def status(self) -> Dict:
+        """Pending dirty people and the current summaries"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT COUNT(DISTINCT person_id) AS pending, MIN(marked_at) AS oldest
+                FROM network_degree_dirty
+            """)
+            dirty = cursor.fetchone()
+            cursor.execute("SELECT * FROM network_summary ORDER BY network")
+            summaries = {row['network']: dict(row) for row in cursor.fetchall()}
+            return {'pending_people': dirty['pending'], 'oldest_change': dirty['oldest'], 'summaries': summaries}
+        finally:
+            cursor.close()
+
+
+def refresh_after_build() -> Dict:
+    """
+    Full refresh on its own connection, for edge builders to run once they finish
+
+    Waits for a scheduled incremental refresh rather than skipping: after a
+    TRUNCATE of an edge table only a full refresh brings the degrees back.
+    """
+    conn = get_db_connection(use_pool=False)
+    try:
+        return NetworkDegree(conn).refresh(full=True, wait=True)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh per-person network degree and network summaries')
+    parser.add_argument('--full', action='store_true', help='Rebuild all people, not just changed ones')
+    parser.add_argument('--stats', action='store_true', help='Show pending changes and summaries only')
+    args = parser.parse_args()
+
+    conn = get_db_connection(use_pool=False)
+    try:
+        degrees = NetworkDegree(conn)
+
+        if not args.stats:
+            print(f"\n🔄 Refreshing network degree ({'full' if args.full else 'incremental'})...")
+            stats = degrees.refresh(full=args.full)
+            if stats['skipped']:
+                print("⚠️  Another refresh is running - skipped")
+                return
+            print(f"✅ {stats['people']:,} people refreshed in {stats['elapsed_seconds']}s")
+
+        status = degrees.status()
+        print(f"\n📋 Pending people: {status['pending_people']:,}"
+              f"{' (oldest change ' + str(status['oldest_change']) + ')' if status['oldest_change'] else ''}")
+        for network in NETWORKS:
+            summary = status['summaries'].get(network)
+            if not summary:
+                print(f"   {network}: not computed yet - run with --full")
+                continue
+            print(f"   {network}: {summary['people']:,} people, {summary['edges']:,} edges, "
+                  f"avg degree {summary['avg_degree'] or 0:.1f}, max {summary['max_degree'] or 0:,} "
+                  f"(as of {summary['refreshed_at']})")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
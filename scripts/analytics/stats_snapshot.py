@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: Refreshes the one-row stats_snapshot (migration 23) behind /api/stats/quality and /coverage
+ABOUTME: One pass over person plus one COUNT(DISTINCT) per side table, instead of five scans per request
+
+Stats Snapshot
+==============
+The quality and coverage endpoints used to count person, person_email,
+github_profile, employment and education on every request (coverage through
+a four-way LEFT JOIN). This computes every metric in a single statement and
+upserts it into stats_snapshot with its refresh time. The endpoints read
+that row and report its age. The API scheduler refreshes it every
+STATS_SNAPSHOT_REFRESH_MINUTES (default 10), and ?fresh=true runs the same
+statement under a short statement_timeout.
+
+Usage:
+    python3 scripts/analytics/stats_snapshot.py          # Refresh now
+    python3 scripts/analytics/stats_snapshot.py --show   # Print the current snapshot
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import get_db_connection
+
+METRICS = (
+    'total_people', 'with_linkedin', 'with_location', 'with_headline',
+    'with_email', 'with_github', 'with_employment', 'with_education',
+)
+
+COMPUTE_SQL = """
+    SELECT
+        p.total_people,
+        p.with_linkedin,
+        p.with_location,
+        p.with_headline,
+        (SELECT COUNT(DISTINCT person_id) FROM person_email) AS with_email,
+        (SELECT COUNT(DISTINCT person_id) FROM github_profile) AS with_github,
+        (SELECT COUNT(DISTINCT person_id) FROM employment) AS with_employment,
+        (SELECT COUNT(DISTINCT person_id) FROM education) AS with_education
+    FROM (
+        SELECT
+            COUNT(*) AS total_people,
+            COUNT(*) FILTER (WHERE normalized_linkedin_url IS NOT NULL AND normalized_linkedin_url != '') AS with_linkedin,
+            COUNT(*) FILTER (WHERE location IS NOT NULL AND location != '') AS with_location,
+            COUNT(*) FILTER (WHERE headline IS NOT NULL AND headline != '') AS with_headline
+        FROM person
+    ) p
+"""
+
+UPSERT_SQL = f"""
+    INSERT INTO stats_snapshot (snapshot_key, {', '.join(METRICS)}, refresh_ms, refreshed_at)
+    VALUES ('people', {', '.join(f'%({m})s' for m in METRICS)}, %(refresh_ms)s, NOW())
+    ON CONFLICT (snapshot_key) DO UPDATE SET
+        {', '.join(f'{m} = EXCLUDED.{m}' for m in METRICS)},
+        refresh_ms = EXCLUDED.refresh_ms,
+        refreshed_at = EXCLUDED.refreshed_at
+    RETURNING {', '.join(METRICS)}, refresh_ms, refreshed_at
+"""
+
+
+class StatsSnapshot:
+    """Computes, stores and reads the people stats snapshot"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def compute(self, budget_ms: Optional[int] = None) -> Dict:
+        """
+        Run the exact counts and store them as the new snapshot
+
+        Args:
+            budget_ms: statement_timeout for the counts (psycopg2 raises
+                QueryCanceled when it is exceeded); None keeps the session's
+
+        Returns:
+            The stored snapshot row
+        """
+        start = time.time()
+        cursor = self.conn.cursor()
+        try:
+            if budget_ms:
+                cursor.execute("SET LOCAL statement_timeout = %s", (f"{int(budget_ms)}ms",))
+            cursor.execute(COMPUTE_SQL)
+            counts = dict(cursor.fetchone())
+            counts['refresh_ms'] = int((time.time() - start) * 1000)
+            if budget_ms:
+                cursor.execute("SET LOCAL statement_timeout = DEFAULT")
+            cursor.execute(UPSERT_SQL, counts)
+            snapshot = dict(cursor.fetchone())
+            self.conn.commit()
+            return snapshot
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def read(self) -> Optional[Dict]:
+        """Current snapshot row, or None if it was never computed"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT {', '.join(METRICS)}, refresh_ms, refreshed_at,
+                       EXTRACT(EPOCH FROM NOW() - refreshed_at) AS age_seconds
+                FROM stats_snapshot
+                WHERE snapshot_key = 'people'
+            """)
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        finally:
+            cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the stats snapshot behind /api/stats/quality and /coverage')
+    parser.add_argument('--show', action='store_true', help='Print the current snapshot without refreshing')
+    args = parser.parse_args()
+
+    conn = get_db_connection(use_pool=False)
+    try:
+        stats = StatsSnapshot(conn)
+        if args.show:
+            snapshot = stats.read()
+            if not snapshot:
+                print("⚠️  No snapshot yet - run without --show to compute one")
+                return
+        else:
+            print("\n🔄 Computing stats snapshot...")
+            snapshot = stats.compute()
+
+        print(f"✅ Snapshot from {snapshot['refreshed_at']} (took {snapshot['refresh_ms']:,} ms)")
+        for metric in METRICS:
+            print(f"   {metric}: {snapshot[metric]:,}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: Sparse company x company talent-flow matrix built from ordered employment histories
+ABOUTME: Persisted as a compressed .npz snapshot and served in memory for top-k and multi-hop queries
+
+Talent Flow Matrix
+==================
+Every direct move of a person from one company to the next, for the whole
+dataset, in one pass:
+
+1. Load (person, company, start, end) for every stint with one query
+2. Pair each stint with the person's most recently *ended* earlier stint
+   (a sorted as-of scan per person, pandas.merge_asof) - that is the
+   company they came from. Overlapping side jobs are not moves.
+3. Count distinct people per (from, to) and store the result as CSR
+   arrays (indptr / indices / data, the layout scipy.sparse uses) plus
+   the transposed CSR for inbound queries
+
+Top feeders / destinations of a company read one CSR row: O(row nnz).
+Multi-hop flows (A -> B -> C) propagate a sparse vector through the
+row-normalised matrix, touching only the rows it reaches.
+
+The snapshot lives in Config.SNAPSHOT_DIR/talent_flow_matrix.npz;
+TalentFlowMatrix.shared() keeps one copy per process and reloads it when
+the file changes. The API scheduler rebuilds it nightly.
+
+Usage:
+    python3 scripts/analytics/talent_flow_matrix.py --build
+    python3 scripts/analytics/talent_flow_matrix.py --stats
+    python3 scripts/analytics/talent_flow_matrix.py --company <uuid> [--hops 2]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import Config, get_db_connection
+
+SNAPSHOT_NAME = 'talent_flow_matrix.npz'
+
+_shared: Dict = {'matrix': None, 'path': None, 'mtime': None}
+_shared_lock = threading.Lock()
+
+
+def transitions(stints: pd.DataFrame) -> pd.DataFrame:
+    """
+    Direct moves from ordered employment histories
+
+    Args:
+        stints: person_id, company_id, start_date, end_date (one row per stint)
+
+    Returns:
+        person_id, from_company_id, to_company_id - one row per person and
+        (from, to) pair; moves within the same company are dropped
+    """
+    stints = stints.dropna(subset=['person_id', 'company_id']).copy()
+    stints['start_date'] = pd.to_datetime(stints['start_date'])
+    stints['end_date'] = pd.to_datetime(stints['end_date'])
+
+    starts = (stints.dropna(subset=['start_date'])
+              .sort_values('start_date')
+              .rename(columns={'company_id': 'to_company_id'})
+              [['person_id', 'to_company_id', 'start_date']])
+    ends = (stints.dropna(subset=['end_date'])
+            .sort_values('end_date')
+            .rename(columns={'company_id': 'from_company_id'})
+            [['person_id', 'from_company_id', 'end_date']])
+
+    # For each stint: the person's latest stint that ended on or before it started
+    moves = pd.merge_asof(starts, ends, left_on='start_date', right_on='end_date',
+                          by='person_id', direction='backward')
+    moves = moves.dropna(subset=['from_company_id'])
+    moves = moves[moves['from_company_id'] != moves['to_company_id']]
+
+    return (moves[['person_id', 'from_company_id', 'to_company_id']]
+            .drop_duplicates()
+            .reset_index(drop=True))
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSR arrays counting each (row, col) occurrence; columns sorted within rows"""
+    keys, counts = np.unique(rows.astype(np.int64) * size + cols, return_counts=True)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // size, minlength=size), out=indptr[1:])
+    return indptr, (keys % size).astype(np.int32), counts.astype(np.int32)
+
+
+def _transpose(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+               size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSR of the transposed matrix"""
+    rows = np.repeat(np.arange(size, dtype=np.int64), np.diff(indptr))
+    order = np.lexsort((rows, indices))
+    t_indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=size), out=t_indptr[1:])
+    return t_indptr, rows[order].astype(np.int32), data[order]
+
+
+class TalentFlowMatrix:
+    """
+    Company x company move counts (row = from, column = to) in CSR form
+
+    company_ids is sorted, so a company's row number is a binary search.
+    """
+
+    def __init__(self, company_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, people: int = 0, built_at: float = None):
+        self.company_ids = company_ids
+        self.size = len(company_ids)
+        self.people = people
+        self.built_at = built_at or time.time()
+
+        self.out_csr = (indptr, indices, data)
+        self.in_csr = _transpose(indptr, indices, data, self.size)
+        rows = np.repeat(np.arange(self.size), np.diff(indptr))
+        self.out_totals = np.bincount(rows, weights=data, minlength=self.size)
+        self.in_totals = np.bincount(indices, weights=data, minlength=self.size)
+
+    @property
+    def moves(self) -> int:
+        return int(self.out_csr[2].sum())
+
+    @property
+    def nnz(self) -> int:
+        return len(self.out_csr[2])
+
+    @classmethod
+    def from_stints(cls, stints: pd.DataFrame) -> 'TalentFlowMatrix':
+        """Build the matrix from a stint frame (see transitions())"""
+        moves = transitions(stints)
+        company_ids = np.unique(np.concatenate([
+            moves['from_company_id'].to_numpy(dtype=str),
+            moves['to_company_id'].to_numpy(dtype=str),
+        ]))
+        rows = np.searchsorted(company_ids, moves['from_company_id'].to_numpy(dtype=str))
+        cols = np.searchsorted(company_ids, moves['to_company_id'].to_numpy(dtype=str))
+        indptr, indices, data = _csr(rows, cols, len(company_ids))
+        return cls(company_ids, indptr, indices, data, people=int(moves['person_id'].nunique()))
+
+    @classmethod
+    def load_from_database(cls, conn) -> 'TalentFlowMatrix':
+        """Build from every dated employment stint (one query)"""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT person_id::text AS person_id, company_id::text AS company_id, start_date, end_date
+            FROM employment
+            WHERE company_id IS NOT NULL
+            AND (start_date IS NOT NULL OR end_date IS NOT NULL)
+        """)
+        stints = pd.DataFrame.from_records(
+            [dict(row) for row in cursor.fetchall()],
+            columns=['person_id', 'company_id', 'start_date', 'end_date']
+        )
+        cursor.close()
+        return cls.from_stints(stints)
+
+    @staticmethod
+    def default_path() -> Path:
+        return Config.SNAPSHOT_DIR / SNAPSHOT_NAME
+
+    def save(self, path: Path = None) -> Path:
+        """Write the compressed snapshot atomically"""
+        path = Path(path or self.default_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        indptr, indices, data = self.out_csr
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, company_ids=self.company_ids, indptr=indptr, indices=indices,
+                                data=data, people=self.people, built_at=self.built_at)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = None) -> 'TalentFlowMatrix':
+        path = Path(path or cls.default_path())
+        with np.load(path, allow_pickle=False) as snapshot:
+            return cls(snapshot['company_ids'], snapshot['indptr'], snapshot['indices'],
+                       snapshot['data'], people=int(snapshot['people']),
+                       built_at=float(snapshot['built_at']))
+
+    @classmethod
+    def shared(cls, path: Path = None) -> Optional['TalentFlowMatrix']:
+        """Process-wide copy of the snapshot, reloaded when the file changes; None if not built"""
+        path = Path(path or cls.default_path())
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        with _shared_lock:
+            if _shared['matrix'] is None or _shared['path'] != path or _shared['mtime'] != mtime:
+                _shared.update(matrix=cls.load(path), path=path, mtime=mtime)
+            return _shared['matrix']
+
+    def index_of(self, company_id) -> Optional[int]:
+        company_id = str(company_id)
+        i = int(np.searchsorted(self.company_ids, company_id))
+        return i if i < self.size and self.company_ids[i] == company_id else None
+
+    def _csr_for(self, direction: str):
+        if direction == 'outbound':
+            return self.out_csr, self.out_totals
+        if direction == 'inbound':
+            return self.in_csr, self.in_totals
+        raise ValueError("direction must be 'inbound' or 'outbound'")
+
+    def top(self, company_id, direction: str = 'outbound', k: int = 20) -> List[Tuple[str, int]]:
+        """
+        Top-k companies by people moved: destinations (outbound) or feeders (inbound)
+
+        Reads one CSR row, O(row nnz).
+        """
+        i = self.index_of(company_id)
+        if i is None:
+            return []
+        (indptr, indices, data), _ = self._csr_for(direction)
+        cols, counts = indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]
+        if len(counts) > k:
+            keep = np.argpartition(-counts, k)[:k]
+            cols, counts = cols[keep], counts[keep]
+        order = np.lexsort((cols, -counts))
+        return [(str(self.company_ids[c]), int(n)) for c, n in zip(cols[order], counts[order])]
+
+    def flow(self, from_company_id, to_company_id) -> int:
+        """People who moved directly from one company to the other"""
+        i, j = self.index_of(from_company_id), self.index_of(to_company_id)
+        if i is None or j is None:
+            return 0
+        indptr, indices, data = self.out_csr
+        row = indices[indptr[i]:indptr[i + 1]]
+        pos = int(np.searchsorted(row, j))
+        return int(data[indptr[i] + pos]) if pos < len(row) and row[pos] == j else 0
+
+    def multi_hop(self, company_id, hops: int = 2, direction: str = 'outbound',
+                  k: int = 20) -> List[Tuple[str, float]]:
+        """
+        Where a company's leavers end up after exactly `hops` moves (or, inbound,
+        where its hires were `hops` moves earlier), as a share of its moves
+
+        Treats moves as a first-order Markov chain: each step splits a
+        company's share over its row in proportion to the move counts. Only
+        the rows the walk reaches are read.
+        """
+        i = self.index_of(company_id)
+        if i is None or hops < 1:
+            return []
+        (indptr, indices, data), totals = self._csr_for(direction)
+
+        support, weight = np.array([i], dtype=np.int64), np.array([1.0])
+        for _ in range(hops):
+            lengths = indptr[support + 1] - indptr[support]
+            if not lengths.sum():
+                return []
+            # Positions of every entry in the reached rows, without a Python loop
+            offsets = np.cumsum(lengths) - lengths
+            positions = np.repeat(indptr[support] - offsets, lengths) + np.arange(lengths.sum())
+            shares = np.repeat(weight / np.maximum(totals[support], 1), lengths) * data[positions]
+            support, inverse = np.unique(indices[positions], return_inverse=True)
+            weight = np.bincount(inverse, weights=shares)
+
+        mask = support != i
+        support, weight = support[mask], weight[mask]
+        order = np.lexsort((support, -weight))[:k]
+        return [(str(self.company_ids[c]), float(w)) for c, w in zip(support[order], weight[order])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the company talent-flow matrix')
+    parser.add_argument('--build', action='store_true', help='Rebuild the snapshot from employment')
+    parser.add_argument('--stats', action='store_true', help='Show snapshot size')
+    parser.add_argument('--company', help='Company UUID to show feeders/destinations for')
+    parser.add_argument('--hops', type=int, default=1, help='Moves away from --company (default 1)')
+    parser.add_argument('--limit', type=int, default=10, help='Companies to show (default 10)')
+    args = parser.parse_args()
+
+    if args.build:
+        start = time.time()
+        conn = get_db_connection(use_pool=False)
+        try:
+            matrix = TalentFlowMatrix.load_from_database(conn)
+        finally:
+            conn.close()
+        path = matrix.save()
+        print(f"✅ Built {matrix.size:,} x {matrix.size:,} matrix: {matrix.nnz:,} company pairs, "
+              f"{matrix.moves:,} moves by {matrix.people:,} people in {time.time() - start:.1f}s")
+        print(f"   Saved to {path} ({path.stat().st_size / 1024:,.0f} KB)")
+    else:
+        matrix = TalentFlowMatrix.load()
+
+    if args.stats:
+        print(f"\n📊 Talent flow matrix ({time.strftime('%Y-%m-%d %H:%M', time.localtime(matrix.built_at))})")
+        print(f"   Companies: {matrix.size:,}")
+        print(f"   Company pairs: {matrix.nnz:,}")
+        print(f"   Moves: {matrix.moves:,} by {matrix.people:,} people")
+
+    if args.company:
+        for direction, label in (('inbound', 'Feeders'), ('outbound', 'Destinations')):
+            print(f"\n{label} ({args.hops} hop{'s' if args.hops > 1 else ''}):")
+            if args.hops == 1:
+                for company_id, count in matrix.top(args.company, direction, args.limit):
+                    print(f"   {company_id}: {count:,}")
+            else:
+                for company_id, share in matrix.multi_hop(args.company, args.hops, direction, args.limit):
+                    print(f"   {company_id}: {share:.1%}")
+
+
+if __name__ == '__main__':
+    main()
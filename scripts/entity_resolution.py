@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Entity Resolution Building Blocks
+=================================
+Shared primitives for scalable deduplication of companies and people
+
+Comparing every record with every other record is O(n²) - 4.6 billion pairs
+for 96K companies. Instead we:
+
+1. Assign each record a handful of cheap blocking keys (name prefix, domain,
+   LinkedIn slug, MinHash LSH bands over character trigrams)
+2. Only compare records that share at least one block
+3. Cluster matching pairs transitively with union-find
+
+Used by:
+- scripts/maintenance/company_dedup_engine.py
+- migration_scripts/04_deduplicate_people.py (probabilistic mode)
+
+Author: AI Assistant
+Date: October 26, 2025
+"""
+
+import re
+import time
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+# rapidfuzz is ~50x faster than difflib; fall back gracefully if missing
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+
+# ============================================================================
+# UNION-FIND
+# ============================================================================
+
+class UnionFind:
+    """Disjoint-set forest with path compression and union by size"""
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item: Hashable) -> Hashable:
+        self.add(item)
+
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        # Path compression
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+
+        return root
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        """Merge the sets containing a and b. Returns False if already joined."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
+
+    def groups(self, min_size: int = 2) -> List[List[Hashable]]:
+        """All sets with at least min_size members"""
+        members = defaultdict(list)
+        for item in self.parent:
+            members[self.find(item)].append(item)
+
+        return [group for group in members.values() if len(group) >= min_size]
+
+
+# ============================================================================
+# SHINGLING AND MINHASH LSH
+# ============================================================================
+
+def char_ngrams(text: Optional[str], n: int = 3) -> Set[str]:
+    """
+    Character n-grams of a string with spaces collapsed
+
+    Short strings (shorter than n) yield the string itself so they still
+    get a signature.
+    """
+    if not text:
+        return set()
+
+    compact = re.sub(r'\s+', ' ', text.lower()).strip()
+    if len(compact) < n:
+        return {compact} if compact else set()
+
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures split into LSH bands
+
+    Two records land in the same bucket for a band when all rows of that band
+    agree. With b bands of r rows, pairs with Jaccard similarity s collide in
+    at least one band with probability 1 - (1 - s^r)^b - e.g. 16 bands x 4
+    rows catches ~96% of pairs at s=0.6 and ~5% at s=0.2.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 42):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Shingle hashes are crc32 (< 2^32), so with a < 2^31 and b < 2^61
+        # a*x + b stays below 2^64 and the mod p below is exact
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> Optional[np.ndarray]:
+        """MinHash signature (num_perm uint64 values), or None for empty input"""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return None
+
+        # Universal hashing h(x) = (a*x + b) mod p, for every permutation at once
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return np.bitwise_and(permuted, _MAX_HASH).min(axis=0)
+
+    def band_keys(self, signature: Optional[np.ndarray], prefix: str = 'lsh') -> List[str]:
+        """One blocking key per band"""
+        if signature is None:
+            return []
+
+        return [
+            f"{prefix}{band}:{signature[band * self.rows:(band + 1) * self.rows].tobytes().hex()}"
+            for band in range(self.bands)
+        ]
+
+
+# ============================================================================
+# BLOCKING
+# ============================================================================
+
+class BlockIndex:
+    """
+    Inverted index from blocking key to record ids
+
+    Blocks larger than max_block_size are skipped when generating candidate
+    pairs (they are usually junk keys like a very common name prefix) and
+    are counted in oversized_blocks so reports can flag them.
+    """
+
+    def __init__(self, max_block_size: int = 200):
+        self.max_block_size = max_block_size
+        self.blocks: Dict[str, List[Hashable]] = defaultdict(list)
+        self.oversized_blocks = 0
+
+    def add(self, record_id: Hashable, keys: Iterable[Optional[str]]):
+        for key in set(keys):
+            if key:
+                self.blocks[key].append(record_id)
+
+    def candidate_pairs(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Yield each unordered pair that shares at least one block, once"""
+        seen = set()
+        self.oversized_blocks = 0
+
+        for members in self.blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                self.oversized_blocks += 1
+                continue
+
+            ordered = sorted(members)
+            for i in range(len(ordered)):
+                for j in range(i + 1, len(ordered)):
+                    pair = (ordered[i], ordered[j])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def stats(self) -> Dict[str, int]:
+        sizes = [len(m) for m in self.blocks.values()]
+        return {
+            'blocks': len(sizes),
+            'multi_record_blocks': sum(1 for s in sizes if s > 1),
+            'largest_block': max(sizes) if sizes else 0,
+        }
+
+
+# ============================================================================
+# SIMILARITY AND TIMING
+# ============================================================================
+
+def string_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """
+    Order-insensitive string similarity in [0, 1]
+
+    Uses rapidfuzz token_sort_ratio when installed, difflib otherwise.
+    """
+    if not a or not b:
+        return 0.0
+
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.token_sort_ratio(a, b) / 100.0
+
+    a_sorted = ' '.join(sorted(a.lower().split()))
+    b_sorted = ' '.join(sorted(b.lower().split()))
+    return SequenceMatcher(None, a_sorted, b_sorted).ratio()
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named pipeline stage"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.time() - start
+
+    def summary(self) -> List[str]:
+        total = sum(self.timings.values())
+        lines = [f"{name:<24} {seconds:>8.2f}s" for name, seconds in self.timings.items()]
+        lines.append(f"{'total':<24} {total:>8.2f}s")
+        return lines
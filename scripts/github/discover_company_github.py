@@ -96,7 +96,8 @@ class CompanyGitHubDiscovery:
         }
         
         logger.info("🚀 Company GitHub Discovery initialized")
-        logger.info(f"   GitHub rate limit: {self.github_client.rate_limit_remaining} requests remaining")
+        logger.info(f"   GitHub rate limit: {self.github_client.rate_limit_remaining} requests remaining "
+                    f"({len(self.github_client.pool)} credential(s))")
     
     def get_companies_with_github_orgs(self) -> List[Dict]:
         """Get all companies that have GitHub organizations"""
@@ -343,7 +344,6 @@ class CompanyGitHubDiscovery:
             # Step 1: Discover repositories
             if discover_repos:
                 new_repos = self.discover_company_repos(company_id, github_org, company_name)
-                time.sleep(1)  # Brief delay between API calls
             
             # Step 2: Get all repos for this company
             self.cursor.execute("""
@@ -367,7 +367,6 @@ class CompanyGitHubDiscovery:
                         repo['owner_username'],
                         repo['repo_name']
                     )
-                    time.sleep(0.5)  # Brief delay between repos
             
             self.stats['companies_processed'] += 1
             logger.info(f"✅ Completed {company_name}")
@@ -413,8 +412,6 @@ class CompanyGitHubDiscovery:
                 if success:
                     self.stats['profiles_enriched'] += 1
                 
-                time.sleep(0.75)  # Rate limiting
-                
             except Exception as e:
                 logger.error(f"Error enriching {profile['github_username']}: {e}")
         
@@ -457,6 +454,9 @@ class CompanyGitHubDiscovery:
         print(f"\n🌐 API:")
         print(f"   Total API calls: {self.stats['api_calls']}")
         print(f"   Rate limit remaining: {self.github_client.rate_limit_remaining}")
+        for resource, quota in self.github_client.pool.utilization()['resources'].items():
+            print(f"   {resource}: {quota['remaining']:,}/{quota['limit']:,} remaining "
+                  f"across {len(self.github_client.pool)} credential(s)")
         
         if self.stats['errors']:
             print(f"\n❌ Errors ({len(self.stats['errors'])}):")
@@ -16,6 +16,7 @@ Usage:
     python3 scripts/github/discover_contributors.py --priority-tier 1
     python3 scripts/github/discover_contributors.py --repos ethereum/EIPs paradigmxyz/reth
     python3 scripts/github/discover_contributors.py --limit 10
+    python3 scripts/github/discover_contributors.py --repos ethereum/EIPs --full-sync
 """
 
 import argparse
@@ -29,12 +30,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 from uuid import UUID
-import requests
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config import Config, get_db_connection
+from github_automation.github_client import GitHubClient
+from github_automation.repo_sync import RepoSyncTracker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lookup_cache import LookupTable, GITHUB_PROFILES_BY_USERNAME, REPOS_BY_NAME
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,27 +47,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# GitHub API setup
+# GitHub API setup - GITHUB_TOKEN plus any GITHUB_TOKENS / GitHub App installations
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-GITHUB_API = 'https://api.github.com'
-HEADERS = {
-    'Accept': 'application/vnd.github.v3+json',
-    'User-Agent': 'TalentIntelligence-Discovery/1.0'
-}
-if GITHUB_TOKEN:
-    HEADERS['Authorization'] = f'token {GITHUB_TOKEN}'
+
+
+class RepoInfo:
+    """The github_repository columns discovery needs"""
+
+    __slots__ = ('repo_id', 'full_name', 'ecosystem_ids', 'owner_username')
+
+    def __init__(self, repo_id, full_name: str, ecosystem_ids: List, owner_username: Optional[str]):
+        self.repo_id = repo_id
+        self.full_name = full_name
+        self.ecosystem_ids = ecosystem_ids
+        self.owner_username = owner_username
 
 
 class ContributorDiscovery:
     """Discover and enrich contributors to repositories"""
     
-    def __init__(self, conn=None, dry_run=False):
+    def __init__(self, conn=None, dry_run=False, full_sync=False):
         self.conn = conn or get_db_connection(use_pool=False)
         self.cursor = self.conn.cursor()
         self.dry_run = dry_run
+        self.full_sync = full_sync
+        self.client = GitHubClient()
+        self.sync = RepoSyncTracker(self.conn, self.client, dry_run=dry_run)
         
         self.stats = {
             'repos_processed': 0,
+            'repos_skipped': 0,
             'contributors_discovered': 0,
             'contributors_enriched': 0,
             'contributors_skipped': 0,
@@ -72,46 +86,29 @@ class ContributorDiscovery:
         }
         
         # Cache
-        self.profile_cache = {}  # username -> github_profile_id
-        self.repo_cache = {}  # full_name -> repo data
+        self.profile_cache = {}  # username -> github_profile_id (LookupTable once loaded)
+        self.repo_ids = {}  # full_name -> repo_id (LookupTable once loaded)
+        self.repo_cache = {}  # full_name -> RepoInfo, filled as repos are processed
         self.ecosystem_cache = {}  # ecosystem_id -> metadata
         
         logger.info(f"🚀 Contributor Discovery initialized (dry_run={dry_run})")
         
-        if not GITHUB_TOKEN:
+        if not self.client.pool.authenticated:
             logger.warning("⚠️  No GITHUB_TOKEN set - API rate limits will be very low")
         else:
-            logger.info("✓ GitHub token configured")
+            logger.info(f"✓ {len(self.client.pool)} GitHub credential(s) configured")
     
     def load_caches(self):
         """Load existing data into cache"""
         logger.info("Loading caches...")
         
-        # Load existing GitHub profiles
-        self.cursor.execute("""
-            SELECT github_profile_id, github_username
-            FROM github_profile
-            WHERE github_username IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.profile_cache[row['github_username'].lower()] = row['github_profile_id']
-        
+        # Username and repo name lookups come from mapped snapshots (scripts/lookup_cache.py);
+        # full repo rows are only read for the repos actually processed
+        self.profile_cache = LookupTable.load(self.cursor, GITHUB_PROFILES_BY_USERNAME)
         logger.info(f"  Loaded {len(self.profile_cache)} GitHub profiles")
         
-        # Load repos
-        self.cursor.execute("""
-            SELECT repo_id, full_name, ecosystem_ids, owner_username
-            FROM github_repository
-        """)
-        for row in self.cursor.fetchall():
-            self.repo_cache[row['full_name'].lower()] = {
-                'repo_id': row['repo_id'],
-                'full_name': row['full_name'],
-                'ecosystem_ids': row['ecosystem_ids'] or [],
-                'owner_username': row['owner_username']
-            }
-        
-        logger.info(f"  Loaded {len(self.repo_cache)} repos")
+        self.repo_ids = LookupTable.load(self.cursor, REPOS_BY_NAME)
+        logger.info(f"  Loaded {len(self.repo_ids)} repos")
         
         # Load ecosystems
         self.cursor.execute("""
@@ -126,37 +123,28 @@ class ContributorDiscovery:
         
         logger.info(f"  Loaded {len(self.ecosystem_cache)} ecosystems")
     
+    def get_repo(self, full_name: str) -> Optional[RepoInfo]:
+        """Repo row by name, read by primary key on first use"""
+        key = full_name.lower()
+        if key not in self.repo_cache:
+            repo_id = self.repo_ids.get(key)
+            row = None
+            if repo_id:
+                self.cursor.execute("""
+                    SELECT repo_id, full_name, ecosystem_ids, owner_username
+                    FROM github_repository
+                    WHERE repo_id = %s
+                """, (repo_id,))
+                row = self.cursor.fetchone()
+            self.repo_cache[key] = RepoInfo(
+                row['repo_id'], row['full_name'], row['ecosystem_ids'] or [], row['owner_username']
+            ) if row else None
+        return self.repo_cache[key]
+    
     def github_api_call(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        """Make a GitHub API call with rate limiting"""
-        url = f"{GITHUB_API}{endpoint}"
-        
+        """Make a GitHub API call (rate limiting handled by GitHubClient)"""
         self.stats['api_calls'] += 1
-        
-        try:
-            response = requests.get(url, headers=HEADERS, params=params or {}, timeout=30)
-            
-            # Check rate limit
-            remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-            if remaining < 10:
-                reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                wait_time = max(reset_time - time.time(), 0)
-                logger.warning(f"⚠️  Rate limit low ({remaining} remaining), waiting {wait_time:.0f}s...")
-                if wait_time > 0:
-                    time.sleep(wait_time + 1)
-            
-            if response.status_code == 404:
-                return None
-            
-            if response.status_code == 403:
-                logger.error(f"Rate limit exceeded")
-                return None
-            
-            response.raise_for_status()
-            return response.json()
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API call failed for {endpoint}: {e}")
-            return None
+        return self.client.get(endpoint, params=params or {})
     
     def fetch_repo_contributors(self, full_name: str) -> List[Dict]:
         """Fetch contributors for a repository"""
@@ -222,9 +210,9 @@ class ContributorDiscovery:
             'hireable': data.get('hireable', False),
         }
     
-    def parse_eip_authors(self, repo_data: Dict) -> Set[str]:
+    def parse_eip_authors(self, repo_data: RepoInfo) -> Set[str]:
         """Parse EIP files to find authors (special case for ethereum/EIPs)"""
-        if 'ethereum/eips' not in repo_data['full_name'].lower():
+        if 'ethereum/eips' not in repo_data.full_name.lower():
             return set()
         
         logger.info("  🔍 Parsing EIP authors...")
@@ -237,17 +225,17 @@ class ContributorDiscovery:
         
         return authors
     
-    def get_ecosystem_tags(self, repo_data: Dict) -> List[str]:
+    def get_ecosystem_tags(self, repo_data: RepoInfo) -> List[str]:
         """Get ecosystem tags for a repository"""
         tags = []
         
         # Add tags from linked ecosystems
-        for ecosystem_id in repo_data['ecosystem_ids']:
+        for ecosystem_id in repo_data.ecosystem_ids:
             if ecosystem_id in self.ecosystem_cache:
                 tags.append(self.ecosystem_cache[ecosystem_id]['normalized'])
         
         # Special tagging
-        full_name_lower = repo_data['full_name'].lower()
+        full_name_lower = repo_data.full_name.lower()
         
         if 'ethereum' in full_name_lower:
             tags.append('ethereum')
@@ -268,7 +256,7 @@ class ContributorDiscovery:
         self,
         username: str,
         profile_data: Dict,
-        repo_data: Dict,
+        repo_data: RepoInfo,
         contribution_count: int
     ) -> Optional[UUID]:
         """Create or update a GitHub profile"""
@@ -378,7 +366,7 @@ class ContributorDiscovery:
             DO UPDATE SET
                 contribution_count = GREATEST(github_contribution.contribution_count, EXCLUDED.contribution_count),
                 updated_at = NOW()
-        """, (profile_id, repo_data['repo_id'], contribution_count))
+        """, (profile_id, repo_data.repo_id, contribution_count))
         
         # Record discovery event
         self.cursor.execute("""
@@ -402,21 +390,37 @@ class ContributorDiscovery:
             ON CONFLICT DO NOTHING
         """, (
             profile_id,
-            repo_data['repo_id'],
-            json.dumps({'contributions': contribution_count, 'repo': repo_data['full_name']})
+            repo_data.repo_id,
+            json.dumps({'contributions': contribution_count, 'repo': repo_data.full_name})
         ))
         
         return profile_id
     
     def discover_repo_contributors(self, full_name: str):
         """Discover all contributors for a repository"""
-        repo_data = self.repo_cache.get(full_name.lower())
+        repo_data = self.get_repo(full_name)
         
         if not repo_data:
             logger.warning(f"Repository not found in cache: {full_name}")
             return
         
         logger.info(f"\n📦 Processing: {full_name}")
+        
+        # Skip repos whose contributors can't have changed since the last walk
+        if not self.full_sync:
+            checks_before = self.sync.stats['api_calls']
+            needs_sync = self.sync.check(repo_data.repo_id, full_name)
+            self.stats['api_calls'] += self.sync.stats['api_calls'] - checks_before
+            
+            if not needs_sync:
+                self.stats['repos_skipped'] += 1
+                if not self.dry_run:
+                    self.cursor.execute("""
+                        UPDATE github_repository SET last_contributor_sync = NOW() WHERE repo_id = %s
+                    """, (repo_data.repo_id,))
+                    self.conn.commit()
+                return
+        
         self.stats['repos_processed'] += 1
         
         # Fetch contributors
@@ -426,8 +430,14 @@ class ContributorDiscovery:
             logger.warning("  No contributors found")
             return
         
+        # Only contributors that are new here or whose count moved need work
+        changed = contributors if self.full_sync else \
+            self.sync.delta(repo_data.repo_id, contributors, key='username')
+        self.stats['contributors_skipped'] += len(contributors) - len(changed)
+        
         # Process each contributor
-        for i, contributor in enumerate(contributors, 1):
+        failed = 0
+        for i, contributor in enumerate(changed, 1):
             username = contributor['username']
             
             # Skip if already enriched recently
@@ -435,13 +445,14 @@ class ContributorDiscovery:
                 self.stats['contributors_skipped'] += 1
                 continue
             
-            logger.info(f"  [{i}/{len(contributors)}] {username} ({contributor['contributions']} contributions)")
+            logger.info(f"  [{i}/{len(changed)}] {username} ({contributor['contributions']} contributions)")
             
             # Fetch profile
             profile_data = self.fetch_user_profile(username)
             
             if not profile_data:
                 logger.warning(f"    Could not fetch profile")
+                failed += 1
                 continue
             
             # Create/update profile
@@ -452,9 +463,6 @@ class ContributorDiscovery:
                 contributor['contributions']
             )
             
-            # Rate limiting
-            time.sleep(0.75)
-            
             # Commit periodically
             if i % 10 == 0:
                 self.conn.commit()
@@ -466,7 +474,10 @@ class ContributorDiscovery:
                 SET last_contributor_sync = NOW(),
                     contributor_count = %s
                 WHERE repo_id = %s
-            """, (len(contributors), repo_data['repo_id']))
+            """, (len(contributors), repo_data.repo_id))
+            # Keep the old sync state if a contributor failed, so the next run retries it
+            if not failed:
+                self.sync.record(repo_data.repo_id, contributors, key='username')
         
         self.conn.commit()
         logger.info(f"  ✅ Completed {full_name}")
@@ -529,6 +540,7 @@ class ContributorDiscovery:
         logger.info("📊 DISCOVERY STATISTICS")
         logger.info("=" * 60)
         logger.info(f"Repositories processed:    {self.stats['repos_processed']:,}")
+        logger.info(f"Repositories skipped:      {self.stats['repos_skipped']:,} (unchanged)")
         logger.info(f"Contributors discovered:   {self.stats['contributors_discovered']:,}")
         logger.info(f"Contributors enriched:     {self.stats['contributors_enriched']:,}")
         logger.info(f"Contributors skipped:      {self.stats['contributors_skipped']:,}")
@@ -537,6 +549,7 @@ class ContributorDiscovery:
         logger.info(f"")
         logger.info(f"Time elapsed:              {elapsed/60:.1f} minutes")
         logger.info("=" * 60)
+        self.sync.log_stats()
     
     def close(self):
         """Close database connection"""
@@ -571,10 +584,15 @@ def main():
         action='store_true',
         help='Dry run - don\'t actually create/update profiles'
     )
+    parser.add_argument(
+        '--full-sync',
+        action='store_true',
+        help='Walk every repo\'s contributors even if unchanged since the last sync'
+    )
     
     args = parser.parse_args()
     
-    discovery = ContributorDiscovery(dry_run=args.dry_run)
+    discovery = ContributorDiscovery(dry_run=args.dry_run, full_sync=args.full_sync)
     
     try:
         if args.repos:
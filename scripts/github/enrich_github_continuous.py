@@ -14,6 +14,10 @@ Usage:
     # Run continuous mode (keeps going until stopped)
     python3 enrich_github_continuous.py --continuous
 
+    # Run several workers in parallel - each claims its own profiles
+    python3 enrich_github_continuous.py --continuous &
+    python3 enrich_github_continuous.py --continuous &
+
     # Run with matching after enrichment
     python3 enrich_github_continuous.py --with-matching
     
@@ -66,6 +70,8 @@ def show_status(queue_manager: QueueManager):
     print(f"  Enriched profiles: {stats['enriched']:,} ({stats['enrichment_coverage']:.1f}%)")
     print(f"  Matched to people: {stats['matched']:,} ({stats['match_rate']:.1f}%)")
     print(f"  Pending enrichment: {stats['stale']:,}")
+    print(f"  Jobs: {stats['jobs']['pending']:,} pending, {stats['jobs']['running']:,} running, "
+          f"{stats['jobs']['failed']:,} failed")
     
     print(f"\n🎯 Goals:")
     print(f"  Target enrichment: 85% ({int(stats['total'] * 0.85):,} profiles)")
@@ -108,8 +114,8 @@ def run_enrichment(batch_size: int = 100, with_matching: bool = False):
     # Show initial status
     show_status(queue)
     
-    # Get profiles to enrich
-    logger.info(f"\n📋 Getting batch of {batch_size} profiles...")
+    # Claim profiles to enrich (leased to this worker)
+    logger.info(f"\n📋 Claiming batch of {batch_size} profiles...")
     profiles = queue.get_batch(batch_size)
     
     if not profiles:
@@ -118,15 +124,20 @@ def run_enrichment(batch_size: int = 100, with_matching: bool = False):
     
     logger.info(f"✅ Found {len(profiles)} profiles to enrich")
     
-    # Enrich batch
+    # Enrich batch, keeping our lease on the claimed jobs alive
     start_time = time.time()
-    batch_stats = engine.enrich_batch(profiles)
+    profile_ids = [profile['github_profile_id'] for profile in profiles]
+    with queue.lease_heartbeat(profile_ids):
+        batch_stats = engine.enrich_batch(profiles)
     elapsed = time.time() - start_time
     
-    # Mark as enriched
-    for profile in profiles:
-        if profile.get('github_username'):  # Only mark if we processed it
-            queue.mark_enriched(profile['github_profile_id'], success=True)
+    # Complete enriched jobs; release the rest for retry
+    enriched_ids = set(batch_stats['enriched_ids'])
+    for profile_id in profile_ids:
+        if profile_id in enriched_ids:
+            queue.mark_enriched(profile_id, success=True)
+        else:
+            queue.mark_enriched(profile_id, success=False, error='enrichment failed')
     
     # Show results
     print("\n" + "📊 " + "=" * 66)
@@ -136,6 +147,8 @@ def run_enrichment(batch_size: int = 100, with_matching: bool = False):
     print(f"✅  Success: {batch_stats['success']:,}")
     print(f"❌  Failed: {batch_stats['failed']:,}")
     print(f"📈  Rate: {batch_stats['success']/elapsed:.1f} profiles/second")
+    for name, stage in batch_stats['pipeline']['stages'].items():
+        print(f"⚙️   {name}: {stage['items_per_second']:.1f}/s, {stage['utilization']:.0%} busy")
     print("=" * 70)
     
     # Run matching if requested
@@ -31,6 +31,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config import Config, get_db_connection
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lookup_cache import LookupTable, REPOS_BY_NAME
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -171,14 +174,8 @@ class TaxonomyParser:
         
         logger.info(f"  Loaded {len(self.ecosystem_cache)} ecosystems")
         
-        # Load repos
-        self.cursor.execute("""
-            SELECT repo_id, full_name
-            FROM github_repository
-        """)
-        
-        for row in self.cursor.fetchall():
-            self.repo_cache[row['full_name'].lower()] = row['repo_id']
+        # Load repos (mapped snapshot, see scripts/lookup_cache.py)
+        self.repo_cache = LookupTable.load(self.cursor, REPOS_BY_NAME)
         
         logger.info(f"  Loaded {len(self.repo_cache)} repositories")
     
@@ -15,7 +15,6 @@ This runs indefinitely until manually stopped.
 import argparse
 import json
 import logging
-import os
 import sys
 import time
 from datetime import datetime, timedelta
@@ -26,7 +25,8 @@ from typing import Dict, List, Set
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config import Config, get_db_connection
-import requests
+from github_automation.github_client import GitHubClient
+from github_automation.repo_sync import RepoSyncTracker
 
 # Setup logging
 logging.basicConfig(
@@ -39,24 +39,26 @@ logger = logging.getLogger(__name__)
 class PerpetualDiscovery:
     """Continuous discovery engine that never stops"""
     
-    def __init__(self, dry_run=False):
+    def __init__(self, dry_run=False, full_sync=False):
         self.dry_run = dry_run
+        self.full_sync = full_sync
         self.conn = get_db_connection(use_pool=False)
         self.cursor = self.conn.cursor()
-        self.github_token = os.getenv('GITHUB_TOKEN')
         
-        if not self.github_token:
-            raise ValueError("GITHUB_TOKEN environment variable not set")
+        # Rotates across GITHUB_TOKEN, GITHUB_TOKENS and GitHub App installations
+        self.client = GitHubClient()
         
-        self.headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+        if not self.client.pool.authenticated:
+            raise ValueError("GITHUB_TOKEN (or GITHUB_TOKENS) environment variable not set")
+        
+        # Skips repos whose contributors can't have changed since the last walk
+        self.sync = RepoSyncTracker(self.conn, self.client, dry_run=dry_run)
         
         # Stats
         self.stats = {
             'repos_discovered': 0,
             'repos_processed': 0,
+            'repos_skipped': 0,
             'contributors_discovered': 0,
             'contributors_enriched': 0,
             'api_calls': 0,
@@ -75,10 +77,13 @@ class PerpetualDiscovery:
         logger.info(f"Cycles completed:        {self.stats['cycles_completed']}")
         logger.info(f"Repos discovered:        {self.stats['repos_discovered']}")
         logger.info(f"Repos processed:         {self.stats['repos_processed']}")
+        logger.info(f"Repos skipped:           {self.stats['repos_skipped']} (unchanged)")
         logger.info(f"Contributors discovered: {self.stats['contributors_discovered']}")
         logger.info(f"Contributors enriched:   {self.stats['contributors_enriched']}")
         logger.info(f"API calls made:          {self.stats['api_calls']}")
         logger.info(f"Errors encountered:      {self.stats['errors']}")
+        self.sync.log_stats()
+        self.client.pool.log_utilization()
         logger.info("=" * 80)
         
     def get_unprocessed_repos(self, limit=50):
@@ -105,8 +110,8 @@ class PerpetualDiscovery:
         logger.info(f"\n🔍 Discovering contributors: {repo_full_name}")
         
         try:
-            # Get contributors from GitHub API
-            url = f"https://api.github.com/repos/{repo_full_name}/contributors"
+            # Get contributors from GitHub API (rate limiting handled by GitHubClient)
+            endpoint = f"/repos/{repo_full_name}/contributors"
             params = {'per_page': 100, 'anon': 'false'}
             
             contributors = []
@@ -114,21 +119,12 @@ class PerpetualDiscovery:
             
             while len(contributors) < limit:
                 params['page'] = page
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
+                page_contributors = self.client.get(endpoint, params=params)
                 self.stats['api_calls'] += 1
                 
-                if response.status_code == 404:
-                    logger.warning(f"  Repository not found: {repo_full_name}")
-                    return []
-                elif response.status_code == 403:
-                    logger.warning(f"  Rate limited or forbidden, sleeping...")
-                    time.sleep(60)
-                    continue
-                elif response.status_code != 200:
-                    logger.warning(f"  API error {response.status_code}")
+                if page_contributors is None and page == 1:
+                    logger.warning(f"  Could not fetch contributors: {repo_full_name}")
                     return []
-                
-                page_contributors = response.json()
                 if not page_contributors:
                     break
                 
@@ -150,19 +146,12 @@ class PerpetualDiscovery:
     def enrich_github_profile(self, username: str):
         """Enrich a GitHub profile with full data"""
         try:
-            url = f"https://api.github.com/users/{username}"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            user = self.client.get_user(username)
             self.stats['api_calls'] += 1
             
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 403:
-                logger.warning(f"  Rate limited while enriching {username}")
-                time.sleep(60)
-                return None
-            else:
-                logger.warning(f"  Failed to enrich {username}: {response.status_code}")
-                return None
+            if not user:
+                logger.warning(f"  Failed to enrich {username}")
+            return user
                 
         except Exception as e:
             logger.error(f"  Error enriching {username}: {e}")
@@ -247,6 +236,20 @@ class PerpetualDiscovery:
         logger.info(f"   Stars: {repo_data['stars']}, Priority: {repo_data.get('priority_tier', 'N/A')}")
         logger.info(f"{'='*80}")
         
+        # One conditional request decides whether the contributor list can have changed
+        if not self.full_sync:
+            checks_before = self.sync.stats['api_calls']
+            needs_sync = self.sync.check(repo_id, repo_full_name)
+            self.stats['api_calls'] += self.sync.stats['api_calls'] - checks_before
+            
+            if not needs_sync:
+                self.cursor.execute("""
+                    UPDATE github_repository SET last_contributor_sync = NOW() WHERE repo_id = %s
+                """, (repo_id,))
+                self.conn.commit()
+                self.stats['repos_skipped'] += 1
+                return
+        
         # Discover contributors
         contributors = self.discover_repo_contributors(repo_full_name, limit=100)
         
@@ -254,14 +257,18 @@ class PerpetualDiscovery:
             logger.info(f"  No contributors found")
             return
         
+        # Only contributors that are new here or whose count moved need work
+        changed = self.sync.delta(repo_id, contributors) if not self.full_sync else contributors
+        logger.info(f"  {len(changed)} of {len(contributors)} contributors new or changed")
+        
         # Process each contributor
         processed = 0
-        for i, contributor in enumerate(contributors[:100], 1):
+        for i, contributor in enumerate(changed, 1):
             username = contributor['login']
             contributions = contributor['contributions']
             
             if i <= 20 or i % 10 == 0:  # Log first 20, then every 10th
-                logger.info(f"  [{i}/{len(contributors[:100])}] {username} ({contributions} contributions)")
+                logger.info(f"  [{i}/{len(changed)}] {username} ({contributions} contributions)")
             
             try:
                 self.process_contributor(username, repo_id, contributions)
@@ -283,6 +290,9 @@ class PerpetualDiscovery:
                 contributor_count = %s
             WHERE repo_id = %s
         """, (len(contributors), repo_id))
+        # Keep the old sync state if a contributor failed, so the next cycle retries it
+        if processed == len(changed):
+            self.sync.record(repo_id, contributors)
         
         self.conn.commit()
         self.stats['repos_processed'] += 1
@@ -319,12 +329,10 @@ class PerpetualDiscovery:
             logger.info(f"  Checking repos from: {username}")
             
             try:
-                url = f"https://api.github.com/users/{username}/repos"
-                response = requests.get(url, headers=self.headers, params={'per_page': 30}, timeout=30)
+                repos = self.client.get(f"/users/{username}/repos", params={'per_page': 30})
                 self.stats['api_calls'] += 1
                 
-                if response.status_code == 200:
-                    repos = response.json()
+                if repos:
                     
                     for repo in repos[:10]:  # Top 10 repos
                         repo_full_name = repo['full_name']
@@ -369,6 +377,7 @@ class PerpetualDiscovery:
         """Run one discovery cycle"""
         try:
             cycle_start = datetime.now()
+            sync_before = self.sync.get_stats()
             logger.info("\n\n" + "="*80)
             logger.info(f"🔄 STARTING DISCOVERY CYCLE #{self.stats['cycles_completed'] + 1}")
             logger.info("="*80)
@@ -393,9 +402,6 @@ class PerpetualDiscovery:
             try:
                 self.process_repository(repo)
                 
-                # Rate limiting: sleep between repos
-                time.sleep(2)
-                
             except Exception as e:
                 logger.error(f"Error processing repo: {e}")
                 self.stats['errors'] += 1
@@ -408,7 +414,11 @@ class PerpetualDiscovery:
         self.stats['cycles_completed'] += 1
         cycle_time = (datetime.now() - cycle_start).total_seconds() / 60
         
+        sync_after = self.sync.get_stats()
         logger.info(f"\n✅ Cycle #{self.stats['cycles_completed']} complete in {cycle_time:.1f} minutes")
+        logger.info(f"   ⏭️  {sync_after['repos_skipped'] - sync_before['repos_skipped']} of "
+                    f"{sync_after['repos_checked'] - sync_before['repos_checked']} repos unchanged, "
+                    f"{sync_after['api_calls_saved'] - sync_before['api_calls_saved']} API calls saved")
         self.log_stats()
         
         # Brief pause between cycles
@@ -449,10 +459,12 @@ class PerpetualDiscovery:
 def main():
     parser = argparse.ArgumentParser(description='Perpetual Discovery Engine')
     parser.add_argument('--dry-run', action='store_true', help='Dry run mode')
+    parser.add_argument('--full-sync', action='store_true',
+                        help='Walk every repo\'s contributors even if unchanged since the last sync')
     
     args = parser.parse_args()
     
-    discovery = PerpetualDiscovery(dry_run=args.dry_run)
+    discovery = PerpetualDiscovery(dry_run=args.dry_run, full_sync=args.full_sync)
     discovery.run_perpetual()
 
 if __name__ == '__main__':
@@ -0,0 +1,1236 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: COPY-based bulk engine behind the CSV people importers (Clay, BM Gem, Datablend, PhantomBuster)
+ABOUTME: Streams CSV chunks through pandas, COPYs them into staging tables and merges set-based
+
+Bulk CSV Import
+===============
+The importers resolve and write one CSV row at a time: a cache lookup, a
+company SELECT/INSERT, an UPDATE or INSERT for the person, then one INSERT per
+email / GitHub profile / employment / education record. At ~10 statements per
+row a 100K-row export is a million round trips.
+
+BulkImporter does the same work a chunk at a time:
+
+1. Read the CSV in chunks and map the source's columns onto the staging layout
+   with a CsvAdapter, normalizing whole columns at once (scalar normalizers
+   such as normalize_linkedin_url run once per distinct value)
+2. COPY the chunk into TEMP staging tables (session-private, never WAL-logged,
+   emptied on commit)
+3. Resolve people and companies with set-based joins against person, company
+   and github_profile
+4. Merge with a fixed set of INSERT ... ON CONFLICT / UPDATE ... FROM
+   statements, one transaction per chunk
+
+Matching and write rules follow the row-by-row importers: people match on
+normalized LinkedIn URL (plus CSV person_id / linked GitHub profile where the
+source has them), existing people are only filled where NULL, employment is
+deduplicated on person + company + start or end date, emails on
+(person_id, lower(email)). Companies are resolved through the
+company_name_key registry (migration 17) and created with ON CONFLICT on the
+normalized name, so concurrent imports never create the same company twice.
+
+After every committed chunk the byte offset reached is saved as a checkpoint
+(Config.save_checkpoint); a crashed run picks up from there when restarted.
+Chunks are idempotent, so the chunk in flight at the crash is simply redone.
+A chunk that hits a data error (bad value, constraint violation) is bisected
+until the failing rows are isolated; only those rows are recorded in
+stats['errors']. Any other error stops the run before its checkpoint moves.
+parallel_import.py runs several BulkImporters over hash-sharded rows.
+
+Usage:
+    python3 scripts/imports/bulk_import.py clay path/to/clay_export.csv
+    python3 scripts/imports/bulk_import.py bm_gem path/to/BM_Gem.csv --chunk-size 20000
+    python3 scripts/imports/bulk_import.py datablend path/to/export.csv --dry-run
+    python3 scripts/imports/bulk_import.py clay path/to/clay_export.csv --restart  # Ignore checkpoint
+    python3 scripts/imports/bulk_import.py phantombuster path/to/export.csv --workers 8
+
+    # Or from the importers themselves (keeps their reports)
+    python3 scripts/imports/import_clay_people.py --bulk
+"""
+
+import argparse
+import io
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import Config, get_db_connection
+from migration_scripts.migration_utils import (
+    normalize_linkedin_url,
+    normalize_email,
+    validate_email,
+    infer_email_type,
+    synthetic_twitter_id
+)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data_quality_filters import is_valid_company_name
+from imports.employment_utils import EmploymentDataExtractor
+
+DEFAULT_CHUNK_SIZE = 10000
+
+UUID_PATTERN = r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+
+# Columns adapters fill (COPY order), per staging table
+STAGING_COLUMNS = {
+    'stage_person': [
+        ('row_no', 'BIGINT PRIMARY KEY'),
+        ('csv_person_id', 'UUID'),
+        ('linkedin_url', 'TEXT'),
+        ('normalized_linkedin_url', 'TEXT'),
+        ('github_username', 'TEXT'),
+        ('full_name', 'TEXT'),
+        ('placeholder_name', 'TEXT'),       # Only used when creating, never to enrich
+        ('first_name', 'TEXT'),
+        ('last_name', 'TEXT'),
+        ('location', 'TEXT'),
+        ('headline', 'TEXT'),
+        ('description', 'TEXT'),
+    ],
+    'stage_employment': [
+        ('row_no', 'BIGINT'),
+        ('company_name', 'TEXT'),
+        ('title', 'TEXT'),
+        ('start_date', 'DATE'),
+        ('end_date', 'DATE'),
+        ('location', 'TEXT'),
+    ],
+    'stage_email': [
+        ('row_no', 'BIGINT'),
+        ('email', 'TEXT'),
+        ('email_type', 'TEXT'),
+        ('is_primary', 'BOOLEAN'),
+    ],
+    'stage_github': [
+        ('row_no', 'BIGINT'),
+        ('github_username', 'TEXT'),
+        ('blog', 'TEXT'),
+    ],
+    'stage_education': [
+        ('row_no', 'BIGINT'),
+        ('school_name', 'TEXT'),
+        ('degree', 'TEXT'),
+        ('start_date', 'DATE'),
+        ('end_date', 'DATE'),
+    ],
+    'stage_twitter': [
+        ('row_no', 'BIGINT'),
+        ('twitter_id', 'BIGINT'),
+        ('username', 'TEXT'),
+    ],
+    'stage_company': [
+        ('company_key', 'TEXT PRIMARY KEY'),  # LOWER(TRIM(company_name))
+        ('company_name', 'TEXT'),
+    ],
+}
+
+# Columns the merge fills in
+WORK_COLUMNS = {
+    'stage_person': [
+        ('person_id', 'UUID'),
+        ('new_person_id', 'UUID'),
+        ('matched', 'BOOLEAN NOT NULL DEFAULT FALSE'),
+    ],
+    'stage_employment': [
+        ('company_id', 'UUID'),
+    ],
+    'stage_company': [
+        ('company_id', 'UUID'),
+    ],
+}
+
+# SQLSTATEs worth retrying a chunk for (deadlock_detected, serialization_failure)
+RETRYABLE_ERRORS = ('40P01', '40001')
+CHUNK_ATTEMPTS = 3
+# SQLSTATE classes caused by the rows themselves (data_exception, integrity_constraint_violation)
+ROW_ERROR_CLASSES = ('22', '23')
+
+
+# Column helpers (all vectorized over a chunk)
+
+def text(df: pd.DataFrame, column: str) -> pd.Series:
+    """Stripped string column ('' where missing)"""
+    if column not in df:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[column].fillna('').astype(str).str.strip()
+
+
+def first_of(df: pd.DataFrame, *columns: str) -> pd.Series:
+    """First non-empty value across columns, like row.get(a) or row.get(b)"""
+    result = pd.Series('', index=df.index, dtype=object)
+    for column in reversed(columns):
+        value = text(df, column)
+        result = value.where(value != '', result)
+    return result
+
+
+def map_unique(series: pd.Series, fn: Callable) -> pd.Series:
+    """Apply a scalar normalizer once per distinct value"""
+    uniques = series.dropna().unique()
+    return series.map(dict(zip(uniques, (fn(v) for v in uniques))))
+
+
+def join_name(first: pd.Series, last: pd.Series) -> pd.Series:
+    return (first + ' ' + last).str.strip()
+
+
+def linkedin_columns(urls: pd.Series) -> pd.DataFrame:
+    normalized = map_unique(urls.where(urls != ''), normalize_linkedin_url)
+    return pd.DataFrame({'linkedin_url': urls, 'normalized_linkedin_url': normalized})
+
+
+def github_usernames(urls: pd.Series, reserved=('orgs', 'organizations', 'repos', 'settings',
+                                                'explore', 'trending', 'features', 'enterprise')) -> pd.Series:
+    usernames = urls.str.extract(r'github\.com/([A-Za-z0-9_-]+)', flags=re.IGNORECASE)[0]
+    return usernames.where(~usernames.str.lower().isin(reserved))
+
+
+def _part(parsed: pd.Series, i: int) -> pd.Series:
+    return parsed.map(lambda value: value[i] if isinstance(value, tuple) else None)
+
+
+def date_ranges(ranges: pd.Series, starts: Optional[pd.Series] = None,
+                ends: Optional[pd.Series] = None) -> pd.DataFrame:
+    """(start_date, end_date) from a range column, else separate start / end columns"""
+    parse = EmploymentDataExtractor.parse_date_range
+    parsed = map_unique(ranges.where(ranges != ''), parse)
+    start, end = _part(parsed, 0), _part(parsed, 1)
+    if starts is not None:
+        start = start.where(ranges != '', _part(map_unique(starts.where(starts != ''), parse), 0))
+    if ends is not None:
+        end = end.where(ranges != '', _part(map_unique(ends.where(ends != ''), parse), 1))
+    return pd.DataFrame({'start_date': start, 'end_date': end}, index=ranges.index)
+
+
+def email_rows(lists: pd.Series, primary: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    One row per (row, email) from a Series of email lists
+
+    Without a primary column the first email of each row is the primary one.
+    """
+    emails = lists.explode().dropna()
+    emails = map_unique(emails, lambda e: normalize_email(e) if validate_email(str(e).strip()) else None).dropna()
+    frame = pd.DataFrame({'email': emails.values}, index=emails.index)
+    if primary is not None:
+        frame['is_primary'] = frame['email'] == map_unique(primary, normalize_email).reindex(frame.index)
+    else:
+        frame['is_primary'] = ~frame.index.duplicated()
+    frame['email_type'] = map_unique(frame['email'], infer_email_type)
+    return frame.rename_axis('row').reset_index() \
+        .sort_values('is_primary', ascending=False, kind='stable') \
+        .drop_duplicates(['row', 'email']) \
+        .set_index('row')
+
+
+class SkipRows:
+    """Skip-reason column builder: the first matching reason wins"""
+
+    def __init__(self, index):
+        self.reason = pd.Series('', index=index, dtype=object)
+
+    def where(self, mask: pd.Series, reason: str) -> 'SkipRows':
+        self.reason = self.reason.mask((self.reason == '') & mask, reason)
+        return self
+
+
+def shard_of(keys: pd.Series, shards: int) -> pd.Series:
+    """Stable shard number per key (the same in every process and run)"""
+    hashes = pd.util.hash_pandas_object(keys.astype(str), index=False)
+    return (hashes % shards).astype(int)
+
+
+# CSV reading by byte offset (resumable)
+
+def iter_records(f, offset: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    (start offset, raw bytes) per CSV record of a binary file, from a record boundary
+
+    A quoted field can span lines; a record is complete once its quote count is even.
+    """
+    f.seek(offset)
+    record, start, quotes = [], offset, 0
+    for line in f:
+        record.append(line)
+        quotes += line.count(b'"')
+        offset += len(line)
+        if quotes % 2 == 0:
+            yield start, b''.join(record)
+            record, start, quotes = [], offset, 0
+    if record:
+        yield start, b''.join(record)
+
+
+def read_csv_chunks(path, chunk_size: int, offset: int = 0) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    (chunk, end offset) pairs; each chunk's index is its rows' byte offsets
+
+    Restarting from a chunk's end offset continues exactly after it.
+    """
+    def parse(header: bytes, records: List[bytes], offsets: List[int]) -> pd.DataFrame:
+        chunk = pd.read_csv(io.BytesIO(header + b''.join(records)), dtype=str,
+                            keep_default_na=False, encoding='utf-8')
+        if len(chunk) != len(offsets):
+            raise ValueError(f"Malformed CSV between bytes {offsets[0]} and {offsets[-1]}")
+        chunk.index = pd.Index(offsets)
+        return chunk
+
+    with open(path, 'rb') as f:
+        _, header = next(iter_records(f, 0), (0, b''))
+        offset = max(offset, len(header))
+        if not header.endswith(b'\n'):
+            header += b'\n'
+
+        records, offsets, end = [], [], offset
+        for start, record in iter_records(f, offset):
+            end = start + len(record)
+            if not record.strip():
+                continue
+            records.append(record)
+            offsets.append(start)
+            if len(records) >= chunk_size:
+                yield parse(header, records, offsets), end
+                records, offsets = [], []
+        if records:
+            yield parse(header, records, offsets), end
+
+
+def merge_stats(stats: Dict, counters: Dict, renames: Optional[Dict[str, str]] = None):
+    """Add bulk counters into a stats dict that already has the keys it wants"""
+    renames = renames or {}
+    for key, value in counters.items():
+        key = renames.get(key, key)
+        if key == 'errors':
+            stats.setdefault('errors', []).extend(value)
+        elif key in stats and isinstance(value, int):
+            stats[key] += value
+
+
+# Adapters: per-source column mappings
+
+class CsvAdapter:
+    """
+    Maps one source's CSV columns onto the staging layout
+
+    people() is required; the other hooks return None when the source has no
+    such data. Frames keep the chunk's index, which becomes row_no.
+    """
+
+    name = None                    # CLI name / migration_log name
+    source = None                  # source / source_text_ref on new rows
+    confidence = 0.8               # employment.source_confidence
+    create_people = True           # False: rows only enrich people that already exist
+    match_github = False           # Also match people through their linked GitHub profile
+    unmatched_stat = 'skipped_invalid'
+
+    def people(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Person columns plus a 'skip' column (stats key, '' keeps the row)"""
+        raise NotImplementedError
+
+    def employment(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        return None
+
+    def emails(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        return None
+
+    def github(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        return None
+
+    def education(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        return None
+
+    def twitter(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        return None
+
+    def fallback(self, df: pd.DataFrame) -> pd.Series:
+        """Rows that must go through the importer's per-row path instead"""
+        return pd.Series(False, index=df.index)
+
+    def shard_keys(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Per-row identity used to shard parallel imports, so all rows of one
+        person go to the same worker: normalized LinkedIn URL, else GitHub
+        username, else first email, else CSV person_id, else the row itself
+        """
+        people = self.people(df)
+        keys = people['normalized_linkedin_url']
+        if 'github_username' in people:
+            keys = keys.fillna('gh:' + people['github_username'].str.lower())
+        emails = self.emails(df)
+        if emails is not None and len(emails):
+            keys = keys.fillna('email:' + emails.groupby(level=0)['email'].first().reindex(df.index))
+        if 'csv_person_id' in people:
+            keys = keys.fillna('id:' + people['csv_person_id'])
+        return keys.fillna('row:' + df.index.to_series().astype(str))
+
+    @staticmethod
+    def current_job(df: pd.DataFrame, company: str, title_columns=('Job Title', 'Title'),
+                    range_columns=('Date Range', 'Employment Dates'),
+                    location_columns=('Location', 'Job Location')) -> pd.DataFrame:
+        """The single current-employment shape shared by Clay / BM Gem / Datablend"""
+        dates = date_ranges(first_of(df, *range_columns), text(df, 'Start Date'), text(df, 'End Date'))
+        return pd.DataFrame({
+            'company_name': text(df, company),
+            'title': first_of(df, *title_columns),
+            'start_date': dates['start_date'],
+            'end_date': dates['end_date'],
+            'location': first_of(df, *location_columns),
+        })
+
+
+class ClayAdapter(CsvAdapter):
+    """import_clay_people.py: Clay 'Find people' export"""
+
+    name = 'clay_csv_import'
+    source = 'clay_import'
+    confidence = 0.85
+
+    def people(self, df):
+        first, last = text(df, 'First Name'), text(df, 'Last Name')
+        full_name = first_of(df, 'Full Name')
+        full_name = full_name.where(full_name != '', join_name(first, last))
+        linkedin = text(df, 'LinkedIn Profile')
+
+        people = linkedin_columns(linkedin)
+        people['full_name'] = full_name
+        people['first_name'] = first
+        people['last_name'] = last
+        people['location'] = text(df, 'Location')
+        people['headline'] = text(df, 'Job Title')
+        people['skip'] = SkipRows(df.index) \
+            .where(linkedin == '', 'skipped_no_linkedin') \
+            .where(full_name == '', 'skipped_invalid').reason
+        return people
+
+    def employment(self, df):
+        return self.current_job(df, 'Current Company')
+
+
+class BMGemAdapter(CsvAdapter):
+    """import_bm_gem_protocol.py: BM Gem Protocol export (emails, GitHub, Twitter, school)"""
+
+    name = 'bm_gem_protocol_import'
+    source = 'bm_gem_import'
+    confidence = 0.85
+
+    def people(self, df):
+        first, last = text(df, 'First Name'), text(df, 'Last Name')
+        full_name = join_name(first, last)
+        linkedin = text(df, 'LinkedIn')
+
+        people = linkedin_columns(linkedin)
+        people['full_name'] = full_name
+        people['first_name'] = first
+        people['last_name'] = last
+        people['location'] = text(df, 'Location')
+        people['headline'] = text(df, 'Title')
+        people['skip'] = SkipRows(df.index) \
+            .where(linkedin == '', 'skipped_no_linkedin') \
+            .where(full_name == '', 'skipped_invalid').reason
+        return people
+
+    def employment(self, df):
+        return self.current_job(df, 'Company', title_columns=('Title', 'Job Title'),
+                                location_columns=('Location',))
+
+    def emails(self, df):
+        primary = text(df, 'Primary Email')
+        parsed = map_unique(text(df, 'All Emails'), self.parse_email_array)
+        lists = primary.map(lambda p: [p] if p else []) + parsed
+        return email_rows(lists, primary)
+
+    def github(self, df):
+        usernames = github_usernames(text(df, 'Github'))
+        return pd.DataFrame({'github_username': usernames, 'blog': text(df, 'Website / Blog')}) \
+            .dropna(subset=['github_username'])
+
+    def twitter(self, df):
+        usernames = text(df, 'Twiiter / X').str.extract(r'(?:twitter|x)\.com/([A-Za-z0-9_]+)',
+                                                         flags=re.IGNORECASE)[0]
+        usernames = usernames[~usernames.str.lower().isin(
+            ['home', 'explore', 'notifications', 'messages', 'settings'])].dropna()
+        # Same synthetic id as BMGemImporter.add_twitter_profile
+        return pd.DataFrame({
+            'twitter_id': usernames.map(synthetic_twitter_id),
+            'username': usernames,
+        })
+
+    def education(self, df):
+        schools = text(df, 'School')
+        return pd.DataFrame({'school_name': schools})[schools != '']
+
+    @staticmethod
+    def parse_email_array(value: str) -> List[str]:
+        """The 'All Emails' field: a JSON array, or anything with emails in it"""
+        if not value:
+            return []
+        try:
+            emails = json.loads(value)
+            if isinstance(emails, list):
+                return [e.strip() for e in emails if e and e.strip()]
+        except json.JSONDecodeError:
+            pass
+        return re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', value)
+
+
+class DatablendAdapter(CsvAdapter):
+    """import_csv_datablend.py: Datablend export (LinkedIn and/or GitHub, ';'-separated emails)"""
+
+    name = 'csv_datablend_import'
+    source = 'csv_datablend_oct2024'
+    match_github = True
+
+    def people(self, df):
+        first, last = text(df, 'First Name'), text(df, 'Last Name')
+        full_name = first_of(df, 'Full Name')
+        full_name = full_name.where(full_name != '', join_name(first, last))
+        linkedin, github_url = text(df, 'LinkedIn URL'), text(df, 'GitHub URL')
+        github = github_usernames(github_url)
+
+        # New profiles without any name get a placeholder to enrich later
+        slug = linkedin.str.rstrip('/').str.split('/').str[-1].str.replace('-', ' ').str.title()
+        placeholder = pd.Series('[Unknown Profile]', index=df.index, dtype=object)
+        placeholder = placeholder.mask(github.notna(), '[GitHub] ' + github.fillna(''))
+        placeholder = placeholder.mask(linkedin != '', '[LinkedIn] ' + slug)
+
+        people = linkedin_columns(linkedin)
+        people['github_username'] = github
+        people['full_name'] = full_name
+        people['placeholder_name'] = placeholder.where(full_name == '')
+        people['first_name'] = first
+        people['last_name'] = last
+        people['location'] = text(df, 'Location')
+        people['headline'] = text(df, 'Job Title')
+        people['skip'] = SkipRows(df.index) \
+            .where((linkedin == '') & (github_url == ''), 'skipped_invalid').reason
+        return people
+
+    def employment(self, df):
+        job = self.current_job(df, 'Company')
+        ranges = first_of(df, 'Date Range', 'Employment Dates', 'Dates', 'Job Dates')
+        job[['start_date', 'end_date']] = date_ranges(ranges, text(df, 'Start Date'), text(df, 'End Date'))
+        return job
+
+    def emails(self, df):
+        return email_rows(text(df, 'Emails').str.split(';'))
+
+    def github(self, df):
+        usernames = github_usernames(text(df, 'GitHub URL')).dropna()
+        return pd.DataFrame({'github_username': usernames})
+
+
+class PhantomBusterAdapter(CsvAdapter):
+    """
+    import_phantombuster_enriched.py: enrichment of people already in the database
+
+    Rows flagged "No Linkedin profile found" go to the importer's per-row
+    deletion / review path.
+    """
+
+    name = 'phantombuster_enriched_import'
+    source = 'phantombuster_enriched'
+    create_people = False
+    unmatched_stat = 'skipped_no_error_profile'
+
+    def fallback(self, df):
+        return text(df, 'error').str.lower().str.contains('no linkedin profile found', regex=False)
+
+    def people(self, df):
+        person_id = text(df, 'person_id')
+
+        people = linkedin_columns(text(df, 'linkedin_url'))
+        people['csv_person_id'] = person_id.where(person_id.str.fullmatch(UUID_PATTERN))
+        people['full_name'] = text(df, 'full_name')
+        people['first_name'] = text(df, 'firstName')
+        people['last_name'] = text(df, 'lastName')
+        people['location'] = text(df, 'location')
+        people['headline'] = text(df, 'linkedinHeadline')
+        people['description'] = text(df, 'linkedinDescription')
+        people['skip'] = ''
+        return people
+
+    def employment(self, df):
+        jobs = []
+        for company, title, dates, location in [
+            ('companyName', 'linkedinJobTitle', 'linkedinJobDateRange', 'linkedinJobLocation'),
+            ('previousCompanyName', 'linkedinPreviousJobTitle', 'linkedinPreviousJobDateRange',
+             'linkedinPreviousJobLocation'),
+        ]:
+            job = pd.DataFrame({
+                'company_name': text(df, company),
+                'title': text(df, title),
+                'location': text(df, location),
+            })
+            job[['start_date', 'end_date']] = date_ranges(text(df, dates))
+            jobs.append(job[(job['company_name'] != '') & (job['title'] != '')])
+        return pd.concat(jobs)
+
+    def education(self, df):
+        schools = []
+        for school, degree, dates in [
+            ('linkedinSchoolName', 'linkedinSchoolDegree', 'linkedinSchoolDateRange'),
+            ('linkedinPreviousSchoolName', 'linkedinPreviousSchoolDegree', 'linkedinPreviousSchoolDateRange'),
+        ]:
+            # "2013 - 2016" -> Jan 1 2013 .. Dec 31 2016 (as parse_education_date_range)
+            parts = text(df, dates).str.split('-')
+            two = parts.str.len() == 2
+            start_year = parts.str[0].str.extract(r'(\d{4})')[0].where(two)
+            end_year = parts.str[-1].str.extract(r'(\d{4})')[0].where(two)
+            education = pd.DataFrame({
+                'school_name': text(df, school),
+                'degree': text(df, degree),
+                'start_date': start_year + '-01-01',
+                'end_date': end_year + '-12-31',
+            })
+            schools.append(education[education['school_name'] != ''])
+        return pd.concat(schools)
+
+
+ADAPTERS = {
+    'clay': ClayAdapter,
+    'bm_gem': BMGemAdapter,
+    'datablend': DatablendAdapter,
+    'phantombuster': PhantomBusterAdapter,
+}
+
+
+# Engine
+
+class BulkImporter:
+    """
+    Chunked CSV -> COPY -> set-based merge
+
+    Args:
+        conn: Database connection (autocommit is switched off while running)
+        adapter: CsvAdapter for the source
+        chunk_size: Rows per chunk / transaction
+        fallback: Called with each row dict the adapter routes to the per-row path
+        dry_run: Roll back every chunk instead of committing
+        shard: (index, count) to import only this worker's share of the rows
+    """
+
+    def __init__(self, conn, adapter: CsvAdapter, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 fallback: Optional[Callable[[Dict], None]] = None, dry_run: bool = False,
+                 shard: Optional[Tuple[int, int]] = None):
+        self.conn = conn
+        self.adapter = adapter
+        self.chunk_size = chunk_size
+        self.fallback = fallback
+        self.dry_run = dry_run
+        self.shard = shard
+
+        self.stats = {
+            'total_rows': 0,
+            'chunks': 0,
+            'profiles_created': 0,
+            'profiles_enriched': 0,
+            'skipped_invalid': 0,
+            'skipped_duplicate_linkedin': 0,
+            adapter.unmatched_stat: 0,
+            'companies_matched': 0,
+            'companies_created': 0,
+            'companies_invalid': 0,
+            'employment_records_added': 0,
+            'emails_added': 0,
+            'github_linked': 0,
+            'github_added': 0,
+            'github_conflicts': 0,
+            'education_records_added': 0,
+            'twitter_profiles_added': 0,
+            'fallback_rows': 0,
+            'chunk_retries': 0,
+            'failed_rows': 0,
+            'errors': [],
+        }
+
+    def checkpoint_name(self, path) -> str:
+        name = f"bulk_{self.adapter.source}_{Path(path).stem}"
+        if self.shard:
+            name += f"_shard{self.shard[0] + 1}of{self.shard[1]}"
+        return re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+
+    def run(self, path, resume: bool = True, keep_checkpoint: bool = False,
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Import one CSV file; returns stats
+
+        Args:
+            path: CSV file
+            resume: Continue from this file's checkpoint if there is one
+            keep_checkpoint: Leave the finished checkpoint for the caller to clear
+                (parallel runs clear theirs only once every shard is done)
+            progress: Called with (offset, file size) after each chunk instead of printing
+        """
+        start = time.time()
+        file_id = self._file_id(path)
+        checkpoint = None if self.dry_run else self.checkpoint_name(path)
+        offset, elapsed_before = 0, 0.0
+
+        saved = Config.load_checkpoint(checkpoint) if checkpoint and resume else None
+        if saved and saved.get('file') == file_id:
+            self.stats.update(saved['stats'])
+            offset, elapsed_before = saved['offset'], self.stats.pop('elapsed_seconds', 0.0)
+            if saved.get('done'):
+                self.stats['elapsed_seconds'] = elapsed_before
+                return self.stats
+            print(f"   ↩️  Resuming at byte {offset:,} of {file_id['size']:,} "
+                  f"({self.stats['total_rows']:,} rows already imported)", flush=True)
+        elif saved:
+            print(f"   ⚠️  Ignoring checkpoint {checkpoint}: the CSV file has changed", flush=True)
+
+        rows_before = self.stats['total_rows']
+        autocommit = self.conn.autocommit
+        self.conn.autocommit = False
+        cursor = self.conn.cursor()
+        try:
+            self._create_staging(cursor)
+            self.conn.commit()
+
+            for chunk, offset in read_csv_chunks(path, self.chunk_size, offset):
+                self._import_chunk(cursor, chunk)
+                self.stats['elapsed_seconds'] = round(elapsed_before + time.time() - start, 1)
+                if checkpoint:
+                    Config.save_checkpoint(checkpoint, {'file': file_id, 'offset': offset,
+                                                        'stats': self.stats})
+                if progress:
+                    progress(offset, file_id['size'])
+                else:
+                    rows = self.stats['total_rows'] - rows_before
+                    print(f"   Processed {self.stats['total_rows']:,} rows "
+                          f"({offset / max(file_id['size'], 1):.0%})... "
+                          f"({self.stats['profiles_created']:,} created, "
+                          f"{self.stats['profiles_enriched']:,} enriched, "
+                          f"{rows / (time.time() - start):,.0f} rows/s)", flush=True)
+        finally:
+            cursor.close()
+            self.conn.autocommit = autocommit
+
+        self.stats['elapsed_seconds'] = round(elapsed_before + time.time() - start, 1)
+        if checkpoint:
+            if keep_checkpoint:
+                Config.save_checkpoint(checkpoint, {'file': file_id, 'offset': offset,
+                                                    'stats': self.stats, 'done': True})
+            else:
+                Config.clear_checkpoint(checkpoint)
+        return self.stats
+
+    @staticmethod
+    def _file_id(path) -> Dict:
+        """What a checkpoint must match to be resumed"""
+        stat = Path(path).stat()
+        return {'path': str(Path(path).resolve()), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+    def merge_into(self, stats: Dict, renames: Optional[Dict[str, str]] = None):
+        """Add the counters into an importer's own stats dict (for its report)"""
+        merge_stats(stats, self.stats, renames)
+
+    def _count(self, key: str, value: int):
+        self.stats[key] = self.stats.get(key, 0) + int(value)
+
+    def _create_staging(self, cursor):
+        for table, columns in STAGING_COLUMNS.items():
+            definition = ', '.join(f"{name} {kind}" for name, kind in columns + WORK_COLUMNS.get(table, []))
+            cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} ({definition}) ON COMMIT DELETE ROWS")
+
+    def _finish(self):
+        if self.dry_run:
+            self.conn.rollback()
+        else:
+            self.conn.commit()
+
+    def _valid_employment(self, employment: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        if employment is None:
+            return None
+        valid = map_unique(employment['company_name'], is_valid_company_name).fillna(False).astype(bool)
+        self._count('companies_invalid', (~valid & (employment['company_name'] != '')).sum())
+        return employment[valid]
+
+    def _import_chunk(self, cursor, chunk: pd.DataFrame):
+        adapter = self.adapter
+        if self.shard:
+            index, count = self.shard
+            chunk = chunk[shard_of(adapter.shard_keys(chunk), count) == index]
+        self.stats['total_rows'] += len(chunk)
+        self.stats['chunks'] += 1
+
+        # Completely empty rows
+        empty = (chunk.apply(lambda column: column.str.strip()) == '').all(axis=1)
+        self._count('skipped_invalid', empty.sum())
+        chunk = chunk[~empty]
+
+        fallback = adapter.fallback(chunk)
+        if fallback.any():
+            self._count('fallback_rows', fallback.sum())
+            if self.fallback:
+                for row in chunk[fallback].to_dict('records'):
+                    self.fallback(row)
+                self._finish()
+            chunk = chunk[~fallback]
+
+        people = adapter.people(chunk)
+        skip = people.pop('skip')
+        for reason, count in skip[skip != ''].value_counts().items():
+            self._count(reason, count)
+        keep = skip == ''
+        chunk, people = chunk[keep], people[keep]
+        if chunk.empty:
+            return
+
+        frames = [
+            ('stage_person', people),
+            ('stage_employment', self._valid_employment(adapter.employment(chunk))),
+            ('stage_email', adapter.emails(chunk)),
+            ('stage_github', adapter.github(chunk)),
+            ('stage_education', adapter.education(chunk)),
+            ('stage_twitter', adapter.twitter(chunk)),
+        ]
+
+        self._load(cursor, frames, chunk.index)
+
+    def _load(self, cursor, frames: List[Tuple[str, Optional[pd.DataFrame]]], rows: pd.Index):
+        """
+        Stage and merge the frames' rows (indexed by row_no) in one transaction
+
+        Workers touching the same rows (GitHub profiles, companies) can
+        deadlock; the loser's rows are rolled back and simply run again. A
+        data error splits the rows in half and loads each half on its own,
+        down to single rows, which are then recorded as failed. Anything else
+        is raised so run() doesn't checkpoint past rows that never loaded.
+        """
+        counters = {key: value for key, value in self.stats.items() if key != 'errors'}
+        for attempt in range(1, CHUNK_ATTEMPTS + 1):
+            try:
+                for table, frame in frames:
+                    if frame is not None and len(frame):
+                        self._copy(cursor, table, frame)
+
+                cursor.execute("ANALYZE stage_person, stage_employment, stage_email, "
+                               "stage_github, stage_education, stage_twitter")
+                self._merge(cursor)
+                self._finish()
+                return
+            except Exception as e:
+                self.conn.rollback()
+                self.stats.update(counters)
+                pgcode = getattr(e, 'pgcode', None) or ''
+                if pgcode in RETRYABLE_ERRORS and attempt < CHUNK_ATTEMPTS:
+                    self._count('chunk_retries', 1)
+                    counters['chunk_retries'] = self.stats['chunk_retries']
+                    time.sleep(attempt)
+                    continue
+                if not pgcode.startswith(ROW_ERROR_CLASSES):
+                    raise
+                if len(rows) == 1:
+                    self._count('failed_rows', 1)
+                    self.stats['errors'].append(f"Row at byte {rows[0]}: {e}")
+                    return
+                break
+
+        half = len(rows) // 2
+        for part in (rows[:half], rows[half:]):
+            self._load(cursor, [
+                (table, None if frame is None else frame[frame.index.isin(part)])
+                for table, frame in frames
+            ], part)
+
+    @staticmethod
+    def _copy(cursor, table: str, frame: pd.DataFrame):
+        """COPY a frame (index = row_no) into a staging table; '' and NaN load as NULL"""
+        columns = [name for name, _ in STAGING_COLUMNS[table]]
+        frame = frame.assign(row_no=frame.index).reindex(columns=columns)
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    def _resolve_companies(self, cursor, create: bool) -> Tuple[int, int]:
+        """
+        Fill stage_company.company_id from the company_name_key registry;
+        returns (matched, created)
+
+        Existing companies not registered yet are registered on the way. New
+        names are claimed with INSERT ... ON CONFLICT DO NOTHING: when two
+        workers create the same company at once, the first claim wins and the
+        other reads its company_id back - no explicit locking.
+        """
+        cursor.execute("""
+            UPDATE stage_company c SET company_id = k.company_id
+            FROM company_name_key k
+            WHERE k.name_key = c.company_key
+        """)
+        cursor.execute("""
+            WITH found AS (
+                SELECT DISTINCT ON (LOWER(TRIM(co.company_name)))
+                       LOWER(TRIM(co.company_name)) AS name_key, co.company_id
+                FROM company co
+                WHERE LOWER(TRIM(co.company_name)) IN (
+                    SELECT company_key FROM stage_company WHERE company_id IS NULL
+                )
+                ORDER BY LOWER(TRIM(co.company_name)), co.company_id
+            ), registered AS (
+                INSERT INTO company_name_key (name_key, company_id)
+                SELECT name_key, company_id FROM found
+                ON CONFLICT (name_key) DO NOTHING
+            )
+            UPDATE stage_company c SET company_id = f.company_id
+            FROM found f
+            WHERE f.name_key = c.company_key
+        """)
+        created = 0
+        if create:
+            cursor.execute("""
+                WITH claimed AS (
+                    INSERT INTO company_name_key (name_key, company_id)
+                    SELECT company_key, gen_random_uuid()
+                    FROM stage_company
+                    WHERE company_id IS NULL
+                    ORDER BY company_key
+                    ON CONFLICT (name_key) DO NOTHING
+                    RETURNING name_key, company_id
+                ), created AS (
+                    INSERT INTO company (company_id, company_name)
+                    SELECT k.company_id, c.company_name
+                    FROM claimed k
+                    JOIN stage_company c ON c.company_key = k.name_key
+                    RETURNING company_id
+                )
+                UPDATE stage_company c SET company_id = k.company_id
+                FROM claimed k
+                WHERE k.name_key = c.company_key
+            """)
+            created = cursor.rowcount
+            # Names another worker claimed first
+            cursor.execute("""
+                UPDATE stage_company c SET company_id = k.company_id
+                FROM company_name_key k
+                WHERE c.company_id IS NULL AND k.name_key = c.company_key
+            """)
+
+        cursor.execute("SELECT COUNT(*) AS matched FROM stage_company WHERE company_id IS NOT NULL")
+        return cursor.fetchone()['matched'] - created, created
+
+    def resolve_companies(self, path) -> Tuple[int, int]:
+        """
+        Pre-resolution pass: register the file's existing companies in
+        company_name_key up front; returns (registered, distinct names)
+
+        Run once before parallel workers start so they mostly hit the
+        registry instead of all falling back to the company table.
+        """
+        names = set()
+        for chunk, _ in read_csv_chunks(path, self.chunk_size):
+            employment = self.adapter.employment(chunk)
+            if employment is not None:
+                names.update(self._valid_employment(employment)['company_name'].unique())
+        names.discard('')
+        if not names:
+            return 0, 0
+
+        autocommit = self.conn.autocommit
+        self.conn.autocommit = False
+        cursor = self.conn.cursor()
+        try:
+            self._create_staging(cursor)
+            self._copy(cursor, 'stage_employment', pd.DataFrame({'company_name': sorted(names)}))
+            cursor.execute("""
+                INSERT INTO stage_company (company_key, company_name)
+                SELECT DISTINCT ON (LOWER(TRIM(company_name))) LOWER(TRIM(company_name)), TRIM(company_name)
+                FROM stage_employment
+                ORDER BY LOWER(TRIM(company_name))
+            """)
+            cursor.execute("SELECT COUNT(*) AS total FROM stage_company")
+            total = cursor.fetchone()['total']
+            matched, _ = self._resolve_companies(cursor, create=False)
+            self._finish()
+        finally:
+            cursor.close()
+            self.conn.autocommit = autocommit
+        self.stats['companies_invalid'] = 0  # Counted again per chunk
+        return matched, total
+
+    def _merge(self, cursor):
+        adapter = self.adapter
+        params = {'source': adapter.source, 'confidence': adapter.confidence}
+
+        # 1. Resolve existing people
+        cursor.execute("""
+            UPDATE stage_person s SET person_id = p.person_id
+            FROM person p
+            WHERE p.person_id = s.csv_person_id
+        """)
+        cursor.execute("""
+            UPDATE stage_person s SET person_id = p.person_id
+            FROM person p
+            WHERE s.person_id IS NULL
+            AND s.normalized_linkedin_url IS NOT NULL
+            AND p.normalized_linkedin_url = s.normalized_linkedin_url
+        """)
+        if adapter.match_github:
+            cursor.execute("""
+                UPDATE stage_person s SET person_id = gp.person_id
+                FROM github_profile gp
+                WHERE s.person_id IS NULL
+                AND s.github_username IS NOT NULL
+                AND LOWER(gp.github_username) = LOWER(s.github_username)
+                AND gp.person_id IS NOT NULL
+            """)
+        cursor.execute("UPDATE stage_person SET matched = TRUE WHERE person_id IS NOT NULL")
+
+        # 2. Enrich them (fill NULLs only)
+        cursor.execute("""
+            UPDATE person p SET
+                first_name = COALESCE(p.first_name, s.first_name),
+                last_name = COALESCE(p.last_name, s.last_name),
+                full_name = COALESCE(p.full_name, s.full_name),
+                location = COALESCE(p.location, s.location),
+                headline = COALESCE(p.headline, s.headline),
+                description = COALESCE(p.description, s.description),
+                refreshed_at = NOW()
+            FROM (
+                SELECT DISTINCT ON (person_id) *
+                FROM stage_person
+                WHERE matched
+                ORDER BY person_id, row_no
+            ) s
+            WHERE p.person_id = s.person_id
+        """)
+        self._count('profiles_enriched', cursor.rowcount)
+
+        # 3. Create the rest (one person per LinkedIn URL / GitHub username in the chunk)
+        if adapter.create_people:
+            cursor.execute("""
+                UPDATE stage_person SET new_person_id = gen_random_uuid()
+                WHERE row_no IN (
+                    SELECT DISTINCT ON (COALESCE(normalized_linkedin_url, LOWER(github_username))) row_no
+                    FROM stage_person
+                    WHERE person_id IS NULL
+                    AND COALESCE(full_name, placeholder_name) IS NOT NULL
+                    ORDER BY COALESCE(normalized_linkedin_url, LOWER(github_username)), row_no
+                )
+            """)
+            cursor.execute("""
+                WITH created AS (
+                    INSERT INTO person (
+                        person_id, full_name, first_name, last_name,
+                        linkedin_url, normalized_linkedin_url,
+                        location, headline, description
+                    )
+                    SELECT new_person_id, COALESCE(full_name, placeholder_name), first_name, last_name,
+                           linkedin_url, normalized_linkedin_url,
+                           location, headline, description
+                    FROM stage_person
+                    WHERE new_person_id IS NOT NULL
+                    ON CONFLICT (linkedin_url) DO NOTHING
+                    RETURNING person_id
+                )
+                UPDATE stage_person s SET person_id = s.new_person_id
+                FROM created c
+                WHERE c.person_id = s.new_person_id
+            """)
+            self._count('profiles_created', cursor.rowcount)
+
+            # Later rows for the same person in this chunk
+            cursor.execute("""
+                UPDATE stage_person s SET person_id = d.person_id
+                FROM stage_person d
+                WHERE s.person_id IS NULL
+                AND d.person_id = d.new_person_id
+                AND COALESCE(s.normalized_linkedin_url, LOWER(s.github_username))
+                  = COALESCE(d.normalized_linkedin_url, LOWER(d.github_username))
+            """)
+
+        cursor.execute("""
+            SELECT
+                COUNT(*) FILTER (WHERE person_id IS NULL AND new_person_id IS NOT NULL) AS duplicate,
+                COUNT(*) FILTER (WHERE person_id IS NULL AND new_person_id IS NULL) AS unmatched
+            FROM stage_person
+        """)
+        row = cursor.fetchone()
+        self._count('skipped_duplicate_linkedin', row['duplicate'])
+        self._count(adapter.unmatched_stat, row['unmatched'])
+
+        # 4. Companies: match by normalized name, create the missing ones
+        cursor.execute("""
+            INSERT INTO stage_company (company_key, company_name)
+            SELECT DISTINCT ON (LOWER(TRIM(e.company_name))) LOWER(TRIM(e.company_name)), TRIM(e.company_name)
+            FROM stage_employment e
+            JOIN stage_person s USING (row_no)
+            WHERE s.person_id IS NOT NULL
+            ORDER BY LOWER(TRIM(e.company_name)), e.row_no
+        """)
+        matched, created = self._resolve_companies(cursor, create=True)
+        self._count('companies_matched', matched)
+        self._count('companies_created', created)
+        cursor.execute("""
+            UPDATE stage_employment e SET company_id = c.company_id
+            FROM stage_company c
+            WHERE LOWER(TRIM(e.company_name)) = c.company_key
+        """)
+
+        # 5. Employment, skipping near-duplicates of existing records
+        cursor.execute("""
+            INSERT INTO employment (
+                employment_id, person_id, company_id, title, start_date, end_date, location,
+                source_text_ref, source_confidence, date_precision
+            )
+            SELECT gen_random_uuid(), n.person_id, n.company_id, n.title, n.start_date, n.end_date, n.location,
+                   %(source)s, %(confidence)s, 'month_year'
+            FROM (
+                SELECT DISTINCT ON (s.person_id, e.company_id, e.start_date)
+                       s.person_id, e.company_id, e.title, e.start_date, e.end_date, e.location
+                FROM stage_employment e
+                JOIN stage_person s USING (row_no)
+                WHERE s.person_id IS NOT NULL AND e.company_id IS NOT NULL
+                ORDER BY s.person_id, e.company_id, e.start_date, e.row_no
+            ) n
+            WHERE NOT EXISTS (
+                SELECT 1 FROM employment x
+                WHERE x.person_id = n.person_id
+                AND x.company_id = n.company_id
+                AND (x.start_date IS NOT DISTINCT FROM n.start_date
+                     OR x.end_date IS NOT DISTINCT FROM n.end_date)
+            )
+        """, params)
+        self._count('employment_records_added', cursor.rowcount)
+
+        # 6. Emails
+        cursor.execute("""
+            INSERT INTO person_email (person_id, email, email_type, is_primary, source, verified)
+            SELECT DISTINCT ON (s.person_id, LOWER(m.email))
+                   s.person_id, m.email, m.email_type, m.is_primary, %(source)s, FALSE
+            FROM stage_email m
+            JOIN stage_person s USING (row_no)
+            WHERE s.person_id IS NOT NULL
+            ORDER BY s.person_id, LOWER(m.email), m.is_primary DESC
+            ON CONFLICT (person_id, LOWER(email)) DO NOTHING
+        """, params)
+        self._count('emails_added', cursor.rowcount)
+
+        # 7. GitHub profiles: link unclaimed ones, add unknown ones, count conflicts
+        cursor.execute("""
+            SELECT COUNT(*) AS conflicts
+            FROM stage_github g
+            JOIN stage_person s USING (row_no)
+            JOIN github_profile gp ON LOWER(gp.github_username) = LOWER(g.github_username)
+            WHERE gp.person_id IS NOT NULL AND gp.person_id <> s.person_id
+        """)
+        self._count('github_conflicts', cursor.fetchone()['conflicts'])
+        cursor.execute("""
+            UPDATE github_profile gp SET
+                person_id = g.person_id,
+                blog = COALESCE(gp.blog, g.blog)
+            FROM (
+                SELECT DISTINCT ON (LOWER(sg.github_username))
+                       LOWER(sg.github_username) AS username, s.person_id, sg.blog
+                FROM stage_github sg
+                JOIN stage_person s USING (row_no)
+                WHERE s.person_id IS NOT NULL
+                ORDER BY LOWER(sg.github_username), sg.row_no
+            ) g
+            WHERE LOWER(gp.github_username) = g.username
+            AND gp.person_id IS NULL
+        """)
+        self._count('github_linked', cursor.rowcount)
+        cursor.execute("""
+            INSERT INTO github_profile (person_id, github_username, blog, source)
+            SELECT DISTINCT ON (LOWER(g.github_username)) s.person_id, g.github_username, g.blog, %(source)s
+            FROM stage_github g
+            JOIN stage_person s USING (row_no)
+            WHERE s.person_id IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM github_profile gp WHERE LOWER(gp.github_username) = LOWER(g.github_username)
+            )
+            ORDER BY LOWER(g.github_username), g.row_no
+            ON CONFLICT (github_username) DO NOTHING
+        """, params)
+        self._count('github_added', cursor.rowcount)
+
+        # 8. Education
+        cursor.execute("""
+            INSERT INTO education (
+                education_id, person_id, school_name, degree, start_date, end_date, date_precision
+            )
+            SELECT gen_random_uuid(), n.person_id, n.school_name, n.degree, n.start_date, n.end_date, 'year'
+            FROM (
+                SELECT DISTINCT ON (s.person_id, LOWER(TRIM(d.school_name)))
+                       s.person_id, TRIM(d.school_name) AS school_name, d.degree, d.start_date, d.end_date
+                FROM stage_education d
+                JOIN stage_person s USING (row_no)
+                WHERE s.person_id IS NOT NULL
+                ORDER BY s.person_id, LOWER(TRIM(d.school_name)), d.row_no
+            ) n
+            WHERE NOT EXISTS (
+                SELECT 1 FROM education x
+                WHERE x.person_id = n.person_id
+                AND LOWER(TRIM(x.school_name)) = LOWER(n.school_name)
+            )
+        """)
+        self._count('education_records_added', cursor.rowcount)
+
+        # 9. Twitter / X
+        cursor.execute("""
+            INSERT INTO twitter_profile (twitter_id, person_id, username)
+            SELECT DISTINCT ON (t.twitter_id) t.twitter_id, s.person_id, t.username
+            FROM stage_twitter t
+            JOIN stage_person s USING (row_no)
+            WHERE s.person_id IS NOT NULL
+            ORDER BY t.twitter_id, t.row_no
+            ON CONFLICT (twitter_id) DO UPDATE
+            SET person_id = COALESCE(twitter_profile.person_id, EXCLUDED.person_id),
+                username = EXCLUDED.username
+        """)
+        self._count('twitter_profiles_added', cursor.rowcount)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='COPY-based bulk CSV import')
+    parser.add_argument('source', choices=sorted(ADAPTERS), help='CSV source (column mapping)')
+    parser.add_argument('csv_path', type=Path, help='CSV file')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Rows per chunk / transaction (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--dry-run', action='store_true', help='Stage and merge, then roll back')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes over hash-sharded rows (default: 1)')
+    parser.add_argument('--restart', action='store_true', help='Ignore checkpoints and start over')
+    args = parser.parse_args()
+
+    if not args.csv_path.exists():
+        print(f"❌ CSV file not found: {args.csv_path}")
+        return 1
+
+    adapter = ADAPTERS[args.source]()
+    print(f"\n📦 Bulk import ({args.source}): {args.csv_path}")
+    if args.workers > 1:
+        from imports.parallel_import import run_parallel
+        stats = run_parallel(adapter, args.csv_path, args.workers, chunk_size=args.chunk_size,
+                             dry_run=args.dry_run, restart=args.restart)
+    else:
+        conn = get_db_connection(use_pool=False)
+        try:
+            importer = BulkImporter(conn, adapter, chunk_size=args.chunk_size, dry_run=args.dry_run)
+            stats = importer.run(args.csv_path, resume=not args.restart)
+        finally:
+            conn.close()
+
+    print(f"\n✅ Done in {stats['elapsed_seconds']}s{' (dry run, rolled back)' if args.dry_run else ''}")
+    for key, value in stats.items():
+        if key != 'errors':
+            print(f"   {key}: {value:,}" if isinstance(value, int) else f"   {key}: {value}")
+    if stats['fallback_rows']:
+        print(f"   ⚠️  {stats['fallback_rows']:,} rows need the per-row path "
+              f"(run the source's importer with --bulk to handle them)")
+    if stats['errors']:
+        print(f"\n⚠️  ERRORS ({len(stats['errors'])}):")
+        for error in stats['errors'][:10]:
+            print(f"   - {error}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
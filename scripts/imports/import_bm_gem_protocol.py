@@ -23,6 +23,7 @@ Author: AI Assistant
 Date: October 23, 2025
 """
 
+import argparse
 import sys
 import csv
 import json
@@ -44,6 +45,7 @@ from data_quality_filters import is_valid_company_name, get_company_validation_m
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from logging_utils import Logger
 from imports.employment_utils import EmploymentDataExtractor, EmploymentRecordManager
+from lookup_cache import LookupTable, PEOPLE_BY_LINKEDIN, COMPANIES_BY_NAME
 
 # Import migration utilities
 try:
@@ -53,7 +55,8 @@ try:
         normalize_email,
         validate_email,
         infer_email_type,
-        log_migration_event
+        log_migration_event,
+        synthetic_twitter_id
     )
 except ImportError:
     print("⚠️  Warning: Could not import migration_utils, using fallback functions")
@@ -110,6 +113,12 @@ except ImportError:
             conn.commit()
         except Exception as e:
             print(f"⚠️  Warning: Could not log migration event: {e}")
+    
+    def synthetic_twitter_id(username: str) -> int:
+        """Fallback stable twitter_id from the username"""
+        import hashlib
+        digest = hashlib.blake2b(username.lower().encode(), digest_size=8).hexdigest()
+        return int(digest, 16) % (10 ** 15)
 
 # CSV Configuration
 CSV_PATH = "/Users/charlie.kerr/Desktop/Imports for TI Final/BM_Gem_Protocol_BE_FE.csv"
@@ -156,24 +165,10 @@ class BMGemImporter:
     
     def _load_caches(self):
         """Pre-load existing data for faster lookups (deduplication pattern)"""
-        # Load people by normalized LinkedIn URL
-        self.cursor.execute("""
-            SELECT normalized_linkedin_url, person_id::text
-            FROM person
-            WHERE normalized_linkedin_url IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.person_cache[row['normalized_linkedin_url']] = row['person_id']
-        
-        # Load companies by name (case-insensitive deduplication)
-        self.cursor.execute("""
-            SELECT LOWER(TRIM(company_name)) as name_lower, company_id::text
-            FROM company
-            WHERE company_name IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.company_cache[row['name_lower']] = row['company_id']
-    
+        # Key -> id maps are mapped snapshots (scripts/lookup_cache.py)
+        self.person_cache = LookupTable.load(self.cursor, PEOPLE_BY_LINKEDIN)
+        self.company_cache = LookupTable.load(self.cursor, COMPANIES_BY_NAME)
+
     def parse_email_array(self, email_str: str) -> List[str]:
         """Parse the All Emails field which is a JSON-like array"""
         if not email_str or not email_str.strip():
@@ -393,8 +388,8 @@ class BMGemImporter:
             return
         
         try:
-            # Generate twitter_id from username hash (simple approach)
-            twitter_id = abs(hash(username.lower())) % (10 ** 15)
+            # Generate twitter_id from a stable username digest
+            twitter_id = synthetic_twitter_id(username)
             
             self.cursor.execute("""
                 INSERT INTO twitter_profile (twitter_id, person_id, username)
@@ -735,6 +730,31 @@ class BMGemImporter:
         
         print(f"\n✅ Processing complete!")
     
+    def process_csv_bulk(self, chunk_size: int = None, workers: int = 1):
+        """
+        Same import through the COPY-based bulk engine (imports/bulk_import.py)
+
+        Much faster on large exports; matching and write rules are the same
+        as process_csv.
+        """
+        from imports.bulk_import import BulkImporter, BMGemAdapter, DEFAULT_CHUNK_SIZE, merge_stats
+        from imports.parallel_import import run_parallel
+
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        print(f"\n{'='*80}")
+        print("BM GEM PROTOCOL CSV IMPORT (BULK)")
+        print(f"{'='*80}")
+        print(f"\nSource: {self.csv_path}")
+        print(f"Database: {Config.PG_DATABASE}@{Config.PG_HOST}\n")
+
+        if workers > 1:
+            stats = run_parallel(BMGemAdapter(), self.csv_path, workers, chunk_size=chunk_size)
+        else:
+            stats = BulkImporter(self.conn, BMGemAdapter(), chunk_size=chunk_size).run(self.csv_path)
+        merge_stats(self.stats, stats, {'github_added': 'github_profiles_added'})
+
+        print(f"\n✅ Processing complete! ({stats['chunks']:,} chunks, {stats['elapsed_seconds']}s)")
+
     def generate_report(self):
         """Generate and display import report"""
         print(f"\n{'='*80}")
@@ -851,10 +871,13 @@ class BMGemImporter:
 
 def main():
     """Main execution"""
-    # Accept CSV path as command line argument
-    csv_path = CSV_PATH  # Default
-    if len(sys.argv) > 1:
-        csv_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description='Import BM Gem Protocol CSV')
+    parser.add_argument('csv_path', nargs='?', default=CSV_PATH, help=f'CSV to import (default: {CSV_PATH})')
+    parser.add_argument('--bulk', action='store_true', help='Use the COPY-based bulk engine (imports/bulk_import.py)')
+    parser.add_argument('--workers', type=int, default=1, help='Parallel workers for --bulk (default: 1)')
+    args = parser.parse_args()
+    
+    csv_path = args.csv_path
     
     # Check if CSV exists
     if not Path(csv_path).exists():
@@ -901,7 +924,10 @@ def main():
     
     try:
         importer = BMGemImporter(csv_path)
-        importer.process_csv()
+        if args.bulk:
+            importer.process_csv_bulk(workers=args.workers)
+        else:
+            importer.process_csv()
         importer.generate_report()
         importer.close()
         
@@ -26,6 +26,7 @@ Author: AI Assistant
 Date: October 22, 2025
 """
 
+import argparse
 import sys
 import csv
 from pathlib import Path
@@ -46,6 +47,8 @@ from data_quality_filters import is_valid_company_name, get_company_validation_m
 sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 from logging_utils import Logger
 from imports.employment_utils import EmploymentDataExtractor, EmploymentRecordManager
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lookup_cache import LookupTable, PEOPLE_BY_LINKEDIN, COMPANIES_BY_NAME
 
 # Import migration utilities
 try:
@@ -126,24 +129,10 @@ class ClayPeopleImporter:
     
     def _load_caches(self):
         """Pre-load existing data for faster lookups"""
-        # Load people by normalized LinkedIn URL
-        self.cursor.execute("""
-            SELECT normalized_linkedin_url, person_id::text
-            FROM person
-            WHERE normalized_linkedin_url IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.person_cache[row['normalized_linkedin_url']] = row['person_id']
-        
-        # Load companies by name
-        self.cursor.execute("""
-            SELECT LOWER(TRIM(company_name)) as name_lower, company_id::text
-            FROM company
-            WHERE company_name IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.company_cache[row['name_lower']] = row['company_id']
-    
+        # Key -> id maps are mapped snapshots (scripts/lookup_cache.py)
+        self.person_cache = LookupTable.load(self.cursor, PEOPLE_BY_LINKEDIN)
+        self.company_cache = LookupTable.load(self.cursor, COMPANIES_BY_NAME)
+
     def find_existing_person(self, row: Dict) -> Optional[str]:
         """Find if person already exists in database by LinkedIn URL"""
         linkedin_url = row.get('LinkedIn Profile', '').strip()
@@ -466,6 +455,31 @@ class ClayPeopleImporter:
         
         print(f"\n✅ Processing complete!")
     
+    def process_csv_bulk(self, chunk_size: int = None, workers: int = 1):
+        """
+        Same import through the COPY-based bulk engine (imports/bulk_import.py)
+
+        Much faster on large exports; matching and write rules are the same
+        as process_csv.
+        """
+        from imports.bulk_import import BulkImporter, ClayAdapter, DEFAULT_CHUNK_SIZE, merge_stats
+        from imports.parallel_import import run_parallel
+
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        print(f"\n{'='*80}")
+        print("CLAY CSV IMPORT - PEOPLE DATA (BULK)")
+        print(f"{'='*80}")
+        print(f"\nSource: {CSV_PATH}")
+        print(f"Database: {Config.PG_DATABASE}@{Config.PG_HOST}\n")
+
+        if workers > 1:
+            stats = run_parallel(ClayAdapter(), CSV_PATH, workers, chunk_size=chunk_size)
+        else:
+            stats = BulkImporter(self.conn, ClayAdapter(), chunk_size=chunk_size).run(CSV_PATH)
+        merge_stats(self.stats, stats)
+
+        print(f"\n✅ Processing complete! ({stats['chunks']:,} chunks, {stats['elapsed_seconds']}s)")
+
     def generate_report(self):
         """Generate and display import report"""
         print(f"\n{'='*80}")
@@ -562,6 +576,11 @@ class ClayPeopleImporter:
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Import Clay people CSV')
+    parser.add_argument('--bulk', action='store_true', help='Use the COPY-based bulk engine (imports/bulk_import.py)')
+    parser.add_argument('--workers', type=int, default=1, help='Parallel workers for --bulk (default: 1)')
+    args = parser.parse_args()
+    
     # Check if CSV exists
     if not Path(CSV_PATH).exists():
         print(f"❌ CSV file not found: {CSV_PATH}")
@@ -605,7 +624,10 @@ def main():
     
     try:
         importer = ClayPeopleImporter()
-        importer.process_csv()
+        if args.bulk:
+            importer.process_csv_bulk(workers=args.workers)
+        else:
+            importer.process_csv()
         importer.generate_report()
         importer.close()
         
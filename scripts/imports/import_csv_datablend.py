@@ -17,6 +17,7 @@ Date: October 21, 2025
 Verified Against: Project structure, migration scripts, existing patterns
 """
 
+import argparse
 import sys
 import csv
 from pathlib import Path
@@ -37,6 +38,8 @@ from data_quality_filters import is_valid_company_name, get_company_validation_m
 sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 from logging_utils import Logger
 from imports.employment_utils import EmploymentDataExtractor, EmploymentRecordManager
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lookup_cache import LookupTable, PEOPLE_BY_LINKEDIN, COMPANIES_BY_NAME, GITHUB_PEOPLE_BY_USERNAME
 
 # Import migration utilities
 try:
@@ -152,45 +155,18 @@ class ProfileImporter:
         """Pre-load existing data for faster lookups"""
         print("📦 Loading database caches...")
         
+        # Key -> id maps are mapped snapshots (scripts/lookup_cache.py)
         try:
-            # Load existing people by normalized LinkedIn URL
-            self.cursor.execute("""
-                SELECT person_id::text, normalized_linkedin_url
-                FROM person
-                WHERE normalized_linkedin_url IS NOT NULL AND normalized_linkedin_url != ''
-            """)
-            for row in self.cursor.fetchall():
-                self.person_cache[row['normalized_linkedin_url']] = row['person_id']
-            
+            self.person_cache = LookupTable.load(self.cursor, PEOPLE_BY_LINKEDIN)
             print(f"   ✓ Loaded {len(self.person_cache):,} people by LinkedIn")
         except Exception as e:
             print(f"   ❌ Error loading people cache: {e}")
             raise
         
-        # Load existing GitHub profiles
-        self.cursor.execute("""
-            SELECT github_profile_id::text, person_id::text, LOWER(github_username) as github_username
-            FROM github_profile
-            WHERE github_username IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.github_cache[row['github_username']] = (
-                row['person_id'],
-                row['github_profile_id']
-            )
-        
+        self.github_cache = LookupTable.load(self.cursor, GITHUB_PEOPLE_BY_USERNAME)
         print(f"   ✓ Loaded {len(self.github_cache):,} GitHub profiles")
         
-        # Load existing companies
-        self.cursor.execute("""
-            SELECT company_id::text, company_name
-            FROM company
-            WHERE company_name IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            name_key = row['company_name'].lower().strip()
-            self.company_cache[name_key] = row['company_id']
-        
+        self.company_cache = LookupTable.load(self.cursor, COMPANIES_BY_NAME)
         print(f"   ✓ Loaded {len(self.company_cache):,} companies\n")
     
     def extract_github_username(self, url: str) -> Optional[str]:
@@ -676,6 +652,32 @@ class ProfileImporter:
         
         print(f"\n✅ Processing complete!")
     
+    def process_csv_bulk(self, chunk_size: int = None, workers: int = 1):
+        """
+        Same import through the COPY-based bulk engine (imports/bulk_import.py)
+
+        Much faster on large exports; matching and write rules are the same
+        as process_csv.
+        """
+        from imports.bulk_import import BulkImporter, DatablendAdapter, DEFAULT_CHUNK_SIZE, merge_stats
+        from imports.parallel_import import run_parallel
+
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self.logger.header("CSV IMPORT AND PROFILE ENRICHMENT (BULK)")
+        self.logger.section("📁 Configuration")
+        self.logger.info(f"Source: {CSV_PATH}")
+        self.logger.info(f"Database: {Config.PG_DATABASE}@{Config.PG_HOST}")
+        self.logger.info(f"Chunk size: {chunk_size:,} rows (COPY + set-based merge)")
+
+        if workers > 1:
+            stats = run_parallel(DatablendAdapter(), CSV_PATH, workers, chunk_size=chunk_size)
+        else:
+            stats = BulkImporter(self.conn, DatablendAdapter(), chunk_size=chunk_size).run(CSV_PATH)
+        merge_stats(self.stats, stats, {'github_linked': 'github_matched_existing',
+                                        'github_added': 'github_matched_new'})
+
+        self.logger.success(f"Processing complete ({stats['chunks']:,} chunks, {stats['elapsed_seconds']}s)")
+
     def generate_report(self):
         """Generate comprehensive import report"""
         self.logger.section("📊 IMPORT REPORT")
@@ -794,6 +796,11 @@ class ProfileImporter:
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Import Datablend profile CSV')
+    parser.add_argument('--bulk', action='store_true', help='Use the COPY-based bulk engine (imports/bulk_import.py)')
+    parser.add_argument('--workers', type=int, default=1, help='Parallel workers for --bulk (default: 1)')
+    args = parser.parse_args()
+    
     # Check if CSV exists
     if not Path(CSV_PATH).exists():
         print(f"❌ CSV file not found: {CSV_PATH}")
@@ -819,7 +826,10 @@ def main():
     
     try:
         importer = ProfileImporter()
-        importer.process_csv()
+        if args.bulk:
+            importer.process_csv_bulk(workers=args.workers)
+        else:
+            importer.process_csv()
         importer.generate_report()
         importer.close()
         
@@ -29,6 +29,7 @@ Author: AI Assistant
 Date: October 23, 2025
 """
 
+import argparse
 import sys
 import csv
 import re
@@ -46,6 +47,7 @@ from config import get_db_connection, Config
 # Import data quality filters
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from data_quality_filters import is_valid_company_name, get_company_validation_message
+from lookup_cache import LookupTable, PEOPLE_BY_LINKEDIN, COMPANIES_BY_NAME
 
 # Import migration utilities
 try:
@@ -119,7 +121,7 @@ class PhantomBusterImporter:
         
         # Caches for performance (deduplication pattern)
         self.person_cache = {}  # normalized_linkedin_url -> person_id
-        self.person_id_cache = {}  # person_id -> person data
+        self.person_id_cache = {}  # person_id -> full_name
         self.company_cache = {}  # company_name_lower -> company_id
         
         print("📦 Loading existing data into cache...")
@@ -128,38 +130,18 @@ class PhantomBusterImporter:
     
     def _load_caches(self):
         """Pre-load existing data for faster lookups (deduplication pattern)"""
-        # Load people by normalized LinkedIn URL
-        self.cursor.execute("""
-            SELECT person_id::text, normalized_linkedin_url, full_name
-            FROM person
-            WHERE normalized_linkedin_url IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.person_cache[row['normalized_linkedin_url']] = row['person_id']
-            self.person_id_cache[row['person_id']] = {'full_name': row['full_name']}
+        # Key -> id maps are mapped snapshots (scripts/lookup_cache.py)
+        self.person_cache = LookupTable.load(self.cursor, PEOPLE_BY_LINKEDIN)
+        self.company_cache = LookupTable.load(self.cursor, COMPANIES_BY_NAME)
         
-        # Also load by person_id for CSV matching
+        # Names by person_id for CSV matching and log lines
         self.cursor.execute("""
-            SELECT person_id::text, normalized_linkedin_url, full_name
+            SELECT person_id::text, full_name
             FROM person
         """)
         for row in self.cursor.fetchall():
-            pid = row['person_id']
-            if pid not in self.person_id_cache:
-                self.person_id_cache[pid] = {}
-            self.person_id_cache[pid]['full_name'] = row['full_name']
-            if row['normalized_linkedin_url']:
-                self.person_id_cache[pid]['normalized_linkedin_url'] = row['normalized_linkedin_url']
-        
-        # Load companies by name (case-insensitive deduplication)
-        self.cursor.execute("""
-            SELECT LOWER(TRIM(company_name)) as name_lower, company_id::text
-            FROM company
-            WHERE company_name IS NOT NULL
-        """)
-        for row in self.cursor.fetchall():
-            self.company_cache[row['name_lower']] = row['company_id']
-    
+            self.person_id_cache[row['person_id']] = row['full_name']
+
     def parse_date_range(self, date_range_str: str) -> Tuple[Optional[date], Optional[date]]:
         """
         Parse PhantomBuster date range like "Nov 2022 - May 2023" or "May 2021 - Present"
@@ -340,7 +322,7 @@ class PhantomBusterImporter:
     def delete_person(self, person_id: str, reason: str):
         """Delete person record (CASCADE will delete all related data)"""
         try:
-            person_name = self.person_id_cache.get(person_id, {}).get('full_name', 'Unknown')
+            person_name = self.person_id_cache.get(person_id) or 'Unknown'
             
             # Log what we're deleting
             print(f"   🗑️  Deleting: {person_name} (ID: {person_id[:8]}...) - {reason}")
@@ -364,7 +346,7 @@ class PhantomBusterImporter:
     def flag_for_review(self, person_id: str, reason: str):
         """Flag person for manual review (has GitHub contributions but no LinkedIn)"""
         try:
-            person_name = self.person_id_cache.get(person_id, {}).get('full_name', 'Unknown')
+            person_name = self.person_id_cache.get(person_id) or 'Unknown'
             
             print(f"   🚩 Flagging for review: {person_name} (ID: {person_id[:8]}...) - {reason}")
             
@@ -561,7 +543,7 @@ class PhantomBusterImporter:
         
         if updated:
             self.stats['profiles_enriched'] += 1
-            person_name = self.person_id_cache.get(person_id, {}).get('full_name', 'Unknown')
+            person_name = self.person_id_cache.get(person_id) or 'Unknown'
             if len(self.stats['enriched_people_sample']) < 10:
                 self.stats['enriched_people_sample'].append(person_name)
     
@@ -663,6 +645,36 @@ class PhantomBusterImporter:
         
         print(f"\n✅ Processing complete!")
     
+    def process_csv_bulk(self, chunk_size: int = None, workers: int = 1):
+        """
+        Same import through the COPY-based bulk engine (imports/bulk_import.py)
+
+        Much faster on large exports; matching and write rules are the same
+        as process_csv.
+
+        Rows flagged for deletion still go through process_row (committed
+        before the rest of their chunk is merged).
+        """
+        from imports.bulk_import import BulkImporter, PhantomBusterAdapter, DEFAULT_CHUNK_SIZE, merge_stats
+        from imports.parallel_import import run_parallel
+
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        print(f"\n{'='*80}")
+        print("PHANTOMBUSTER ENRICHED CSV IMPORT (BULK)")
+        print(f"{'='*80}")
+        print(f"\nSource: {CSV_PATH}")
+        print(f"Database: {Config.PG_DATABASE}@{Config.PG_HOST}\n")
+
+        if workers > 1:
+            stats = run_parallel(PhantomBusterAdapter(), CSV_PATH, workers, chunk_size=chunk_size,
+                                 importer_class=type(self))
+        else:
+            stats = BulkImporter(self.conn, PhantomBusterAdapter(), chunk_size=chunk_size,
+                                 fallback=self.process_row).run(CSV_PATH)
+        merge_stats(self.stats, stats)
+
+        print(f"\n✅ Processing complete! ({stats['chunks']:,} chunks, {stats['elapsed_seconds']}s)")
+
     def generate_report(self):
         """Generate and display import report"""
         print(f"\n{'='*80}")
@@ -799,6 +811,11 @@ class PhantomBusterImporter:
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Import PhantomBuster enriched CSV')
+    parser.add_argument('--bulk', action='store_true', help='Use the COPY-based bulk engine (imports/bulk_import.py)')
+    parser.add_argument('--workers', type=int, default=1, help='Parallel workers for --bulk (default: 1)')
+    args = parser.parse_args()
+    
     # Check if CSV exists
     if not Path(CSV_PATH).exists():
         print(f"❌ CSV file not found: {CSV_PATH}")
@@ -851,7 +868,10 @@ def main():
     
     try:
         importer = PhantomBusterImporter()
-        importer.process_csv()
+        if args.bulk:
+            importer.process_csv_bulk(workers=args.workers)
+        else:
+            importer.process_csv()
         importer.generate_report()
         importer.close()
         
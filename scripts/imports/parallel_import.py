@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+ABOUTME: Runs the COPY-based bulk importer in several worker processes over hash-sharded rows
+ABOUTME: Per-shard progress and byte-offset checkpoints; companies are created lock-free
+
+Parallel Bulk Import
+====================
+Large PhantomBuster / Datablend exports take hours even through the bulk
+path because one session does all the merging. run_parallel() starts one
+BulkImporter per shard in its own process (and database session):
+
+- Every worker streams the whole file but only imports the rows whose
+  shard_keys() hash to its shard - normalized LinkedIn URL, else GitHub
+  username / email - so all rows of one person land on the same worker and
+  no two workers ever create or enrich the same person.
+- Before the workers start, a pre-resolution pass registers every company
+  name in the file that already exists (company_name_key, migration 17).
+  Workers create the remaining ones with INSERT ... ON CONFLICT on the
+  normalized name, so there is nothing to lock.
+- Each worker checkpoints the byte offset it has committed. After a crash,
+  run again with the same worker count and every shard resumes where it
+  stopped; checkpoints are cleared once all shards have finished.
+
+Usage:
+    python3 scripts/imports/bulk_import.py phantombuster path/to/export.csv --workers 8
+
+    # Or from an importer (keeps its report and per-row fallback)
+    python3 scripts/imports/import_phantombuster_enriched.py --bulk --workers 8
+"""
+
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config import Config, get_db_connection
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from imports.bulk_import import BulkImporter, CsvAdapter, DEFAULT_CHUNK_SIZE, merge_stats
+
+POLL_SECONDS = 5
+
+
+def _run_shard(adapter: CsvAdapter, path: str, shard: int, shards: int, chunk_size: int,
+               importer_class, dry_run: bool, restart: bool, queue):
+    """Worker process: import one shard and report progress / final stats on the queue"""
+    importer = conn = None
+    try:
+        # An importer instance gives the worker its per-row fallback (and its own connection)
+        importer = importer_class() if importer_class else None
+        conn = importer.conn if importer else get_db_connection(use_pool=False)
+        engine = BulkImporter(conn, adapter, chunk_size=chunk_size, dry_run=dry_run,
+                              fallback=importer.process_row if importer else None,
+                              shard=(shard, shards))
+        start = time.time()
+
+        def progress(offset: int, size: int):
+            queue.put(('progress', shard, {
+                'offset': offset,
+                'size': size,
+                'rows': engine.stats['total_rows'],
+                'created': engine.stats['profiles_created'],
+                'enriched': engine.stats['profiles_enriched'],
+                'errors': len(engine.stats['errors']),
+                'elapsed': time.time() - start,
+            }))
+
+        stats = engine.run(path, resume=not restart, keep_checkpoint=True, progress=progress)
+        if importer:
+            # What the per-row fallback did (deletions, reviews, ...)
+            for key, value in importer.stats.items():
+                if isinstance(value, int) and key not in ('total_rows', 'skipped_invalid'):
+                    stats[key] = stats.get(key, 0) + value
+                elif key == 'errors':
+                    stats['errors'].extend(value)
+        queue.put(('done', shard, stats))
+    except Exception as e:
+        queue.put(('failed', shard, f"{type(e).__name__}: {e}"))
+    finally:
+        if importer:
+            importer.close()
+        elif conn:
+            conn.close()
+
+
+def _print_progress(shard: int, shards: int, progress: Dict):
+    rate = progress['rows'] / progress['elapsed'] if progress['elapsed'] else 0
+    print(f"   [shard {shard + 1}/{shards}] {progress['offset'] / max(progress['size'], 1):4.0%} | "
+          f"{progress['rows']:,} rows | {progress['created']:,} created, "
+          f"{progress['enriched']:,} enriched | {rate:,.0f} rows/s"
+          f"{' | ' + str(progress['errors']) + ' errors' if progress['errors'] else ''}", flush=True)
+
+
+def run_parallel(adapter: CsvAdapter, path, workers: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 importer_class=None, dry_run: bool = False, restart: bool = False) -> Dict:
+    """
+    Import one CSV with `workers` processes; returns the combined stats
+
+    Args:
+        adapter: CsvAdapter for the source
+        path: CSV file
+        workers: Number of shards / worker processes (keep it the same when resuming)
+        chunk_size: Rows read per chunk (each worker imports ~1/workers of them)
+        importer_class: Importer to instantiate in each worker for rows the adapter
+            routes to the per-row path (its process_row is the fallback)
+        dry_run: Roll back every chunk
+        restart: Ignore existing checkpoints
+    """
+    start = time.time()
+    path = str(path)
+
+    conn = get_db_connection(use_pool=False)
+    try:
+        resolver = BulkImporter(conn, adapter, chunk_size=chunk_size, dry_run=dry_run)
+        registered, names = resolver.resolve_companies(path)
+    finally:
+        conn.close()
+    print(f"   🏢 Pre-resolved {registered:,} of {names:,} company names "
+          f"({names - registered:,} to be created by the workers)", flush=True)
+
+    # fork: workers inherit the adapter / importer class and open their own connections
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    processes = {
+        shard: context.Process(
+            target=_run_shard, name=f"bulk-import-{shard + 1}",
+            args=(adapter, path, shard, workers, chunk_size, importer_class, dry_run, restart, queue),
+        )
+        for shard in range(workers)
+    }
+    for process in processes.values():
+        process.start()
+    print(f"   🚀 Started {workers} workers", flush=True)
+
+    results: Dict[int, Dict] = {}
+    failures: Dict[int, str] = {}
+    while len(results) + len(failures) < workers:
+        try:
+            kind, shard, payload = queue.get(timeout=POLL_SECONDS)
+        except Empty:
+            # A worker killed outright never reports; a clean exit always has
+            for shard, process in processes.items():
+                if shard not in results and shard not in failures and process.exitcode not in (None, 0):
+                    failures[shard] = f"worker exited with code {process.exitcode}"
+                    print(f"   ❌ [shard {shard + 1}/{workers}] {failures[shard]}", flush=True)
+            continue
+
+        if kind == 'progress':
+            _print_progress(shard, workers, payload)
+        elif kind == 'done':
+            results[shard] = payload
+            print(f"   ✅ [shard {shard + 1}/{workers}] done: {payload['total_rows']:,} rows in "
+                  f"{payload.get('elapsed_seconds', 0)}s", flush=True)
+        else:
+            failures[shard] = payload
+            print(f"   ❌ [shard {shard + 1}/{workers}] failed: {payload}", flush=True)
+
+    for process in processes.values():
+        process.join()
+
+    stats = {'errors': []}
+    for shard_stats in results.values():
+        for key, value in shard_stats.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                stats.setdefault(key, 0)
+        merge_stats(stats, shard_stats)
+    stats['errors'].extend(f"Shard {shard + 1}/{workers}: {error}" for shard, error in sorted(failures.items()))
+    stats['shards'] = workers
+    stats['shards_failed'] = len(failures)
+    stats['elapsed_seconds'] = round(time.time() - start, 1)
+
+    if failures:
+        print(f"   ⚠️  {len(failures)} shard(s) failed; run again with --workers {workers} to resume them",
+              flush=True)
+    elif not dry_run:
+        for shard in range(workers):
+            Config.clear_checkpoint(BulkImporter(None, adapter, shard=(shard, workers)).checkpoint_name(path))
+    return stats
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Lookup Caches for Discovery and Import Scripts
+==============================================
+Memory-lean key -> UUID maps with an on-disk, memory-mapped snapshot
+
+Every importer used to start by pulling whole tables into dicts of dicts
+(100K GitHub profiles, 333K repos, every person and company): hundreds of
+MB of small Python objects and tens of seconds before the first row is
+processed. A LookupTable instead stores
+
+- keys as one sorted UTF-8 blob plus an offset array (binary search)
+- values as fixed 16-byte UUIDs, `width` per key (0 bytes = NULL)
+
+in a single flat file, mapped read-only. Starting a script is an mmap, the
+pages are shared by every process using the same snapshot, and nothing is
+materialised as Python objects until it is looked up. Keys added while a
+script runs go into a small overlay dict.
+
+Each snapshot records a transaction watermark (the xmin of the database
+snapshot it was read in: every transaction below it had finished) and the
+table's delete counter (migration 25). On load, rows written by any
+transaction at or above the watermark are fetched - including ones that
+started before the snapshot but committed after it - and merged. A moved
+delete counter, a changed row whose key moved or no longer matches the
+spec's filter (a re-key), or a snapshot older than MAX_AGE -> full rebuild.
+
+Usage:
+    from lookup_cache import LookupTable, REPOS_BY_NAME
+
+    repo_cache = LookupTable.load(cursor, REPOS_BY_NAME)
+    repo_id = repo_cache.get('paradigmxyz/reth')
+    repo_cache['new/repo'] = repo_id          # overlay, this process only
+
+    python3 scripts/lookup_cache.py --refresh       # rebuild all snapshots
+    python3 scripts/lookup_cache.py --stats
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import uuid
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import Config
+
+MAGIC = b'LKC1'
+HEADER = struct.Struct('<4sIQQI')  # magic, width, keys, key blob bytes, meta bytes
+NULL_UUID = bytes(16)
+
+# Snapshots older than this are rebuilt from scratch anyway
+MAX_AGE = 24 * 3600
+
+# Transactions below the current snapshot's xmin have all finished; the table's
+# delete counter (25_table_delete_counter.sql) moves on every DELETE/TRUNCATE
+WATERMARK_SQL = """
+    SELECT
+        txid_snapshot_xmin(txid_current_snapshot()) AS mark,
+        COALESCE((SELECT deletes FROM table_delete_counter WHERE table_name = %s), 0) AS deletes
+"""
+
+# A row's xmin as a 64-bit txid: rows visible to this statement were written
+# below its xmax, so they take xmax's epoch (or the one before if the 32-bit
+# xid is above xmax's). Frozen / bootstrap xmins (< 3) count as 0.
+ROW_TXID_SQL = """
+    CASE WHEN xmin::text::bigint < 3 THEN 0 ELSE
+        ((w.next_txid >> 32) << 32) + xmin::text::bigint
+        - CASE WHEN xmin::text::bigint >= (w.next_txid & 4294967295) THEN 4294967296 ELSE 0 END
+    END
+"""
+
+DEFAULT_DIR = Config.SNAPSHOT_DIR / 'lookup'
+
+
+class CacheSpec:
+    """
+    What a LookupTable holds and where it comes from
+
+    Args:
+        name: Snapshot file name
+        table: Source table (its xmin and delete counter are checked)
+        key_sql: SQL expression for the key
+        id_columns: UUID columns stored per key
+        where: Row filter
+        key_fn: Optional Python normalisation applied to key_sql's value
+            (keys for which it returns a falsy value are dropped)
+        pk: Index in id_columns of the table's primary key (to spot re-keyed rows)
+    """
+
+    __slots__ = ('name', 'table', 'key_sql', 'id_columns', 'where', 'key_fn', 'pk')
+
+    def __init__(self, name: str, table: str, key_sql: str, id_columns: Tuple[str, ...],
+                 where: str = 'TRUE', key_fn: Optional[Callable[[str], Optional[str]]] = None,
+                 pk: int = 0):
+        self.name = name
+        self.table = table
+        self.key_sql = key_sql
+        self.id_columns = tuple(id_columns)
+        self.where = where
+        self.key_fn = key_fn
+        self.pk = pk
+
+    @property
+    def width(self) -> int:
+        return len(self.id_columns)
+
+    def _ids_sql(self) -> str:
+        return ', '.join(f"{c}::text AS v{i}" for i, c in enumerate(self.id_columns))
+
+    def rows_sql(self) -> str:
+        return f"SELECT {self.key_sql} AS k, {self._ids_sql()} FROM {self.table} WHERE ({self.where})"
+
+    def changed_rows_sql(self) -> str:
+        """Rows written by transactions at or above a watermark, flagged by whether they pass the filter"""
+        return (f"SELECT {self.key_sql} AS k, {self._ids_sql()}, COALESCE(({self.where}), FALSE) AS keep "
+                f"FROM {self.table}, (SELECT txid_snapshot_xmax(txid_current_snapshot()) AS next_txid) w "
+                f"WHERE {ROW_TXID_SQL} >= %s")
+
+
+# Caches shared by the discovery and import scripts
+PEOPLE_BY_LINKEDIN = CacheSpec(
+    'people_by_linkedin', 'person', 'normalized_linkedin_url', ('person_id',),
+    where="normalized_linkedin_url IS NOT NULL AND normalized_linkedin_url != ''"
+)
+COMPANIES_BY_NAME = CacheSpec(
+    'companies_by_name', 'company', 'LOWER(TRIM(company_name))', ('company_id',),
+    where='company_name IS NOT NULL'
+)
+GITHUB_PROFILES_BY_USERNAME = CacheSpec(
+    'github_profiles_by_username', 'github_profile', 'LOWER(github_username)',
+    ('github_profile_id',), where='github_username IS NOT NULL'
+)
+GITHUB_PEOPLE_BY_USERNAME = CacheSpec(
+    'github_people_by_username', 'github_profile', 'LOWER(github_username)',
+    ('person_id', 'github_profile_id'), where='github_username IS NOT NULL', pk=1
+)
+REPOS_BY_NAME = CacheSpec(
+    'repos_by_name', 'github_repository', 'LOWER(full_name)', ('repo_id',)
+)
+
+SPECS = [PEOPLE_BY_LINKEDIN, COMPANIES_BY_NAME, GITHUB_PROFILES_BY_USERNAME,
+         GITHUB_PEOPLE_BY_USERNAME, REPOS_BY_NAME]
+
+
+def _pack_ids(values: Iterable[Optional[str]]) -> bytes:
+    return b''.join(uuid.UUID(str(v)).bytes if v else NULL_UUID for v in values)
+
+
+def _unpack_ids(raw: bytes) -> Tuple[Optional[str], ...]:
+    return tuple(
+        str(uuid.UUID(bytes=raw[i:i + 16])) if raw[i:i + 16] != NULL_UUID else None
+        for i in range(0, len(raw), 16)
+    )
+
+
+class LookupTable:
+    """
+    Read-mostly key -> UUID(s) map over a flat sorted buffer
+
+    get() returns a str UUID (width 1) or a tuple of str-or-None (width > 1),
+    like the dicts it replaces.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], meta: Optional[Dict] = None,
+                 source: Optional[Path] = None):
+        self._buffer = buffer
+        self.meta = meta or {}
+        self.source = source
+
+        magic, self.width, self._count, key_bytes, meta_bytes = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a lookup snapshot: {source}")
+
+        view = memoryview(buffer)
+        start = HEADER.size + meta_bytes
+        offsets_end = start + 8 * (self._count + 1)
+        self._offsets = view[start:offsets_end].cast('Q')
+        self._keys = view[offsets_end:offsets_end + key_bytes]
+        self._values = view[offsets_end + key_bytes:]
+
+        self._overlay: Dict[str, Tuple[Optional[str], ...]] = {}
+
+    # Building
+
+    @staticmethod
+    def build(entries: Dict[bytes, bytes], width: int, meta: Optional[Dict] = None) -> bytes:
+        """Serialise {key bytes: packed ids} into the snapshot format"""
+        keys = sorted(entries)
+        offsets = array('Q', [0])
+        for key in keys:
+            offsets.append(offsets[-1] + len(key))
+
+        meta_raw = json.dumps(meta or {}).encode()
+        # Pad with JSON whitespace so the offset array starts 8-byte aligned
+        meta_raw += b' ' * (-(HEADER.size + len(meta_raw)) % 8)
+        return b''.join([
+            HEADER.pack(MAGIC, width, len(keys), offsets[-1], len(meta_raw)),
+            meta_raw,
+            offsets.tobytes(),
+            b''.join(keys),
+            b''.join(entries[key] for key in keys),
+        ])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable, spec: CacheSpec, meta: Optional[Dict] = None) -> 'LookupTable':
+        return cls(cls.build(cls._entries(rows, spec), spec.width, meta))
+
+    @staticmethod
+    def _key(row: Dict, spec: CacheSpec) -> Optional[bytes]:
+        key = row['k']
+        if spec.key_fn:
+            key = spec.key_fn(key)
+        return key.encode() if key else None
+
+    @classmethod
+    def _entries(cls, rows: Iterable, spec: CacheSpec) -> Dict[bytes, bytes]:
+        entries = {}
+        for row in rows:
+            key = cls._key(row, spec)
+            if key:
+                entries[key] = _pack_ids(row[f"v{i}"] for i in range(spec.width))
+        return entries
+
+    def _merge_changes(self, rows: Iterable, spec: CacheSpec) -> Optional[Dict[bytes, bytes]]:
+        """
+        Snapshot entries with changed rows applied; None when a row's old key
+        would have to be removed (re-keyed or filtered out), which needs a rebuild
+        """
+        entries = dict(self.raw_items())
+        pk = slice(16 * spec.pk, 16 * (spec.pk + 1))
+        key_by_pk = {ids[pk]: key for key, ids in entries.items()}
+
+        for row in rows:
+            key = self._key(row, spec) if row['keep'] else None
+            ids = _pack_ids(row[f"v{i}"] for i in range(spec.width))
+            previous = key_by_pk.get(ids[pk])
+            if previous is not None and previous != key:
+                return None
+            if key:
+                entries[key] = ids
+        return entries
+
+    def raw_items(self) -> Iterator[Tuple[bytes, bytes]]:
+        """(key bytes, packed ids) for the snapshot part, in key order"""
+        size = 16 * self.width
+        for i in range(self._count):
+            yield (bytes(self._keys[self._offsets[i]:self._offsets[i + 1]]),
+                   bytes(self._values[i * size:(i + 1) * size]))
+
+    # Loading
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'LookupTable':
+        """Map a snapshot file read-only (pages shared between processes)"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, _, meta_bytes = HEADER.unpack_from(buffer, 0)
+        meta = json.loads(bytes(buffer[HEADER.size:HEADER.size + meta_bytes]))
+        return cls(buffer, meta, Path(path))
+
+    @classmethod
+    def load(cls, cursor, spec: CacheSpec, snapshot_dir: Union[str, Path, None] = DEFAULT_DIR,
+             refresh: bool = False) -> 'LookupTable':
+        """
+        Snapshot for spec, refreshed against the database watermark
+
+        snapshot_dir=None skips the file and builds in memory.
+        """
+        cursor.execute(WATERMARK_SQL, (spec.table,))
+        row = cursor.fetchone()
+        mark, deletes = row['mark'], row['deletes']
+
+        if snapshot_dir is None:
+            cursor.execute(spec.rows_sql())
+            return cls.from_rows(cursor.fetchall(), spec, {'mark': mark, 'deletes': deletes})
+
+        path = Path(snapshot_dir) / f"{spec.name}.lkc"
+        current = None
+        if path.exists() and not refresh:
+            try:
+                current = cls.open(path)
+            except (ValueError, OSError, struct.error):
+                current = None
+
+        if current:
+            meta = current.meta
+            fresh = time.time() - meta.get('built_at', 0) < MAX_AGE
+            if fresh and 'mark' in meta and meta.get('deletes') == deletes:
+                # Rows from transactions the snapshot may not have seen
+                cursor.execute(spec.changed_rows_sql(), (meta['mark'],))
+                rows = cursor.fetchall()
+                if not rows:
+                    return current
+                entries = current._merge_changes(rows, spec)
+                if entries is not None:
+                    return cls._write(path, entries, spec, {**meta, 'mark': mark, 'merged_at': time.time()})
+
+        cursor.execute(spec.rows_sql())
+        entries = cls._entries(cursor.fetchall(), spec)
+        return cls._write(path, entries, spec, {'mark': mark, 'deletes': deletes,
+                                                'built_at': time.time()})
+
+    @classmethod
+    def _write(cls, path: Path, entries: Dict[bytes, bytes], spec: CacheSpec, meta: Dict) -> 'LookupTable':
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(cls.build(entries, spec.width, meta))
+        # Atomic: processes that already mapped the old file keep their pages
+        os.replace(tmp, path)
+        return cls.open(path)
+
+    # Lookups
+
+    def _find(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        offsets, keys = self._offsets, self._keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(keys[offsets[mid]:offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and keys[offsets[lo]:offsets[lo + 1]] == key:
+            return lo
+        return -1
+
+    def _lookup(self, key: str) -> Optional[Tuple[Optional[str], ...]]:
+        if key in self._overlay:
+            return self._overlay[key]
+        i = self._find(key.encode())
+        if i < 0:
+            return None
+        size = 16 * self.width
+        return _unpack_ids(bytes(self._values[i * size:(i + 1) * size]))
+
+    def get(self, key: str, default=None):
+        ids = self._lookup(key)
+        if ids is None:
+            return default
+        return ids[0] if self.width == 1 else ids
+
+    def __getitem__(self, key: str):
+        ids = self._lookup(key)
+        if ids is None:
+            raise KeyError(key)
+        return ids[0] if self.width == 1 else ids
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._overlay or self._find(key.encode()) >= 0
+
+    def __setitem__(self, key: str, value):
+        """Record a row created while the script runs (not written to the snapshot)"""
+        ids = (value,) if self.width == 1 else tuple(value)
+        self._overlay[sys.intern(key)] = tuple(str(v) if v else None for v in ids)
+
+    def __len__(self) -> int:
+        return self._count + sum(1 for key in self._overlay if self._find(key.encode()) < 0)
+
+    def stats(self) -> Dict:
+        return {
+            'keys': len(self),
+            'overlay': len(self._overlay),
+            'bytes': len(self._buffer),
+            'mapped': isinstance(self._buffer, mmap.mmap),
+            **self.meta,
+        }
+
+
+def main():
+    from config import get_db_connection
+
+    parser = argparse.ArgumentParser(description='Build / inspect lookup cache snapshots')
+    parser.add_argument('--refresh', action='store_true', help='Rebuild every snapshot from scratch')
+    parser.add_argument('--stats', action='store_true', help='Show snapshot sizes')
+    parser.add_argument('--snapshot-dir', type=Path, default=DEFAULT_DIR,
+                        help=f'Snapshot directory (default: {DEFAULT_DIR})')
+    args = parser.parse_args()
+
+    conn = get_db_connection(use_pool=False)
+    cursor = conn.cursor()
+    try:
+        for spec in SPECS:
+            started = time.time()
+            table = LookupTable.load(cursor, spec, args.snapshot_dir, refresh=args.refresh)
+            stats = table.stats()
+            print(f"✓ {spec.name:<30} {stats['keys']:>9,} keys  {stats['bytes'] / 1e6:>7.1f} MB  "
+                  f"{time.time() - started:.2f}s")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Company Deduplication Engine
+==================================
+Finds near-duplicate companies ("Paradigm" / "Paradigm.xyz" / "Paradigm Operations")
+that exact normalized-name grouping in deduplicate_companies.py misses, without
+comparing all 96K x 96K pairs.
+
+Pipeline (each stage is timed):
+1. load     - one query for all companies + employment counts
+2. block    - blocking keys per company:
+                * normalized-name prefix
+                * real (non-placeholder) domain, from company_domain or website_url
+                * LinkedIn company slug
+                * MinHash LSH bands over name trigrams
+3. exact    - companies with identical normalized names are joined directly
+              (same behaviour as deduplicate_companies.py)
+4. score    - candidate pairs inside blocks: shared LinkedIn slug, shared domain
+              with related names, or name similarity >= threshold
+5. cluster  - union-find over matching pairs, then each member is re-checked
+              against the canonical company so A~B~C chains can't drag in
+              unrelated companies; Labs/Foundation rules still apply
+6. merge    - set-based: whole groups per transaction, employment and
+              repositories repointed with one UPDATE ... FROM per table
+
+Websites on shared hosts (github.com/org, linkedin.com/company/x, medium.com/@x)
+don't identify a company, so those hosts are never used as a domain.
+
+Dry run (default) writes a CSV report of every proposed group to reports/.
+
+Usage:
+    python3 company_dedup_engine.py                          # Dry run + report
+    python3 company_dedup_engine.py --threshold 0.95         # Stricter name matching
+    python3 company_dedup_engine.py --live --batch-size 200  # Merge
+
+Author: AI Assistant
+Date: October 26, 2025
+"""
+
+import argparse
+import csv
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, str(Path(__file__).parent))
+from deduplicate_companies import CompanyDeduplicator, Config, logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from entity_resolution import (
+    BlockIndex,
+    MinHashLSH,
+    StageTimer,
+    UnionFind,
+    char_ngrams,
+    string_similarity,
+)
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_BATCH_SIZE = 100
+NAME_PREFIX_LENGTH = 6
+# Fuzzy name matches on very short names ("abc" vs "abd") are mostly noise
+MIN_FUZZY_NAME_LENGTH = 5
+# A shared domain still needs the names to be related ("Paradigm" / "Paradigm Operations")
+DOMAIN_NAME_THRESHOLD = 0.6
+
+# Hosts many unrelated companies have as their "website"
+SHARED_HOSTS = frozenset({
+    'angel.co', 'bit.ly', 'crunchbase.com', 'discord.gg', 'docs.google.com',
+    'facebook.com', 'github.com', 'github.io', 'gitbook.io', 'instagram.com',
+    'linkedin.com', 'linktr.ee', 'medium.com', 'mirror.xyz', 'notion.site',
+    'notion.so', 'sites.google.com', 't.me', 'twitter.com', 'wellfound.com',
+    'x.com', 'youtube.com',
+})
+
+
+def extract_domain(value: Optional[str]) -> Optional[str]:
+    """Bare domain from a domain or URL; None for placeholders and shared hosts"""
+    if not value:
+        return None
+
+    domain = value.lower().strip()
+    domain = re.sub(r'^https?://', '', domain)
+    domain = re.sub(r'^www\.', '', domain)
+    domain = domain.split('/')[0].split('?')[0].strip()
+
+    if not domain or '.' not in domain or domain.endswith('.placeholder'):
+        return None
+    if domain in SHARED_HOSTS:
+        return None
+
+    return domain
+
+
+def extract_linkedin_slug(url: Optional[str]) -> Optional[str]:
+    """Company slug from a LinkedIn company URL"""
+    if not url:
+        return None
+
+    match = re.search(r'linkedin\.com/company/([^/?#]+)', url.lower())
+    return match.group(1) if match else None
+
+
+class CompanyDedupEngine(CompanyDeduplicator):
+    """Blocking + union-find company deduplication"""
+
+    def __init__(self, dry_run: bool = True, threshold: float = DEFAULT_THRESHOLD,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_block_size: int = 200):
+        super().__init__(dry_run=dry_run)
+
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.max_block_size = max_block_size
+        self.timer = StageTimer()
+        self.lsh = MinHashLSH(num_perm=64, bands=16)
+
+        # Filled in by find_duplicate_groups for the report
+        self.match_reasons: Dict[str, str] = {}
+
+        self.stats.update({
+            'candidate_pairs': 0,
+            'matched_pairs': 0,
+            'oversized_blocks': 0,
+            'members_rejected': 0,
+            'ecosystem_links_moved': 0,
+        })
+
+    def _prepare(self, company: Dict) -> Dict:
+        """Attach normalized fields used for blocking and scoring"""
+        normalized = self.normalize_company_name(company['company_name'])
+        company['_normalized'] = normalized
+        company['_domain'] = extract_domain(company.get('company_domain')) or \
+            extract_domain(company.get('website_url'))
+        company['_linkedin'] = extract_linkedin_slug(company.get('linkedin_url'))
+        return company
+
+    def _blocking_keys(self, company: Dict) -> List[str]:
+        keys = []
+        compact = company['_normalized'].replace(' ', '')
+
+        if len(compact) >= 3:
+            keys.append(f"prefix:{compact[:NAME_PREFIX_LENGTH]}")
+        if company['_domain']:
+            keys.append(f"domain:{company['_domain']}")
+        if company['_linkedin']:
+            keys.append(f"linkedin:{company['_linkedin']}")
+
+        signature = self.lsh.signature(char_ngrams(company['_normalized']))
+        keys.extend(self.lsh.band_keys(signature))
+        return keys
+
+    def _match_reason(self, a: Dict, b: Dict) -> Optional[str]:
+        """Why two companies are duplicates, or None if they aren't"""
+        if a['_normalized'] and a['_normalized'] == b['_normalized']:
+            return 'exact_name'
+        if a['_linkedin'] and a['_linkedin'] == b['_linkedin']:
+            return 'linkedin'
+
+        similarity = string_similarity(a['_normalized'], b['_normalized'])
+        if a['_domain'] and a['_domain'] == b['_domain'] and self._names_related(a, b, similarity):
+            return f"domain+name_similarity={similarity:.2f}"
+
+        if min(len(a['_normalized']), len(b['_normalized'])) >= MIN_FUZZY_NAME_LENGTH:
+            if similarity >= self.threshold:
+                return f"name_similarity={similarity:.2f}"
+
+        return None
+
+    @staticmethod
+    def _names_related(a: Dict, b: Dict, similarity: float) -> bool:
+        """One name extends the other ("paradigm" / "paradigmxyz") or they are similar"""
+        compact_a = a['_normalized'].replace(' ', '')
+        compact_b = b['_normalized'].replace(' ', '')
+        if not compact_a or not compact_b:
+            return False
+        shorter, longer = sorted((compact_a, compact_b), key=len)
+        return longer.startswith(shorter) or similarity >= DOMAIN_NAME_THRESHOLD
+
+    def find_duplicate_groups(self) -> List[List[Dict]]:
+        """Find exact and fuzzy duplicate groups via blocking + union-find"""
+        logger.info("Searching for duplicate companies (fuzzy)...")
+        print("🔍 Searching for duplicate companies (blocking + union-find)...\n")
+
+        with self.timer.stage('load'):
+            companies = [self._prepare(c) for c in self.load_companies()]
+
+        by_id = {c['company_id']: c for c in companies}
+        uf = UnionFind()
+
+        with self.timer.stage('block'):
+            index = BlockIndex(max_block_size=self.max_block_size)
+            for company in companies:
+                uf.add(company['company_id'])
+                index.add(company['company_id'], self._blocking_keys(company))
+
+        with self.timer.stage('exact'):
+            first_by_name = {}
+            for company in companies:
+                name = company['_normalized']
+                if name in first_by_name:
+                    uf.union(first_by_name[name], company['company_id'])
+                else:
+                    first_by_name[name] = company['company_id']
+
+        with self.timer.stage('score'):
+            for id_a, id_b in index.candidate_pairs():
+                self.stats['candidate_pairs'] += 1
+                if self._match_reason(by_id[id_a], by_id[id_b]):
+                    self.stats['matched_pairs'] += 1
+                    uf.union(id_a, id_b)
+            self.stats['oversized_blocks'] = index.oversized_blocks
+
+        block_stats = index.stats()
+        logger.info(f"Blocks: {block_stats['blocks']:,} "
+                    f"({block_stats['multi_record_blocks']:,} with 2+ companies, "
+                    f"largest {block_stats['largest_block']:,}, "
+                    f"{self.stats['oversized_blocks']:,} skipped as oversized)")
+        logger.info(f"Candidate pairs: {self.stats['candidate_pairs']:,} "
+                    f"(vs {len(companies) * (len(companies) - 1) // 2:,} all-pairs), "
+                    f"matched: {self.stats['matched_pairs']:,}")
+
+        with self.timer.stage('cluster'):
+            duplicate_groups = []
+            for member_ids in uf.groups(min_size=2):
+                group = self._verify_cluster([by_id[i] for i in member_ids])
+                if len(group) > 1:
+                    group = self._filter_separate_entities(group)
+                if len(group) > 1:
+                    duplicate_groups.append(group)
+
+        return duplicate_groups
+
+    def _verify_cluster(self, group: List[Dict]) -> List[Dict]:
+        """Keep only members that directly match the canonical company"""
+        canonical = self.choose_canonical_company(group)
+        self.match_reasons[canonical['company_id']] = 'canonical'
+        verified = [canonical]
+
+        for company in group:
+            if company is canonical:
+                continue
+            reason = self._match_reason(canonical, company)
+            if reason:
+                self.match_reasons[company['company_id']] = reason
+                verified.append(company)
+            else:
+                self.stats['members_rejected'] += 1
+
+        return verified
+
+    def write_report(self, groups: List[List[Dict]]) -> Path:
+        """CSV with one row per company in each proposed merge group"""
+        report_path = Config.REPORTS_DIR / \
+            f"company_dedup_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['group', 'role', 'company_id', 'company_name', 'domain',
+                             'linkedin_slug', 'employee_count', 'match_reason'])
+
+            for i, group in enumerate(groups, 1):
+                canonical = self.choose_canonical_company(group)
+                for company in group:
+                    is_canonical = company['company_id'] == canonical['company_id']
+                    writer.writerow([
+                        i,
+                        'canonical' if is_canonical else 'duplicate',
+                        company['company_id'],
+                        company['company_name'],
+                        company['_domain'] or '',
+                        company['_linkedin'] or '',
+                        company['employee_count'],
+                        self.match_reasons.get(company['company_id'], ''),
+                    ])
+
+        return report_path
+
+    def _merge_batch(self, merges: List[Tuple[str, str]]) -> bool:
+        """
+        Merge a batch of (duplicate_id, canonical_id) pairs in one transaction
+
+        Employment and repository links are repointed with one UPDATE each.
+        Ecosystem links and name registry rows would cascade away with the
+        duplicates, so they are copied to (or repointed at) the canonical
+        company first; then all duplicates are deleted.
+        """
+        try:
+            self.cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS company_merge_map (
+                    duplicate_id UUID PRIMARY KEY,
+                    canonical_id UUID NOT NULL
+                ) ON COMMIT DELETE ROWS
+            """)
+            execute_values(
+                self.cursor,
+                "INSERT INTO company_merge_map (duplicate_id, canonical_id) VALUES %s",
+                merges,
+                template="(%s::uuid, %s::uuid)"
+            )
+
+            self.cursor.execute("""
+                UPDATE employment e
+                SET company_id = m.canonical_id
+                FROM company_merge_map m
+                WHERE e.company_id = m.duplicate_id
+            """)
+            self.stats['employment_records_moved'] += self.cursor.rowcount
+
+            self.cursor.execute("""
+                UPDATE github_repository r
+                SET company_id = m.canonical_id
+                FROM company_merge_map m
+                WHERE r.company_id = m.duplicate_id
+            """)
+
+            # UNIQUE (company_id, ecosystem_id, relationship_type) treats NULL
+            # types as distinct, so existing links are skipped explicitly
+            self.cursor.execute("""
+                INSERT INTO company_ecosystem (
+                    company_id, ecosystem_id, relationship_type, confidence_score, source, created_at
+                )
+                SELECT DISTINCT ON (m.canonical_id, ce.ecosystem_id, ce.relationship_type)
+                    m.canonical_id, ce.ecosystem_id, ce.relationship_type,
+                    ce.confidence_score, ce.source, ce.created_at
+                FROM company_ecosystem ce
+                JOIN company_merge_map m ON ce.company_id = m.duplicate_id
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM company_ecosystem existing
+                    WHERE existing.company_id = m.canonical_id
+                    AND existing.ecosystem_id = ce.ecosystem_id
+                    AND existing.relationship_type IS NOT DISTINCT FROM ce.relationship_type
+                )
+                ORDER BY m.canonical_id, ce.ecosystem_id, ce.relationship_type,
+                         ce.confidence_score DESC NULLS LAST
+                ON CONFLICT (company_id, ecosystem_id, relationship_type) DO NOTHING
+            """)
+            self.stats['ecosystem_links_moved'] += self.cursor.rowcount
+
+            # Keep the duplicates' names claimed, or the importer would recreate them
+            self.cursor.execute("""
+                UPDATE company_name_key k
+                SET company_id = m.canonical_id
+                FROM company_merge_map m
+                WHERE k.company_id = m.duplicate_id
+            """)
+
+            self.cursor.execute("""
+                DELETE FROM company c
+                USING company_merge_map m
+                WHERE c.company_id = m.duplicate_id
+            """)
+            self.stats['companies_deleted'] += self.cursor.rowcount
+
+            self.conn.commit()
+            return True
+
+        except Exception as e:
+            self.conn.rollback()
+            error_msg = f"Error merging batch of {len(merges)} companies: {e}"
+            self.stats['errors'].append(error_msg)
+            logger.error(error_msg)
+            return False
+
+    def process(self):
+        """Find fuzzy duplicate groups, report them and merge in batches"""
+        logger.info("Starting fuzzy deduplication process...")
+
+        with self.timer.stage('domains'):
+            self.update_missing_domains()
+
+        duplicate_groups = self.find_duplicate_groups()
+        self.stats['duplicates_found'] = len(duplicate_groups)
+
+        report_path = self.write_report(duplicate_groups)
+        logger.info(f"Found {len(duplicate_groups):,} duplicate groups - report: {report_path}")
+        print(f"\nFound {len(duplicate_groups):,} duplicate groups")
+        print(f"📄 Group report: {report_path}\n")
+
+        # Whole groups per batch, so a failed batch never leaves a group half merged
+        batches = [[]]
+        for group in duplicate_groups:
+            canonical = self.choose_canonical_company(group)
+            group_merges = [
+                (company['company_id'], canonical['company_id'])
+                for company in group
+                if company['company_id'] != canonical['company_id']
+            ]
+            if batches[-1] and len(batches[-1]) + len(group_merges) > self.batch_size:
+                batches.append([])
+            batches[-1].extend(group_merges)
+            self.stats['companies_merged'] += len(group_merges)
+        total = self.stats['companies_merged']
+
+        if not self.dry_run:
+            with self.timer.stage('merge'):
+                done = 0
+                for number, batch in enumerate(b for b in batches if b):
+                    done += len(batch)
+                    if self._merge_batch(batch):
+                        logger.info(f"  Merged batch {number + 1} ({done:,}/{total:,} companies)")
+        else:
+            print(f"   [DRY RUN] Would merge {total:,} companies "
+                  f"into {len(duplicate_groups):,} canonical records")
+
+        print("\n⏱️  Stage timings:")
+        for line in self.timer.summary():
+            logger.info(f"  {line}")
+            print(f"   {line}")
+
+        print(f"\n   Candidate pairs scored: {self.stats['candidate_pairs']:,}")
+        print(f"   Matching pairs: {self.stats['matched_pairs']:,}")
+        print(f"   Oversized blocks skipped: {self.stats['oversized_blocks']:,}")
+        print(f"   Cluster members rejected on re-check: {self.stats['members_rejected']:,}")
+
+        self.print_summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzzy company deduplication (blocking + union-find)')
+    parser.add_argument('--live', action='store_true', help='Perform actual merge (default is dry-run)')
+    parser.add_argument('--no-confirm', action='store_true', help='Skip confirmation prompt (use with caution!)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Name similarity needed to match (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Companies merged per transaction (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--max-block-size', type=int, default=200,
+                        help='Skip blocks larger than this when generating pairs (default: 200)')
+    args = parser.parse_args()
+
+    if args.live and not args.no_confirm:
+        print("\n⚠️  WARNING: You are about to perform a LIVE fuzzy merge operation!")
+        print("Run without --live first and review the CSV report.")
+        print(f"\nDatabase: {Config.PG_DATABASE}@{Config.PG_HOST}")
+
+        response = input("\nProceed with LIVE merge? (type 'MERGE' to confirm): ")
+        if response != 'MERGE':
+            print("❌ Operation cancelled")
+            return 0
+
+    try:
+        engine = CompanyDedupEngine(
+            dry_run=not args.live,
+            threshold=args.threshold,
+            batch_size=args.batch_size,
+            max_block_size=args.max_block_size
+        )
+        engine.process()
+        engine.close()
+        return 0
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Operation interrupted by user")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
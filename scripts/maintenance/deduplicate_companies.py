@@ -12,6 +12,9 @@ Features:
 - Preserves all data during merge
 - Full audit trail
 
+Only exact normalized-name matches are found here; for fuzzy matching
+(blocking + union-find) see company_dedup_engine.py.
+
 Author: AI Assistant
 Date: October 22, 2025
 """
@@ -23,12 +26,12 @@ from typing import Dict, List, Tuple, Optional
 import re
 import logging
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import get_db_connection, Config
 
 # Import data quality filters
-sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 from data_quality_filters import should_skip_company_deduplication
 
 # Setup logging
@@ -141,11 +144,8 @@ class CompanyDeduplicator:
         
         return name.strip()
     
-    def find_duplicate_groups(self) -> List[List[Dict]]:
-        """Find groups of duplicate companies"""
-        logger.info("Searching for duplicate companies...")
-        print("🔍 Searching for duplicate companies...\n")
-        
+    def load_companies(self) -> List[Dict]:
+        """Load all companies with employment counts, minus invalid names"""
         # Get all companies with their employment counts
         logger.info("Querying database for all companies...")
         self.cursor.execute("""
@@ -181,6 +181,15 @@ class CompanyDeduplicator:
             print(f"   ⚠️  Skipped {skipped_count} companies with invalid names (suffix-only, too short, etc.)")
             print(f"   Remaining: {len(companies):,} companies for deduplication\n")
         
+        return companies
+    
+    def find_duplicate_groups(self) -> List[List[Dict]]:
+        """Find groups of duplicate companies"""
+        logger.info("Searching for duplicate companies...")
+        print("🔍 Searching for duplicate companies...\n")
+        
+        companies = self.load_companies()
+        
         # Group by normalized name
         name_groups = {}
         for company in companies:
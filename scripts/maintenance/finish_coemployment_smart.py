@@ -13,6 +13,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from logging_utils import Logger
+from analytics.network_degree import refresh_after_build
 
 def finish_smart():
     logger = Logger("SmartFinish")
@@ -104,6 +105,11 @@ def finish_smart():
         cursor.execute("SELECT COUNT(*) as count FROM edge_coemployment")
         final_count = cursor.fetchone()['count']
         
+        # Per-person degree / network summaries (TRUNCATE and bulk loads are not picked up incrementally)
+        logger.info("Refreshing network degree...")
+        degree = refresh_after_build()
+        logger.success(f"Network degree refreshed: {degree['people']:,} people in {degree['elapsed_seconds']}s")
+        
         logger.section("✅ SMART FINISH COMPLETE!")
         logger.success(f"Added {total_added:,} new edges in {duration:.1f}s")
         logger.success(f"Final edge count: {final_count:,}")
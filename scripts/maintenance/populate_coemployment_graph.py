@@ -12,6 +12,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from logging_utils import Logger
+from analytics.network_degree import refresh_after_build
 
 def populate_coemployment_graph():
     """Populate edge_coemployment table using SQL for efficiency"""
@@ -248,6 +249,11 @@ def populate_coemployment_graph():
         if overlap_stats['avg_overlap_months']:
             logger.info(f"  Average overlap duration: {overlap_stats['avg_overlap_months']:,} months")
         
+        # Per-person degree / network summaries (TRUNCATE and bulk loads are not picked up incrementally)
+        logger.info("Refreshing network degree...")
+        degree = refresh_after_build()
+        logger.success(f"Network degree refreshed: {degree['people']:,} people in {degree['elapsed_seconds']}s")
+        
         logger.section("✅ CO-EMPLOYMENT GRAPH POPULATION COMPLETE!")
         logger.success(f"Total time: {(datetime.now() - start_time).total_seconds():.1f}s")
         logger.success(f"Total edges: {final_count:,}")
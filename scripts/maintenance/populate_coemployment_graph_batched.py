@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from logging_utils import Logger
 from progress_reporter import ProgressReporter
+from analytics.network_degree import refresh_after_build
 
 def populate_coemployment_graph_batched():
     """Populate edge_coemployment table using batched approach for efficiency"""
@@ -169,49 +170,34 @@ def populate_coemployment_graph_batched():
         final_count = cursor.fetchone()['count']
         logger.success(f"Final edge count: {final_count:,}")
         
-        # Get statistics
-        logger.info("Calculating graph statistics...")
+        # Per-person degree / network summaries (TRUNCATE and bulk loads are not picked up incrementally)
+        logger.info("Refreshing network degree...")
+        degree = refresh_after_build()
+        logger.success(f"Network degree refreshed: {degree['people']:,} people in {degree['elapsed_seconds']}s")
+        
         cursor.execute("""
-            WITH connection_counts AS (
-                SELECT person_id, COUNT(*) as connections
-                FROM (
-                    SELECT src_person_id as person_id FROM edge_coemployment
-                    UNION ALL
-                    SELECT dst_person_id as person_id FROM edge_coemployment
-                ) all_connections
-                GROUP BY person_id
-            )
-            SELECT 
-                COUNT(*) as people_connected,
-                MIN(connections) as min_connections,
-                MAX(connections) as max_connections,
-                AVG(connections)::integer as avg_connections,
-                PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY connections)::integer as median_connections
-            FROM connection_counts
+            SELECT people, min_degree, max_degree, avg_degree, median_degree
+            FROM network_summary
+            WHERE network = 'coemployment'
         """)
         stats = cursor.fetchone()
         
         logger.section("GRAPH STATISTICS")
-        logger.info(f"People in network: {stats['people_connected']:,}")
-        logger.info(f"Min connections: {stats['min_connections']:,}")
-        logger.info(f"Max connections: {stats['max_connections']:,}")
-        logger.info(f"Avg connections: {stats['avg_connections']:,}")
-        logger.info(f"Median connections: {stats['median_connections']:,}")
+        logger.info(f"People in network: {stats['people']:,}")
+        logger.info(f"Min connections: {stats['min_degree'] or 0:,}")
+        logger.info(f"Max connections: {stats['max_degree'] or 0:,}")
+        logger.info(f"Avg connections: {round(stats['avg_degree'] or 0):,}")
+        logger.info(f"Median connections: {round(stats['median_degree'] or 0):,}")
         
         # Get top connected people
         cursor.execute("""
-            WITH all_connections AS (
-                SELECT src_person_id as person_id FROM edge_coemployment
-                UNION ALL
-                SELECT dst_person_id as person_id FROM edge_coemployment
-            )
             SELECT 
                 p.full_name,
-                COUNT(*) as connection_count
-            FROM all_connections ac
-            JOIN person p ON ac.person_id = p.person_id
-            GROUP BY p.person_id, p.full_name
-            ORDER BY connection_count DESC
+                d.coemployment_degree as connection_count
+            FROM person_network_degree d
+            JOIN person p ON d.person_id = p.person_id
+            WHERE d.coemployment_degree > 0
+            ORDER BY d.coemployment_degree DESC
             LIMIT 10
         """)
         top_connected = cursor.fetchall()
@@ -14,6 +14,7 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from logging_utils import Logger
+from analytics.network_degree import refresh_after_build
 
 def populate_coemployment_incremental():
     """Populate edge_coemployment processing one company at a time"""
@@ -198,6 +199,11 @@ def populate_coemployment_incremental():
         if stats['avg_overlap']:
             logger.info(f"Average overlap: {stats['avg_overlap']} months")
         
+        # Per-person degree / network summaries (TRUNCATE and bulk loads are not picked up incrementally)
+        logger.info("Refreshing network degree...")
+        degree = refresh_after_build()
+        logger.success(f"Network degree refreshed: {degree['people']:,} people in {degree['elapsed_seconds']}s")
+        
         logger.section("✅ SUCCESS!")
         
     except Exception as e:
@@ -41,6 +41,7 @@ from datetime import date, datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import load_env_file, get_db_connection
+from scripts.analytics.network_degree import NetworkDegree
 load_env_file()
 
 # Setup comprehensive logging
@@ -546,6 +547,11 @@ class CollaborationNetworkBuilder:
         logger.info("Computing collaboration strengths...")
         self.compute_collaboration_strengths()
         
+        # Per-person degree / network summaries behind the network-density endpoint
+        logger.info("Refreshing network degree...")
+        degree = NetworkDegree(self.conn).refresh(full=True)
+        logger.info(f"Network degree refreshed: {degree['people']:,} people in {degree['elapsed_seconds']}s")
+        
         logger.info("="*80)
         logger.info("✅ NETWORK BUILD COMPLETE!")
         logger.info("="*80)
@@ -17,6 +17,8 @@ Usage:
     python3 extract_skills_from_repos.py --all
     python3 extract_skills_from_repos.py --limit 1000
     python3 extract_skills_from_repos.py --repos-only  # Only tag repos, don't compute person skills
+    python3 extract_skills_from_repos.py --all --bulk         # Set-based recompute of every person
+    python3 extract_skills_from_repos.py --all --incremental  # Only people whose contributions changed
 
 Author: AI Assistant (Tier 1 Data Completion)
 Date: October 24, 2025
@@ -24,12 +26,14 @@ Date: October 24, 2025
 
 import argparse
 import sys
+import time
 from pathlib import Path
 import logging
+from datetime import datetime
 from typing import Dict, List, Set, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from config import load_env_file, get_db_connection
+from config import load_env_file, get_db_connection, Config
 load_env_file()
 
 logging.basicConfig(
@@ -38,6 +42,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Checkpoint holding the DB timestamp of the last successful bulk run
+PERSON_SKILLS_CHECKPOINT = 'person_skills_from_repos'
+
 
 class RepoSkillExtractor:
     """Extract skills from repositories and derive person skills"""
@@ -330,6 +337,176 @@ class RepoSkillExtractor:
                 self.conn.rollback()
                 self.stats['errors'].append(str(e))
     
+    def compute_person_skills_bulk(self, since: Optional[datetime] = None) -> int:
+        """
+        Set-based version of compute_person_skills_from_repos
+        
+        Aggregates every person's repo-derived skills in one grouped query over
+        github_contribution ⨝ repository_skills, stages the result (with the
+        proficiency formula applied in SQL) and merges it into person_skills
+        with a single upsert.
+        
+        If since is given, only people with a contribution, profile link or
+        repository skill tag changed at or after that time are recomputed.
+        
+        Unlike the per-person path, merged_prs_count is set to the recomputed
+        total rather than added to the previous value, so re-runs are
+        idempotent.
+        
+        Returns: Number of people processed
+        """
+        cursor = self.conn.cursor()
+        
+        # Use the DB clock for the watermark so it lines up with updated_at
+        cursor.execute("SELECT NOW() AS started_at")
+        started_at = cursor.fetchone()['started_at']
+        
+        person_filter = ""
+        params = {}
+        
+        if since is not None:
+            person_filter = """
+                AND gp.person_id IN (
+                    SELECT gp2.person_id
+                    FROM github_contribution gc2
+                    JOIN github_profile gp2 ON gc2.github_profile_id = gp2.github_profile_id
+                    LEFT JOIN repository_skills rs2 ON gc2.repo_id = rs2.repo_id
+                    WHERE gp2.person_id IS NOT NULL
+                    AND (
+                        gc2.updated_at >= %(since)s
+                        OR gp2.updated_at >= %(since)s
+                        OR rs2.created_at >= %(since)s
+                    )
+                )
+            """
+            params['since'] = since
+            logger.info(f"Incremental mode: people changed since {since}")
+        
+        start_time = time.time()
+        
+        try:
+            cursor.execute(f"""
+                CREATE TEMP TABLE staged_person_skills ON COMMIT DROP AS
+                SELECT
+                    agg.*,
+                    -- Same formula as _compute_person_skills_from_contributions:
+                    -- 30 base + repos (10 each, max 30) + contributions (0.01 each,
+                    -- max 20) + merged PRs (2 each, max 20), capped at 100
+                    LEAST(
+                        30
+                        + LEAST(agg.repos_using_skill * 10, 30)
+                        + LEAST(agg.total_contributions * 0.01, 20)
+                        + LEAST(agg.merged_prs * 2, 20),
+                        100
+                    ) AS proficiency
+                FROM (
+                    SELECT
+                        gp.person_id,
+                        rs.skill_id,
+                        COUNT(DISTINCT gc.repo_id) AS repos_using_skill,
+                        COALESCE(SUM(gc.contribution_count), 0) AS total_contributions,
+                        COALESCE(SUM(gc.merged_pr_count), 0) AS merged_prs,
+                        MIN(gc.first_contribution_date) AS first_seen,
+                        MAX(gc.last_contribution_date) AS last_used
+                    FROM github_contribution gc
+                    JOIN github_profile gp ON gc.github_profile_id = gp.github_profile_id
+                    JOIN repository_skills rs ON gc.repo_id = rs.repo_id
+                    WHERE gp.person_id IS NOT NULL
+                    AND rs.is_primary = TRUE
+                    {person_filter}
+                    GROUP BY gp.person_id, rs.skill_id
+                ) agg
+            """, params)
+            
+            cursor.execute("""
+                SELECT COUNT(*) AS skills, COUNT(DISTINCT person_id) AS people
+                FROM staged_person_skills
+            """)
+            staged = cursor.fetchone()
+            logger.info(f"Staged {staged['skills']:,} person-skills for {staged['people']:,} people "
+                        f"in {time.time() - start_time:.1f}s")
+            
+            cursor.execute("""
+                WITH upserted AS (
+                    INSERT INTO person_skills (
+                        person_id,
+                        skill_id,
+                        proficiency_score,
+                        evidence_sources,
+                        confidence_score,
+                        merged_prs_count,
+                        repos_using_skill,
+                        first_seen,
+                        last_used
+                    )
+                    SELECT
+                        person_id,
+                        skill_id,
+                        proficiency,
+                        ARRAY['repos'],
+                        0.85,
+                        merged_prs,
+                        repos_using_skill,
+                        first_seen,
+                        last_used
+                    FROM staged_person_skills
+                    ON CONFLICT (person_id, skill_id) DO UPDATE SET
+                        evidence_sources = CASE 
+                            WHEN 'repos' = ANY(person_skills.evidence_sources) THEN person_skills.evidence_sources
+                            ELSE array_append(person_skills.evidence_sources, 'repos')
+                        END,
+                        proficiency_score = GREATEST(
+                            person_skills.proficiency_score,
+                            (person_skills.proficiency_score + EXCLUDED.proficiency_score) / 2.0
+                        ),
+                        confidence_score = LEAST(
+                            (person_skills.confidence_score + EXCLUDED.confidence_score) / 2.0,
+                            1.0
+                        ),
+                        merged_prs_count = EXCLUDED.merged_prs_count,
+                        repos_using_skill = EXCLUDED.repos_using_skill,
+                        first_seen = LEAST(person_skills.first_seen, EXCLUDED.first_seen),
+                        last_used = GREATEST(person_skills.last_used, EXCLUDED.last_used),
+                        updated_at = NOW()
+                    RETURNING (xmax = 0) AS is_insert
+                )
+                SELECT
+                    COUNT(*) FILTER (WHERE is_insert) AS created,
+                    COUNT(*) FILTER (WHERE NOT is_insert) AS updated
+                FROM upserted
+            """)
+            result = cursor.fetchone()
+            self.conn.commit()
+            
+        except Exception as e:
+            logger.error(f"Error in bulk person skill computation: {e}")
+            self.conn.rollback()
+            self.stats['errors'].append(str(e))
+            return 0
+        
+        self.stats['people_processed'] += staged['people']
+        self.stats['person_skills_created'] += result['created']
+        self.stats['person_skills_updated'] += result['updated']
+        
+        Config.save_checkpoint(PERSON_SKILLS_CHECKPOINT, {'last_run_at': started_at.isoformat()})
+        
+        logger.info(f"Merged person skills in {time.time() - start_time:.1f}s total")
+        return staged['people']
+    
+    def compute_person_skills_incremental(self) -> int:
+        """
+        Recompute skills only for people whose contributions changed since the
+        last successful bulk run (falls back to a full bulk run the first time)
+        """
+        checkpoint = Config.load_checkpoint(PERSON_SKILLS_CHECKPOINT)
+        
+        if not checkpoint or not checkpoint.get('last_run_at'):
+            logger.info("No previous bulk run recorded - computing all people")
+            return self.compute_person_skills_bulk()
+        
+        since = datetime.fromisoformat(checkpoint['last_run_at'])
+        return self.compute_person_skills_bulk(since=since)
+    
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -341,6 +518,10 @@ def main():
     parser.add_argument('--all', action='store_true', help='Process all repos and people')
     parser.add_argument('--limit', type=int, help='Limit number to process')
     parser.add_argument('--repos-only', action='store_true', help='Only tag repos, skip person skills')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Compute person skills with one set-based query (ignores --limit)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Set-based, only people whose contributions changed since the last bulk run')
     args = parser.parse_args()
     
     print("\n" + "🔍 " + "=" * 66)
@@ -359,7 +540,12 @@ def main():
     if not args.repos_only:
         # Phase 2: Compute person skills
         print(f"\n📋 Phase 2: Computing person skills from contributions...")
-        people_processed = extractor.compute_person_skills_from_repos(limit=limit)
+        if args.incremental:
+            people_processed = extractor.compute_person_skills_incremental()
+        elif args.bulk:
+            people_processed = extractor.compute_person_skills_bulk()
+        else:
+            people_processed = extractor.compute_person_skills_from_repos(limit=limit)
         print(f"✅ Processed {people_processed:,} people")
     
     stats = extractor.stats
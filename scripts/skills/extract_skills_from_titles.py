@@ -9,12 +9,15 @@ Extracts skills from:
 - employment.title (e.g., "Senior Solidity Engineer")
 - person.headline (e.g., "Full Stack Developer | React & Node.js")
 
-Uses pattern matching to identify skills from titles.
+Uses a prebuilt Aho-Corasick automaton (skill_matcher.SkillMatcher) to
+identify skills, and processes people in batches: one query for headlines,
+one for titles and one bulk upsert per batch.
 
 Usage:
     python3 extract_skills_from_titles.py --all
     python3 extract_skills_from_titles.py --limit 1000
     python3 extract_skills_from_titles.py --person-id <uuid>
+    python3 extract_skills_from_titles.py --benchmark 5000  # people/sec, regex vs automaton
 
 Author: AI Assistant (Tier 1 Data Completion)
 Date: October 24, 2025
@@ -22,16 +25,22 @@ Date: October 24, 2025
 
 import argparse
 import sys
+import time
 from pathlib import Path
 import logging
 import re
 from typing import Dict, List, Set, Optional, Tuple
 from datetime import datetime, date
 
+from psycopg2.extras import execute_values
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import load_env_file, get_db_connection
 load_env_file()
 
+sys.path.insert(0, str(Path(__file__).parent))
+from skill_matcher import SkillMatcher, regex_find_skills
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -62,6 +71,27 @@ SENIORITY_LEVELS = {
     'ceo': 7,
 }
 
+# Checked longest keyword first, so "senior" wins over "sr" etc.
+SENIORITY_PATTERNS = [
+    (re.compile(r'\b' + re.escape(keyword) + r'\b'), level)
+    for keyword, level in sorted(SENIORITY_LEVELS.items(), key=lambda x: len(x[0]), reverse=True)
+]
+
+# Initial proficiency by seniority
+# Junior: 20-30, Mid: 40-50, Senior: 60-70, Lead+: 75-85
+SENIORITY_PROFICIENCY = {
+    0: 30,  # Unknown
+    1: 25,  # Junior
+    2: 45,  # Mid
+    3: 65,  # Senior
+    4: 75,  # Lead
+    5: 80,  # Principal/Staff
+    6: 85,  # Distinguished
+    7: 90,  # Fellow/C-level
+}
+
+DEFAULT_BATCH_SIZE = 2000
+
 
 class TitleSkillExtractor:
     """Extract skills from job titles and headlines"""
@@ -70,8 +100,9 @@ class TitleSkillExtractor:
         self.conn = get_db_connection(use_pool=False)
         self.cursor = self.conn.cursor()
         
-        # Load skills from database
+        # Load skills from database and build the matcher once per run
         self.skills_map = self._load_skills_map()
+        self.matcher = SkillMatcher(self.skills_map)
         
         self.stats = {
             'people_processed': 0,
@@ -117,36 +148,16 @@ class TitleSkillExtractor:
         logger.info(f"Loaded {len(skills_map)} skill mappings ({len(set(s['skill_id'] for s in skills_map.values()))} unique skills)")
         return skills_map
     
-    def extract_skills_from_text(self, text: str) -> Set[Dict]:
+    def extract_skills_from_text(self, text: str) -> Set[Tuple[str, str, str]]:
         """
-        Extract skills from text using pattern matching
+        Extract skills from text using the prebuilt skill automaton
         
-        Returns: Set of dicts with skill_id, skill_name, match_text
-        """
-        if not text or not text.strip():
-            return set()
+        Word boundaries are respected, e.g. "Go" matches "Go Developer" but
+        not "Google".
         
-        text_lower = text.lower()
-        found_skills = set()
-        
-        # Try exact matches first (for multi-word skills)
-        for skill_key, skill_dict in sorted(
-            self.skills_map.items(),
-            key=lambda x: len(x[0]),  # Longer matches first
-            reverse=True
-        ):
-            # Use word boundaries to avoid partial matches
-            # e.g., "Go" should match "Go Developer" but not "Google"
-            pattern = r'\b' + re.escape(skill_key) + r'\b'
-            
-            if re.search(pattern, text_lower):
-                found_skills.add((
-                    skill_dict['skill_id'],
-                    skill_dict['skill_name'],
-                    skill_key
-                ))
-        
-        return found_skills
+        Returns: Set of (skill_id, skill_name, match_text) tuples
+        """
+        return self.matcher.find(text)
     
     def detect_seniority_level(self, text: str) -> int:
         """
@@ -159,12 +170,8 @@ class TitleSkillExtractor:
         
         text_lower = text.lower()
         
-        for keyword, level in sorted(
-            SENIORITY_LEVELS.items(),
-            key=lambda x: len(x[0]),
-            reverse=True
-        ):
-            if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
+        for pattern, level in SENIORITY_PATTERNS:
+            if pattern.search(text_lower):
                 return level
         
         return 2  # Default to mid-level if no seniority detected
@@ -193,48 +200,18 @@ class TitleSkillExtractor:
             return 0
         
         person = dict(person_row)
-        skills_found = set()
-        
-        # Extract from headline
-        headline = person.get('headline', '')
-        if headline:
-            headline_skills = self.extract_skills_from_text(headline)
-            for skill_id, skill_name, match_text in headline_skills:
-                seniority = self.detect_seniority_level(headline)
-                skills_found.add((skill_id, skill_name, seniority, 'headline'))
         
         # Extract from employment titles
         cursor.execute("""
             SELECT 
                 title,
-                start_date,
-                end_date,
                 (end_date IS NULL) as is_current
             FROM employment
             WHERE person_id = %s::uuid
-            ORDER BY (end_date IS NULL) DESC, start_date DESC NULLS LAST
         """, (person_id,))
         
-        employment_rows = cursor.fetchall()
-        
-        for emp_row in employment_rows:
-            emp = dict(emp_row)
-            title = emp.get('title', '')
-            
-            if not title:
-                continue
-            
-            self.stats['titles_processed'] += 1
-            
-            title_skills = self.extract_skills_from_text(title)
-            for skill_id, skill_name, match_text in title_skills:
-                seniority = self.detect_seniority_level(title)
-                
-                # Boost seniority if it's a current position
-                if emp.get('is_current'):
-                    seniority = min(seniority + 1, 7)
-                
-                skills_found.add((skill_id, skill_name, seniority, 'title'))
+        employment = [dict(row) for row in cursor.fetchall()]
+        skills_found = self._collect_person_skills(person.get('headline'), employment)
         
         # Insert/update person_skills
         for skill_id, skill_name, seniority, source in skills_found:
@@ -249,6 +226,45 @@ class TitleSkillExtractor:
         self.stats['skills_extracted'] += len(skills_found)
         return len(skills_found)
     
+    def _collect_person_skills(self, headline: Optional[str],
+                               employment: List[Dict]) -> Set[Tuple[str, str, int, str]]:
+        """
+        Match skills in one person's headline and employment titles
+        
+        Returns: Set of (skill_id, skill_name, seniority, source) tuples
+        """
+        skills_found = set()
+        
+        if headline:
+            headline_skills = self.extract_skills_from_text(headline)
+            if headline_skills:
+                seniority = self.detect_seniority_level(headline)
+                for skill_id, skill_name, match_text in headline_skills:
+                    skills_found.add((skill_id, skill_name, seniority, 'headline'))
+        
+        for emp in employment:
+            title = emp.get('title')
+            
+            if not title:
+                continue
+            
+            self.stats['titles_processed'] += 1
+            
+            title_skills = self.extract_skills_from_text(title)
+            if not title_skills:
+                continue
+            
+            seniority = self.detect_seniority_level(title)
+            
+            # Boost seniority if it's a current position
+            if emp.get('is_current'):
+                seniority = min(seniority + 1, 7)
+            
+            for skill_id, skill_name, match_text in title_skills:
+                skills_found.add((skill_id, skill_name, seniority, 'title'))
+        
+        return skills_found
+    
     def _upsert_person_skill(
         self,
         person_id: str,
@@ -261,17 +277,7 @@ class TitleSkillExtractor:
         cursor = self.conn.cursor()
         
         # Calculate initial proficiency based on seniority
-        # Junior: 20-30, Mid: 40-50, Senior: 60-70, Lead+: 75-85
-        base_proficiency = {
-            0: 30,  # Unknown
-            1: 25,  # Junior
-            2: 45,  # Mid
-            3: 65,  # Senior
-            4: 75,  # Lead
-            5: 80,  # Principal/Staff
-            6: 85,  # Distinguished
-            7: 90,  # Fellow/C-level
-        }.get(seniority, 45)
+        base_proficiency = SENIORITY_PROFICIENCY.get(seniority, 45)
         
         try:
             # First check if exists
@@ -325,14 +331,94 @@ class TitleSkillExtractor:
             self.conn.rollback()
             self.stats['errors'].append(str(e))
     
-    def extract_skills_for_all(self, limit: Optional[int] = None) -> Dict:
-        """Extract skills for all people"""
+    def _bulk_upsert_person_skills(self, person_skills: Dict[str, Set[Tuple[str, str, int, str]]]):
+        """
+        Upsert a batch of people's title skills in one statement
+        
+        Rows for the same (person, skill) are collapsed first (a single
+        INSERT ... ON CONFLICT cannot touch the same row twice): highest
+        proficiency wins and evidence sources are unioned.
+        """
+        collapsed: Dict[Tuple[str, str], Dict] = {}
+        
+        for person_id, skills_found in person_skills.items():
+            for skill_id, skill_name, seniority, source in skills_found:
+                proficiency = SENIORITY_PROFICIENCY.get(seniority, 45)
+                entry = collapsed.setdefault(
+                    (str(person_id), str(skill_id)),
+                    {'proficiency': proficiency, 'sources': []}
+                )
+                entry['proficiency'] = max(entry['proficiency'], proficiency)
+                if source not in entry['sources']:
+                    entry['sources'].append(source)
+        
+        if not collapsed:
+            return
+        
+        rows = [
+            (person_id, skill_id, entry['proficiency'], entry['sources'])
+            for (person_id, skill_id), entry in collapsed.items()
+        ]
+        
+        cursor = self.conn.cursor()
+        
+        try:
+            results = execute_values(cursor, """
+                INSERT INTO person_skills (
+                    person_id,
+                    skill_id,
+                    proficiency_score,
+                    evidence_sources,
+                    confidence_score,
+                    first_seen,
+                    last_used
+                )
+                SELECT
+                    v.person_id::uuid,
+                    v.skill_id::uuid,
+                    v.proficiency,
+                    v.sources::text[],
+                    0.7,
+                    CURRENT_DATE,
+                    CURRENT_DATE
+                FROM (VALUES %s) AS v(person_id, skill_id, proficiency, sources)
+                ON CONFLICT (person_id, skill_id) DO UPDATE SET
+                    evidence_sources = COALESCE(person_skills.evidence_sources, '{}') || ARRAY(
+                        SELECT src FROM unnest(EXCLUDED.evidence_sources) AS src
+                        WHERE NOT src = ANY(COALESCE(person_skills.evidence_sources, '{}'))
+                    ),
+                    proficiency_score = GREATEST(person_skills.proficiency_score, EXCLUDED.proficiency_score),
+                    confidence_score = (person_skills.confidence_score + EXCLUDED.confidence_score) / 2.0,
+                    last_used = CURRENT_DATE,
+                    updated_at = NOW()
+                RETURNING (xmax = 0) AS is_insert
+            """, rows, page_size=1000, fetch=True)
+            
+            self.conn.commit()
+            
+            created = sum(1 for row in results if row['is_insert'])
+            self.stats['person_skills_created'] += created
+            self.stats['person_skills_updated'] += len(results) - created
+            
+        except Exception as e:
+            logger.error(f"Error bulk upserting person skills: {e}")
+            self.conn.rollback()
+            self.stats['errors'].append(str(e))
+    
+    def _fetch_batch(self, after_person_id: Optional[str], batch_size: int) -> List[Dict]:
+        """
+        Load the next batch of people with their headline and titles
+        
+        Keyset pagination on person_id; two queries per batch regardless of
+        batch size.
+        """
         cursor = self.conn.cursor()
         
-        query = """
-            SELECT person_id
+        cursor.execute("""
+            SELECT person_id, headline
             FROM person
-            WHERE (
+            WHERE (%s::uuid IS NULL OR person_id > %s::uuid)
+            AND (
                 headline IS NOT NULL
                 OR EXISTS (
                     SELECT 1 FROM employment e 
@@ -341,31 +427,119 @@ class TitleSkillExtractor:
                 )
             )
             ORDER BY person_id
-        """
+            LIMIT %s
+        """, (after_person_id, after_person_id, batch_size))
+        
+        people = [dict(row) for row in cursor.fetchall()]
+        if not people:
+            return []
         
-        if limit:
-            query += f" LIMIT {limit}"
+        by_id = {str(p['person_id']): p for p in people}
+        for person in people:
+            person['employment'] = []
         
-        cursor.execute(query)
-        person_ids = [row['person_id'] for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT person_id, title, (end_date IS NULL) as is_current
+            FROM employment
+            WHERE person_id = ANY(%s::uuid[])
+            AND title IS NOT NULL
+        """, (list(by_id.keys()),))
         
-        total = len(person_ids)
-        logger.info(f"Extracting skills from titles for {total:,} people...")
+        for row in cursor.fetchall():
+            by_id[str(row['person_id'])]['employment'].append(dict(row))
         
-        for i, person_id in enumerate(person_ids, 1):
-            if i % 500 == 0:
-                logger.info(f"  Progress: {i:,}/{total:,} ({i/total*100:.1f}%) - "
-                           f"Skills extracted: {self.stats['skills_extracted']:,}")
-            
+        return people
+    
+    def extract_skills_for_batch(self, people: List[Dict]) -> int:
+        """
+        Extract and store skills for a batch of people loaded by _fetch_batch
+        
+        Returns: Number of (person, skill, source) matches found
+        """
+        person_skills = {}
+        found = 0
+        
+        for person in people:
             try:
-                self.extract_skills_for_person(person_id)
+                skills_found = self._collect_person_skills(
+                    person.get('headline'), person['employment']
+                )
+                person_skills[person['person_id']] = skills_found
+                found += len(skills_found)
                 self.stats['people_processed'] += 1
             except Exception as e:
-                logger.error(f"Error processing person {person_id}: {e}")
-                self.stats['errors'].append(f"Person {person_id}: {e}")
+                logger.error(f"Error processing person {person['person_id']}: {e}")
+                self.stats['errors'].append(f"Person {person['person_id']}: {e}")
+        
+        self._bulk_upsert_person_skills(person_skills)
+        self.stats['skills_extracted'] += found
+        return found
+    
+    def extract_skills_for_all(self, limit: Optional[int] = None,
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+        """Extract skills for all people, batch by batch"""
+        logger.info(f"Extracting skills from titles (batch size {batch_size:,}"
+                    f"{f', limit {limit:,}' if limit else ''})...")
+        
+        start_time = time.time()
+        last_person_id = None
+        processed = 0
+        
+        while limit is None or processed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            people = self._fetch_batch(last_person_id, size)
+            if not people:
+                break
+            
+            self.extract_skills_for_batch(people)
+            processed += len(people)
+            last_person_id = str(people[-1]['person_id'])
+            
+            elapsed = time.time() - start_time
+            rate = processed / elapsed if elapsed > 0 else 0
+            logger.info(f"  Progress: {processed:,} people | "
+                        f"Skills extracted: {self.stats['skills_extracted']:,} | "
+                        f"Rate: {rate:,.0f} people/sec")
         
         return self.stats
     
+    def benchmark(self, sample_size: int = 5000) -> Dict:
+        """
+        Compare the old per-alias regex scan with the automaton
+        
+        Matching only (no writes); also verifies both produce identical skills.
+        """
+        people = self._fetch_batch(None, sample_size)
+        texts_per_person = [
+            [person.get('headline')] + [emp['title'] for emp in person['employment']]
+            for person in people
+        ]
+        
+        start = time.time()
+        regex_results = [
+            [regex_find_skills(self.skills_map, text) for text in texts]
+            for texts in texts_per_person
+        ]
+        regex_elapsed = time.time() - start
+        
+        start = time.time()
+        matcher_results = [
+            [self.matcher.find(text) for text in texts]
+            for texts in texts_per_person
+        ]
+        matcher_elapsed = time.time() - start
+        
+        mismatches = sum(1 for a, b in zip(regex_results, matcher_results) if a != b)
+        
+        return {
+            'people': len(people),
+            'skill_keys': len(self.skills_map),
+            'regex_people_per_sec': len(people) / regex_elapsed if regex_elapsed > 0 else 0,
+            'matcher_people_per_sec': len(people) / matcher_elapsed if matcher_elapsed > 0 else 0,
+            'speedup': regex_elapsed / matcher_elapsed if matcher_elapsed > 0 else 0,
+            'mismatches': mismatches
+        }
+    
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -377,6 +551,10 @@ def main():
     parser.add_argument('--all', action='store_true', help='Extract for all people')
     parser.add_argument('--limit', type=int, help='Limit number of people to process')
     parser.add_argument('--person-id', help='Extract for specific person')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'People per batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Benchmark regex vs automaton matching on N people (no writes)')
     args = parser.parse_args()
     
     print("\n" + "🔍 " + "=" * 66)
@@ -385,7 +563,17 @@ def main():
     
     extractor = TitleSkillExtractor()
     
-    if args.person_id:
+    if args.benchmark:
+        print(f"\n⏱️  Benchmarking skill matching on {args.benchmark:,} people...")
+        result = extractor.benchmark(args.benchmark)
+        print(f"\n   People sampled:   {result['people']:,}")
+        print(f"   Skill keys:       {result['skill_keys']:,}")
+        print(f"   Regex (before):   {result['regex_people_per_sec']:,.0f} people/sec")
+        print(f"   Automaton (after):{result['matcher_people_per_sec']:>7,.0f} people/sec")
+        print(f"   Speedup:          {result['speedup']:.1f}x")
+        print(f"   Mismatches:       {result['mismatches']}")
+    
+    elif args.person_id:
         print(f"\n📋 Extracting skills for person: {args.person_id}")
         count = extractor.extract_skills_for_person(args.person_id)
         print(f"\n✅ Extracted {count} skills")
@@ -397,7 +585,7 @@ def main():
         else:
             print(f"\n📋 Extracting for up to {limit:,} people")
         
-        stats = extractor.extract_skills_for_all(limit=limit)
+        stats = extractor.extract_skills_for_all(limit=limit, batch_size=args.batch_size)
         
         print("\n" + "📊 " + "=" * 66)
         print("📊  Extraction Results")
@@ -0,0 +1,159 @@
+"""
+ABOUTME: Prebuilt Aho-Corasick automaton for matching skill names/aliases in text
+ABOUTME: Replaces one-regex-per-alias scans with a single pass per headline/title
+
+Skill Matcher
+=============
+The original extraction compiled and ran a separate word-boundary regex for
+every skill alias on every piece of text, i.e. O(aliases x texts) regex scans.
+
+SkillMatcher builds one automaton per run and walks each text once, reporting
+every alias occurrence (including overlapping ones such as "react" inside
+"react native"). Matches are then post-filtered with the exact semantics of
+regex ``\\b``, so results are identical to the old per-alias regexes.
+
+Usage:
+    matcher = SkillMatcher(skills_map)      # {alias_lower: skill_dict}
+    matcher.find("Senior Solidity Engineer")
+    # {(skill_id, 'Solidity', 'solidity')}
+"""
+
+import re
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as re's \\w for str patterns"""
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over lowercase skill keys"""
+
+    def __init__(self, skills_map: Dict[str, Dict]):
+        self.skills_map = skills_map
+
+        # Trie stored as parallel lists indexed by node id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for key in skills_map:
+            if key:
+                self._add_key(key)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.skills_map)
+
+    def _add_key(self, key: str):
+        node = 0
+        for ch in key:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(key)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each node to its longest proper suffix"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+
+                # Inherit matches that end at the suffix node
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_keys(self, text: str) -> Set[str]:
+        """Return every skill key that occurs in text on word boundaries"""
+        if not text:
+            return set()
+
+        text_lower = text.lower()
+        is_word = [_is_word_char(ch) for ch in text_lower]
+        length = len(text_lower)
+
+        def at_boundary(pos: int) -> bool:
+            before = is_word[pos - 1] if pos > 0 else False
+            after = is_word[pos] if pos < length else False
+            return before != after
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found = set()
+        node = 0
+
+        for i, ch in enumerate(text_lower):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            if output[node]:
+                end = i + 1
+                if not at_boundary(end):
+                    continue
+                for key in output[node]:
+                    if key not in found and at_boundary(end - len(key)):
+                        found.add(key)
+
+        return found
+
+    def find(self, text: str) -> Set[Tuple[str, str, str]]:
+        """
+        Extract skills from text
+
+        Returns: Set of (skill_id, skill_name, match_text) tuples
+        """
+        if not text or not text.strip():
+            return set()
+
+        return {
+            (self.skills_map[key]['skill_id'], self.skills_map[key]['skill_name'], key)
+            for key in self.find_keys(text)
+        }
+
+
+def regex_find_skills(skills_map: Dict[str, Dict], text: str) -> Set[Tuple[str, str, str]]:
+    """
+    Reference implementation: one word-boundary regex per skill key
+
+    This is the original TitleSkillExtractor algorithm, kept for parity checks
+    and the --benchmark comparison. Do not use it for bulk extraction.
+    """
+    if not text or not text.strip():
+        return set()
+
+    text_lower = text.lower()
+    found_skills = set()
+
+    for skill_key, skill_dict in sorted(
+        skills_map.items(),
+        key=lambda x: len(x[0]),
+        reverse=True
+    ):
+        pattern = r'\b' + re.escape(skill_key) + r'\b'
+
+        if re.search(pattern, text_lower):
+            found_skills.add((
+                skill_dict['skill_id'],
+                skill_dict['skill_name'],
+                skill_key
+            ))
+
+    return found_skills
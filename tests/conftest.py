@@ -342,3 +342,26 @@ def insert_test_company(pg_test_conn):
     
     return _insert
 
+
+
+@pytest.fixture
+def apply_migrations(pg_test_conn):
+    """Helper to run migration_scripts/*.sql on the test database (skips if their base tables are missing)"""
+    def _apply(*migrations: str, requires: tuple = ()):
+        cursor = pg_test_conn.cursor()
+
+        for table in requires:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (table,))
+            row = cursor.fetchone()
+            if not (row['present'] if isinstance(row, dict) else row[0]):
+                cursor.close()
+                pytest.skip(f"{table} is not in the test schema")
+
+        for migration in migrations:
+            sql_file = Path(__file__).parent.parent / "migration_scripts" / migration
+            cursor.execute(sql_file.read_text())
+
+        pg_test_conn.commit()
+        cursor.close()
+
+    return _apply
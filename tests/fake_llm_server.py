@@ -0,0 +1,209 @@
+# ABOUTME: Local fake OpenAI/Anthropic HTTP server for exercising AI batch jobs without API keys or spend
+# ABOUTME: Answers chat completions with a canned profile summary after a configurable delay, streamed or whole
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SUMMARY = {
+    "executive_summary": "Backend engineer with protocol experience.",
+    "key_strengths": ["distributed systems", "Rust"],
+    "technical_domains": ["infrastructure"],
+    "ideal_roles": ["Senior Backend Engineer"],
+    "career_trajectory": "Steady growth into senior roles",
+    "standout_projects": [],
+    "recruiter_notes": "Generated by the fake LLM server."
+}
+
+
+class FakeLLMServer:
+    """
+    OpenAI (/v1/chat/completions) and Anthropic (/v1/messages) compatible server.
+
+    `latency` is the time to the first token; with `token_delay` the answer
+    is produced in TOKEN_CHARS-sized tokens that delay apart, either streamed
+    (stream=true requests) or returned whole once all are generated.
+
+    Usage:
+        with FakeLLMServer(latency=0.2) as server:
+            os.environ['OPENAI_BASE_URL'] = server.openai_base_url
+            ...
+            print(server.requests, server.max_in_flight)
+    """
+
+    TOKEN_CHARS = 8
+
+    def __init__(self, latency: float = 0.1, port: int = 0, fail_every: int = 0, token_delay: float = 0.0):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail_every = fail_every  # Answer every Nth request with a 500
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    @property
+    def anthropic_base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                with server._lock:
+                    server.requests += 1
+                    number = server.requests
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.latency)
+                    if server.fail_every and number % server.fail_every == 0:
+                        self._reply(500, {"error": {"message": "fake failure", "type": "server_error"}})
+                    elif body.get('stream'):
+                        self._stream(number, body)
+                    elif self.path.endswith('/chat/completions'):
+                        time.sleep(server.token_delay * len(server.tokens()))
+                        self._reply(200, {
+                            "id": f"chatcmpl-{number}",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": body.get('model', 'fake'),
+                            "choices": [{
+                                "index": 0,
+                                "message": {"role": "assistant", "content": json.dumps(SUMMARY)},
+                                "finish_reason": "stop"
+                            }],
+                            "usage": {"prompt_tokens": 800, "completion_tokens": 200, "total_tokens": 1000}
+                        })
+                    elif self.path.endswith('/messages'):
+                        time.sleep(server.token_delay * len(server.tokens()))
+                        self._reply(200, {
+                            "id": f"msg_{number}",
+                            "type": "message",
+                            "role": "assistant",
+                            "model": body.get('model', 'fake'),
+                            "content": [{"type": "text", "text": json.dumps(SUMMARY)}],
+                            "stop_reason": "end_turn",
+                            "usage": {"input_tokens": 800, "output_tokens": 200}
+                        })
+                    else:
+                        self._reply(404, {"error": {"message": f"unknown path {self.path}"}})
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _stream(self, number, body):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                model = body.get('model', 'fake')
+
+                if self.path.endswith('/chat/completions'):
+                    for i, token in enumerate(server.tokens()):
+                        if i:
+                            time.sleep(server.token_delay)
+                        self._event(None, {
+                            "id": f"chatcmpl-{number}", "object": "chat.completion.chunk",
+                            "created": int(time.time()), "model": model,
+                            "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+                        })
+                    self._event(None, {
+                        "id": f"chatcmpl-{number}", "object": "chat.completion.chunk",
+                        "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+                    })
+                    self.wfile.write(b"data: [DONE]\n\n")
+                else:
+                    self._event('message_start', {"type": "message_start", "message": {
+                        "id": f"msg_{number}", "type": "message", "role": "assistant", "model": model,
+                        "content": [], "stop_reason": None, "stop_sequence": None,
+                        "usage": {"input_tokens": 800, "output_tokens": 0}
+                    }})
+                    self._event('content_block_start', {
+                        "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}
+                    })
+                    for i, token in enumerate(server.tokens()):
+                        if i:
+                            time.sleep(server.token_delay)
+                        self._event('content_block_delta', {
+                            "type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": token}
+                        })
+                    self._event('content_block_stop', {"type": "content_block_stop", "index": 0})
+                    self._event('message_delta', {
+                        "type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                        "usage": {"output_tokens": 200}
+                    })
+                    self._event('message_stop', {"type": "message_stop"})
+                self.wfile.flush()
+
+            def _event(self, event, payload):
+                prefix = f"event: {event}\n" if event else ""
+                self.wfile.write(f"{prefix}data: {json.dumps(payload)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def tokens(self):
+        text = json.dumps(SUMMARY)
+        return [text[i:i + self.TOKEN_CHARS] for i in range(0, len(text), self.TOKEN_CHARS)]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a fake OpenAI/Anthropic server for AI batch benchmarks')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=1.0, help='Seconds to the first token')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='Seconds between tokens')
+    parser.add_argument('--fail-every', type=int, default=0, help='Fail every Nth request with a 500')
+    args = parser.parse_args()
+
+    server = FakeLLMServer(latency=args.latency, port=args.port, fail_every=args.fail_every,
+                           token_delay=args.token_delay)
+    print(f"Fake LLM server on port {server.port} ({args.latency}s to first token, "
+          f"{len(server.tokens())} tokens {args.token_delay}s apart)")
+    print(f"  OPENAI_BASE_URL={server.openai_base_url}")
+    print(f"  ANTHROPIC_BASE_URL={server.anthropic_base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{server.requests} requests, max {server.max_in_flight} in flight")
@@ -0,0 +1,112 @@
+# ABOUTME: Unit tests for SSE streaming of AI answers (api/services/ai_streaming.py, AIService.open_stream)
+# ABOUTME: Measures time-to-first-byte against the local fake LLM server with a slow context build
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_llm_server import SUMMARY, FakeLLMServer
+from ttfb_harness import measure_events
+
+from api.services.ai_streaming import stream_completion
+
+CANDIDATE = {"person": {"person_id": "p1", "full_name": "Ada"}, "employment": [], "omitted_sections": []}
+
+
+def parse(chunk):
+    event, data = chunk.strip().split('\n')
+    return event.replace('event: ', ''), json.loads(data.replace('data: ', ''))
+
+
+async def deltas(*parts):
+    for part in parts:
+        yield part
+
+
+class NotFound(Exception):
+    status_code = 404
+    detail = "Person not found"
+
+
+class FakeCache:
+    def __init__(self, hit=None):
+        self.hit = hit
+        self.stored = []
+
+    def get(self, key, template):
+        return self.hit
+
+    def put(self, key, response, **kwargs):
+        self.stored.append(response)
+
+
+@pytest.mark.unit
+class TestEventStream:
+
+    def test_event_order(self):
+        async def prepare():
+            return {"cached": False, "sources": ["person"]}, deltas("Hel", "lo")
+
+        async def collect():
+            return [parse(chunk) async for chunk in stream_completion({"person_id": "p1"}, prepare)]
+
+        events = asyncio.run(collect())
+
+        assert [name for name, _ in events] == ['start', 'meta', 'token', 'token', 'done']
+        assert events[1][1]["sources"] == ["person"]
+        assert events[-1][1] == {"answer": "Hello"}
+
+    def test_errors_become_events_with_status(self):
+        async def prepare():
+            raise NotFound()
+
+        async def collect():
+            return [parse(chunk) async for chunk in stream_completion({}, prepare)]
+
+        events = asyncio.run(collect())
+
+        assert events[-1] == ('error', {"status": 404, "detail": "Person not found"})
+
+
+@pytest.mark.unit
+class TestTimeToFirstByte:
+
+    def test_start_event_precedes_slow_context_and_provider(self, monkeypatch):
+        pytest.importorskip("openai")
+        from api.services.ai_service import AIService
+
+        with FakeLLMServer(latency=0.4, token_delay=0.01) as server:
+            monkeypatch.setenv('OPENAI_BASE_URL', server.openai_base_url)
+            ai = AIService(provider="openai", api_key="fake-key", cache=FakeCache())
+
+            async def prepare():
+                await asyncio.sleep(0.4)  # Context assembly
+                cached, stream = await ai.stream_profile_summary(CANDIDATE)
+                return {"cached": cached}, stream
+
+            timings = asyncio.run(measure_events(stream_completion({}, prepare, ai._profile_summary_result)))
+
+        assert timings['ttfb'] < 0.1
+        assert timings['meta'] >= 0.4
+        assert timings['first_token'] >= 0.8
+        assert timings['events'].count('token') == len(server.tokens())
+        assert ai.cache.stored == [json.dumps(SUMMARY)]
+
+    def test_cache_hit_replays_without_provider_call(self, monkeypatch):
+        pytest.importorskip("openai")
+        from api.services.ai_service import AIService
+
+        with FakeLLMServer(latency=0.4) as server:
+            monkeypatch.setenv('OPENAI_BASE_URL', server.openai_base_url)
+            ai = AIService(provider="openai", api_key="fake-key", cache=FakeCache(hit="cached answer"))
+
+            async def answer():
+                cached, stream = await ai.stream_answer(CANDIDATE, "Senior backend?")
+                return cached, [delta async for delta in stream]
+
+            assert asyncio.run(answer()) == (True, ["cached answer"])
+            assert server.requests == 0
@@ -0,0 +1,416 @@
+# ABOUTME: Unit tests for the CSV -> staging adapters of the COPY-based bulk importer
+# ABOUTME: Also covers byte-offset chunking, shard routing, checkpoint resume, failed-row bisection
+# ABOUTME: and (on Postgres) the set-based merge into person, company and the child tables
+
+import io
+
+import pytest
+import sys
+from pathlib import Path
+
+import pandas as pd
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'imports'))
+from bulk_import import (
+    BulkImporter,
+    BMGemAdapter,
+    ClayAdapter,
+    DatablendAdapter,
+    PhantomBusterAdapter,
+    STAGING_COLUMNS,
+    read_csv_chunks,
+    shard_of,
+)
+from config import Config
+from migration_scripts.migration_utils import normalize_linkedin_url, synthetic_twitter_id
+
+
+def frame(csv: str) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(csv), dtype=str, keep_default_na=False)
+
+
+@pytest.mark.unit
+class TestAdapters:
+
+    def test_clay_skip_reasons_and_names(self):
+        df = frame(
+            "First Name,Last Name,Full Name,Job Title,Current Company,LinkedIn Profile\n"
+            "Ada,Lovelace,,Engineer,Acme Inc,https://www.linkedin.com/in/ada-l/\n"
+            "Bob,,,CTO,Foo,\n"
+            ",,,,Bar,linkedin.com/in/nobody\n"
+        )
+        people = ClayAdapter().people(df)
+
+        assert people.loc[0, 'full_name'] == 'Ada Lovelace'
+        assert people.loc[0, 'normalized_linkedin_url'] == 'linkedin.com/in/ada-l'
+        assert list(people['skip']) == ['', 'skipped_no_linkedin', 'skipped_invalid']
+
+    def test_bm_gem_emails_primary_first_and_deduplicated(self):
+        df = frame(
+            'First Name,Last Name,LinkedIn,Primary Email,All Emails\n'
+            'A,B,linkedin.com/in/ab,A@X.com,"[""a@x.com"", ""b@y.org""]"\n'
+            'C,D,linkedin.com/in/cd,,junk c@d.io more\n'
+        )
+        emails = BMGemAdapter().emails(df)
+
+        assert list(emails.loc[0, 'email']) == ['a@x.com', 'b@y.org']
+        assert list(emails.loc[0, 'is_primary']) == [True, False]
+        assert emails.loc[1, 'email'] == 'c@d.io'
+        assert not emails.loc[1, 'is_primary']
+
+    def test_bm_gem_github_and_twitter(self):
+        df = frame(
+            "Github,Twiiter / X\n"
+            "https://github.com/octocat,https://x.com/octo\n"
+            "https://github.com/orgs/foo,https://twitter.com/home\n"
+        )
+        adapter = BMGemAdapter()
+
+        assert list(adapter.github(df)['github_username']) == ['octocat']
+        twitter = adapter.twitter(df)
+        assert list(twitter['username']) == ['octo']
+        assert twitter['twitter_id'].iloc[0] == synthetic_twitter_id('OCTO')
+
+    def test_datablend_placeholder_names(self):
+        df = frame(
+            "Full Name,LinkedIn URL,GitHub URL,Emails\n"
+            ",https://linkedin.com/in/jane-doe,,j@x.com; bad; k@y.com\n"
+            ",,https://github.com/octo,\n"
+            "X Y,,,\n"
+        )
+        adapter = DatablendAdapter()
+        people = adapter.people(df)
+
+        assert people.loc[0, 'placeholder_name'] == '[LinkedIn] Jane Doe'
+        assert people.loc[1, 'placeholder_name'] == '[GitHub] octo'
+        assert people.loc[1, 'github_username'] == 'octo'
+        assert people.loc[2, 'skip'] == 'skipped_invalid'
+        assert list(adapter.emails(df)['email']) == ['j@x.com', 'k@y.com']
+
+    def test_phantombuster_fallback_and_education_years(self):
+        df = frame(
+            "person_id,linkedin_url,error,linkedinSchoolName,linkedinSchoolDateRange\n"
+            "7f1e2d3c-0000-4000-8000-000000000001,linkedin.com/in/z,,MIT,2013 - 2016\n"
+            "not-a-uuid,,No Linkedin profile found for q,,\n"
+        )
+        adapter = PhantomBusterAdapter()
+
+        assert list(adapter.fallback(df)) == [False, True]
+        people = adapter.people(df)
+        assert people.loc[0, 'csv_person_id'] == '7f1e2d3c-0000-4000-8000-000000000001'
+        assert pd.isna(people.loc[1, 'csv_person_id'])
+
+        education = adapter.education(df)
+        assert education.loc[0, 'start_date'] == '2013-01-01'
+        assert education.loc[0, 'end_date'] == '2016-12-31'
+
+
+@pytest.mark.unit
+class TestCopy:
+
+    def test_copy_payload_follows_staging_columns(self):
+        class Cursor:
+            def copy_expert(self, sql, buffer):
+                self.sql, self.payload = sql, buffer.getvalue()
+
+        df = frame("Current Company,Job Title,Date Range\nAcme,Dev,Jan 2020 - Present\n")
+        cursor = Cursor()
+        BulkImporter._copy(cursor, 'stage_employment', ClayAdapter().employment(df))
+
+        columns = [name for name, _ in STAGING_COLUMNS['stage_employment']]
+        assert f"stage_employment ({', '.join(columns)})" in cursor.sql
+        assert cursor.payload.startswith('0,Acme,Dev,2020-01-01,')
+
+
+@pytest.mark.unit
+class TestChunkedReading:
+
+    CSV = (
+        'Full Name,LinkedIn URL,Emails\n'
+        'Ada,https://linkedin.com/in/ada,a@x.com\n'
+        '"Bob ""B"" Smith","https://linkedin.com/in/bob","multi\nline@x.com"\n'
+        '\n'
+        'Cy,,c@y.com\n'
+        'Di,https://linkedin.com/in/di,\n'
+    )
+
+    def test_chunks_are_indexed_by_byte_offset(self, tmp_path):
+        path = tmp_path / 'export.csv'
+        path.write_text(self.CSV)
+
+        chunks = list(read_csv_chunks(path, chunk_size=2))
+        frame = pd.concat(chunk for chunk, _ in chunks)
+
+        assert list(frame['Full Name']) == ['Ada', 'Bob "B" Smith', 'Cy', 'Di']
+        assert frame.loc[frame.index[1], 'Emails'] == 'multi\nline@x.com'
+        raw = self.CSV.encode()
+        assert [raw[offset:offset + 3] for offset in frame.index] == [b'Ada', b'"Bo', b'Cy,', b'Di,']
+        assert chunks[-1][1] == len(raw)
+
+    def test_resume_from_end_offset(self, tmp_path):
+        path = tmp_path / 'export.csv'
+        path.write_text(self.CSV)
+
+        first, end = next(read_csv_chunks(path, chunk_size=2))
+        rest = pd.concat(chunk for chunk, _ in read_csv_chunks(path, chunk_size=2, offset=end))
+
+        assert list(first['Full Name']) == ['Ada', 'Bob "B" Smith']
+        assert list(rest['Full Name']) == ['Cy', 'Di']
+
+
+@pytest.mark.unit
+class TestSharding:
+
+    def test_same_person_same_shard(self):
+        df = frame(
+            "Full Name,LinkedIn URL,GitHub URL\n"
+            "A,https://www.linkedin.com/in/ada/,\n"
+            "A,linkedin.com/in/ada,\n"
+            "B,,https://github.com/Octo\n"
+            "B,,https://github.com/octo\n"
+        )
+        keys = DatablendAdapter().shard_keys(df)
+        shards = shard_of(keys, 8)
+
+        assert keys[0] == keys[1]
+        assert keys[2] == keys[3] == 'gh:octo'
+        assert shards[0] == shards[1] and shards[2] == shards[3]
+
+    def test_shards_partition_rows(self):
+        df = pd.DataFrame({'LinkedIn Profile': [f"linkedin.com/in/p{i}" for i in range(200)],
+                           'Full Name': 'X'})
+        shards = shard_of(ClayAdapter().shard_keys(df), 4)
+
+        assert set(shards) == {0, 1, 2, 3}
+        assert list(shards) == list(shard_of(ClayAdapter().shard_keys(df), 4))
+
+
+class Conn:
+    """Just enough connection for BulkImporter.run"""
+
+    autocommit = True
+
+    def cursor(self):
+        return self
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.unit
+class TestCheckpoints:
+
+    class Importer(BulkImporter):
+        """Records the chunks it would import instead of touching a database"""
+
+        def __init__(self, fail_after=None, **kwargs):
+            super().__init__(Conn(), ClayAdapter(), chunk_size=1, **kwargs)
+            self.imported = []
+            self.fail_after = fail_after
+
+        def _create_staging(self, cursor):
+            pass
+
+        def _import_chunk(self, cursor, chunk):
+            if self.fail_after is not None and len(self.imported) == self.fail_after:
+                raise RuntimeError('crash')
+            self.imported.extend(chunk['Full Name'])
+            self.stats['total_rows'] += len(chunk)
+
+    def test_crashed_run_resumes_after_last_chunk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, 'BASE_DIR', tmp_path)
+        path = tmp_path / 'clay.csv'
+        path.write_text("Full Name\nA\nB\nC\n")
+
+        crashed = self.Importer(fail_after=2)
+        with pytest.raises(RuntimeError):
+            crashed.run(path, progress=lambda offset, size: None)
+
+        resumed = self.Importer()
+        stats = resumed.run(path, progress=lambda offset, size: None)
+
+        assert crashed.imported == ['A', 'B']
+        assert resumed.imported == ['C']
+        assert stats['total_rows'] == 3
+        assert not list(tmp_path.glob('.checkpoint_*'))  # Cleared when finished
+
+    def test_changed_file_starts_over(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, 'BASE_DIR', tmp_path)
+        path = tmp_path / 'clay.csv'
+        path.write_text("Full Name\nA\nB\n")
+        with pytest.raises(RuntimeError):
+            self.Importer(fail_after=1).run(path, progress=lambda offset, size: None)
+
+        path.write_text("Full Name\nA\nB\nC\nD\n")
+        resumed = self.Importer()
+        resumed.run(path, progress=lambda offset, size: None)
+
+        assert resumed.imported == ['A', 'B', 'C', 'D']
+
+
+
+class DataError(Exception):
+    pgcode = '23505'
+
+
+@pytest.mark.unit
+class TestChunkErrors:
+
+    class Importer(BulkImporter):
+        """Merges staged names unless one of them is 'Bad', which raises a data error"""
+
+        def __init__(self, error=DataError):
+            conn = Conn()
+            conn.execute = lambda sql, params=None: None
+            conn.rollback = lambda: self.staged.clear()
+            super().__init__(conn, ClayAdapter())
+            self.error = error
+            self.staged, self.merged = [], []
+
+        def _copy(self, cursor, table, frame):
+            if table == 'stage_person':
+                self.staged.extend(frame['full_name'])
+
+        def _merge(self, cursor):
+            if 'Bad' in self.staged:
+                raise self.error('duplicate key')
+            self.merged.extend(self.staged)
+            self.staged.clear()
+
+    CSV = "Full Name,LinkedIn Profile\n" + ''.join(
+        f"{name},linkedin.com/in/{name.lower()}\n" for name in ('Ada', 'Bob', 'Bad', 'Cy', 'Di')
+    )
+
+    def test_data_error_fails_only_the_bad_row(self):
+        importer = self.Importer()
+
+        importer._import_chunk(importer.conn, frame(self.CSV))
+
+        assert sorted(importer.merged) == ['Ada', 'Bob', 'Cy', 'Di']
+        assert importer.stats['failed_rows'] == 1
+        assert len(importer.stats['errors']) == 1 and 'duplicate key' in importer.stats['errors'][0]
+
+    def test_other_errors_are_raised(self):
+        importer = self.Importer(error=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            importer._import_chunk(importer.conn, frame(self.CSV))
+
+        assert importer.merged == [] and importer.stats['errors'] == []
+
+
+@pytest.mark.integration
+class TestMerge:
+
+    CSV = (
+        "First Name,Last Name,LinkedIn,Title,Company,Primary Email,All Emails,"
+        "Github,Website / Blog,Twiiter / X,School\n"
+        "Ada,Lovelace,https://www.linkedin.com/in/bulktest-ada/,Engineer,Bulktest Existing Co,"
+        "ada@x.com,\"[\"\"ada@x.com\"\", \"\"ada@y.com\"\"]\",https://github.com/bulktest-ada,,"
+        "https://x.com/bulktest_ada,Bulktest University\n"
+        "Bob,Babbage,https://linkedin.com/in/bulktest-bob,CTO,Bulktest New Co,"
+        "bob@x.com,,https://github.com/bulktest-bob,https://bob.dev,,\n"
+        "Bob,Babbage,linkedin.com/in/bulktest-bob,CTO,bulktest new co,,,,,,\n"
+    )
+
+    @pytest.fixture
+    def merge_db(self, pg_test_conn, apply_migrations, insert_test_person, monkeypatch, tmp_path):
+        pg_test_conn.cursor_factory = RealDictCursor
+        apply_migrations(
+            '17_company_name_key.sql',
+            requires=('employment', 'person_email', 'github_profile', 'education', 'twitter_profile')
+        )
+        monkeypatch.setattr(Config, 'BASE_DIR', tmp_path)
+
+        ada = insert_test_person({
+            'full_name': 'Ada Lovelace',
+            'linkedin_url': 'https://www.linkedin.com/in/bulktest-ada/',
+            'normalized_linkedin_url': normalize_linkedin_url('https://www.linkedin.com/in/bulktest-ada/'),
+        })
+        cursor = pg_test_conn.cursor()
+        cursor.execute("INSERT INTO company (company_name) VALUES ('Bulktest Existing Co') RETURNING company_id")
+        existing_company = cursor.fetchone()['company_id']
+        pg_test_conn.commit()
+        cursor.close()
+        return pg_test_conn, ada, existing_company
+
+    def rows(self, conn, sql, params=None):
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def test_people_companies_and_children(self, merge_db, tmp_path):
+        conn, ada, existing_company = merge_db
+        path = tmp_path / 'bm_gem.csv'
+        path.write_text(self.CSV)
+
+        stats = BulkImporter(conn, BMGemAdapter()).run(path, progress=lambda offset, size: None)
+
+        people = self.rows(conn, """
+            SELECT person_id, full_name, headline FROM person
+            WHERE normalized_linkedin_url LIKE %s ORDER BY full_name
+        """, ('%bulktest-%',))
+        assert [row['full_name'] for row in people] == ['Ada Lovelace', 'Bob Babbage']
+        assert people[0]['person_id'] == ada  # Matched by LinkedIn, enriched in place
+        assert people[0]['headline'] == 'Engineer'
+        bob = people[1]['person_id']
+        assert stats['profiles_enriched'] == 1
+        assert stats['profiles_created'] == 1  # Bob's second row joins the first
+
+        # Existing company matched, new one created once and registered
+        employment = self.rows(conn, """
+            SELECT e.person_id, c.company_id, c.company_name
+            FROM employment e JOIN company c USING (company_id)
+            WHERE e.person_id IN (%s, %s) ORDER BY c.company_name
+        """, (ada, bob))
+        assert [(row['person_id'], row['company_name']) for row in employment] == [
+            (ada, 'Bulktest Existing Co'), (bob, 'Bulktest New Co')
+        ]
+        assert employment[0]['company_id'] == existing_company
+        keys = self.rows(conn, """
+            SELECT name_key, company_id FROM company_name_key
+            WHERE name_key LIKE 'bulktest %' ORDER BY name_key
+        """)
+        assert [(row['name_key'], row['company_id']) for row in keys] == [
+            ('bulktest existing co', existing_company), ('bulktest new co', employment[1]['company_id'])
+        ]
+        assert stats['companies_matched'] == 1 and stats['companies_created'] == 1
+
+        emails = self.rows(conn, """
+            SELECT person_id, email, is_primary FROM person_email
+            WHERE person_id IN (%s, %s) ORDER BY email
+        """, (ada, bob))
+        assert [(row['person_id'], row['email'], row['is_primary']) for row in emails] == [
+            (ada, 'ada@x.com', True), (ada, 'ada@y.com', False), (bob, 'bob@x.com', True)
+        ]
+        github = self.rows(conn, """
+            SELECT person_id, github_username, blog FROM github_profile
+            WHERE github_username LIKE 'bulktest-%' ORDER BY github_username
+        """)
+        assert [tuple(row.values()) for row in github] == [
+            (ada, 'bulktest-ada', None), (bob, 'bulktest-bob', 'https://bob.dev')
+        ]
+        twitter = self.rows(conn, "SELECT twitter_id, person_id FROM twitter_profile WHERE username = 'bulktest_ada'")
+        assert [tuple(row.values()) for row in twitter] == [(synthetic_twitter_id('bulktest_ada'), ada)]
+        education = self.rows(conn, "SELECT school_name FROM education WHERE person_id = %s", (ada,))
+        assert [row['school_name'] for row in education] == ['Bulktest University']
+        assert not stats['errors'] and stats['failed_rows'] == 0
+
+    def test_rerun_adds_nothing(self, merge_db, tmp_path):
+        conn, _, _ = merge_db
+        path = tmp_path / 'bm_gem.csv'
+        path.write_text(self.CSV)
+        BulkImporter(conn, BMGemAdapter()).run(path, progress=lambda offset, size: None)
+
+        stats = BulkImporter(conn, BMGemAdapter()).run(path, resume=False, progress=lambda offset, size: None)
+
+        assert stats['profiles_created'] == 0 and stats['profiles_enriched'] == 2
+        assert stats['companies_created'] == 0
+        for key in ('employment_records_added', 'emails_added', 'github_added', 'education_records_added'):
+            assert stats[key] == 0, key
@@ -0,0 +1,212 @@
+# ABOUTME: Unit tests for the change feed over change_log (api/services/change_log.py)
+# ABOUTME: Checks snapshot cursors, commit/rollback of a consumer's batch, purging, LLM cache invalidation and the triggers on Postgres
+
+from contextlib import contextmanager
+
+import psycopg2
+import pytest
+from psycopg2.extras import RealDictCursor
+
+from api.services import change_log, llm_cache
+from api.services.change_log import ChangeFeed, purge_change_log, visible_in_snapshot
+from api.services.llm_cache import LLMCache
+
+
+class Conn:
+    """Fake pooled connection: current snapshot '20:25:', stored cursor '10:12:'"""
+
+    def __init__(self, changed=()):
+        self.changed = list(changed)
+        self.sql = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.rowcount = 0
+        self._last = ''
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self._last = ' '.join(sql.split())
+        self.sql.append((self._last, params))
+        if self._last.startswith('DELETE FROM llm_response_cache'):
+            self.rowcount = len(params[0])
+
+    def fetchone(self):
+        if 'txid_current_snapshot' in self._last:
+            return {'snapshot': '20:25:'}
+        return {'snapshot': '10:12:'}
+
+    def fetchall(self):
+        return self.changed
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+    def statements(self, prefix):
+        return [(sql, params) for sql, params in self.sql if sql.startswith(prefix)]
+
+
+def person(person_id, change_id):
+    return {'person_id': person_id, 'tables': ['person'], 'changed_at': None, 'last_change_id': change_id}
+
+
+@pytest.mark.unit
+class TestChangeFeed:
+
+    def test_batch_reads_between_snapshots_and_advances_cursor(self):
+        conn = Conn(changed=[person('p1', 41), person('p2', 57)])
+
+        with ChangeFeed(conn, 'llm_cache') as feed:
+            people = feed.changed_people(tables=['person', 'employment'])
+
+        assert [row['person_id'] for row in people] == ['p1', 'p2']
+        _, params = conn.statements('SELECT person_id')[0]
+        assert params['previous'] == '10:12:' and params['current'] == '20:25:'
+        assert params['tables'] == ['person', 'employment']
+
+        _, params = conn.statements('UPDATE change_consumer')[0]
+        assert params == ('20:25:', 57, 2, 'llm_cache')
+        assert conn.commits == 1
+
+    def test_failed_consumer_keeps_cursor(self):
+        conn = Conn(changed=[person('p1', 41)])
+
+        with pytest.raises(RuntimeError):
+            with ChangeFeed(conn, 'monitoring') as feed:
+                feed.changed_people()
+                raise RuntimeError('consumer failed')
+
+        assert conn.statements('UPDATE change_consumer') == []
+        assert conn.commits == 0 and conn.rollbacks == 1
+
+    def test_llm_cache_drops_changed_subjects(self, monkeypatch):
+        conn = Conn(changed=[person('p1', 41), person('p2', 57)])
+
+        @contextmanager
+        def get_db_context():
+            yield conn
+        monkeypatch.setattr(llm_cache, 'get_db_context', get_db_context)
+
+        assert LLMCache().invalidate_changed() == 2
+        _, params = conn.statements('DELETE FROM llm_response_cache')[0]
+        assert params == (['p1', 'p2'],)
+
+        conn.changed = []
+        assert LLMCache().invalidate_changed() == 0
+        assert len(conn.statements('DELETE FROM llm_response_cache')) == 1
+
+
+@pytest.mark.unit
+class TestPurge:
+
+    def test_stale_consumers_do_not_hold_back_purge(self, monkeypatch):
+        conn = Conn(changed=[{'consumer': 'retired', 'updated_at': '2026-08-01'}])
+
+        @contextmanager
+        def get_db_context():
+            yield conn
+        monkeypatch.setattr(change_log, 'get_db_context', get_db_context)
+
+        purge_change_log(retention_days=7, stale_days=30)
+
+        sql, params = conn.statements('DELETE FROM change_log')[0]
+        assert "WHERE updated_at >= NOW() - %(stale)s * INTERVAL '1 day'" in sql
+        assert params == {'retention': 7, 'stale': 30}
+        assert conn.commits == 1
+
+    def test_snapshot_visibility_matches_txid_visible_in_snapshot(self):
+        snapshot = '20:25:21,23'
+
+        assert visible_in_snapshot(19, snapshot) and visible_in_snapshot(22, snapshot)
+        assert not visible_in_snapshot(21, snapshot) and not visible_in_snapshot(25, snapshot)
+
+
+@pytest.fixture
+def change_db(pg_test_conn, apply_migrations):
+    """Test database with migration 22 applied and an empty change log"""
+    pg_test_conn.cursor_factory = RealDictCursor
+    apply_migrations(
+        '22_change_log.sql',
+        requires=('person', 'person_email', 'employment', 'github_profile', 'github_contribution')
+    )
+    cursor = pg_test_conn.cursor()
+    cursor.execute("DELETE FROM change_log")
+    cursor.execute("DELETE FROM change_consumer")
+    pg_test_conn.commit()
+    cursor.close()
+    return pg_test_conn
+
+
+def add_person(conn, name):
+    url = f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}"
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO person (full_name, linkedin_url, normalized_linkedin_url)
+        VALUES (%s, %s, %s) RETURNING person_id
+    """, (name, url, url))
+    person_id = cursor.fetchone()['person_id']
+    cursor.close()
+    return person_id
+
+
+def read_people(conn, consumer):
+    with ChangeFeed(conn, consumer) as feed:
+        return {row['person_id'] for row in feed.changed_people()}
+
+
+@pytest.mark.integration
+class TestChangeFeedDatabase:
+    """Runs the change_log triggers and snapshot windows on the test database"""
+
+    def test_transaction_committing_after_a_read_is_in_the_next_batch(self, change_db, pg_test_connection_params):
+        read_people(change_db, 'feed_test')
+        late = psycopg2.connect(cursor_factory=RealDictCursor, **pg_test_connection_params)
+        try:
+            # Lower xid than the early write, but commits after the first read
+            late_person = add_person(late, 'Late Writer')
+            early_person = add_person(change_db, 'Early Writer')
+            change_db.commit()
+
+            assert read_people(change_db, 'feed_test') == {early_person}
+
+            late.commit()
+            assert read_people(change_db, 'feed_test') == {late_person}
+            assert read_people(change_db, 'feed_test') == set()
+        finally:
+            late.close()
+
+    def test_triggers_log_changed_columns_and_skip_noop_updates(self, change_db):
+        read_people(change_db, 'columns_test')
+        person_id = add_person(change_db, 'Column Test')
+        cursor = change_db.cursor()
+        cursor.execute("UPDATE person SET headline = 'Staff Engineer' WHERE person_id = %s", (person_id,))
+        cursor.execute("UPDATE person SET full_name = full_name WHERE person_id = %s", (person_id,))
+        cursor.execute("DELETE FROM person WHERE person_id = %s", (person_id,))
+        change_db.commit()
+        cursor.close()
+
+        with ChangeFeed(change_db, 'columns_test') as feed:
+            changes = feed.changes(tables=['person'])
+
+        assert [row['op'] for row in changes] == ['I', 'U', 'D']
+        assert all(row['person_id'] == person_id for row in changes)
+        assert changes[1]['changed_columns'] == ['headline']
+
+    def test_failed_batch_leaves_the_cursor_in_place(self, change_db):
+        read_people(change_db, 'retry_test')
+        person_id = add_person(change_db, 'Retry Test')
+        change_db.commit()
+
+        with pytest.raises(RuntimeError):
+            with ChangeFeed(change_db, 'retry_test') as feed:
+                assert {row['person_id'] for row in feed.changed_people()} == {person_id}
+                raise RuntimeError('consumer failed')
+
+        assert read_people(change_db, 'retry_test') == {person_id}
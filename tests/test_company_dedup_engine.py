@@ -0,0 +1,165 @@
+# ABOUTME: Tests for fuzzy company deduplication (scripts/maintenance/company_dedup_engine.py)
+# ABOUTME: Unit tests for domain/slug extraction and matching, and a Postgres test for the set-based merge
+
+import importlib
+
+import pytest
+import sys
+from pathlib import Path
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'maintenance'))
+
+
+class Conn:
+    """Stands in for the database when only matching is exercised"""
+    autocommit = True
+
+    def cursor(self):
+        return self
+
+    def close(self):
+        pass
+
+
+def load_engine_module(monkeypatch, tmp_path, conn):
+    """Import company_dedup_engine with its log file in tmp_path and `conn` as the database"""
+    monkeypatch.chdir(tmp_path)
+    engine_module = importlib.import_module('company_dedup_engine')
+    monkeypatch.setattr(sys.modules['deduplicate_companies'], 'get_db_connection', lambda use_pool=False: conn)
+    return engine_module
+
+
+@pytest.fixture
+def engine_module(monkeypatch, tmp_path):
+    return load_engine_module(monkeypatch, tmp_path, Conn())
+
+
+@pytest.mark.unit
+class TestCompanyKeys:
+
+    def test_domain_from_url(self, engine_module):
+        assert engine_module.extract_domain('https://www.Paradigm.xyz/team?x=1') == 'paradigm.xyz'
+
+    def test_shared_hosts_and_placeholders_are_not_domains(self, engine_module):
+        assert engine_module.extract_domain('https://github.com/paradigmxyz') is None
+        assert engine_module.extract_domain('paradigm.placeholder') is None
+        assert engine_module.extract_domain('paradigm') is None
+
+    def test_linkedin_slug(self, engine_module):
+        assert engine_module.extract_linkedin_slug('https://www.linkedin.com/company/Paradigm/about/') == 'paradigm'
+        assert engine_module.extract_linkedin_slug('https://www.linkedin.com/in/someone') is None
+
+
+@pytest.mark.unit
+class TestMatchReason:
+
+    def company(self, engine, name, domain=None, linkedin=None):
+        return engine._prepare({
+            'company_id': name, 'company_name': name, 'company_domain': domain,
+            'website_url': None, 'linkedin_url': linkedin
+        })
+
+    def test_shared_domain_needs_related_names(self, engine_module):
+        engine = engine_module.CompanyDedupEngine()
+        paradigm = self.company(engine, 'Paradigm', 'paradigm.xyz')
+
+        assert engine._match_reason(paradigm, self.company(engine, 'Paradigm Operations', 'paradigm.xyz')).startswith('domain')
+        assert engine._match_reason(paradigm, self.company(engine, 'Totally Unrelated', 'paradigm.xyz')) is None
+
+    def test_shared_linkedin_slug(self, engine_module):
+        engine = engine_module.CompanyDedupEngine()
+        a = self.company(engine, 'Acme', linkedin='https://linkedin.com/company/acme-co')
+        b = self.company(engine, 'Acme Holdings Worldwide', linkedin='https://www.linkedin.com/company/acme-co/')
+
+        assert engine._match_reason(a, b) == 'linkedin'
+
+    def test_short_names_need_exact_match(self, engine_module):
+        engine = engine_module.CompanyDedupEngine(threshold=0.5)
+
+        assert engine._match_reason(self.company(engine, 'abc'), self.company(engine, 'abd')) is None
+
+
+@pytest.mark.integration
+class TestMergeBatch:
+
+    @pytest.fixture
+    def merge_db(self, pg_test_conn, apply_migrations, monkeypatch, tmp_path):
+        pg_test_conn.cursor_factory = RealDictCursor
+        apply_migrations(
+            '02_ecosystem_schema.sql', '17_company_name_key.sql',
+            requires=('company', 'employment', 'github_repository')
+        )
+        engine_module = load_engine_module(monkeypatch, tmp_path, pg_test_conn)
+        return pg_test_conn, engine_module.CompanyDedupEngine(dry_run=False)
+
+    def build_fixture(self, conn):
+        cursor = conn.cursor()
+        ids = {}
+        for name in ('Mergetest Paradigm', 'Mergetest Paradigm Operations'):
+            cursor.execute("INSERT INTO company (company_name) VALUES (%s) RETURNING company_id", (name,))
+            ids[name] = cursor.fetchone()['company_id']
+            cursor.execute("""
+                INSERT INTO company_name_key (name_key, company_id) VALUES (LOWER(%s), %s)
+                ON CONFLICT (name_key) DO UPDATE SET company_id = EXCLUDED.company_id
+            """, (name, ids[name]))
+        canonical, duplicate = ids['Mergetest Paradigm'], ids['Mergetest Paradigm Operations']
+
+        url = 'https://www.linkedin.com/in/mergetest-ada'
+        cursor.execute("""
+            INSERT INTO person (full_name, linkedin_url, normalized_linkedin_url)
+            VALUES ('Ada', %s, %s) RETURNING person_id
+        """, (url, url))
+        person_id = cursor.fetchone()['person_id']
+        cursor.execute("""
+            INSERT INTO employment (person_id, company_id, title) VALUES (%s, %s, 'Engineer')
+        """, (person_id, duplicate))
+
+        ecosystems = []
+        for name in ('Mergetest Ethereum', 'Mergetest Solana'):
+            cursor.execute("""
+                INSERT INTO crypto_ecosystem (ecosystem_name) VALUES (%s)
+                ON CONFLICT (ecosystem_name) DO UPDATE SET ecosystem_name = EXCLUDED.ecosystem_name
+                RETURNING ecosystem_id
+            """, (name,))
+            ecosystems.append(cursor.fetchone()['ecosystem_id'])
+        ethereum, solana = ecosystems
+
+        # Ethereum (NULL type) is on both sides; Solana only on the duplicate
+        cursor.executemany("""
+            INSERT INTO company_ecosystem (company_id, ecosystem_id, relationship_type, source)
+            VALUES (%s, %s, %s, 'test')
+        """, [(canonical, ethereum, None), (duplicate, ethereum, None), (duplicate, solana, 'owner')])
+        conn.commit()
+        cursor.close()
+        return canonical, duplicate, person_id
+
+    def test_merge_repoints_children(self, merge_db):
+        conn, engine = merge_db
+        canonical, duplicate, person_id = self.build_fixture(conn)
+
+        assert engine._merge_batch([(str(duplicate), str(canonical))])
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS n FROM company WHERE company_id = %s", (duplicate,))
+        assert cursor.fetchone()['n'] == 0
+        cursor.execute("SELECT company_id FROM employment WHERE person_id = %s", (person_id,))
+        assert [row['company_id'] for row in cursor.fetchall()] == [canonical]
+        cursor.execute("""
+            SELECT ce.company_id, e.ecosystem_name, ce.relationship_type
+            FROM company_ecosystem ce JOIN crypto_ecosystem e ON e.ecosystem_id = ce.ecosystem_id
+            WHERE ce.company_id IN (%s, %s)
+            ORDER BY e.ecosystem_name
+        """, (canonical, duplicate))
+        assert [tuple(row.values()) for row in cursor.fetchall()] == [
+            (canonical, 'Mergetest Ethereum', None),
+            (canonical, 'Mergetest Solana', 'owner'),
+        ]
+        cursor.execute("SELECT company_id FROM company_name_key WHERE name_key = 'mergetest paradigm operations'")
+        assert cursor.fetchone()['company_id'] == canonical
+        cursor.close()
+
+        assert engine.stats['companies_deleted'] == 1
+        assert engine.stats['employment_records_moved'] == 1
+        assert engine.stats['ecosystem_links_moved'] == 1
+        assert not engine.stats['errors']
@@ -0,0 +1,184 @@
+# ABOUTME: Unit tests for the company analytics rollup refresh (scripts/analytics/company_rollups.py)
+# ABOUTME: Uses a recording fake connection per mode, and checks incremental == full refresh on Postgres
+
+import pytest
+import sys
+from pathlib import Path
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'analytics'))
+from company_rollups import CompanyRollups, ROLLUP_TABLES
+
+
+class Conn:
+    """Records executed SQL; claims `claimed` companies and grants the lock unless `locked`"""
+
+    def __init__(self, claimed=0, locked=False, fail_on=None):
+        self.claimed = claimed
+        self.locked = locked
+        self.fail_on = fail_on
+        self.sql = []
+        self.committed = self.rolled_back = False
+        self.rowcount = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.sql.append(' '.join(sql.split()))
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError('boom')
+        self.rowcount = self.claimed if 'INSERT INTO rollup_batch' in sql else 7
+
+    def fetchone(self):
+        return {'locked': not self.locked}
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+
+@pytest.mark.unit
+class TestRefresh:
+
+    def test_incremental_claims_dirty_companies_only(self):
+        conn = Conn(claimed=3)
+        stats = CompanyRollups(conn).refresh()
+
+        assert any(s.startswith('WITH claimed AS ( DELETE FROM company_rollup_dirty') for s in conn.sql)
+        assert not any('SELECT DISTINCT company_id FROM employment' in s for s in conn.sql)
+        deletes = [s for s in conn.sql if s.startswith('DELETE FROM company_') and 'rollup_batch' in s]
+        assert len(deletes) == len(ROLLUP_TABLES)
+        assert stats['companies'] == 3
+        assert all(stats[table] == 7 for table in ROLLUP_TABLES)
+        assert conn.committed
+
+    def test_nothing_dirty_touches_no_rollups(self):
+        conn = Conn(claimed=0)
+        stats = CompanyRollups(conn).refresh()
+
+        assert not any(s.startswith('INSERT INTO company_') for s in conn.sql)
+        assert stats['companies'] == 0
+        assert conn.committed
+
+    def test_full_rebuilds_every_table(self):
+        conn = Conn(claimed=50)
+        CompanyRollups(conn).refresh(full=True)
+
+        assert 'DELETE FROM company_rollup_dirty' in conn.sql
+        for table in ROLLUP_TABLES:
+            assert f"DELETE FROM {table}" in conn.sql
+            assert any(s.startswith(f"INSERT INTO {table}") for s in conn.sql)
+
+    def test_skips_when_another_refresh_holds_the_lock(self):
+        conn = Conn(claimed=3, locked=True)
+        stats = CompanyRollups(conn).refresh()
+
+        assert stats['skipped']
+        assert len(conn.sql) == 1
+        assert not conn.committed
+
+    def test_failure_rolls_back_claim(self):
+        conn = Conn(claimed=3, fail_on='INSERT INTO company_language_rollup')
+        with pytest.raises(RuntimeError):
+            CompanyRollups(conn).refresh()
+
+        assert conn.rolled_back and not conn.committed
+
+
+@pytest.fixture
+def rollup_db(pg_test_conn, apply_migrations):
+    """Test database with migration 18 applied and no rollup state left from earlier tests"""
+    pg_test_conn.cursor_factory = RealDictCursor
+    apply_migrations(
+        '18_company_rollups.sql',
+        requires=('company', 'employment', 'person_email', 'github_profile', 'github_contribution', 'github_repository')
+    )
+    cursor = pg_test_conn.cursor()
+    for table in ('company_rollup_dirty',) + ROLLUP_TABLES:
+        cursor.execute(f"DELETE FROM {table}")
+    pg_test_conn.commit()
+    cursor.close()
+    return pg_test_conn
+
+
+def insert_returning(conn, sql, params):
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    value = list(cursor.fetchone().values())[0]
+    cursor.close()
+    return value
+
+
+def rollup_state(conn):
+    """Every rollup row, minus refresh timestamps, in a stable order"""
+    cursor = conn.cursor()
+    state = {}
+    for table in ROLLUP_TABLES:
+        cursor.execute(f"SELECT * FROM {table}")
+        rows = [{k: v for k, v in row.items() if k != 'refreshed_at'} for row in cursor.fetchall()]
+        state[table] = sorted(rows, key=str)
+    cursor.close()
+    return state
+
+
+@pytest.mark.integration
+class TestRollupsDatabase:
+    """Runs the employment triggers and rollup SQL on the test database"""
+
+    def test_incremental_refresh_matches_full_rebuild(self, rollup_db):
+        acme, globex = (
+            insert_returning(rollup_db, "INSERT INTO company (company_name) VALUES (%s) RETURNING company_id", (name,))
+            for name in ('Rollup Acme', 'Rollup Globex')
+        )
+        ada, bob, cy = (
+            insert_returning(rollup_db, """
+                INSERT INTO person (full_name, linkedin_url, normalized_linkedin_url)
+                VALUES (%s, %s, %s) RETURNING person_id
+            """, (name, f"https://www.linkedin.com/in/rollup-{name}", f"https://www.linkedin.com/in/rollup-{name}"))
+            for name in ('ada', 'bob', 'cy')
+        )
+        rollup_db.commit()
+        rollups = CompanyRollups(rollup_db)
+        rollups.refresh(full=True)
+
+        cursor = rollup_db.cursor()
+        cursor.execute("""
+            INSERT INTO employment (person_id, company_id, title, start_date, end_date) VALUES
+                (%(ada)s, %(acme)s, 'Engineer', '2020-01-15', '2022-03-10'),
+                (%(ada)s, %(globex)s, 'Staff Engineer', '2022-05-01', NULL),
+                (%(bob)s, %(acme)s, 'Designer', '2021-02-01', NULL),
+                (%(cy)s, %(globex)s, 'Analyst', '2019-06-01', '2023-01-31')
+        """, {'ada': ada, 'bob': bob, 'cy': cy, 'acme': acme, 'globex': globex})
+        rollup_db.commit()
+        assert rollups.refresh()['companies'] == 2
+
+        cursor.execute("UPDATE employment SET end_date = '2024-01-01' WHERE person_id = %s", (bob,))
+        cursor.execute("DELETE FROM employment WHERE person_id = %s", (cy,))
+        cursor.execute("""
+            INSERT INTO employment (person_id, company_id, title, start_date)
+            VALUES (%s, %s, 'Analyst', '2023-03-01')
+        """, (cy, acme))
+        rollup_db.commit()
+        cursor.close()
+        stats = rollups.refresh()
+        incremental = rollup_state(rollup_db)
+
+        rollups.refresh(full=True)
+
+        assert stats['companies'] == 2
+        assert incremental == rollup_state(rollup_db)
+        flows = incremental['company_talent_flow_rollup']
+        assert [(f['from_company_id'], f['to_company_id'], f['moves'], f['moves_within_6mo']) for f in flows] == [
+            (acme, globex, 1, 1)
+        ]
+        summaries = {(s['company_id'], s['scope']): s for s in incremental['company_summary_rollup']}
+        assert summaries[(acme, 'all')]['total_employees'] == 3
+        assert summaries[(acme, 'current')]['total_employees'] == 1
+        assert (globex, 'current') in summaries and summaries[(globex, 'all')]['former_employees'] == 0
+        assert rollups.status()['pending_companies'] == 0
@@ -0,0 +1,148 @@
+# ABOUTME: Unit tests for concurrent AI context assembly (api/services/context_assembly.py)
+# ABOUTME: Uses fake pooled connections to check budgets, omission of slow/failing sections, required sections and cleanup
+
+import asyncio
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from fastapi import HTTPException
+
+from api.routers import ai as ai_router
+from api.services import context_assembly
+from api.services.context_assembly import fetch_sections
+
+PERSON_ID = '2f1c9a54-8d3e-4c7b-9a61-0e5b7d2c4f10'
+
+
+class Conn:
+    """Fake pooled connection recording statements and rollbacks"""
+
+    def __init__(self):
+        self.sql = []
+        self.rolled_back = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.sql.append((sql, params))
+
+    def close(self):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.fixture
+def conns(monkeypatch):
+    opened = []
+
+    @contextmanager
+    def get_db_context():
+        conn = Conn()
+        opened.append(conn)
+        yield conn
+
+    monkeypatch.setattr(context_assembly, 'get_db_context', get_db_context)
+    monkeypatch.setattr(context_assembly.Config, 'DB_TYPE', 'postgresql')
+    return opened
+
+
+def slow(seconds, value):
+    def fetch(conn):
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+def failing(conn):
+    raise RuntimeError('boom')
+
+
+class QueryCanceled(Exception):
+    pgcode = '57014'
+
+
+def cancelled(conn):
+    raise QueryCanceled('canceling statement due to statement timeout')
+
+
+@pytest.mark.unit
+class TestFetchSections:
+
+    def test_sections_run_concurrently_on_own_connections(self, conns):
+        start = time.time()
+        results, omitted = asyncio.run(fetch_sections(
+            {'a': slow(0.2, 1), 'b': slow(0.2, 2), 'c': slow(0.2, 3)}, budget=2
+        ))
+
+        assert results == {'a': 1, 'b': 2, 'c': 3}
+        assert omitted == []
+        assert time.time() - start < 0.5
+        assert len(conns) == 3
+        assert all(conn.rolled_back for conn in conns)
+        assert all(conn.sql[0] == ("SET LOCAL statement_timeout = %s", ("2000ms",)) for conn in conns)
+
+    def test_slow_section_is_omitted(self, conns):
+        results, omitted = asyncio.run(fetch_sections(
+            {'fast': slow(0, 'ok'), 'slow': slow(0.6, 'late')}, budget=0.2
+        ))
+
+        assert results == {'fast': 'ok'}
+        assert omitted == ['slow']
+
+    def test_failing_section_is_omitted(self, conns):
+        results, omitted = asyncio.run(fetch_sections({'ok': slow(0, 1), 'bad': failing}, budget=1))
+
+        assert results == {'ok': 1}
+        assert omitted == ['bad']
+        assert all(conn.rolled_back for conn in conns)
+
+    def test_required_section_error_is_raised(self, conns):
+        with pytest.raises(RuntimeError, match='boom'):
+            asyncio.run(fetch_sections({'ok': slow(0, 1), 'person': failing}, budget=1, required=('person',)))
+
+    def test_required_section_timeout_is_omitted(self, conns):
+        results, omitted = asyncio.run(fetch_sections(
+            {'person': cancelled, 'slow': slow(0.6, 'late')}, budget=0.2, required=('person', 'slow')
+        ))
+
+        assert results == {}
+        assert omitted == ['person', 'slow']
+
+    def test_no_sections(self, conns):
+        assert asyncio.run(fetch_sections({})) == ({}, [])
+
+
+@pytest.mark.unit
+class TestCandidateData:
+    """How a failed person section maps to the API response"""
+
+    def fetch_with_person(self, monkeypatch, person):
+        async def sections(fetches, budget=None, required=()):
+            assert required == ('person',)
+            return await fetch_sections({'person': person}, budget=1, required=required)
+        monkeypatch.setattr(ai_router, 'fetch_sections', sections)
+        return asyncio.run(ai_router._fetch_candidate_data(PERSON_ID))
+
+    def test_malformed_id_is_422(self):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(ai_router._fetch_candidate_data('not-a-uuid'))
+        assert error.value.status_code == 422
+
+    def test_missing_person_is_404(self, conns, monkeypatch):
+        with pytest.raises(HTTPException) as error:
+            self.fetch_with_person(monkeypatch, lambda conn: None)
+        assert error.value.status_code == 404
+
+    def test_timeout_is_503(self, conns, monkeypatch):
+        with pytest.raises(HTTPException) as error:
+            self.fetch_with_person(monkeypatch, cancelled)
+        assert error.value.status_code == 503
+
+    def test_other_errors_surface(self, conns, monkeypatch):
+        with pytest.raises(RuntimeError, match='boom'):
+            self.fetch_with_person(monkeypatch, failing)
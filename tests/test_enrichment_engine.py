@@ -0,0 +1,135 @@
+# ABOUTME: Unit tests for EnrichmentEngine.enrich_batch (github_automation/enrichment_engine.py)
+# ABOUTME: Runs the fetch/parse/write pipeline against a fake GitHub client and a recording connection
+
+import _thread
+import threading
+import time
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from github_automation import enrichment_engine
+from github_automation.enrichment_engine import EnrichmentEngine
+
+
+class FakeClient:
+    """REST-only client (no GraphQL batching); `missing` users return None"""
+
+    def __init__(self, missing=(), on_get_user=None):
+        self.pool = type('Pool', (), {'authenticated': False})()
+        self.missing = set(missing)
+        self.on_get_user = on_get_user
+
+    def get_user(self, username):
+        if self.on_get_user:
+            self.on_get_user(username)
+        if username in self.missing:
+            return None
+        return {'login': username, 'name': username.title(), 'followers': 3, 'bio': 'Rust'}
+
+    def get_user_repos(self, username, per_page=100):
+        return [{'name': 'repo', 'stargazers_count': 5, 'language': 'Rust'}]
+
+
+class Conn:
+    """Records per-row UPDATEs; statements mentioning `fail_on` profile ids raise"""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.updated = []
+        self.commits = self.rollbacks = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        profile_id = params[-1]
+        if profile_id in self.fail_on:
+            raise RuntimeError('bad row')
+        self.updated.append(profile_id)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Engine on a FakeClient and Conn; batched writes are recorded in engine.batches"""
+    conn = Conn()
+    batches = []
+
+    def execute_values(cursor, sql, values, template=None, page_size=100):
+        ids = [row[0] for row in values]
+        if conn.fail_on & set(ids):
+            raise RuntimeError('bad row in batch')
+        batches.append(ids)
+
+    monkeypatch.setattr(enrichment_engine, 'get_db_connection', lambda use_pool=False: conn)
+    monkeypatch.setattr(enrichment_engine, 'execute_values', execute_values)
+    engine = EnrichmentEngine(github_client=FakeClient())
+    engine.batches = batches
+    return engine
+
+
+def profiles(n):
+    return [{'github_profile_id': f"id-{i}", 'github_username': f"user-{i}"} for i in range(n)]
+
+
+@pytest.mark.unit
+class TestEnrichBatch:
+
+    def test_batched_writes(self, engine):
+        stats = engine.enrich_batch(profiles(7), fetch_workers=2, write_batch_size=3, queue_size=4)
+
+        assert stats['success'] == 7 and stats['failed'] == 0
+        assert sorted(stats['enriched_ids']) == sorted(p['github_profile_id'] for p in profiles(7))
+        assert sum(len(batch) for batch in engine.batches) == 7
+        assert max(len(batch) for batch in engine.batches) <= 3
+        assert engine.conn.updated == []  # No per-row fallback
+        assert engine.stats['enriched'] == 7
+
+    def test_failed_batch_falls_back_to_rows(self, engine):
+        engine.conn.fail_on = {'id-2'}
+
+        stats = engine.enrich_batch(profiles(4), fetch_workers=1, write_batch_size=10)
+
+        assert engine.batches == []
+        assert engine.conn.rollbacks >= 1
+        assert sorted(engine.conn.updated) == ['id-0', 'id-1', 'id-3']
+        assert sorted(stats['enriched_ids']) == ['id-0', 'id-1', 'id-3']
+        assert stats['success'] == 3 and stats['failed'] == 1
+
+    def test_missing_users_and_usernames_are_failures(self, engine):
+        engine.client.missing = {'user-1'}
+        batch = profiles(3) + [{'github_profile_id': 'id-x', 'github_username': None}]
+
+        stats = engine.enrich_batch(batch, fetch_workers=2, write_batch_size=10)
+
+        assert sorted(stats['enriched_ids']) == ['id-0', 'id-2']
+        assert stats['success'] == 2 and stats['failed'] == 2
+        assert engine.stats['skipped'] == 1
+
+    def test_interrupt_after_feeding_does_not_block(self, engine):
+        # Fires Ctrl-C once every unit and SENTINEL is queued; fetch_q (size 1)
+        # has no room for a second round of sentinels
+        def interrupt_on_last(username):
+            if username == 'user-3':
+                time.sleep(0.2)
+                _thread.interrupt_main()
+
+        engine.client.on_get_user = interrupt_on_last
+        thread_count = threading.active_count()
+
+        stats = engine.enrich_batch(profiles(4), fetch_workers=2, write_batch_size=10, queue_size=1)
+
+        # Everything fetched before the interrupt is still written
+        assert sorted(stats['enriched_ids']) == ['id-0', 'id-1', 'id-2', 'id-3']
+        assert threading.active_count() == thread_count
@@ -0,0 +1,111 @@
+# ABOUTME: Unit tests for the shared entity resolution primitives
+# ABOUTME: Covers union-find clustering, blocking pair generation and MinHash LSH
+
+import zlib
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from entity_resolution import BlockIndex, MinHashLSH, UnionFind, char_ngrams, string_similarity
+
+
+@pytest.mark.unit
+class TestUnionFind:
+    """Test transitive clustering"""
+
+    def test_transitive_union(self):
+        uf = UnionFind()
+        uf.union('a', 'b')
+        uf.union('b', 'c')
+        uf.add('d')
+
+        assert uf.find('a') == uf.find('c')
+        assert uf.find('d') != uf.find('a')
+        assert sorted(map(sorted, uf.groups())) == [['a', 'b', 'c']]
+
+    def test_union_already_joined(self):
+        uf = UnionFind()
+        assert uf.union(1, 2) is True
+        assert uf.union(2, 1) is False
+
+    def test_groups_min_size(self):
+        uf = UnionFind()
+        for item in ['x', 'y', 'z']:
+            uf.add(item)
+        assert uf.groups(min_size=2) == []
+        assert len(uf.groups(min_size=1)) == 3
+
+
+@pytest.mark.unit
+class TestBlockIndex:
+    """Test candidate pair generation"""
+
+    def test_pairs_are_deduplicated(self):
+        index = BlockIndex()
+        index.add('a', ['prefix:parad', 'domain:paradigm.xyz'])
+        index.add('b', ['prefix:parad', 'domain:paradigm.xyz'])
+        index.add('c', ['prefix:coinb'])
+
+        assert list(index.candidate_pairs()) == [('a', 'b')]
+
+    def test_oversized_blocks_skipped(self):
+        index = BlockIndex(max_block_size=2)
+        for record_id in ['a', 'b', 'c']:
+            index.add(record_id, ['prefix:the'])
+
+        assert list(index.candidate_pairs()) == []
+        assert index.oversized_blocks == 1
+
+    def test_empty_keys_ignored(self):
+        index = BlockIndex()
+        index.add('a', [None, ''])
+        assert index.stats()['blocks'] == 0
+
+
+@pytest.mark.unit
+class TestMinHashLSH:
+    """Test signatures and band keys"""
+
+    def test_identical_names_share_all_bands(self):
+        lsh = MinHashLSH(num_perm=32, bands=8)
+        keys_a = lsh.band_keys(lsh.signature(char_ngrams("Paradigm Operations")))
+        keys_b = lsh.band_keys(lsh.signature(char_ngrams("paradigm  operations")))
+
+        assert len(keys_a) == 8
+        assert keys_a == keys_b
+
+    def test_similar_names_share_a_band(self):
+        lsh = MinHashLSH()
+        keys_a = set(lsh.band_keys(lsh.signature(char_ngrams("uniswap labs"))))
+        keys_b = set(lsh.band_keys(lsh.signature(char_ngrams("uniswap lab"))))
+
+        assert keys_a & keys_b
+
+    def test_signature_is_exact_universal_hash(self):
+        lsh = MinHashLSH(num_perm=8, bands=2)
+        shingles = char_ngrams("paradigm operations")
+        prime = (1 << 61) - 1
+
+        expected = [
+            min(((int(a) * zlib.crc32(s.encode('utf-8')) + int(b)) % prime) & 0xFFFFFFFF for s in shingles)
+            for a, b in zip(lsh._a, lsh._b)
+        ]
+
+        assert lsh.signature(shingles).tolist() == expected
+
+    def test_empty_input(self):
+        lsh = MinHashLSH()
+        assert lsh.signature(char_ngrams("")) is None
+        assert lsh.band_keys(None) == []
+
+    def test_bands_must_divide_permutations(self):
+        with pytest.raises(ValueError):
+            MinHashLSH(num_perm=10, bands=3)
+
+
+@pytest.mark.unit
+def test_string_similarity_ignores_token_order():
+    assert string_similarity("labs uniswap", "uniswap labs") == pytest.approx(1.0)
+    assert string_similarity("uniswap", None) == 0.0
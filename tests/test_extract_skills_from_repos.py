@@ -0,0 +1,193 @@
+# ABOUTME: Integration tests for repo-derived person skills (scripts/skills/extract_skills_from_repos.py)
+# ABOUTME: Checks the set-based bulk and incremental paths agree with the per-person path on Postgres
+
+import importlib
+import uuid
+
+import pytest
+import sys
+from pathlib import Path
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'enrichment_scripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'skills'))
+import extract_skills_from_repos
+from extract_skills_from_repos import RepoSkillExtractor
+
+# Compared columns; proficiency is compared approximately
+SKILL_COLUMNS = ('person_id', 'skill_id', 'merged_prs_count', 'repos_using_skill', 'first_seen', 'last_used')
+
+
+@pytest.fixture
+def skills_db(pg_test_conn, apply_migrations, monkeypatch):
+    """Test database with the skills tables, an in-memory checkpoint and a fresh extractor connection"""
+    pg_test_conn.cursor_factory = RealDictCursor
+    apply_migrations(
+        '08_github_pr_enrichment.sql',
+        requires=('skills', 'person_skills', 'repository_skills', 'github_contribution')
+    )
+    cursor = pg_test_conn.cursor()
+    cursor.execute("DELETE FROM github_repository WHERE full_name LIKE 'skilltest/%'")
+    pg_test_conn.commit()
+    cursor.close()
+
+    checkpoints = {}
+    monkeypatch.setattr(extract_skills_from_repos, 'get_db_connection', lambda use_pool=False: pg_test_conn)
+    monkeypatch.setattr(extract_skills_from_repos.Config, 'save_checkpoint', lambda name, data: checkpoints.update({name: data}))
+    monkeypatch.setattr(extract_skills_from_repos.Config, 'load_checkpoint', lambda name: checkpoints.get(name))
+    return pg_test_conn
+
+
+def build_fixture(conn):
+    """Two people, three repos in two test languages; returns (ada, bob) profile ids"""
+    cursor = conn.cursor()
+    for language in ('Skilltest Lang A', 'Skilltest Lang B'):
+        cursor.execute("""
+            INSERT INTO skills (skill_name, category) VALUES (%s, 'language')
+            ON CONFLICT (skill_name) DO UPDATE SET category = 'language'
+        """, (language,))
+
+    repos = []
+    for name, language in (('alpha', 'Skilltest Lang A'), ('beta', 'Skilltest Lang A'), ('gamma', 'Skilltest Lang B')):
+        cursor.execute("""
+            INSERT INTO github_repository (repo_name, full_name, language)
+            VALUES (%s, %s, %s) RETURNING repo_id
+        """, (name, f"skilltest/{name}", language))
+        repos.append(cursor.fetchone()['repo_id'])
+
+    profiles = []
+    for name in ('ada', 'bob'):
+        url = f"https://www.linkedin.com/in/skilltest-{name}"
+        cursor.execute("""
+            INSERT INTO person (full_name, linkedin_url, normalized_linkedin_url)
+            VALUES (%s, %s, %s) RETURNING person_id
+        """, (name, url, url))
+        person_id = cursor.fetchone()['person_id']
+        cursor.execute("""
+            INSERT INTO github_profile (person_id, github_username)
+            VALUES (%s, %s) RETURNING github_profile_id
+        """, (person_id, f"skilltest-{name}-{uuid.uuid4().hex[:8]}"))
+        profiles.append(cursor.fetchone()['github_profile_id'])
+
+    alpha, beta, gamma = repos
+    ada, bob = profiles
+    cursor.executemany("""
+        INSERT INTO github_contribution (
+            github_profile_id, repo_id, contribution_count, merged_pr_count,
+            first_contribution_date, last_contribution_date
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+    """, [
+        (ada, alpha, 250, 4, '2021-01-10', '2024-06-01'),
+        (ada, beta, 3000, 12, '2019-03-02', '2025-02-14'),
+        (ada, gamma, 40, 0, '2023-07-07', '2023-09-30'),
+        (bob, gamma, 900, 7, '2020-05-05', '2025-08-20'),
+    ])
+    conn.commit()
+    cursor.close()
+    return ada, bob
+
+
+class Batcher:
+    batch_size = 25
+
+    def log_stats(self):
+        pass
+
+
+def pr_data(repo_name, merged_count):
+    """parse_pr_data output for one merged-PR repo"""
+    return {
+        'merged_prs': merged_count, 'is_pro': False, 'total_lines_added': 120, 'total_stars_earned': 0,
+        'last_merged_date': None,
+        'repos': {repo_name: {
+            'pr_count': merged_count, 'merged_count': merged_count, 'open_count': 0, 'closed_unmerged': 0,
+            'lines_added': 120, 'lines_deleted': 10, 'files_changed': 4, 'is_fork': False
+        }}
+    }
+
+
+def run_pr_enrichment(monkeypatch, connection_params, results):
+    """Run 07_github_pr_enrichment.py's writer on its own connection with canned GraphQL results"""
+    monkeypatch.setenv('GITHUB_TOKEN', 'test-token')
+    pr_enrichment = importlib.import_module('07_github_pr_enrichment')
+    conn = psycopg2.connect(**connection_params)
+    monkeypatch.setattr(pr_enrichment, 'get_batcher', lambda batch_size=25: Batcher())
+    monkeypatch.setattr(pr_enrichment, 'fetch_github_pr_data_batch', lambda usernames, batch_size=25: {u: results.get(u) for u in usernames})
+    monkeypatch.setattr(pr_enrichment.Config, 'get_pooled_connection', lambda: conn)
+    monkeypatch.setattr(pr_enrichment.Config, 'return_connection', lambda c: c.close())
+    pr_enrichment.enrich_github_profiles(batch_size=10)
+
+
+def person_skills(conn, profile_ids):
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT {', '.join('ps.' + c for c in SKILL_COLUMNS)}, ps.proficiency_score
+        FROM person_skills ps
+        JOIN github_profile gp ON gp.person_id = ps.person_id
+        WHERE gp.github_profile_id = ANY(%s::uuid[])
+        ORDER BY ps.person_id, ps.skill_id
+    """, ([str(p) for p in profile_ids],))
+    rows = [dict(row) for row in cursor.fetchall()]
+    cursor.close()
+    return rows
+
+
+def assert_same_skills(actual, expected):
+    assert [tuple(r[c] for c in SKILL_COLUMNS) for r in actual] == [tuple(r[c] for c in SKILL_COLUMNS) for r in expected]
+    assert [r['proficiency_score'] for r in actual] == pytest.approx([r['proficiency_score'] for r in expected])
+
+
+def clear_person_skills(conn, profile_ids):
+    cursor = conn.cursor()
+    cursor.execute("""
+        DELETE FROM person_skills ps USING github_profile gp
+        WHERE gp.person_id = ps.person_id AND gp.github_profile_id = ANY(%s::uuid[])
+    """, ([str(p) for p in profile_ids],))
+    conn.commit()
+    cursor.close()
+
+
+@pytest.mark.integration
+class TestPersonSkillPaths:
+
+    def test_bulk_matches_per_person(self, skills_db):
+        profiles = build_fixture(skills_db)
+        extractor = RepoSkillExtractor()
+        extractor.tag_repositories_with_skills()
+
+        extractor.compute_person_skills_from_repos()
+        per_person = person_skills(skills_db, profiles)
+        clear_person_skills(skills_db, profiles)
+
+        extractor.compute_person_skills_bulk()
+
+        assert len(per_person) == 3
+        assert_same_skills(person_skills(skills_db, profiles), per_person)
+        assert not extractor.stats['errors']
+
+    def test_incremental_picks_up_pr_enrichment(self, skills_db, pg_test_connection_params, monkeypatch):
+        ada, bob = profiles = build_fixture(skills_db)
+        extractor = RepoSkillExtractor()
+        extractor.tag_repositories_with_skills()
+        extractor.compute_person_skills_incremental()
+        before = person_skills(skills_db, [bob])
+
+        cursor = skills_db.cursor()
+        cursor.execute("SELECT github_username FROM github_profile WHERE github_profile_id = %s", (ada,))
+        username = cursor.fetchone()['github_username']
+        skills_db.commit()
+        cursor.close()
+        # The real contribution writer; bob's lookup fails and leaves his rows alone
+        run_pr_enrichment(monkeypatch, pg_test_connection_params, {username: pr_data('skilltest/alpha', 30)})
+
+        assert extractor.compute_person_skills_incremental() == 1
+        incremental = person_skills(skills_db, profiles)
+        clear_person_skills(skills_db, profiles)
+        extractor.compute_person_skills_from_repos()
+        per_person = person_skills(skills_db, profiles)
+
+        # Proficiency blends with the stored score on update, so only the recomputed facts are compared
+        keys = [tuple(r[c] for c in SKILL_COLUMNS) for r in incremental]
+        assert keys == [tuple(r[c] for c in SKILL_COLUMNS) for r in per_person]
+        assert [r for r in incremental if r['person_id'] == before[0]['person_id']] == before
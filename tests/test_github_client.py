@@ -0,0 +1,589 @@
+# ABOUTME: Unit tests for GitHub API rate limiting, the credential pool, the ETag cache,
+# ABOUTME: GraphQL batching and the async client
+# ABOUTME: Runs the clients against the local mock GitHub server
+
+import asyncio
+import threading
+import time
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from github_automation.rate_limiter import TokenBucket, retry_delay
+from github_automation.credential_pool import CredentialPool, resource_for
+from github_automation.http_cache import ResponseCache
+from github_automation.config import GitHubAutomationConfig
+from github_automation.graphql_batcher import (
+    GraphQLUserBatcher, build_query, estimate_cost, to_rest_repos, to_rest_user
+)
+from github_automation.async_client import AsyncGitHubClient
+from github_automation.github_client import GitHubClient
+from github_automation.mock_server import MockGitHubServer
+from github_automation.pipeline import MeteredQueue, StageMetrics
+from github_automation.repo_sync import RepoSyncTracker, contributors_hash
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    """Keep clients off the real on-disk cache unless a test passes one"""
+    monkeypatch.setattr(GitHubAutomationConfig, 'HTTP_CACHE_ENABLED', False)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / 'http_cache.sqlite3')
+    yield cache
+    cache.close()
+
+
+class NullConnection:
+    """DB connection stand-in: accepts writes, stores nothing"""
+
+    class _Cursor:
+        def execute(self, sql, params=None):
+            pass
+
+        def fetchone(self):
+            return None
+
+        def fetchall(self):
+            return []
+
+        def close(self):
+            pass
+
+    def cursor(self):
+        return self._Cursor()
+
+
+@pytest.fixture
+def mock_server():
+    server = MockGitHubServer(latency=0.01).start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test adaptive token bucket"""
+
+    def test_burst_then_paced(self):
+        clock = FakeClock()
+        bucket = TokenBucket(buffer=0, burst=3, max_rate=2, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+
+        clock.now += 0.5
+        assert bucket.try_acquire() == 0
+
+    def test_waits_for_reset_when_quota_exhausted(self):
+        clock = FakeClock()
+        bucket = TokenBucket(buffer=10, burst=5, clock=clock)
+        bucket.update({'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': str(int(clock.now + 120))})
+
+        assert bucket.try_acquire() == pytest.approx(121)
+
+        clock.now += 121
+        assert bucket.try_acquire() == 0
+
+    def test_out_of_order_headers_keep_lowest_remaining(self):
+        bucket = TokenBucket()
+        reset = '2000000000'
+        bucket.update({'X-RateLimit-Remaining': '400', 'X-RateLimit-Reset': reset})
+        bucket.update({'X-RateLimit-Remaining': '450', 'X-RateLimit-Reset': reset})
+        assert bucket.remaining == 400
+
+        bucket.update({'X-RateLimit-Remaining': '4999', 'X-RateLimit-Reset': '2000003600'})
+        assert bucket.remaining == 4999
+
+    def test_secondary_limit_pauses_and_slows(self):
+        clock = FakeClock()
+        bucket = TokenBucket(burst=5, max_rate=10, clock=clock)
+
+        bucket.pause(30)
+        assert bucket.try_acquire() == pytest.approx(30)
+        assert bucket.rate == 5
+
+        bucket.record_success()
+        assert bucket.rate == pytest.approx(5.1)
+
+
+@pytest.mark.unit
+class TestRetryDelay:
+    """Test rate-limit response classification"""
+
+    def test_retry_after_header(self):
+        assert retry_delay(403, {'Retry-After': '42'}, '', attempt=0) == 42
+
+    def test_secondary_limit_backs_off_exponentially(self):
+        body = 'You have exceeded a secondary rate limit'
+        assert retry_delay(403, {}, body, attempt=2) == 4 * retry_delay(403, {}, body, attempt=0)
+
+    def test_primary_limit_waits_for_reset(self):
+        headers = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '1000100'}
+        assert retry_delay(403, headers, 'API rate limit exceeded', 0, now=1000000) == 101
+
+    def test_not_rate_limited(self):
+        assert retry_delay(404, {}, 'Not Found', 0) is None
+        assert retry_delay(403, {}, 'Resource not accessible', 0) is None
+
+
+def _quota(remaining, resource='core', limit=5000):
+    return {
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(int(time.time()) + 3600),
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Resource': resource,
+    }
+
+
+@pytest.mark.unit
+class TestCredentialPool:
+    """Test routing requests across tokens"""
+
+    def test_resource_for_endpoint(self):
+        assert resource_for('/users/octocat') == 'core'
+        assert resource_for('/search/users') == 'search'
+        assert resource_for('/graphql') == 'graphql'
+
+    def test_routes_to_most_headroom(self):
+        pool = CredentialPool.from_tokens(['aaaa', 'bbbb', 'cccc'])
+        first, second, third = pool.credentials
+        pool.update(first, _quota(300))
+        pool.update(second, _quota(4000))
+        pool.update(third, _quota(1200))
+
+        credential, wait = pool.try_acquire('core')
+
+        assert credential is second
+        assert wait == 0
+
+    def test_duplicate_tokens_collapsed(self):
+        assert len(CredentialPool.from_tokens(['aaaa', None, 'aaaa', 'bbbb'])) == 2
+
+    def test_resources_tracked_separately(self):
+        pool = CredentialPool.from_tokens(['aaaa', 'bbbb'])
+        first, second = pool.credentials
+        # First token has spent its search quota but not its REST quota
+        pool.update(first, _quota(0, 'search', limit=30))
+        pool.update(first, _quota(4900))
+        pool.update(second, _quota(30, 'search', limit=30))
+        pool.update(second, _quota(200))
+
+        assert pool.try_acquire('search')[0] is second
+        assert pool.try_acquire('core')[0] is first
+
+    def test_waits_only_when_all_exhausted(self):
+        pool = CredentialPool.from_tokens(['aaaa', 'bbbb'])
+        for credential in pool.credentials:
+            pool.update(credential, _quota(5))
+
+        credential, wait = pool.try_acquire('core')
+
+        assert credential is None
+        assert wait > 3000
+
+    def test_utilization_totals(self):
+        pool = CredentialPool.from_tokens(['aaaa', 'bbbb'])
+        pool.update(pool.credentials[0], _quota(2500))
+
+        core = pool.utilization()['resources']['core']
+
+        assert core['limit'] == 10000
+        assert core['remaining'] == 7500
+        assert core['used_pct'] == 25.0
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test the conditional-request cache"""
+
+    def test_key_depends_on_scope_and_params(self):
+        base = ResponseCache.key('a', 'https://x/users/u', {'page': 1, 'per_page': 100})
+        assert base == ResponseCache.key('a', 'https://x/users/u', {'per_page': 100, 'page': 1})
+        assert base != ResponseCache.key('b', 'https://x/users/u', {'page': 1, 'per_page': 100})
+        assert base != ResponseCache.key('a', 'https://x/users/u', {'page': 2, 'per_page': 100})
+
+    def test_store_and_validators(self, cache):
+        key = cache.key('scope', 'https://x/users/u')
+        cache.store(key, 'https://x/users/u', {'ETag': '"abc"'}, '{"login": "u"}')
+
+        cached = cache.lookup(key)
+
+        assert cached.validators() == {'If-None-Match': '"abc"'}
+        assert cached.json() == {'login': 'u'}
+
+    def test_responses_without_validators_not_stored(self, cache):
+        key = cache.key('scope', 'https://x/search/users')
+        cache.store(key, 'https://x/search/users', {}, '{}')
+
+        assert cache.lookup(key) is None
+        assert cache.get_stats()['misses'] == 1
+
+    def test_expired_entries_are_ignored_and_pruned(self, cache):
+        key = cache.key('scope', 'https://x/users/u')
+        cache.store(key, 'https://x/users/u', {'ETag': '"abc"'}, '{}')
+
+        cache.ttl_seconds = -1
+        assert cache.lookup(key) is None
+        assert cache.prune() == 1
+        assert cache.get_stats()['entries'] == 0
+
+    def test_size_bound_evicts_least_recently_validated(self, tmp_path, monkeypatch):
+        cache = ResponseCache(tmp_path / 'bounded.sqlite3', max_entries=2)
+        clock = iter(range(1_000_000_000, 1_000_000_100))
+        monkeypatch.setattr('github_automation.http_cache.time.time', lambda: next(clock))
+        keys = [cache.key('scope', f"https://x/users/{name}") for name in ('a', 'b', 'c')]
+        for key in keys:
+            cache.store(key, 'https://x/users', {'ETag': '"e"'}, '{}')
+        cache.record_hit(keys[0])  # 'a' was used last, so 'b' goes
+
+        assert cache.prune() == 1
+        assert [cache.lookup(key) is not None for key in keys] == [True, False, True]
+        cache.close()
+
+    def test_hits_count_as_quota_saved(self, cache):
+        key = cache.key('scope', 'https://x/users/u')
+        cache.store(key, 'https://x/users/u', {'ETag': '"abc"'}, '{}')
+        cache.record_hit(key)
+        cache.record_hit(key)
+
+        stats = cache.get_stats()
+
+        assert stats['quota_saved'] == 2
+        assert stats['entries'] == 1
+        assert stats['hit_rate'] == round(2 / 3, 3)
+
+
+class FakeGraphQLClient:
+    """Answers aliased user queries; fails queries with more than max_users aliases"""
+
+    def __init__(self, max_users=100, missing=(), erroring=()):
+        self.max_users = max_users
+        self.missing = set(missing)
+        self.erroring = set(erroring)
+        self.queries = []
+
+    def graphql(self, query, variables):
+        aliases = {k: v for k, v in variables.items() if k.startswith('u')}
+        self.queries.append(len(aliases))
+        if len(aliases) > self.max_users:
+            return None
+
+        data, errors = {'rateLimit': {'cost': 1, 'remaining': 4999}}, []
+        for alias, login in aliases.items():
+            if login in self.missing:
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias], 'message': 'not found'})
+            elif login in self.erroring and len(aliases) > 1:
+                data[alias] = None
+                errors.append({'path': [alias, 'contributionsCollection'], 'message': 'timeout'})
+            else:
+                data[alias] = {'login': login}
+        return {'data': data, 'errors': errors}
+
+
+@pytest.mark.unit
+class TestGraphQLUserBatcher:
+    """Test aliased GraphQL batching"""
+
+    def test_query_aliases_match_variables(self):
+        query = build_query(3)
+        assert 'u2: user(login: $u2)' in query
+        assert '$u0: String!' in query
+        assert 'fragment UserFields on User' in query
+
+    def test_batch_size_fits_cost_budget(self):
+        batcher = GraphQLUserBatcher(FakeGraphQLClient(), batch_size=500, max_cost=2)
+        assert estimate_cost(batcher.batch_size) <= 2
+        assert estimate_cost(batcher.batch_size + 1) > 2
+
+    def test_packs_users_into_few_queries(self):
+        client = FakeGraphQLClient()
+        batcher = GraphQLUserBatcher(client, batch_size=25)
+
+        results = batcher.fetch_users([f"user-{i}" for i in range(60)])
+
+        assert client.queries == [25, 25, 10]
+        assert all(results[f"user-{i}"]['login'] == f"user-{i}" for i in range(60))
+        assert batcher.get_stats()['points_used'] == 3
+
+    def test_failed_query_is_split(self):
+        client = FakeGraphQLClient(max_users=10)
+        batcher = GraphQLUserBatcher(client, batch_size=25)
+
+        results = batcher.fetch_users([f"user-{i}" for i in range(40)])
+
+        assert len([r for r in results.values() if r]) == 40
+        assert batcher.batch_size <= 10
+        assert batcher.stats['splits'] >= 1
+
+    def test_missing_and_erroring_aliases(self):
+        client = FakeGraphQLClient(missing={'ghost'}, erroring={'flaky'})
+        batcher = GraphQLUserBatcher(client, batch_size=25)
+
+        results = batcher.fetch_users(['alice', 'ghost', 'flaky', 'bob'])
+
+        assert results['ghost'] is None
+        assert results['flaky'] == {'login': 'flaky'}
+        assert client.queries == [4, 1]
+        assert batcher.stats['not_found'] == 1
+        assert batcher.stats['alias_retries'] == 1
+
+    def test_failed_users_are_left_out(self):
+        batcher = GraphQLUserBatcher(FakeGraphQLClient(max_users=0), batch_size=25)
+
+        results = batcher.fetch_users(['alice', 'bob'])
+
+        assert results == {}  # Unlike not-found users, which map to None
+        assert batcher.stats['failed'] == 2
+
+    def test_rest_adapters(self):
+        node = {
+            'login': 'octocat', 'name': 'Octo Cat', 'email': '', 'websiteUrl': 'https://octo.cat',
+            'followers': {'totalCount': 10}, 'following': {'totalCount': 2},
+            'repositories': {'totalCount': 250, 'nodes': [
+                {'name': 'hello', 'stargazerCount': 80, 'primaryLanguage': {'name': 'Rust'}},
+                {'name': 'docs', 'stargazerCount': 3, 'primaryLanguage': None},
+            ]},
+        }
+
+        user = to_rest_user(node)
+        repos = to_rest_repos(node)
+
+        assert user['email'] is None
+        assert user['blog'] == 'https://octo.cat'
+        assert user['followers'] == 10
+        assert user['public_repos'] == 250
+        assert repos[0] == {'name': 'hello', 'stargazers_count': 80, 'forks_count': 0,
+                            'fork': False, 'language': 'Rust'}
+        assert repos[1]['language'] is None
+
+
+@pytest.mark.unit
+class TestPipelineMetrics:
+    """Queue and stage metrics behind EnrichmentEngine.enrich_batch"""
+
+    def test_queue_tracks_depth(self):
+        q = MeteredQueue('fetch', 10)
+        for i in range(3):
+            q.put(i)
+        q.get()
+        q.put(3)
+
+        snapshot = q.snapshot()
+        assert snapshot['max_depth'] == 3
+        assert snapshot['depth'] == 3
+        assert snapshot['avg_depth'] == pytest.approx(2.25, abs=0.05)
+        assert snapshot['blocked_puts'] == 0
+
+    def test_full_queue_blocks_producer(self):
+        q = MeteredQueue('write', 1)
+        q.put('a')
+
+        threading.Timer(0.1, q.get).start()
+        q.put('b')  # Waits until the consumer frees a slot
+
+        snapshot = q.snapshot()
+        assert snapshot['blocked_puts'] == 1
+        assert snapshot['blocked_seconds'] >= 0.05
+
+    def test_stage_throughput_and_utilization(self):
+        stage = StageMetrics('fetch', workers=2)
+        stage.started -= 10  # Pretend the stage ran for 10s
+        stage.record(40, 5.0)
+        stage.record(60, 5.0)
+        stage.finish()
+
+        snapshot = stage.snapshot()
+        assert snapshot['items'] == 100
+        assert snapshot['items_per_second'] == pytest.approx(10.0, rel=0.01)
+        # 10 busy seconds across 2 workers over 10s
+        assert snapshot['utilization'] == pytest.approx(0.5, rel=0.01)
+
+
+@pytest.mark.unit
+class TestClientsAgainstMockServer:
+    """Sync and async clients share one interface"""
+
+    def test_async_client_fetches_concurrently(self, mock_server):
+        async def run():
+            async with AsyncGitHubClient(token='test', base_url=mock_server.base_url,
+                                         max_concurrency=8) as client:
+                users = await client.map(client.get_user, [f"user-{i}" for i in range(20)])
+                repos = await client.get_user_repos('user-0', per_page=5)
+                return users, repos, client.get_stats()
+
+        users, repos, stats = asyncio.run(run())
+
+        assert [u['login'] for u in users] == [f"user-{i}" for i in range(20)]
+        assert len(repos) == mock_server.repos_per_owner
+        assert stats['rate_limit_remaining'] is not None
+
+    def test_async_client_retries_secondary_limit(self, mock_server):
+        mock_server.secondary_every = 3
+
+        async def run():
+            async with AsyncGitHubClient(token='test', base_url=mock_server.base_url) as client:
+                users = [await client.get_user(f"user-{i}") for i in range(4)]
+                return users, client.stats
+
+        users, stats = asyncio.run(run())
+
+        assert all(users)
+        assert stats['rate_limit_waits'] >= 1
+
+    def test_sync_client_same_results(self, mock_server):
+        client = GitHubClient(token='test', base_url=mock_server.base_url)
+        try:
+            assert client.get_user('user-1')['login'] == 'user-1'
+            assert client.get('/does/not/exist') is None
+            assert len(client.get_repo_contributors('org', 'repo')) == 100
+        finally:
+            client.close()
+
+    def test_sync_client_threads_get_their_own_session(self, mock_server):
+        client = GitHubClient(token='test', base_url=mock_server.base_url)
+        requests_before = client.get_stats()['requests']
+        sessions = {}
+
+        def fetch(worker):
+            sessions[worker] = client.session
+            for i in range(10):
+                assert client.get_user(f"user-{worker}-{i}")
+            assert client.session is sessions[worker]
+
+        threads = [threading.Thread(target=fetch, args=(worker,)) for worker in range(4)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            client.close()
+
+        assert len({id(session) for session in sessions.values()}) == 4
+        assert client.get_stats()['requests'] - requests_before == 40
+
+    def test_sync_client_rotates_tokens(self, mock_server):
+        # Token "low" starts nearly exhausted, so requests drain "high" first
+        mock_server.set_remaining('low', 150)
+        pool = CredentialPool.from_tokens(['high', 'low'])
+        client = GitHubClient(base_url=mock_server.base_url, pool=pool)
+        try:
+            for i in range(10):
+                assert client.get_user(f"user-{i}")
+        finally:
+            client.close()
+
+        assert mock_server.requests_by_token.get('token high') == 10
+        assert 'token low' not in mock_server.requests_by_token
+        assert client.get_stats()['credential_pool']['core']['remaining'] == 5000 - 10 + 150
+
+    def test_sync_client_reuses_not_modified(self, mock_server, cache):
+        client = GitHubClient(token='test', base_url=mock_server.base_url, cache=cache)
+        try:
+            first = client.get_user_repos('octocat')
+            second = client.get_user_repos('octocat')
+        finally:
+            client.close()
+
+        assert first == second
+        assert mock_server.not_modified == 1
+        assert cache.get_stats()['quota_saved'] == 1
+
+    def test_cache_shared_between_clients(self, mock_server, cache):
+        async def run():
+            async with AsyncGitHubClient(token='test', base_url=mock_server.base_url,
+                                         cache=cache) as client:
+                return await client.get_user('octocat')
+
+        sync_client = GitHubClient(token='test', base_url=mock_server.base_url, cache=cache)
+        try:
+            assert sync_client.get_user('octocat')['login'] == 'octocat'
+        finally:
+            sync_client.close()
+
+        assert asyncio.run(run())['login'] == 'octocat'
+        assert mock_server.not_modified == 1
+
+    def test_graphql_batch_against_mock_server(self, mock_server):
+        mock_server.graphql_max_users = 10
+        client = GitHubClient(token='test', base_url=mock_server.base_url)
+        try:
+            batcher = GraphQLUserBatcher(client, batch_size=25)
+            results = batcher.fetch_users([f"dev-{i}" for i in range(30)] + ['ghost-1', 'flaky-1'])
+        finally:
+            client.close()
+
+        assert results['ghost-1'] is None
+        assert results['flaky-1']['login'] == 'flaky-1'
+        assert all(results[f"dev-{i}"]['repositories']['nodes'] for i in range(30))
+        # 25 fails and halves (12 still fails -> 6 + 6, then 13 -> 6 + 7); later batches use 6.
+        # Each failed batch is sent once - the client doesn't retry GraphQL 502s before the split
+        assert mock_server.graphql_queries == [25, 12, 6, 6, 13, 6, 7, 6, 1]
+        assert batcher.batch_size == 6
+        assert batcher.get_stats()['splits'] == 3
+
+    def test_repo_sync_skips_unchanged_repo(self, mock_server):
+        client = GitHubClient(token='test', base_url=mock_server.base_url)
+        tracker = RepoSyncTracker(NullConnection(), client)
+        try:
+            assert tracker.check('repo-1', 'org/repo')  # Never synced
+            contributors = client.get_repo_contributors('org', 'repo')
+            tracker.record('repo-1', contributors)
+
+            assert not tracker.check('repo-1', 'org/repo')  # 304 on the stored ETag
+            assert tracker.delta('repo-1', contributors) == []
+
+            mock_server.pushed_at['org/repo'] = '2025-06-01T00:00:00Z'
+            assert tracker.check('repo-1', 'org/repo')  # New push
+        finally:
+            client.close()
+
+        stats = tracker.get_stats()
+        assert mock_server.not_modified == 1
+        assert stats['repos_checked'] == 3
+        assert stats['repos_skipped'] == 1
+        assert stats['api_calls_saved'] == 1  # One page of 100 contributors
+
+    def test_repo_sync_dry_run_writes_nothing(self):
+        class Client:
+            def get_if_changed(self, path, etag):
+                return False, None, etag
+
+        class RecordingConnection(NullConnection):
+            statements = []
+
+            def cursor(self):
+                cursor = NullConnection._Cursor()
+                cursor.execute = lambda sql, params=None: self.statements.append(sql)
+                return cursor
+
+        conn = RecordingConnection()
+        tracker = RepoSyncTracker(conn, Client(), dry_run=True)
+        tracker._states['repo-1'] = {'etag': '"v1"', 'pushed_at': None,
+                                     'contributors_hash': 'abc', 'contributor_count': 1}
+
+        assert not tracker.check('repo-1', 'org/repo')
+        tracker.record('repo-1', [{'login': 'alice', 'contributions': 1}])
+
+        assert conn.statements == []
+
+    def test_contributors_hash_ignores_order(self):
+        contributors = [{'login': 'Alice', 'contributions': 5}, {'login': 'bob', 'contributions': 2}]
+        assert contributors_hash(contributors) == contributors_hash(contributors[::-1])
+        assert contributors_hash(contributors) != contributors_hash(
+            [{'login': 'alice', 'contributions': 6}, {'login': 'bob', 'contributions': 2}]
+        )
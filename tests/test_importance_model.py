@@ -0,0 +1,130 @@
+# ABOUTME: Unit tests for the vectorized importance-score model
+# ABOUTME: Checks parity with the SQL scoring functions and weight overrides
+
+import pytest
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "analytics"))
+from importance_model import (
+    DEFAULT_REPOSITORY_WEIGHTS,
+    merge_weights,
+    score_repositories,
+    score_developers,
+    compare_scores
+)
+
+
+def repo_frame(**overrides):
+    row = {
+        'repo_id': 'r1',
+        'stars': 0,
+        'forks': 0,
+        'contributor_count': 0,
+        'ecosystem_count': 0,
+        'days_since_push': float('nan')
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def developer_frame(**overrides):
+    row = {
+        'github_profile_id': 'd1',
+        'followers': 0,
+        'total_merged_prs': 0,
+        'total_lines_contributed': 0,
+        'repo_count': 0,
+        'total_contributions': 0,
+        'ecosystem_count': 0,
+        'orbit_count': 0
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+@pytest.mark.unit
+class TestRepositoryScoring:
+    """Vectorized scores should match compute_repository_importance()"""
+
+    def test_empty_repo_scores_zero(self):
+        assert score_repositories(repo_frame())[0] == 0
+
+    def test_linear_terms(self):
+        # 500/100 + 100/50 + 30/10 = 5 + 2 + 3
+        df = repo_frame(stars=500, forks=100, contributor_count=30)
+        assert score_repositories(df)[0] == pytest.approx(10.0)
+
+    def test_linear_terms_are_capped(self):
+        df = repo_frame(stars=1_000_000, forks=1_000_000, contributor_count=1_000_000)
+        assert score_repositories(df)[0] == pytest.approx(90.0)
+
+    def test_ecosystem_bonus(self):
+        assert score_repositories(repo_frame(ecosystem_count=3))[0] == pytest.approx(10.0)
+
+    def test_recency_decay(self):
+        df = pd.concat([
+            repo_frame(days_since_push=0.0),
+            repo_frame(days_since_push=182.5),
+            repo_frame(days_since_push=1000.0)
+        ])
+        scores = score_repositories(df)
+        assert scores[0] == pytest.approx(10.0)
+        assert scores[1] == pytest.approx(5.0)
+        assert scores[2] == pytest.approx(0.0)
+
+    def test_total_capped_at_max(self):
+        df = repo_frame(stars=10**7, forks=10**7, contributor_count=10**7,
+                        ecosystem_count=1, days_since_push=0.0)
+        assert score_repositories(df)[0] == pytest.approx(100.0)
+
+
+@pytest.mark.unit
+class TestDeveloperScoring:
+    """Vectorized scores should match compute_developer_importance()"""
+
+    def test_linear_terms(self):
+        # 100/50 + 20/10 + 10000/5000 + 10/5 = 2 + 2 + 2 + 2
+        df = developer_frame(followers=100, total_merged_prs=20,
+                             total_lines_contributed=10000, repo_count=10)
+        assert score_developers(df)[0] == pytest.approx(8.0)
+
+    def test_ecosystem_points_capped(self):
+        assert score_developers(developer_frame(ecosystem_count=2))[0] == pytest.approx(10.0)
+        assert score_developers(developer_frame(ecosystem_count=9))[0] == pytest.approx(15.0)
+
+    def test_orbit_bonus(self):
+        assert score_developers(developer_frame(orbit_count=4))[0] == pytest.approx(5.0)
+
+
+@pytest.mark.unit
+class TestWeightOverrides:
+    """What-if weights should merge onto the defaults"""
+
+    def test_merge_keeps_unspecified_terms(self):
+        weights = merge_weights(DEFAULT_REPOSITORY_WEIGHTS, {'linear': {'stars': [10, 5]}})
+        assert weights['linear']['stars'] == [10, 5]
+        assert weights['linear']['forks'] == DEFAULT_REPOSITORY_WEIGHTS['linear']['forks']
+        # Defaults must not be mutated
+        assert DEFAULT_REPOSITORY_WEIGHTS['linear']['stars'] == [100.0, 50.0]
+
+    def test_new_feature_can_be_weighted(self):
+        weights = {'linear': {'total_contributions': [100, 10]}, 'points_per_ecosystem': 0,
+                   'ecosystem_cap': 0, 'orbit_bonus': 0, 'max_score': 100}
+        df = developer_frame(total_contributions=500)
+        assert score_developers(df, weights)[0] == pytest.approx(5.0)
+
+    def test_unknown_feature_raises(self):
+        weights = merge_weights(DEFAULT_REPOSITORY_WEIGHTS, {'linear': {'watchers': [1, 1]}})
+        with pytest.raises(KeyError):
+            score_repositories(repo_frame(), weights)
+
+    def test_compare_scores(self):
+        baseline = pd.DataFrame({'repo_id': ['a', 'b'], 'importance_score': [1.0, 2.0]})
+        candidate = pd.DataFrame({'repo_id': ['a', 'b'], 'importance_score': [1.0, 4.0]})
+        summary = compare_scores(baseline, candidate, 'repo_id', top_n=1)
+        assert summary['changed'] == 1
+        assert summary['max_increase'] == pytest.approx(2.0)
+        assert summary['top_1_overlap'] == 1
@@ -0,0 +1,201 @@
+# ABOUTME: Unit tests for the LLM response cache (api/services/llm_cache.py)
+# ABOUTME: Covers prompt fingerprints, subject versions, hit/miss accounting, invalidation on store and per-call usage
+
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from api.services import llm_cache
+from api.services.ai_service import AIService
+from api.services.llm_cache import LLMCache, context_version, estimate_cost, fingerprint
+
+MESSAGES = [
+    {"role": "system", "content": "You are a recruiter."},
+    {"role": "user", "content": "Name: Ada\nCurrent Role: Engineer"}
+]
+
+
+class Conn:
+    """Fake pooled connection: records SQL, returns `row` from fetchone"""
+
+    def __init__(self, row=None, fail=False):
+        self.row = row
+        self.fail = fail
+        self.sql = []
+        self.rowcount = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        if self.fail:
+            raise RuntimeError('database down')
+        self.sql.append((' '.join(sql.split()), params))
+
+    def fetchone(self):
+        return self.row
+
+    def fetchall(self):
+        return []
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def use_conn(monkeypatch):
+    def install(conn):
+        @contextmanager
+        def get_db_context():
+            yield conn
+        monkeypatch.setattr(llm_cache, 'get_db_context', get_db_context)
+        return conn
+    return install
+
+
+@pytest.mark.unit
+class TestFingerprint:
+
+    def test_formatting_and_key_order_do_not_change_the_key(self):
+        reformatted = [
+            {"content": "You are a  recruiter. ", "role": "system"},
+            {"role": "user", "content": "Name: Ada\n\nCurrent Role:   Engineer"}
+        ]
+
+        assert fingerprint("openai", "gpt-4o-mini", "question", 1, MESSAGES) == \
+            fingerprint("openai", "gpt-4o-mini", "question", 1, reformatted)
+
+    def test_model_version_and_content_change_the_key(self):
+        base = fingerprint("openai", "gpt-4o-mini", "question", 1, MESSAGES)
+        changed = [{"role": "user", "content": "Name: Grace"}]
+
+        assert base != fingerprint("anthropic", "gpt-4o-mini", "question", 1, MESSAGES)
+        assert base != fingerprint("openai", "gpt-4o", "question", 1, MESSAGES)
+        assert base != fingerprint("openai", "gpt-4o-mini", "question", 2, MESSAGES)
+        assert base != fingerprint("openai", "gpt-4o-mini", "question", 1, changed)
+
+    def test_context_version_ignores_omitted_sections(self):
+        data = {"person": {"person_id": "p1", "full_name": "Ada"}, "employment": []}
+
+        assert context_version(data) == context_version({**data, "omitted_sections": []})
+        assert context_version(data) != context_version({**data, "employment": [{"title": "CTO"}]})
+
+    def test_cost_estimate(self):
+        assert estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000) == pytest.approx(0.75)
+        assert estimate_cost("unknown-model", 1000, 1000) == 0.0
+
+
+@pytest.mark.unit
+class TestLookups:
+
+    def test_hit_reports_savings(self, use_conn):
+        use_conn(Conn(row={
+            'response': 'cached answer', 'latency_ms': 2500,
+            'prompt_tokens': 900, 'completion_tokens': 100, 'cost_usd': 0.01
+        }))
+        cache = LLMCache()
+
+        assert cache.get('key', 'question') == 'cached answer'
+        session = cache.stats()['session']['question']
+        assert session['hits'] == 1 and session['hit_rate'] == 100.0
+        assert session['latency_saved_seconds'] == 2.5
+        assert session['tokens_saved'] == 1000
+
+    def test_miss_and_database_errors_count_as_misses(self, use_conn):
+        cache = LLMCache()
+        use_conn(Conn(row=None))
+        assert cache.get('key', 'question') is None
+        use_conn(Conn(fail=True))
+        assert cache.get('key', 'question') is None
+
+        assert cache.stats()['session']['question']['misses'] == 2
+
+    def test_store_drops_older_versions_of_the_subject(self, use_conn):
+        conn = use_conn(Conn())
+        stored = LLMCache(ttl_hours=24).put(
+            'key', 'answer', provider='openai', model='gpt-4o-mini', template='profile_summary',
+            template_version=1, latency_ms=1200, subject_id='p1', subject_version='v2'
+        )
+
+        assert stored
+        (delete_sql, delete_params), (insert_sql, insert_params) = conn.sql
+        assert delete_sql.startswith('DELETE FROM llm_response_cache WHERE subject_id')
+        assert delete_params == ('p1', 'profile_summary', 'v2')
+        assert insert_sql.startswith('INSERT INTO llm_response_cache')
+        assert insert_params[-1] == 24
+
+    def test_store_without_subject_only_inserts(self, use_conn):
+        conn = use_conn(Conn())
+        LLMCache().put('key', '{}', provider='openai', model='gpt-4o-mini', template='jd_parse',
+                       template_version=1, latency_ms=800)
+
+        assert len(conn.sql) == 1
+
+
+@pytest.mark.unit
+class TestServiceUsage:
+
+    def test_concurrent_calls_store_their_own_usage(self):
+        class Completions:
+            async def create(self, messages, **kwargs):
+                # The first request finishes last, so a shared "last usage" would be overwritten
+                tokens = int(messages[-1]["content"])
+                await asyncio.sleep(0.05 if tokens == 100 else 0.01)
+                return SimpleNamespace(
+                    choices=[SimpleNamespace(message=SimpleNamespace(content=f"answer {tokens}"))],
+                    usage=SimpleNamespace(prompt_tokens=tokens, completion_tokens=tokens // 10)
+                )
+
+        class Cache:
+            stored = {}
+
+            def get(self, key, template):
+                return None
+
+            def put(self, key, response, **kwargs):
+                self.stored[response] = (kwargs['prompt_tokens'], kwargs['completion_tokens'])
+
+        ai = AIService.__new__(AIService)
+        ai.provider, ai.model, ai.cache = "openai", "gpt-4o-mini", Cache()
+        ai.async_client = SimpleNamespace(chat=SimpleNamespace(completions=Completions()))
+        candidate = {"person": {"person_id": "p1"}, "omitted_sections": []}
+
+        async def both():
+            return await asyncio.gather(*(
+                ai._call_ai_cached_async("question", candidate, [{"role": "user", "content": str(tokens)}])
+                for tokens in (100, 200)
+            ))
+
+        assert asyncio.run(both()) == ["answer 100", "answer 200"]
+        assert ai.cache.stored == {"answer 100": (100, 10), "answer 200": (200, 20)}
+
+    @pytest.mark.parametrize('template, response, cached', [
+        ("profile_summary", "Sorry, I can't produce JSON", False),
+        ("profile_summary", '```json\n{"executive_summary": "ok"}\n```', True),
+        ("question", "Plain text answers are fine", True),
+    ])
+    def test_only_parseable_structured_answers_are_cached(self, template, response, cached):
+        class Cache:
+            stored = []
+
+            def get(self, key, template):
+                return None
+
+            def put(self, key, response, **kwargs):
+                self.stored.append(response)
+
+        ai = AIService.__new__(AIService)
+        ai.provider, ai.model, ai.cache = "openai", "gpt-4o-mini", Cache()
+        ai._call_ai = lambda messages, **kwargs: (response, {"prompt_tokens": 1, "completion_tokens": 1})
+        candidate = {"person": {"person_id": "p1"}, "omitted_sections": []}
+
+        assert ai._call_ai_cached(template, candidate, [{"role": "user", "content": "hi"}]) == response
+        assert ai.cache.stored == ([response] if cached else [])
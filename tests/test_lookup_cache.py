@@ -0,0 +1,152 @@
+# ABOUTME: Unit tests for the mapped key -> UUID lookup tables in scripts/lookup_cache.py
+# ABOUTME: Covers lookups, the runtime overlay and snapshot refresh against a fake cursor
+
+import uuid
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+from lookup_cache import CacheSpec, LookupTable
+
+REPOS = CacheSpec('repos', 'github_repository', 'LOWER(full_name)', ('repo_id',))
+PEOPLE = CacheSpec('people', 'github_profile', 'LOWER(github_username)', ('person_id', 'github_profile_id'), pk=1)
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+class FakeCursor:
+    """Answers the watermark / rows / changed-rows queries LookupTable.load issues"""
+
+    def __init__(self, rows, mark, deletes=0):
+        self.rows = rows  # list of (key, [ids], txid); key None = filtered out by the spec's where
+        self.mark = mark
+        self.deletes = deletes
+        self.queries = []
+        self._result = []
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        if 'table_delete_counter' in sql:
+            self._result = [{'mark': self.mark, 'deletes': self.deletes}]
+        elif params:
+            self._result = [
+                {'k': key, **{f"v{i}": v for i, v in enumerate(ids)}, 'keep': key is not None}
+                for key, ids, txid in self.rows if txid >= params[0]
+            ]
+        else:
+            self._result = [
+                {'k': key, **{f"v{i}": v for i, v in enumerate(ids)}}
+                for key, ids, txid in self.rows if key is not None
+            ]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+@pytest.mark.unit
+class TestLookupTable:
+
+    def test_lookup(self):
+        ids = {f"org/repo-{i}": _id() for i in range(500)}
+        table = LookupTable.from_rows([{'k': k, 'v0': v} for k, v in ids.items()], REPOS)
+
+        assert len(table) == 500
+        assert all(table.get(k) == v for k, v in ids.items())
+        assert table['org/repo-7'] == ids['org/repo-7']
+        assert 'org/repo-500' not in table
+        assert table.get('org/repo-500') is None
+        with pytest.raises(KeyError):
+            table['org/missing']
+
+    def test_multi_column_and_null_ids(self):
+        person, profile = _id(), _id()
+        table = LookupTable.from_rows([
+            {'k': 'vitalik', 'v0': person, 'v1': profile},
+            {'k': 'anon', 'v0': None, 'v1': profile},
+        ], PEOPLE)
+
+        assert table['vitalik'] == (person, profile)
+        assert table['anon'] == (None, profile)
+
+    def test_overlay(self):
+        existing = _id()
+        table = LookupTable.from_rows([{'k': 'a/b', 'v0': existing}], REPOS)
+        added = uuid.uuid4()
+        table['c/d'] = added
+        table['a/b'] = existing
+
+        assert table['c/d'] == str(added)
+        assert 'c/d' in table
+        assert len(table) == 2
+
+    def test_non_ascii_keys_sort_as_bytes(self):
+        keys = ['zeta', 'ärger', 'alpha', '日本', 'Zed']
+        table = LookupTable.from_rows([{'k': k, 'v0': _id()} for k in keys], REPOS)
+        assert all(k in table for k in keys)
+        assert 'beta' not in table
+
+
+@pytest.mark.unit
+class TestSnapshots:
+
+    def test_nothing_written_reuses_snapshot(self, tmp_path):
+        cursor = FakeCursor([('a/b', [_id()], 8)], mark=10)
+        LookupTable.load(cursor, REPOS, tmp_path)
+
+        cursor.queries.clear()
+        table = LookupTable.load(cursor, REPOS, tmp_path)
+
+        assert len(cursor.queries) == 2  # Watermark + empty changed rows
+        assert table.stats()['mapped']
+        assert 'a/b' in table
+
+    def test_late_commits_below_next_watermark_are_merged(self, tmp_path):
+        rows = [('a/b', [_id()], 8)]
+        cursor = FakeCursor(rows, mark=10)
+        LookupTable.load(cursor, REPOS, tmp_path)
+
+        # Transaction 10 was still running at the snapshot and commits after 11
+        late_id, new_id = _id(), _id()
+        rows.extend([('c/d', [new_id], 11), ('e/f', [late_id], 10)])
+        cursor.mark = 12
+        table = LookupTable.load(cursor, REPOS, tmp_path)
+
+        assert 'next_txid' in cursor.queries[-1]
+        assert table['c/d'] == new_id and table['e/f'] == late_id
+        assert 'a/b' in table
+        assert table.meta['mark'] == 12
+
+    def test_deletes_force_rebuild(self, tmp_path):
+        rows = [('a/b', [_id()], 8), ('c/d', [_id()], 8)]
+        cursor = FakeCursor(rows, mark=10)
+        LookupTable.load(cursor, REPOS, tmp_path)
+
+        rows.pop()
+        cursor.deletes = 1
+        table = LookupTable.load(cursor, REPOS, tmp_path)
+
+        assert 'next_txid' not in cursor.queries[-1]
+        assert 'c/d' not in table
+        assert 'a/b' in table
+
+    def test_rekeyed_or_filtered_rows_force_rebuild(self, tmp_path):
+        profile = _id()
+        rows = [('alice', [_id(), profile], 8), ('bob', [_id(), _id()], 8)]
+        cursor = FakeCursor(rows, mark=10)
+        LookupTable.load(cursor, PEOPLE, tmp_path)
+
+        # Same github_profile_id (the pk) under a new username; bob's loses its username
+        rows[0] = ('alice2', [rows[0][1][0], profile], 11)
+        rows[1] = (None, rows[1][1], 11)
+        cursor.mark = 12
+        table = LookupTable.load(cursor, PEOPLE, tmp_path)
+
+        assert 'alice' not in table and 'bob' not in table
+        assert table['alice2'][1] == profile
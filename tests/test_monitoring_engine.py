@@ -0,0 +1,249 @@
+# ABOUTME: Unit tests for set-based saved search monitoring (api/services/monitoring_engine.py)
+# ABOUTME: Covers search compilation, match scoring, per-search change cursors, change-feed job changes and parallel bulk writes
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.services import monitoring_engine
+from api.services.monitoring_engine import MonitoringEngine, compile_search, evaluate, score_match
+
+NOW = datetime(2026, 10, 18, 2, 0, tzinfo=timezone.utc)
+# This run's snapshot (the fake feed's current) and the cursor of a search monitored last run
+CURRENT = '100:100:'
+LAST_RUN = '90:90:'
+
+
+def search_row(search_id, user_id, filters, since_hours=24, min_match_score=70, name='Rust in Berlin',
+               snapshot=LAST_RUN):
+    return {
+        'run_at': NOW, 'search_id': search_id, 'user_id': user_id, 'name': name,
+        'filters': filters, 'min_match_score': min_match_score, 'since': NOW - timedelta(hours=since_hours),
+        'snapshot': snapshot
+    }
+
+
+def person(person_id, changed_hours_ago=1, xids=(95,), **fields):
+    row = {
+        'person_id': person_id, 'full_name': f"Person {person_id}", 'headline': 'Rust and Go engineer',
+        'location': 'Berlin, Germany', 'changed_at': NOW - timedelta(hours=changed_hours_ago),
+        'xids': list(xids), 'has_email': True, 'has_github': True, 'current_companies': ['Parity']
+    }
+    row.update(fields)
+    return row
+
+
+class Conn:
+    """Fake pooled connection: answers the search/scan queries, records writes"""
+
+    def __init__(self, searches=(), people=(), job_changes=(), fail_users=(), stale_cursors=0):
+        self.searches = list(searches)
+        self.people = list(people)
+        self.job_changes = list(job_changes)
+        self.fail_users = set(fail_users)
+        self.lock = threading.Lock()
+        self.queries = []
+        self.inserted = []
+        self.updated = []
+        self.cursors = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.feed_committed = False
+        self.stale_cursors = stale_cursors
+        self.rowcount = 0
+        self._last = None
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        sql = ' '.join(sql.split())
+        with self.lock:
+            self.queries.append(sql)
+        self._last = sql
+        if sql.startswith('UPDATE saved_searches'):
+            with self.lock:
+                self.updated.extend(params[1])
+        if sql.startswith('INSERT INTO change_consumer') and 'unnest' in sql:
+            with self.lock:
+                self.cursors.extend((params[0] + search_id, params[1]) for search_id in params[2])
+        if sql.startswith('UPDATE change_consumer'):
+            self.feed_committed = True
+        if sql.startswith('DELETE FROM change_consumer'):
+            self.rowcount = self.stale_cursors
+
+    def fetchall(self):
+        if 'FROM saved_searches' in self._last:
+            return self.searches
+        if 'SELECT DISTINCT row_id' in self._last:
+            return self.job_changes
+        return self.people
+
+    def fetchone(self):
+        return {'run_at': NOW, 'snapshot': CURRENT}
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def install(monkeypatch):
+    def _install(conn):
+        @contextmanager
+        def get_db_context():
+            yield conn
+
+        def execute_values(cursor, sql, rows, template=None, page_size=100):
+            with conn.lock:
+                conn.in_flight += 1
+                conn.max_in_flight = max(conn.max_in_flight, conn.in_flight)
+            try:
+                time.sleep(0.05)
+                if rows[0][0] in conn.fail_users:
+                    raise RuntimeError('insert failed')
+                with conn.lock:
+                    conn.queries.append(' '.join(sql.split()))
+                    conn.inserted.extend(rows)
+            finally:
+                with conn.lock:
+                    conn.in_flight -= 1
+
+        monkeypatch.setattr(monitoring_engine, 'get_db_context', get_db_context)
+        monkeypatch.setattr(monitoring_engine, 'execute_values', execute_values)
+        return conn
+    return _install
+
+
+@pytest.mark.unit
+class TestMatching:
+
+    def test_scores_share_of_possible_points(self):
+        search = compile_search(search_row('s1', 'u1', {
+            'locations': ['berlin'], 'skills': ['Rust', 'Go', 'Python'], 'has_email': True
+        }))
+
+        score, reason = score_match(person('p1'), search)
+
+        # 30 email + 15 location + 10 of 15 skill points = 55 of 60
+        assert score == 92
+        assert 'located in Berlin, Germany' in reason
+        assert 'matches skills: rust, go' in reason
+
+    def test_failed_criterion_or_low_score_is_no_match(self):
+        companies = compile_search(search_row('s1', 'u1', {'companies': ['Stripe'], 'skills': ['rust']}))
+        skills = compile_search(search_row('s2', 'u1', {'skills': ['rust', 'python', 'java']}))
+        empty = compile_search(search_row('s3', 'u1', {}))
+
+        assert score_match(person('p1'), companies) is None
+        assert score_match(person('p1', current_companies=['STRIPE']), companies)[0] == 100
+        assert score_match(person('p1'), skills) is None  # One of three skills: 33 < 70
+        assert score_match(person('p1'), empty) is None
+
+    def test_evaluate_respects_each_search_cursor(self):
+        daily = compile_search(search_row('daily', 'u1', {'skills': ['rust']}, snapshot=LAST_RUN))
+        weekly = compile_search(search_row('weekly', 'u2', {'skills': ['rust']}, snapshot='50:50:'))
+        people = [
+            person('recent', changed_hours_ago=2, xids=[95]),
+            # Transaction 85 was still open when daily's cursor was taken and committed later
+            person('late', changed_hours_ago=30, xids=[85]),
+            person('old', changed_hours_ago=72, xids=[60]),
+        ]
+        daily['snapshot'] = '85:91:85'
+
+        matches = evaluate([daily, weekly], people, CURRENT)
+
+        assert sorted(m['person_id'] for m in matches['u1']) == ['late', 'recent']
+        assert sorted(m['person_id'] for m in matches['u2']) == ['late', 'old', 'recent']
+        assert matches['u2'][0]['search_id'] == 'weekly'
+
+    def test_first_run_looks_back_and_skips_uncommitted_changes(self):
+        new = compile_search(search_row('new', 'u1', {'skills': ['rust']}, since_hours=24, snapshot=None))
+        people = [
+            person('recent', changed_hours_ago=2),
+            person('old', changed_hours_ago=72, xids=[60]),
+            person('in_flight', changed_hours_ago=1, xids=[101]),  # Not visible in this run's snapshot
+        ]
+
+        matches = evaluate([new], people, CURRENT)
+
+        assert [m['person_id'] for m in matches['u1']] == ['recent']
+
+
+@pytest.mark.unit
+class TestRun:
+
+    def test_one_scan_and_bulk_insert_per_user_in_parallel(self, install):
+        users = [f"u{i}" for i in range(6)]
+        conn = install(Conn(
+            searches=[search_row(f"s{i}", user, {'skills': ['rust']}) for i, user in enumerate(users)],
+            people=[person('p1'), person('p2', headline='Designer')]
+        ))
+
+        results = MonitoringEngine(workers=3).run()
+
+        assert sum('array_agg(DISTINCT xid) AS xids' in q for q in conn.queries) == 1
+        assert sum(q.startswith('INSERT INTO notifications') for q in conn.queries) == 6
+        assert conn.max_in_flight == 3
+        assert results['users'] == 6 and results['people_scanned'] == 2
+        assert results['notifications_created'] == 6 and results['errors'] == []
+        assert sorted(conn.updated) == sorted(f"s{i}" for i in range(6))
+        assert sorted(conn.cursors) == sorted((f"saved_search:s{i}", CURRENT) for i in range(6))
+
+        row = conn.inserted[0]
+        assert row[1] == 'new_match' and row[2] == 'high'
+        assert row[3] == '🎯 New Match: Person p1 (100% match)'
+
+    def test_failed_user_keeps_watermark(self, install):
+        conn = install(Conn(
+            searches=[search_row('s1', 'u1', {'skills': ['rust']}), search_row('s2', 'u2', {'skills': ['rust']})],
+            people=[person('p1')],
+            fail_users={'u2'}
+        ))
+
+        results = MonitoringEngine(workers=2).run()
+
+        assert results['notifications_by_user'] == {'u1': 1}
+        assert len(results['errors']) == 1 and 'u2' in results['errors'][0]
+        assert conn.updated == ['s1'] and conn.cursors == [('saved_search:s1', CURRENT)]
+        assert not conn.feed_committed  # Job changes are re-read next run
+
+    def test_job_changes_notify_watching_users(self, install):
+        change = {
+            'user_id': 'u9', 'employment_id': 'e1', 'person_id': 'p7', 'person_name': 'Ada',
+            'new_title': 'Staff Engineer', 'new_company': 'Parity', 'detected_at': NOW
+        }
+        conn = install(Conn(job_changes=[change]))
+
+        results = MonitoringEngine().run()
+
+        assert results['job_changes'] == 1 and results['notifications_by_user'] == {'u9': 1}
+        row = conn.inserted[0]
+        assert row[1] == 'job_change' and row[2] == 'urgent'
+        assert row[3] == '🔔 Ada joined Parity'
+        assert conn.updated == [] and conn.feed_committed
+
+    def test_nothing_due_skips_the_scan(self, install):
+        conn = install(Conn())
+
+        results = MonitoringEngine().run()
+
+        assert results['searches'] == 0 and results['notifications_created'] == 0
+        assert not any('array_agg(DISTINCT xid)' in q for q in conn.queries)
+
+    def test_unmonitored_search_cursors_are_dropped(self, install):
+        conn = install(Conn(stale_cursors=2))
+
+        results = MonitoringEngine().run()
+
+        drops = [q for q in conn.queries if q.startswith('DELETE FROM change_consumer')]
+        assert len(drops) == 1 and 'NOT EXISTS' in drops[0] and 's.auto_monitor = TRUE' in drops[0]
+        assert results['search_cursors_dropped'] == 2
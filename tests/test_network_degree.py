@@ -0,0 +1,251 @@
+# ABOUTME: Unit tests for the network degree refresh (scripts/analytics/network_degree.py) and graph stats readers
+# ABOUTME: Checks incremental/full refresh statements, lock skipping, summary reads, and incremental == full on Postgres
+
+from datetime import datetime
+
+import pytest
+import sys
+from pathlib import Path
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'analytics'))
+import network_degree
+from network_degree import DEGREE_COLUMNS, INSERT_ALL_SQL, INSERT_BATCH_SQL, SUMMARY_SQL, NetworkDegree
+from api.crud import graph as graph_crud
+
+REFRESHED_AT = datetime(2026, 10, 18, 3, 0)
+
+SUMMARY = {
+    'network': 'coemployment', 'people': 1200, 'edges': 45000, 'min_degree': 1, 'max_degree': 900,
+    'avg_degree': 75.4, 'median_degree': 12.5, 'avg_strength': None, 'avg_shared_repos': None,
+    'refreshed_at': REFRESHED_AT
+}
+
+
+def normalize(sql):
+    return ' '.join(sql.split())
+
+
+class Conn:
+    """Records SQL; hands out the advisory lock, a claimed batch and an optional stored summary"""
+
+    def __init__(self, locked=True, claimed=3, summary=None, rows=()):
+        self.locked = locked
+        self.claimed = claimed
+        self.summary = summary
+        self.rows = list(rows)
+        self.sql = []
+        self.committed = self.rolled_back = False
+        self.rowcount = 0
+        self._last = ''
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self._last = normalize(sql)
+        self.sql.append((self._last, params))
+        self.rowcount = self.claimed if self._last.startswith(('WITH claimed', 'INSERT INTO person_network_degree')) else 0
+
+    def fetchone(self):
+        if 'pg_try_advisory_xact_lock' in self._last:
+            return {'locked': self.locked}
+        if 'FROM network_summary' in self._last:
+            return self.summary
+        if self._last.split(' FROM ')[0].endswith(' as count'):
+            return {'count': 10}
+        return {'min_connections': 1, 'max_connections': 4, 'avg_connections': 2, 'median_connections': 2}
+
+    def fetchall(self):
+        return self.rows
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+    def statements(self):
+        return [sql for sql, _ in self.sql]
+
+
+@pytest.mark.unit
+class TestNetworkDegreeRefresh:
+
+    def test_incremental_recounts_claimed_people_then_summaries(self):
+        conn = Conn(claimed=3)
+
+        stats = NetworkDegree(conn).refresh()
+
+        statements = conn.statements()
+        assert stats['people'] == 3 and stats['degree_rows'] == 3 and not stats['skipped']
+        assert statements[1].startswith('CREATE TEMP TABLE degree_batch')
+        assert statements[2].startswith('WITH claimed AS ( DELETE FROM network_degree_dirty')
+        assert statements[4].startswith('DELETE FROM person_network_degree d USING degree_batch b')
+        assert statements[5] == normalize(INSERT_BATCH_SQL)
+        assert statements[-1] == normalize(SUMMARY_SQL)
+        assert normalize(INSERT_ALL_SQL) not in statements
+        assert conn.committed
+
+    def test_nothing_dirty_leaves_summaries_alone(self):
+        conn = Conn(claimed=0)
+
+        stats = NetworkDegree(conn).refresh()
+
+        assert stats['people'] == 0
+        assert normalize(SUMMARY_SQL) not in conn.statements()
+        assert conn.committed
+
+    def test_full_rebuilds_everyone_from_grouped_scans(self):
+        conn = Conn(claimed=500)
+
+        stats = NetworkDegree(conn).refresh(full=True)
+
+        statements = conn.statements()
+        assert stats['people'] == 500
+        assert 'DELETE FROM network_degree_dirty' in statements
+        assert 'DELETE FROM person_network_degree' in statements
+        assert normalize(INSERT_ALL_SQL) in statements and statements[-1] == normalize(SUMMARY_SQL)
+        assert not any('degree_batch' in sql for sql in statements)
+
+    def test_skips_when_another_refresh_holds_the_lock(self):
+        conn = Conn(locked=False)
+
+        stats = NetworkDegree(conn).refresh()
+
+        assert stats['skipped'] and conn.rolled_back and not conn.committed
+        assert len(conn.sql) == 1
+        assert 'elapsed_seconds' in stats
+
+    def test_build_refresh_waits_for_the_lock(self, monkeypatch):
+        conn = Conn(locked=False, claimed=500)
+        monkeypatch.setattr(network_degree, 'get_db_connection', lambda use_pool=False: conn)
+
+        stats = network_degree.refresh_after_build()
+
+        assert not stats['skipped'] and stats['people'] == 500 and 'elapsed_seconds' in stats
+        assert conn.statements()[0] == 'SELECT pg_advisory_xact_lock(%s)'
+        assert conn.committed
+
+
+@pytest.mark.unit
+class TestGraphStatsReaders:
+
+    def test_graph_stats_read_summary(self):
+        conn = Conn(summary=SUMMARY)
+
+        stats = graph_crud.get_graph_stats(conn)
+
+        assert stats == {
+            'total_edges': 45000, 'people_in_graph': 1200, 'min_connections': 1, 'max_connections': 900,
+            'avg_connections': 75, 'median_connections': 12, 'as_of': REFRESHED_AT.isoformat()
+        }
+        assert not any('edge_coemployment' in sql for sql in conn.statements())
+
+    def test_graph_stats_fall_back_to_edges_before_first_refresh(self):
+        conn = Conn(summary=None)
+
+        stats = graph_crud.get_graph_stats(conn)
+
+        assert stats['total_edges'] == 10 and stats['max_connections'] == 4 and stats['as_of'] is None
+        assert any('FROM edge_coemployment' in sql for sql in conn.statements())
+
+    def test_top_connected_ordered_by_stored_degree(self):
+        hub = {'person_id': 'p1', 'full_name': 'Ada', 'location': None, 'headline': None, 'connection_count': 900}
+        conn = Conn(summary=SUMMARY, rows=[hub])
+
+        assert graph_crud.get_top_connected_people(conn, limit=5) == [hub]
+        sql, params = conn.sql[-1]
+        assert 'FROM person_network_degree d' in sql and 'ORDER BY d.coemployment_degree DESC' in sql
+        assert params == (5,)
+
+
+@pytest.fixture
+def degree_db(pg_test_conn, apply_migrations):
+    """Test database with migration 24 applied and no degree state left from earlier tests"""
+    pg_test_conn.cursor_factory = RealDictCursor
+    apply_migrations('24_network_degree.sql', requires=('person', 'edge_coemployment', 'edge_github_collaboration'))
+    cursor = pg_test_conn.cursor()
+    for table in ('network_degree_dirty', 'person_network_degree', 'network_summary'):
+        cursor.execute(f"DELETE FROM {table}")
+    pg_test_conn.commit()
+    cursor.close()
+    return pg_test_conn
+
+
+def add_people(conn, count):
+    cursor = conn.cursor()
+    people = []
+    for i in range(count):
+        url = f"https://www.linkedin.com/in/degree-test-{i}"
+        cursor.execute("""
+            INSERT INTO person (full_name, linkedin_url, normalized_linkedin_url)
+            VALUES (%s, %s, %s) RETURNING person_id
+        """, (f"Degree Test {i}", url, url))
+        people.append(cursor.fetchone()['person_id'])
+    cursor.execute("INSERT INTO company (company_name) VALUES ('Degree Test Co') RETURNING company_id")
+    company_id = cursor.fetchone()['company_id']
+    conn.commit()
+    cursor.close()
+    return people, company_id
+
+
+def run(conn, sql, params=None):
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    conn.commit()
+    cursor.close()
+
+
+def degree_state(conn):
+    """Degree rows and summaries without their refresh timestamps"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {DEGREE_COLUMNS} FROM person_network_degree ORDER BY person_id")
+    degrees = [dict(row) for row in cursor.fetchall()]
+    cursor.execute("SELECT * FROM network_summary ORDER BY network")
+    summaries = [{k: v for k, v in row.items() if k != 'refreshed_at'} for row in cursor.fetchall()]
+    cursor.close()
+    return degrees, summaries
+
+
+@pytest.mark.integration
+class TestNetworkDegreeDatabase:
+    """Runs the triggers and refresh SQL on the test database"""
+
+    def test_incremental_refresh_matches_full_rebuild(self, degree_db):
+        (a, b, c, d), company_id = add_people(degree_db, 4)
+        degrees = NetworkDegree(degree_db)
+        degrees.refresh(full=True)
+
+        for src, dst in ((a, b), (a, c), (b, c)):
+            run(degree_db, """
+                INSERT INTO edge_coemployment (src_person_id, dst_person_id, company_id, overlap_months)
+                VALUES (%s, %s, %s, 12)
+            """, (src, dst, company_id))
+        run(degree_db, """
+            INSERT INTO edge_github_collaboration (src_person_id, dst_person_id, collaboration_strength, shared_repos)
+            VALUES (%s, %s, 0.5, 2), (%s, %s, NULL, 1)
+        """, (a, b, c, d))
+        assert degrees.refresh()['people'] == 4
+
+        run(degree_db, "DELETE FROM edge_coemployment WHERE src_person_id = %s AND dst_person_id = %s", (a, c))
+        run(degree_db, "DELETE FROM edge_github_collaboration WHERE src_person_id = %s", (c,))
+        run(degree_db, "UPDATE edge_github_collaboration SET collaboration_strength = 0.9 WHERE src_person_id = %s", (a,))
+        stats = degrees.refresh()
+        incremental = degree_state(degree_db)
+
+        degrees.refresh(full=True)
+
+        assert stats['people'] == 4
+        assert incremental == degree_state(degree_db)
+        rows = {row['person_id']: row for row in incremental[0]}
+        assert d not in rows
+        assert (rows[a]['coemployment_degree'], rows[b]['coemployment_degree'], rows[c]['coemployment_degree']) == (1, 2, 1)
+        assert rows[a]['github_degree'] == rows[b]['github_degree'] == 1 and rows[c]['github_degree'] == 0
+        summaries = {row['network']: row for row in incremental[1]}
+        assert summaries['coemployment']['edges'] == 2 and summaries['coemployment']['people'] == 3
+        assert summaries['github']['edges'] == 1 and summaries['github']['avg_strength'] == pytest.approx(0.9)
+        assert degrees.status()['pending_people'] == 0
@@ -0,0 +1,124 @@
+# ABOUTME: Unit tests for probabilistic person resolution
+# ABOUTME: Vectorized scores must equal calculate_match_score for every pair
+
+import itertools
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "migration_scripts"))
+from migration_utils import calculate_match_score
+from person_resolution import (
+    DEFAULT_MIN_SCORE,
+    VectorizedMatchScorer,
+    candidate_pairs,
+    is_auto_merge,
+    score_candidate_pairs
+)
+
+
+RECORDS = [
+    {'full_name': 'John Smith', 'linkedin_url': 'https://www.linkedin.com/in/jsmith/',
+     'email': 'john@example.com', 'company': 'Coinbase', 'location': 'San Francisco, CA'},
+    {'full_name': 'john smith', 'linkedin_url': 'linkedin.com/in/jsmith',
+     'email': None, 'company': 'Coinbase Inc', 'location': 'San Francisco'},
+    {'full_name': 'Jon Smith', 'linkedin_url': None,
+     'email': 'JOHN@example.com', 'company': 'coinbase', 'location': None},
+    {'full_name': 'Jane Doe', 'linkedin_url': 'https://linkedin.com/in/janedoe',
+     'email': 'jane@example.com', 'company': None, 'location': 'New York'},
+    {'full_name': 'Ｊａｎｅ Ｄｏｅ', 'linkedin_url': None,
+     'email': 'not-an-email', 'company': '', 'location': 'New York'},
+    {'full_name': '  ', 'linkedin_url': '', 'email': '', 'company': 'Paradigm', 'location': ''},
+    {'full_name': '', 'linkedin_url': None, 'email': None, 'company': None, 'location': None},
+]
+
+
+@pytest.mark.unit
+class TestVectorizedMatchScorer:
+    """Test batch scoring parity with calculate_match_score"""
+
+    def test_parity_with_calculate_match_score(self):
+        scorer = VectorizedMatchScorer(RECORDS)
+        pairs = list(itertools.combinations(range(len(RECORDS)), 2))
+        left = np.array([i for i, _ in pairs])
+        right = np.array([j for _, j in pairs])
+
+        scores = scorer.score(left, right)
+
+        for k, (i, j) in enumerate(pairs):
+            assert scores[k] == calculate_match_score(RECORDS[i], RECORDS[j]), (i, j)
+
+    def test_conflicting_linkedin_vetoes_match(self):
+        records = [
+            {'full_name': 'John Smith', 'linkedin_url': 'linkedin.com/in/john-smith-1', 'company': 'Google'},
+            {'full_name': 'John Smith', 'linkedin_url': 'linkedin.com/in/john-smith-2', 'company': 'Google'},
+        ]
+        scorer = VectorizedMatchScorer(records)
+        matches = list(score_candidate_pairs(scorer, np.array([0]), np.array([1]), min_score=0.2))
+
+        assert matches == []
+
+
+@pytest.mark.unit
+class TestAutoMerge:
+    """Only pairs sharing a strong identifier are merged without review"""
+
+    def scored(self, records, min_score=DEFAULT_MIN_SCORE):
+        scorer = VectorizedMatchScorer(records)
+        return [
+            is_auto_merge(scorer, i, j, score, min_score)
+            for i, j, score in score_candidate_pairs(scorer, np.array([0]), np.array([1]))
+        ]
+
+    def test_namesakes_at_same_company_are_review_only(self):
+        records = [
+            {'full_name': 'John Smith', 'company': 'Google'},
+            {'full_name': 'John Smith', 'company': 'Google'},
+        ]
+
+        assert self.scored(records) == [False]
+        assert self.scored(records, min_score=0.1) == [False]
+
+    def test_shared_email_and_name_auto_merges(self):
+        records = [
+            {'full_name': 'John Smith', 'email': 'John@Example.com', 'company': 'Google'},
+            {'full_name': 'John Smith', 'email': 'john@example.com', 'company': None},
+        ]
+
+        assert self.scored(records) == [True]
+
+    def test_secondary_email_or_github_login_counts_as_identifier(self):
+        records = [
+            {'full_name': 'John Smith', 'email': 'john@example.com', 'github_logins': ['JSmith']},
+            {'full_name': 'John Smith', 'email': 'js@work.com', 'emails': ['john@example.com'],
+             'github_logins': ['jsmith']},
+        ]
+        scorer = VectorizedMatchScorer(records)
+
+        assert scorer.shares_identifier(0, 1)
+        # Primary emails differ, so the score alone (exact name) is below the auto-merge bar
+        assert self.scored(records) == []
+
+
+@pytest.mark.unit
+class TestPersonBlocking:
+    """Test candidate pair generation"""
+
+    def test_similar_names_are_candidates(self):
+        left, right, _ = candidate_pairs(RECORDS)
+        pairs = set(zip(left.tolist(), right.tolist()))
+
+        assert (0, 1) in pairs
+        assert (0, 3) not in pairs
+
+    def test_common_name_paired_by_location_when_lsh_block_oversized(self):
+        records = [{'full_name': 'John Smith', 'location': f"City {i}", 'company': None}
+                   for i in range(5)]
+        records.append({'full_name': 'John Smith', 'location': 'City 0, CA', 'company': None})
+
+        left, right, index = candidate_pairs(records, max_block_size=3)
+
+        assert list(zip(left.tolist(), right.tolist())) == [(0, 5)]
+        assert index.oversized_blocks > 0
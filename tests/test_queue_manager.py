@@ -0,0 +1,259 @@
+# ABOUTME: Unit tests for the GitHub enrichment queue's SQL priority expression and job transitions
+# ABOUTME: Checks the materialized priority matches QueueManager.calculate_priority, re-queueing and lease checks,
+# ABOUTME: and SKIP LOCKED claiming, lease expiry and concurrent workers on Postgres
+
+import sqlite3
+import threading
+
+import pytest
+import sys
+from pathlib import Path
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from github_automation import queue_manager
+from github_automation.queue_manager import QueueManager
+
+
+PROFILES = [
+    {},
+    {'github_email': 'a@example.com', 'location': 'Berlin', 'followers': 5000, 'bio': 'Rust'},
+    {'github_email': '', 'location': '', 'followers': 101, 'github_name': 'Ada'},
+    {'followers': 100, 'github_company': 'Acme'},
+    {'followers': 1001, 'last_enriched': '2024-01-01', 'bio': 'x', 'github_email': 'b@example.com'},
+]
+
+
+def _evaluate(sql, profile):
+    """Evaluate a priority expression against one profile row in SQLite"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("""
+        CREATE TABLE github_profile (
+            github_email TEXT, location TEXT, followers INTEGER, bio TEXT,
+            github_name TEXT, github_company TEXT, last_enriched TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO github_profile VALUES (?, ?, ?, ?, ?, ?, ?)",
+        tuple(profile.get(c) for c in ('github_email', 'location', 'followers', 'bio',
+                                        'github_name', 'github_company', 'last_enriched'))
+    )
+    value = conn.execute(f"SELECT {sql} FROM github_profile gp").fetchone()[0]
+    conn.close()
+    return value
+
+
+@pytest.mark.unit
+class TestPrioritySQL:
+    """enrichment_job.priority is computed in SQL; it must agree with Python"""
+
+    @pytest.mark.parametrize('profile', PROFILES)
+    def test_matches_calculate_priority(self, profile):
+        expected = QueueManager.calculate_priority(None, {'followers': 0, **profile})
+        assert _evaluate(QueueManager.priority_sql('gp'), profile) == expected
+
+    def test_base_priority(self):
+        assert _evaluate(QueueManager.base_priority_sql('gp'), {}) == 100
+        assert _evaluate(QueueManager.base_priority_sql('gp'), {'last_enriched': '2024-01-01'}) == 90
+        assert _evaluate(QueueManager.base_priority_sql('gp'),
+                         {'last_enriched': '2024-01-01', 'bio': 'x'}) == 80
+
+
+class Conn:
+    """Records SQL; every UPDATE touches `rowcount` rows, the refill lock is free unless `locked`"""
+
+    def __init__(self, rowcount=1, locked=False):
+        self.sql = []
+        self.rowcount = rowcount
+        self.locked = locked
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.sql.append((' '.join(sql.split()), params))
+
+    def fetchone(self):
+        return {'locked': not self.locked}
+
+    def fetchall(self):
+        return []
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    conn = Conn()
+    monkeypatch.setattr(queue_manager, 'get_db_connection', lambda use_pool=False: conn)
+    return QueueManager(worker_id='worker-a')
+
+
+@pytest.mark.unit
+class TestJobTransitions:
+
+    def test_enqueue_stale_requeues_failed_jobs_after_backoff(self, queue):
+        queue.enqueue_stale()
+
+        sql, params = queue.conn.sql[-1]
+        assert "WHERE enrichment_job.status = 'done' OR (enrichment_job.status = 'failed'" in sql
+        assert "enrichment_job.updated_at < NOW() - make_interval(hours => %s)" in sql
+        assert params[1] == queue_manager.AutoConfig.JOB_FAILED_RETRY_HOURS
+
+    def test_enqueue_stale_skips_while_another_worker_refills(self, queue):
+        queue.conn.locked = True
+
+        assert queue.enqueue_stale() == 0
+        assert not any(sql.startswith('INSERT INTO enrichment_job') for sql, _ in queue.conn.sql)
+
+    def test_get_batch_refills_once_per_interval(self, queue):
+        queue.get_batch(10)
+        queue.get_batch(10)
+
+        refills = [sql for sql, _ in queue.conn.sql if sql.startswith('INSERT INTO enrichment_job')]
+        assert len(refills) == 1
+
+    @pytest.mark.parametrize('success', [True, False])
+    def test_mark_enriched_requires_the_lease(self, queue, success):
+        queue.mark_enriched('p1', success=success, error=None if success else 'boom')
+
+        sql, params = queue.conn.sql[0]
+        assert sql.startswith('UPDATE enrichment_job') and sql.endswith('AND leased_by = %s')
+        assert params[-2:] == ('p1', 'worker-a')
+
+    def test_lost_lease_leaves_last_enriched_alone(self, queue):
+        queue.conn.rowcount = 0
+        queue.mark_enriched('p1', success=True)
+
+        assert not any(sql.startswith('UPDATE github_profile') for sql, _ in queue.conn.sql)
+
+
+@pytest.fixture
+def job_db(pg_test_conn, pg_test_connection_params, apply_migrations, monkeypatch):
+    """enrichment_job on the test database; every QueueManager gets its own connection"""
+    pg_test_conn.cursor_factory = RealDictCursor
+    apply_migrations('15_enrichment_job_queue.sql', requires=('github_profile',))
+    cursor = pg_test_conn.cursor()
+    cursor.execute("DELETE FROM enrichment_job")
+    cursor.execute("DELETE FROM github_profile WHERE github_username LIKE 'queuetest-%%'")
+    # Profiles left by other tests are fresh, so only queuetest profiles are queued
+    cursor.execute("UPDATE github_profile SET last_enriched = NOW()")
+    pg_test_conn.commit()
+    cursor.close()
+
+    connections = []
+
+    def connect(use_pool=False):
+        conn = psycopg2.connect(cursor_factory=RealDictCursor, **pg_test_connection_params)
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(queue_manager, 'get_db_connection', connect)
+    yield pg_test_conn
+    for conn in connections:
+        conn.close()
+
+
+def add_profiles(conn, count):
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO github_profile (github_username)
+        SELECT 'queuetest-' || n FROM generate_series(1, %s) AS n
+    """, (count,))
+    conn.commit()
+    cursor.close()
+
+
+def job_rows(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT gp.github_username, j.status, j.leased_by, j.attempts, gp.last_enriched
+        FROM enrichment_job j JOIN github_profile gp USING (github_profile_id)
+        ORDER BY gp.github_username
+    """)
+    rows = {row['github_username']: row for row in cursor.fetchall()}
+    conn.commit()
+    cursor.close()
+    return rows
+
+
+@pytest.mark.integration
+class TestJobQueue:
+
+    def test_open_claim_is_skipped_by_other_workers(self, job_db):
+        add_profiles(job_db, 6)
+        worker_a = QueueManager(worker_id='worker-a')
+        worker_b = QueueManager(worker_id='worker-b')
+        worker_a.enqueue_stale()
+
+        # Hold worker-a's claim open: its locked rows must be skipped, not waited on
+        cursor = worker_a.conn.cursor()
+        cursor.execute("""
+            SELECT github_profile_id FROM enrichment_job
+            ORDER BY github_profile_id LIMIT 4 FOR UPDATE SKIP LOCKED
+        """)
+        held = {str(row['github_profile_id']) for row in cursor.fetchall()}
+
+        claimed = worker_b.claim_batch(6)
+        worker_a.conn.rollback()
+
+        assert len(claimed) == 2
+        assert not held & {str(p['github_profile_id']) for p in claimed}
+
+    def test_expired_lease_returns_job_to_the_queue(self, job_db):
+        add_profiles(job_db, 1)
+        worker_a = QueueManager(worker_id='worker-a')
+        worker_b = QueueManager(worker_id='worker-b')
+        profile_id = worker_a.get_batch(1)[0]['github_profile_id']
+
+        cursor = job_db.cursor()
+        cursor.execute("UPDATE enrichment_job SET lease_expires_at = NOW() - INTERVAL '1 second'")
+        job_db.commit()
+        cursor.close()
+
+        assert [p['github_profile_id'] for p in worker_b.get_batch(1)] == [profile_id]
+        assert worker_b.stats['recovered'] == 1
+
+        # worker-a finishing late must not touch the job or the profile
+        worker_a.mark_enriched(profile_id, success=True)
+        row = job_rows(job_db)['queuetest-1']
+        assert (row['status'], row['leased_by'], row['attempts']) == ('running', 'worker-b', 2)
+        assert row['last_enriched'] is None
+
+        worker_b.mark_enriched(profile_id, success=True)
+        row = job_rows(job_db)['queuetest-1']
+        assert (row['status'], row['leased_by']) == ('done', None)
+        assert row['last_enriched'] is not None
+
+    def test_concurrent_workers_claim_disjoint_batches(self, job_db):
+        add_profiles(job_db, 40)
+        QueueManager(worker_id='seed').enqueue_stale()
+        workers = [QueueManager(worker_id=f"worker-{n}") for n in range(2)]
+        claims = {}
+        start = threading.Barrier(len(workers))
+
+        def work(queue):
+            start.wait()
+            claimed = []
+            while True:
+                batch = queue.claim_batch(5)
+                if not batch:
+                    break
+                claimed += [str(p['github_profile_id']) for p in batch]
+            claims[queue.worker_id] = claimed
+
+        threads = [threading.Thread(target=work, args=(queue,)) for queue in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        claimed_a, claimed_b = claims.values()
+        assert len(claimed_a) + len(claimed_b) == 40
+        assert not set(claimed_a) & set(claimed_b)
+        assert all(row['attempts'] == 1 for row in job_rows(job_db).values())
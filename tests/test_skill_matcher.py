@@ -0,0 +1,61 @@
+# ABOUTME: Unit tests for the Aho-Corasick skill matcher
+# ABOUTME: Verifies word-boundary semantics match the original per-alias regexes
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "skills"))
+from skill_matcher import SkillMatcher, regex_find_skills
+
+
+SKILL_KEYS = [
+    'solidity', 'rust', 'go', 'golang', 'javascript', 'js', 'react', 'react native',
+    'node.js', 'c++', 'c', '.net', 'asp.net', 'c#', 'machine learning', 'ml'
+]
+
+
+@pytest.fixture
+def skills_map():
+    return {key: {'skill_id': f"id-{key}", 'skill_name': key.title()} for key in SKILL_KEYS}
+
+
+@pytest.fixture
+def matcher(skills_map):
+    return SkillMatcher(skills_map)
+
+
+@pytest.mark.unit
+class TestSkillMatcher:
+    """Test skill extraction from titles and headlines"""
+
+    def test_simple_match(self, matcher):
+        result = matcher.find("Senior Solidity Engineer")
+        assert result == {('id-solidity', 'Solidity', 'solidity')}
+
+    def test_word_boundaries(self, matcher):
+        # "Go" must not match inside "Google"
+        assert matcher.find("Software Engineer at Google") == set()
+        assert matcher.find_keys("Go Developer") == {'go'}
+
+    def test_overlapping_matches(self, matcher):
+        keys = matcher.find_keys("React Native & Node.js developer")
+        assert {'react', 'react native', 'node.js', 'js'} <= keys
+
+    def test_empty_text(self, matcher):
+        assert matcher.find("") == set()
+        assert matcher.find("   ") == set()
+        assert matcher.find(None) == set()
+
+    @pytest.mark.parametrize("text", [
+        "Full Stack Developer | React & Node.js",
+        "C++ / C# engineer, ex-ASP.NET",
+        "ML engineer (machine learning, golang)",
+        "c++developer",
+        "Rust_lang enthusiast",
+        ".NET Core lead",
+        "Head of Engineering",
+    ])
+    def test_parity_with_regex(self, skills_map, matcher, text):
+        """Automaton must return exactly what the per-alias regexes returned"""
+        assert matcher.find(text) == regex_find_skills(skills_map, text)
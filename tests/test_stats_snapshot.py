@@ -0,0 +1,113 @@
+# ABOUTME: Unit tests for the stats snapshot (scripts/analytics/stats_snapshot.py) and the /api/stats readers
+# ABOUTME: Checks the budgeted recompute, snapshot reads and the fallback when ?fresh=true runs out of time
+
+from datetime import datetime, timezone
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts' / 'analytics'))
+from stats_snapshot import METRICS, StatsSnapshot
+
+COUNTS = {
+    'total_people': 200, 'with_linkedin': 150, 'with_location': 120, 'with_headline': 180,
+    'with_email': 50, 'with_github': 40, 'with_employment': 190, 'with_education': 90
+}
+REFRESHED_AT = datetime(2026, 10, 18, 1, 50, tzinfo=timezone.utc)
+
+
+class Conn:
+    """Records SQL; serves COUNTS, an optional stored snapshot, and can time out the counts"""
+
+    def __init__(self, stored=True, cancel=None):
+        self.stored = stored
+        self.cancel = cancel
+        self.sql = []
+        self.committed = self.rolled_back = False
+        self._last = ''
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self._last = ' '.join(sql.split())
+        self.sql.append((self._last, params))
+        if self.cancel and 'FROM person_email' in self._last:
+            raise self.cancel('canceling statement due to statement timeout')
+
+    def fetchone(self):
+        if self._last.startswith('INSERT INTO stats_snapshot'):
+            return {**COUNTS, 'refresh_ms': 12, 'refreshed_at': REFRESHED_AT}
+        if 'FROM stats_snapshot' in self._last:
+            if not self.stored:
+                return None
+            return {**COUNTS, 'refresh_ms': 900, 'refreshed_at': REFRESHED_AT, 'age_seconds': 600.4}
+        return dict(COUNTS)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+
+@pytest.mark.unit
+class TestStatsSnapshot:
+
+    def test_compute_counts_in_one_statement_under_budget(self):
+        conn = Conn()
+
+        snapshot = StatsSnapshot(conn).compute(budget_ms=2500)
+
+        statements = [sql for sql, _ in conn.sql]
+        assert statements[0] == "SET LOCAL statement_timeout = %s" and conn.sql[0][1] == ('2500ms',)
+        assert sum(sql.startswith('SELECT') for sql in statements) == 1
+        assert statements[-1].startswith('INSERT INTO stats_snapshot')
+        assert {m: snapshot[m] for m in METRICS} == COUNTS
+        assert conn.committed
+
+    def test_failed_compute_rolls_back(self):
+        conn = Conn(cancel=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            StatsSnapshot(conn).compute(budget_ms=10)
+
+        assert conn.rolled_back and not conn.committed
+        assert not any(sql.startswith('INSERT') for sql, _ in conn.sql)
+
+
+@pytest.mark.unit
+class TestEndpoints:
+
+    @pytest.fixture
+    def stats(self):
+        pytest.importorskip("fastapi")
+        from api.routers import stats
+        return stats
+
+    def test_reads_snapshot_without_counting(self, stats):
+        conn = Conn()
+
+        result = stats.get_coverage_stats(fresh=False, db=conn)
+
+        assert result['coverage']['email'] == {'count': 50, 'percentage': 25.0}
+        assert result['freshness'] == {
+            'source': 'snapshot', 'as_of': REFRESHED_AT.isoformat(), 'age_seconds': 600, 'compute_ms': 900
+        }
+        assert not any('FROM person_email' in sql for sql, _ in conn.sql)
+
+    def test_fresh_recomputes_and_falls_back_on_timeout(self, stats):
+        result = stats.get_quality_metrics(fresh=True, db=Conn())
+        assert result['freshness']['source'] == 'live'
+        assert result['completeness']['linkedin']['percentage'] == 75.0
+
+        result = stats.get_quality_metrics(fresh=True, db=Conn(cancel=stats.QueryCanceledError))
+        assert result['freshness']['source'] == 'snapshot' and result['freshness']['fresh_timed_out']
+
+        with pytest.raises(stats.HTTPException) as error:
+            stats.get_quality_metrics(fresh=True, db=Conn(stored=False, cancel=stats.QueryCanceledError))
+        assert error.value.status_code == 503
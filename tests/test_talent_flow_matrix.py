@@ -0,0 +1,147 @@
+# ABOUTME: Unit tests for the sparse company-to-company talent-flow matrix
+# ABOUTME: Covers move extraction from stints, top-k rows, multi-hop shares and snapshots,
+# ABOUTME: and that the API's employment fallback counts the same moves as the matrix (Postgres)
+
+import os
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "analytics"))
+from talent_flow_matrix import TalentFlowMatrix, transitions
+
+
+def stints(*rows):
+    return pd.DataFrame(rows, columns=['person_id', 'company_id', 'start_date', 'end_date'])
+
+
+HISTORIES = stints(
+    ('p1', 'A', '2015-01-01', '2017-06-01'),
+    ('p1', 'B', '2017-07-01', '2019-01-01'),
+    ('p1', 'C', '2019-02-01', None),
+    ('p2', 'A', '2014-01-01', '2016-01-01'),
+    ('p2', 'X', '2015-01-01', '2015-06-01'),    # Side gig while at A: not a move
+    ('p2', 'B', '2016-01-01', None),
+    ('p2', 'B', '2017-01-01', None),            # New title, same company
+    ('p3', 'B', '2010-01-01', '2012-01-01'),
+    ('p3', 'D', '2012-01-01', None),
+)
+
+
+@pytest.mark.unit
+class TestTransitions:
+
+    def test_moves_follow_the_latest_ended_stint(self):
+        moves = transitions(HISTORIES)
+        pairs = sorted(zip(moves['person_id'], moves['from_company_id'], moves['to_company_id']))
+
+        assert pairs == [('p1', 'A', 'B'), ('p1', 'B', 'C'), ('p2', 'A', 'B'), ('p3', 'B', 'D')]
+
+    def test_empty_histories(self):
+        matrix = TalentFlowMatrix.from_stints(stints())
+
+        assert matrix.size == 0
+        assert matrix.top('A') == []
+
+
+@pytest.mark.unit
+class TestQueries:
+
+    def test_top_feeders_and_destinations(self):
+        matrix = TalentFlowMatrix.from_stints(HISTORIES)
+
+        assert matrix.top('B', 'inbound') == [('A', 2)]
+        assert matrix.top('B', 'outbound') == [('C', 1), ('D', 1)]
+        assert matrix.top('B', 'outbound', k=1) == [('C', 1)]
+        assert matrix.flow('A', 'B') == 2
+        assert matrix.flow('B', 'A') == 0
+        assert matrix.top('unknown') == []
+
+    def test_multi_hop_shares(self):
+        matrix = TalentFlowMatrix.from_stints(HISTORIES)
+
+        # A's leavers all went to B; B's leavers split evenly over C and D
+        assert matrix.multi_hop('A', hops=2) == [('C', 0.5), ('D', 0.5)]
+        assert matrix.multi_hop('C', hops=2, direction='inbound') == [('A', 1.0)]
+        assert matrix.multi_hop('C', hops=3) == []
+
+    def test_matches_scipy_layout(self):
+        matrix = TalentFlowMatrix.from_stints(HISTORIES)
+        indptr, indices, data = matrix.out_csr
+        dense = np.zeros((matrix.size, matrix.size), dtype=int)
+        for row in range(matrix.size):
+            dense[row, indices[indptr[row]:indptr[row + 1]]] = data[indptr[row]:indptr[row + 1]]
+
+        t_indptr, t_indices, t_data = matrix.in_csr
+        for col in range(matrix.size):
+            assert list(dense[t_indices[t_indptr[col]:t_indptr[col + 1]], col]) == list(t_data[t_indptr[col]:t_indptr[col + 1]])
+
+
+@pytest.mark.unit
+class TestSnapshot:
+
+    def test_save_load_and_shared_reload(self, tmp_path):
+        path = tmp_path / 'flow.npz'
+        TalentFlowMatrix.from_stints(HISTORIES).save(path)
+
+        shared = TalentFlowMatrix.shared(path)
+        assert shared.top('B', 'inbound') == [('A', 2)]
+        assert TalentFlowMatrix.shared(path) is shared
+
+        TalentFlowMatrix.from_stints(HISTORIES.iloc[:3]).save(path)
+        os.utime(path, (shared.built_at + 10, shared.built_at + 10))
+        assert TalentFlowMatrix.shared(path).top('B', 'inbound') == [('A', 1)]
+
+    def test_missing_snapshot(self, tmp_path):
+        assert TalentFlowMatrix.shared(tmp_path / 'missing.npz') is None
+
+
+@pytest.mark.integration
+class TestEmploymentFallback:
+
+    def test_fallback_matches_matrix(self, pg_test_conn, monkeypatch):
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        from api.services import market_intelligence
+
+        pg_test_conn.cursor_factory = RealDictCursor
+        cursor = pg_test_conn.cursor()
+        companies = {}
+        for code in sorted(set(HISTORIES['company_id'])):
+            cursor.execute("INSERT INTO company (company_name) VALUES (%s) RETURNING company_id",
+                           (f"Flowtest {code}",))
+            companies[code] = str(cursor.fetchone()['company_id'])
+        people = {}
+        for code in sorted(set(HISTORIES['person_id'])):
+            url = f"https://www.linkedin.com/in/flowtest-{code}"
+            cursor.execute("""
+                INSERT INTO person (full_name, linkedin_url, normalized_linkedin_url)
+                VALUES (%s, %s, %s) RETURNING person_id
+            """, (code, url, url))
+            people[code] = cursor.fetchone()['person_id']
+        for person, company, start, end in HISTORIES.itertuples(index=False):
+            cursor.execute("""
+                INSERT INTO employment (person_id, company_id, title, start_date, end_date)
+                VALUES (%s, %s, 'Engineer', %s, %s)
+            """, (people[person], companies[company], start, end))
+        pg_test_conn.commit()
+        cursor.close()
+
+        service = market_intelligence.MarketIntelligenceService(pg_test_conn)
+        matrix = TalentFlowMatrix.load_from_database(pg_test_conn)
+
+        def flows(shared):
+            monkeypatch.setattr(market_intelligence.TalentFlowMatrix, 'shared', classmethod(lambda cls: shared))
+            result = service.get_talent_flow(company_id=companies['B'])
+            return {key: sorted((f['company_id'], f['person_count']) for f in result[key])
+                    for key in ('feeder_companies', 'destination_companies')}, result['flow_source']
+
+        from_matrix, source = flows(matrix)
+        assert source == 'matrix'
+        from_employment, source = flows(None)
+        assert source == 'employment'
+        assert from_employment == from_matrix
+        assert from_matrix['feeder_companies'] == [(companies['A'], 2)]
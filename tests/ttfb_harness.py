@@ -0,0 +1,113 @@
+# ABOUTME: Time-to-first-byte harness for the AI endpoints, blocking vs ?stream=true (server-sent events)
+# ABOUTME: Runs against a live API; pair it with fake_llm_server.py to take provider variance out of the numbers
+
+import argparse
+import http.client
+import json
+import statistics
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+from fake_llm_server import FakeLLMServer
+
+
+def measure_http(api_url: str, path: str, payload: Dict[str, Any], timeout: float = 120) -> Dict[str, Optional[float]]:
+    """
+    POST to the API and time the response.
+
+    Returns seconds to the first body byte (ttfb), to the first SSE token
+    event (first_token, None for blocking responses) and to the end (total).
+    """
+    url = urlsplit(api_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+    body = json.dumps(payload)
+    start = time.perf_counter()
+    conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+
+    ttfb = first_token = None
+    while True:
+        line = response.readline()
+        if not line:
+            break
+        if ttfb is None:
+            ttfb = time.perf_counter() - start
+        if first_token is None and line.startswith(b'event: token'):
+            first_token = time.perf_counter() - start
+    total = time.perf_counter() - start
+    conn.close()
+
+    if response.status != 200:
+        raise RuntimeError(f"{path} returned HTTP {response.status}")
+    return {'ttfb': ttfb, 'first_token': first_token, 'total': total}
+
+
+async def measure_events(events: AsyncIterator[str]) -> Dict[str, Any]:
+    """Time an in-process SSE body (e.g. ai_streaming.stream_completion) event by event"""
+    start = time.perf_counter()
+    timings = {'ttfb': None, 'meta': None, 'first_token': None, 'total': None, 'events': []}
+    async for chunk in events:
+        elapsed = time.perf_counter() - start
+        event = chunk.split('\n', 1)[0].replace('event: ', '')
+        timings['events'].append(event)
+        if timings['ttfb'] is None:
+            timings['ttfb'] = elapsed
+        if event == 'meta' and timings['meta'] is None:
+            timings['meta'] = elapsed
+        if event == 'token' and timings['first_token'] is None:
+            timings['first_token'] = elapsed
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+
+def _report(label: str, runs):
+    def median(key):
+        values = [run[key] for run in runs if run[key] is not None]
+        return f"{statistics.median(values):7.3f}s" if values else "      -"
+    print(f"  {label:10s} ttfb {median('ttfb')}   first token {median('first_token')}   total {median('total')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure AI endpoint time-to-first-byte, blocking vs streaming')
+    parser.add_argument('--api', default='http://localhost:8000', help='Running API base URL')
+    parser.add_argument('--endpoint', default='/api/ai/ask',
+                        choices=['/api/ai/ask', '/api/ai/profile-summary', '/api/market/ask'])
+    parser.add_argument('--person-id', help='Candidate for /api/ai endpoints')
+    parser.add_argument('--company-name', help='Company for /api/market/ask')
+    parser.add_argument('--question', default='Would they be good for a senior backend role?')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--mock-port', type=int,
+                        help='Also run fake_llm_server on this port (start the API with OPENAI_BASE_URL pointing at it)')
+    parser.add_argument('--mock-latency', type=float, default=2.0, help='Mock seconds to first token')
+    parser.add_argument('--mock-token-delay', type=float, default=0.05, help='Mock seconds between tokens')
+    args = parser.parse_args()
+
+    payload = {'question': args.question}
+    if args.endpoint.startswith('/api/ai'):
+        if not args.person_id:
+            parser.error('--person-id is required for /api/ai endpoints')
+        payload['person_id'] = args.person_id
+    else:
+        payload['company_name'] = args.company_name
+
+    mock = None
+    if args.mock_port:
+        mock = FakeLLMServer(latency=args.mock_latency, port=args.mock_port, token_delay=args.mock_token_delay).start()
+        print(f"Mock provider on {mock.openai_base_url} - start the API with "
+              f"OPENAI_BASE_URL={mock.openai_base_url} LLM_CACHE_ENABLED=false")
+
+    try:
+        blocking = [measure_http(args.api, args.endpoint, payload) for _ in range(args.runs)]
+        streaming = [measure_http(args.api, f"{args.endpoint}?stream=true", payload) for _ in range(args.runs)]
+    finally:
+        if mock:
+            mock.stop()
+
+    print(f"\n{args.endpoint} - median of {args.runs} runs")
+    _report('blocking', blocking)
+    _report('streaming', streaming)
+
+
+if __name__ == '__main__':
+    main()